@@ -0,0 +1,383 @@
+# -*- coding: utf8 -*-
+
+#***************************************************************************
+#*                                                                         *
+#*   Copyright (c) 2019 FreeCAD Developers                                 *
+#*                                                                         *
+#*   This program is free software; you can redistribute it and/or modify  *
+#*   it under the terms of the GNU Lesser General Public License (LGPL)    *
+#*   as published by the Free Software Foundation; either version 2 of     *
+#*   the License, or (at your option) any later version.                   *
+#*   for detail see the LICENCE text file.                                 *
+#*                                                                         *
+#*   This program is distributed in the hope that it will be useful,       *
+#*   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+#*   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+#*   GNU Library General Public License for more details.                  *
+#*                                                                         *
+#*   You should have received a copy of the GNU Library General Public     *
+#*   License along with this program; if not, write to the Free Software   *
+#*   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+#*   USA                                                                   *
+#*                                                                         *
+#***************************************************************************
+
+__title__="FreeCAD Draft Workbench - DXF reader"
+__author__ = "FreeCAD Developers"
+__url__ = ["http://www.freecadweb.org"]
+
+## @package DraftDXFReader
+#  \ingroup DRAFT
+#  \brief Streaming reader of ASCII DXF files
+#
+# This module reads ASCII DXF files for the legacy DXF importer, without
+# the external dxfReader library
+
+'''
+The file is memory-mapped and split into (group code, value) pairs chunk by
+chunk, the values converted to int, float or text by their group code.
+The pairs are grouped into records, each starting with a 0 group, and the
+records into the objects of the dxfReader library used by importDXF:
+
+drawing.header, drawing.tables, drawing.blocks, drawing.entities
+
+The entities have the attributes of the dxfReader entities the importer
+uses (layer, color_index, points, loc, radius...) and keep their pairs in
+data. readDXF can hand every entity to a function as soon as it is read,
+the entities this function consumes are not kept in the drawing, so the
+memory used for them stays bounded. The classes and objects sections are
+skipped.
+
+color_map is the AutoCAD color index palette, as in dxfColorMap.
+'''
+
+import colorsys, mmap, os, sys
+
+CHUNKSIZE = 1 << 20 # bytes of the file split into lines at once
+
+def _decode(value):
+    "returns the text of a dxf value, without its line end"
+    value = value.rstrip(b"\r")
+    if sys.version_info.major < 3:
+        return value
+    try:
+        return value.decode("utf8")
+    except UnicodeDecodeError:
+        return value.decode("cp1252")
+
+def _groupTypes():
+    "returns the value conversion of the group codes that aren't text"
+    types = {}
+    for conv,ranges in [(float,[(10,59),(110,149),(210,239),(460,469),(1010,1059)]),
+                        (int,[(60,79),(90,99),(160,179),(270,299),(370,389),(400,409),
+                              (420,429),(440,459),(1060,1071)])]:
+        for first,last in ranges:
+            for code in range(first,last+1):
+                types[code] = conv
+    return types
+
+GroupTypes = _groupTypes()
+
+def tokens(filename):
+    "yields the (group code, value) pairs of an ASCII dxf file"
+    f = open(filename,"rb")
+    try:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return
+        mm = mmap.mmap(f.fileno(),0,access=mmap.ACCESS_READ)
+        try:
+            if mm[:18] == b"AutoCAD Binary DXF":
+                raise ValueError("binary DXF files are not supported: "+filename)
+            get = GroupTypes.get
+            pos = 0
+            rest = b""
+            while pos < size:
+                lines = (rest+mm[pos:pos+CHUNKSIZE]).split(b"\n")
+                pos += CHUNKSIZE
+                rest = b""
+                if pos < size:
+                    # keep the partial last line, and a group code without its value
+                    rest = lines.pop()
+                    if len(lines) % 2:
+                        rest = lines.pop()+b"\n"+rest
+                pairs = iter(lines)
+                for code,value in zip(pairs,pairs):
+                    code = int(code)
+                    conv = get(code,_decode)
+                    try:
+                        yield code,conv(value)
+                    except ValueError:
+                        yield code,_decode(value)
+        finally:
+            mm.close()
+    finally:
+        f.close()
+
+def records(pairs):
+    "yields the (type, data) records of the pairs, data being the pairs following the 0 group"
+    kind = None
+    data = []
+    for code,value in pairs:
+        if code == 0:
+            if kind is not None:
+                yield kind,data
+            kind = value.strip().lower()
+            data = []
+        else:
+            data.append((code,value))
+    if kind is not None:
+        yield kind,data
+
+
+# OBJECTS #######################################################################
+
+class Object(object):
+    "a dxf object, with its type, name and data, the list of its pairs or contents"
+    def __init__(self,_type="",data=None):
+        self.type = _type
+        self.name = ""
+        self.data = data if data is not None else []
+
+    def __str__(self):
+        return self.name or self.type
+
+    def __repr__(self):
+        return "<%s %s>" % (self.type,self.name)
+
+    def get_type(self,kind=""):
+        "returns the contents of this object of the given type"
+        return [item for item in self.data if isinstance(item,Object) and item.type == kind]
+
+class Vertex(list):
+    "a polyline vertex, usable as its [x,y,z] location"
+    def __init__(self,loc,bulge=0.0,flags=0,data=None):
+        list.__init__(self,loc)
+        self.type = "vertex"
+        self.bulge = bulge
+        self.flags = flags
+        self.data = data if data is not None else []
+
+    @property
+    def loc(self):
+        return self[:]
+
+def _point(v,code,default=0.0):
+    "returns the point of the given group code and the two following"
+    return [v.get(code,default),v.get(code+10,default),v.get(code+20,default)]
+
+def _line(e,v):
+    e.points = [_point(v,10),_point(v,11)]
+
+def _lwpolyline(e,v):
+    e.elevation = v.get(38,0.0)
+    e.flags = v.get(70,0)
+    e.closed = bool(e.flags & 1)
+    e.num_points = v.get(90,0)
+    e.points = []
+    p = None
+    for code,value in e.data:
+        if code == 10:
+            p = Vertex([value,0.0,0.0])
+            e.points.append(p)
+        elif p is None:
+            continue
+        elif code == 20:
+            p[1] = value
+        elif code == 42:
+            p.bulge = value
+
+def _polyline(e,v):
+    e.elevation = v.get(30,0.0)
+    e.flags = v.get(70,0)
+    e.closed = bool(e.flags & 1)
+    e.points = []
+
+def _vertex(data):
+    v = dict(reversed(data))
+    return Vertex(_point(v,10),v.get(42,0.0),v.get(70,0),data)
+
+def _circle(e,v):
+    e.loc = _point(v,10)
+    e.radius = v.get(40,0.0)
+
+def _arc(e,v):
+    _circle(e,v)
+    e.start_angle = v.get(50,0.0)
+    e.end_angle = v.get(51,360.0)
+
+def _ellipse(e,v):
+    e.loc = _point(v,10)
+    e.major = _point(v,11)
+    e.ratio = v.get(40,1.0)
+    e.start_angle = v.get(41,0.0)
+    e.end_angle = v.get(42,6.283185307179586)
+
+def _face(e,v):
+    e.points = [_point(v,10),_point(v,11),_point(v,12),_point(v,13)]
+    if (not 13 in v) or (e.points[3] == e.points[2]):
+        e.points.pop()
+
+def _text(e,v):
+    e.value = v.get(1,"")
+    e.loc = _point(v,10)
+    e.height = v.get(40,1.0)
+    e.rotation = v.get(50,0.0)
+
+def _mtext(e,v):
+    _text(e,v)
+    e.value = "".join([value for code,value in e.data if code == 3])+e.value
+    e.width = v.get(41,0.0)
+    e.alignment = v.get(71,1)
+
+def _insert(e,v):
+    e.block = v.get(2,"")
+    e.loc = _point(v,10)
+    e.scale = [v.get(41,1.0),v.get(42,1.0),v.get(43,1.0)]
+    e.rotation = v.get(50,0.0)
+
+Setups = {"line":_line,"lwpolyline":_lwpolyline,"polyline":_polyline,"circle":_circle,
+          "arc":_arc,"ellipse":_ellipse,"3dface":_face,"text":_text,"mtext":_mtext,
+          "insert":_insert}
+
+class Entity(Object):
+    "a dxf entity, with the attributes of its type"
+    def __init__(self,_type,data):
+        Object.__init__(self,_type,data)
+        v = dict(reversed(data)) # the first value of each group code
+        self.layer = v.get(8,"0")
+        self.color_index = v.get(62,256)
+        self.space = v.get(67,0)
+        self.thickness = v.get(39,0.0)
+        self.extrusion = [v.get(210,0.0),v.get(220,0.0),v.get(230,1.0)]
+        setup = Setups.get(_type)
+        if setup:
+            setup(self,v)
+
+class Drawing(Object):
+    "the sections of a dxf file"
+    def __init__(self):
+        Object.__init__(self,"drawing")
+        self.header = Object("header")
+        self.classes = Object("classes")
+        self.tables = Object("tables")
+        self.blocks = Object("blocks")
+        self.entities = Object("entities")
+        self.objects = Object("objects")
+        self.data = [self.header,self.classes,self.tables,self.blocks,self.entities,self.objects]
+
+
+# READING #######################################################################
+
+def _entities(recs,end):
+    "yields the entities of the records up to the given end records"
+    polyline = None
+    for kind,data in recs:
+        if polyline is not None:
+            if kind == "vertex":
+                polyline.points.append(_vertex(data))
+                continue
+            entity,polyline = polyline,None
+            yield entity
+            if kind == "seqend":
+                continue
+        if kind in end:
+            return
+        entity = Entity(kind,data)
+        if kind == "polyline":
+            polyline = entity
+        else:
+            yield entity
+    if polyline is not None:
+        yield polyline
+
+def _readTables(recs,tables):
+    "reads the tables section"
+    table = None
+    for kind,data in recs:
+        if kind == "endsec":
+            return
+        elif kind == "table":
+            table = Object("table")
+            table.name = _first(data,2,"").strip().lower()
+            tables.data.append(table)
+        elif kind == "endtab":
+            table = None
+        elif table is not None:
+            entry = Object(kind,data)
+            entry.name = _first(data,2,"")
+            if kind == "layer":
+                entry.color = _first(data,62,7)
+                entry.flags = _first(data,70,0)
+            table.data.append(entry)
+
+def _readBlocks(recs,blocks):
+    "reads the blocks section"
+    for kind,data in recs:
+        if kind == "endsec":
+            return
+        elif kind == "block":
+            block = Object("block",data)
+            v = dict(reversed(data))
+            block.name = v.get(2,"")
+            block.layer = v.get(8,"0")
+            block.loc = _point(v,10)
+            block.entities = Object("block_contents",list(_entities(recs,("endblk","endsec"))))
+            blocks.data.append(block)
+
+def _first(data,code,default=None):
+    "returns the first value of the given group code"
+    for c,value in data:
+        if c == code:
+            return value
+    return default
+
+def readDXF(filename,consume=None):
+    """readDXF(filename,[consume]): returns the drawing of the dxf file.
+    If consume is given, it is called with each entity of the entities section
+    as soon as it is read, the entities for which it returns True are not kept
+    in drawing.entities"""
+    drawing = Drawing()
+    recs = records(tokens(filename))
+    for kind,data in recs:
+        if kind == "eof":
+            break
+        elif kind != "section":
+            continue
+        name = _first(data,2,"").strip().lower()
+        if name == "header":
+            drawing.header.data = data[1:]
+        elif name == "tables":
+            _readTables(recs,drawing.tables)
+        elif name == "blocks":
+            _readBlocks(recs,drawing.blocks)
+        elif name == "entities":
+            entities = drawing.entities.data
+            for entity in _entities(recs,("endsec",)):
+                if (consume is None) or (not consume(entity)):
+                    entities.append(entity)
+        else:
+            for kind,data in recs:
+                if kind == "endsec":
+                    break
+    return drawing
+
+
+# COLORS ########################################################################
+
+def _colorMap():
+    "returns the rgb colors of the AutoCAD color index"
+    cm = {0:[0.0,0.0,0.0],1:[1.0,0.0,0.0],2:[1.0,1.0,0.0],3:[0.0,1.0,0.0],4:[0.0,1.0,1.0],
+          5:[0.0,0.0,1.0],6:[1.0,0.0,1.0],7:[1.0,1.0,1.0],8:[0.5,0.5,0.5],9:[0.75,0.75,0.75]}
+    # 24 hues, each in 5 shades, full and half saturated
+    values = [255,165,127,76,38]
+    for i in range(10,250):
+        hue = (i//10-1)/24.0
+        sat = 1.0 if i % 2 == 0 else 0.5
+        val = values[(i % 10)//2]/255.0
+        cm[i] = list(colorsys.hsv_to_rgb(hue,sat,val))
+    for i,g in enumerate([51,80,105,130,190,255]):
+        cm[250+i] = [g/255.0]*3
+    return cm
+
+color_map = _colorMap()
@@ -0,0 +1,128 @@
+# -*- coding: utf8 -*-
+
+#***************************************************************************
+#*                                                                         *
+#*   Copyright (c) 2019 FreeCAD Developers                                 *
+#*                                                                         *
+#*   This program is free software; you can redistribute it and/or modify  *
+#*   it under the terms of the GNU Lesser General Public License (LGPL)    *
+#*   as published by the Free Software Foundation; either version 2 of     *
+#*   the License, or (at your option) any later version.                   *
+#*   for detail see the LICENCE text file.                                 *
+#*                                                                         *
+#*   This program is distributed in the hope that it will be useful,       *
+#*   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+#*   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+#*   GNU Library General Public License for more details.                  *
+#*                                                                         *
+#*   You should have received a copy of the GNU Library General Public     *
+#*   License along with this program; if not, write to the Free Software   *
+#*   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+#*   USA                                                                   *
+#*                                                                         *
+#***************************************************************************
+
+__title__="FreeCAD Draft Workbench - DXF reader benchmark"
+__author__ = "FreeCAD Developers"
+__url__ = ["http://www.freecadweb.org"]
+
+'''
+Benchmark of the bundled DXF reader on synthetic DXF files of lines,
+polylines, arcs, circles and texts on 20 layers. For each size it prints
+the time and MB/s of the tokenizer alone, of reading the whole drawing and
+of streaming the entities, and the peak memory of the last two.
+
+run in the FreeCAD Python console, FreeCADCmd or a plain python:
+
+import benchmarkDXFReader
+benchmarkDXFReader.run()
+'''
+
+import os, random, shutil, sys, tempfile, time
+import DraftDXFReader
+
+def writeDXF(filename,count,seed=0):
+    "writes a dxf file with count entities"
+    rnd = random.Random(seed)
+    f = open(filename,"w")
+    f.write("  0\nSECTION\n  2\nHEADER\n  9\n$ACADVER\n  1\nAC1015\n  0\nENDSEC\n")
+    f.write("  0\nSECTION\n  2\nTABLES\n  0\nTABLE\n  2\nLAYER\n 70\n20\n")
+    for l in range(20):
+        f.write("  0\nLAYER\n  2\nLayer%d\n 70\n0\n 62\n%d\n  6\nCONTINUOUS\n" % (l,l+1))
+    f.write("  0\nENDTAB\n  0\nENDSEC\n  0\nSECTION\n  2\nENTITIES\n")
+    for i in range(count):
+        x = rnd.uniform(0,1000)
+        y = rnd.uniform(0,1000)
+        head = "  8\nLayer%d\n 62\n256\n" % (i % 20)
+        kind = i % 10
+        if kind < 5:
+            f.write("  0\nLINE\n%s 10\n%.6f\n 20\n%.6f\n 30\n0.0\n 11\n%.6f\n 21\n%.6f\n 31\n0.0\n"
+                    % (head,x,y,x+rnd.uniform(-10,10),y+rnd.uniform(-10,10)))
+        elif kind < 7:
+            f.write("  0\nLWPOLYLINE\n%s 90\n8\n 70\n1\n" % head)
+            for v in range(8):
+                f.write(" 10\n%.6f\n 20\n%.6f\n" % (x+rnd.uniform(-10,10),y+rnd.uniform(-10,10)))
+                if v % 3 == 0:
+                    f.write(" 42\n0.25\n")
+        elif kind == 7:
+            f.write("  0\nARC\n%s 10\n%.6f\n 20\n%.6f\n 30\n0.0\n 40\n%.6f\n 50\n%.6f\n 51\n%.6f\n"
+                    % (head,x,y,rnd.uniform(1,10),rnd.uniform(0,180),rnd.uniform(180,360)))
+        elif kind == 8:
+            f.write("  0\nCIRCLE\n%s 10\n%.6f\n 20\n%.6f\n 30\n0.0\n 40\n%.6f\n"
+                    % (head,x,y,rnd.uniform(1,10)))
+        else:
+            f.write("  0\nTEXT\n%s 10\n%.6f\n 20\n%.6f\n 30\n0.0\n 40\n2.5\n  1\nText %d\n"
+                    % (head,x,y,i))
+    f.write("  0\nENDSEC\n  0\nEOF\n")
+    f.close()
+
+def peakMemory(func):
+    "returns the peak memory in MB allocated by func, None if it can't be traced"
+    try:
+        import tracemalloc
+    except ImportError:
+        return None
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]/1e6
+    finally:
+        tracemalloc.stop()
+
+def run(sizes=(100000,500000,1000000),memory=True,directory=None):
+    "runs the benchmark for dxf files of the given numbers of entities"
+    tmp = directory or tempfile.mkdtemp(prefix="dxfbench")
+    try:
+        print("%10s %8s %22s %22s %22s" % ("entities","MB","tokens s (MB/s)","readDXF s (MB)","streamed s (MB)"))
+        for count in sizes:
+            filename = os.path.join(tmp,"bench%d.dxf" % count)
+            writeDXF(filename,count)
+            mb = os.path.getsize(filename)/1e6
+            t = time.time()
+            for pair in DraftDXFReader.tokens(filename):
+                pass
+            ttok = time.time()-t
+            read = lambda: DraftDXFReader.readDXF(filename)
+            stream = lambda: DraftDXFReader.readDXF(filename,lambda entity: True)
+            t = time.time()
+            drawing = read()
+            tread = time.time()-t
+            assert len(drawing.entities.data) == count
+            del drawing
+            t = time.time()
+            stream()
+            tstream = time.time()-t
+            mread = mstream = None
+            if memory:
+                mread = peakMemory(read)
+                mstream = peakMemory(stream)
+            fmt = lambda s,m: "%8.2f (%s)" % (s,"%.0f" % m if m is not None else "-")
+            print("%10d %8.1f %22s %22s %22s" % (count,mb,"%8.2f (%.1f)" % (ttok,mb/ttok),
+                                                 fmt(tread,mread),fmt(tstream,mstream)))
+            os.remove(filename)
+    finally:
+        if not directory:
+            shutil.rmtree(tmp)
+
+if __name__ == "__main__":
+    run([int(a) for a in sys.argv[1:]] or (100000,500000,1000000))
@@ -34,7 +34,8 @@ __url__ = ["http://www.freecadweb.org"]
 
 '''
 This script uses a DXF-parsing library created by Stani,
-Kitsu and Migius for Blender
+Kitsu and Migius for Blender to export, the legacy importer
+reads the files with the bundled DraftDXFReader module
 
 imports:
 line, polylines, lwpolylines, arcs, circles, texts,
@@ -50,7 +51,7 @@ CURRENTDXFLIB = 1.40 # the minimal version of the dxfLibrary needed to run
 
 import six
 
-import sys, FreeCAD, os, Part, math, re, string, Mesh, Draft, DraftVecUtils, DraftGeomUtils, WorkingPlane
+import sys, FreeCAD, os, Part, math, re, string, time, Mesh, Draft, DraftVecUtils, DraftGeomUtils, WorkingPlane
 from Draft import _Dimension, _ViewProviderDimension
 from FreeCAD import Vector
 
@@ -134,6 +135,14 @@ To enabled FreeCAD to download these libraries, answer Yes.""")
                 FreeCAD.Console.PrintWarning("Please check https://github.com/yorikvanhavre/Draft-dxf-importer\n")
 
 
+def getDXFReader():
+    "loads the bundled DXF reader, and its color map if the DXF libraries aren't loaded"
+    global dxfReader,dxfColorMap
+    import DraftDXFReader
+    dxfReader = DraftDXFReader
+    if not dxfColorMap:
+        dxfColorMap = DraftDXFReader
+
 def getDXFlibs():
     "loads the DXF python libraries"
     try:
@@ -1068,15 +1077,135 @@ def addToBlock(obj,layer):
     else:
         layerBlocks[layer] = [obj]
 
+class BatchBuilder:
+    "collects the shapes of dxf entities per layer and color and creates one object per group"
+
+    def __init__(self):
+        self.groups = {}
+        self.order = []
+        self.count = 0
+
+    def add(self,shape,name,layer,dxfobj,sketch=False):
+        "adds the shape of a dxf entity to the group of its layer and color, or to the sketch of its layer"
+        color = None
+        if dxfGetColors and (not sketch) and hasattr(dxfobj,"color_index"):
+            color = dxfobj.color_index
+        key = (layer,color,sketch)
+        if not key in self.groups:
+            self.groups[key] = (name,dxfobj,[])
+            self.order.append(key)
+        if not isinstance(shape,Part.Shape):
+            shape = shape.Shape
+        self.groups[key][2].append(shape)
+        self.count += 1
+
+    def build(self):
+        "creates a compound, or a sketch, for each group"
+        for key in self.order:
+            name,dxfobj,shapes = self.groups[key]
+            if key[2]:
+                newob = addObject(makeBatchSketch(shapes),"Sketch",key[0])
+            else:
+                if len(shapes) > 1:
+                    name = "Compound"
+                    shape = Part.makeCompound(shapes)
+                else:
+                    shape = shapes[0]
+                newob = addObject(shape,name,key[0])
+            if key[0]:
+                newob.Label = decodeName(key[0])
+            if gui: formatObject(newob,dxfobj)
+
+def isFlat(shape):
+    "returns True if the given shape lies in a plane parallel to the XY plane"
+    return DraftVecUtils.isNull(Vector(0,0,shape.BoundBox.ZLength))
+
+def makeBatchSketch(shapes):
+    "makes a sketch of the given shapes lying in planes parallel to the XY plane, adding all geometry and constraints at once"
+    from Sketcher import Constraint
+    geometry = []
+    constraints = []
+    for shape in shapes:
+        if shape.Wires:
+            wires = [w.OrderedEdges for w in shape.Wires]
+        else:
+            wires = [[e] for e in shape.Edges]
+        for edges in wires:
+            first = len(geometry)
+            for edge in edges:
+                g = DraftGeomUtils.orientEdge(edge,None,make_arc=True)
+                if isinstance(g,Part.LineSegment):
+                    if DraftGeomUtils.isAligned(g,"x"):
+                        constraints.append(Constraint("Vertical",len(geometry)))
+                    elif DraftGeomUtils.isAligned(g,"y"):
+                        constraints.append(Constraint("Horizontal",len(geometry)))
+                elif isinstance(g,(Part.Circle,Part.ArcOfCircle)):
+                    constraints.append(Constraint("Radius",len(geometry),g.Radius))
+                geometry.append(g)
+            last = len(geometry)-1
+            for i in range(first,last+1):
+                j = i+1 if i < last else first
+                if (i == j) or (edges[i-first].Closed):
+                    continue
+                g1 = geometry[i]
+                g2 = geometry[j]
+                if DraftVecUtils.equals(g1.value(g1.LastParameter),g2.value(g2.FirstParameter)):
+                    constraints.append(Constraint("Coincident",i,2,j,1))
+    sketch = doc.addObject("Sketcher::SketchObject","Sketch")
+    sketch.addGeometry(geometry)
+    sketch.addConstraint(constraints)
+    return sketch
+
+def drawBatchEntity(entity,batch):
+    """draws a line, polyline, arc, circle, solid, spline, ellipse or 3dface in the given batch, returns False for other entities.
+    When creating sketches, only the lines, polylines, arcs and circles parallel to the XY plane go into the sketch of their layer,
+    the others are left to be imported one by one"""
+    names = {"line":"Line","lwpolyline":"Polyline","polyline":"Polyline","arc":"Arc","circle":"Circle",
+             "solid":"Solid","spline":"Spline","ellipse":"Ellipse","3dface":"Face"}
+    kind = entity.type
+    if not kind in names:
+        return False
+    sketch = dxfCreateSketch and (kind in ["line","lwpolyline","polyline","arc","circle"])
+    if (kind in ["lwpolyline","polyline"]) and (entity.flags in [16,64]):
+        return False # meshes
+    if dxfImportLayouts or (not entity.space):
+        if kind == "line":
+            shape = drawLine(entity,forceShape=True)
+        elif kind in ["lwpolyline","polyline"]:
+            shape = drawPolyline(entity,forceShape=True)
+        elif kind == "arc":
+            shape = drawArc(entity,forceShape=True)
+        elif kind == "circle":
+            shape = drawCircle(entity,forceShape=True)
+        elif kind == "solid":
+            shape = drawSolid(entity)
+        elif kind == "spline":
+            shape = drawSpline(entity,forceShape=True)
+        elif kind == "ellipse":
+            shape = drawEllipse(entity,forceShape=True)
+        else:
+            shape = drawFace(entity)
+        if shape:
+            if sketch and not isFlat(shape if isinstance(shape,Part.Shape) else shape.Shape):
+                return False
+            batch.add(shape,names[kind],entity.layer,entity,sketch)
+    return True
+
 def processdxf(document,filename,getShapes=False,reComputeFlag=True):
     "Recompute causes OpenSCAD import to loop, supply flag to make conditional"
     "this does the translation of the dxf contents into FreeCAD Part objects"
     global drawing # for debugging - so drawing is still accessible to python after the script ran
     if not dxfReader:
-        getDXFlibs()
         readPreferences()
+    getDXFReader()
     FreeCAD.Console.PrintMessage("opening "+filename+"...\n")
-    drawing = dxfReader.readDXF(filename)
+    timings = []
+    start = [time.time()]
+    def stage(name):
+        "records the time since the previous stage"
+        now = time.time()
+        timings.append((name,now-start[0]))
+        start[0] = now
     global layers
     layers = []
     global doc
@@ -1091,6 +1220,15 @@ def processdxf(document,filename,getShapes=False,reComputeFlag=True):
     layerBlocks = {}
     sketch = None
     shapes = []
+    batch = None
+    if dxfBatchImport and not (getShapes or dxfJoin):
+        # the geometry is drawn while reading, and not kept in the drawing
+        batch = BatchBuilder()
+        drawing = dxfReader.readDXF(filename,lambda entity: drawBatchEntity(entity,batch))
+        stage("reading and drawing "+str(batch.count)+" entities")
+    else:
+        drawing = dxfReader.readDXF(filename)
+        stage("reading")
 
     # drawing lines
 
@@ -1120,6 +1258,7 @@ def processdxf(document,filename,getShapes=False,reComputeFlag=True):
                 else:
                     newob = addObject(shape,"Line",line.layer)
                     if gui: formatObject(newob,line)
+    stage("lines")
 
     # drawing polylines
 
@@ -1167,6 +1306,7 @@ def processdxf(document,filename,getShapes=False,reComputeFlag=True):
                     newob = addObject(shape,"Polyline",polyline.layer)
                     if gui: formatObject(newob,polyline)
             num += 1
+    stage("polylines")
 
     # drawing arcs
 
@@ -1196,6 +1336,7 @@ def processdxf(document,filename,getShapes=False,reComputeFlag=True):
                 else:
                     newob = addObject(shape,"Arc",arc.layer)
                     if gui: formatObject(newob,arc)
+    stage("arcs")
 
     # joining lines, polylines and arcs if needed
 
@@ -1249,6 +1390,7 @@ def processdxf(document,filename,getShapes=False,reComputeFlag=True):
                 else:
                     newob = addObject(shape,"Circle",circle.layer)
                     if gui: formatObject(newob,circle)
+    stage("circles")
 
     # drawing solids
 
@@ -1269,6 +1411,7 @@ def processdxf(document,filename,getShapes=False,reComputeFlag=True):
                 else:
                     newob = addObject(shape,"Solid",lay)
                     if gui: formatObject(newob,solid)
+    stage("solids")
 
     # drawing splines
 
@@ -1289,6 +1432,7 @@ def processdxf(document,filename,getShapes=False,reComputeFlag=True):
                 else:
                     newob = addObject(shape,"Spline",lay)
                     if gui: formatObject(newob,spline)
+    stage("splines")
 
     # drawing ellipses
 
@@ -1309,6 +1453,7 @@ def processdxf(document,filename,getShapes=False,reComputeFlag=True):
                 else:
                     newob = addObject(shape,"Ellipse",lay)
                     if gui: formatObject(newob,ellipse)
+    stage("ellipses")
 
     # drawing texts
 
@@ -1338,6 +1483,14 @@ def processdxf(document,filename,getShapes=False,reComputeFlag=True):
             else:
                 newob = addObject(shape,"Face",face3d.layer)
                 if gui: formatObject(newob,face3d)
+    stage("3dfaces")
+
+    # creating the objects of the batch import
+
+    if batch:
+        FreeCAD.Console.PrintMessage("creating objects of "+str(batch.count)+" entities...\n")
+        batch.build()
+        stage("batch objects")
     if meshes: FreeCAD.Console.PrintMessage("drawing "+str(len(meshes))+" 3dmeshes...\n")
     for mesh in meshes:
         me = drawMesh(mesh)
@@ -1555,9 +1708,13 @@ def processdxf(document,filename,getShapes=False,reComputeFlag=True):
 
     print("done processing")
 
+    stage("other entities")
     if reComputeFlag :
        doc.recompute()
        print("recompute done")
+       stage("recompute")
+
+    FreeCAD.Console.PrintMessage("timings: "+", ".join("%s %.2fs" % t for t in timings)+"\n")
 
     FreeCAD.Console.PrintMessage("successfully imported "+filename+"\n")
     if badobjects:
@@ -1574,19 +1731,15 @@ def open(filename):
     "called when freecad opens a file."
     readPreferences()
     if dxfUseLegacyImporter:
-        getDXFlibs()
-        if dxfReader:
-            docname = os.path.splitext(os.path.basename(filename))[0]
-            if six.PY2:
-                if isinstance(docname,six.text_type): 
-                    #workaround since newDocument currently can't handle unicode filenames
-                    docname = docname.encode(sys.getfilesystemencoding())
-            doc = FreeCAD.newDocument(docname)
-            doc.Label = decodeName(docname)
-            processdxf(doc,filename)
-            return doc
-        else:
-            errorDXFLib(gui)
+        docname = os.path.splitext(os.path.basename(filename))[0]
+        if six.PY2:
+            if isinstance(docname,six.text_type): 
+                #workaround since newDocument currently can't handle unicode filenames
+                docname = docname.encode(sys.getfilesystemencoding())
+        doc = FreeCAD.newDocument(docname)
+        doc.Label = decodeName(docname)
+        processdxf(doc,filename)
+        return doc
     else:
         docname = os.path.splitext(os.path.basename(filename))[0]
         if six.PY2:
@@ -1608,28 +1761,23 @@ def insert(filename,docname):
         doc=FreeCAD.newDocument(docname)
     FreeCAD.setActiveDocument(docname)
     if dxfUseLegacyImporter:
-        getDXFlibs()
-        if dxfReader:
-            groupname = os.path.splitext(os.path.basename(filename))[0]
-            if six.PY2:
-                if isinstance(groupname,six.text_type): 
-                    #workaround since newDocument currently can't handle unicode filenames
-                    groupname = groupname.encode(sys.getfilesystemencoding())
-            importgroup = doc.addObject("App::DocumentObjectGroup",groupname)
-            importgroup.Label = decodeName(groupname)
-            processdxf(doc,filename)
-            for l in layers:
-                importgroup.addObject(l)
-        else:
-            errorDXFLib(gui)
+        groupname = os.path.splitext(os.path.basename(filename))[0]
+        if six.PY2:
+            if isinstance(groupname,six.text_type): 
+                #workaround since newDocument currently can't handle unicode filenames
+                groupname = groupname.encode(sys.getfilesystemencoding())
+        importgroup = doc.addObject("App::DocumentObjectGroup",groupname)
+        importgroup.Label = decodeName(groupname)
+        processdxf(doc,filename)
+        for l in layers:
+            importgroup.addObject(l)
     else:
         import Import
         Import.readDXF(filename)
 
 def getShapes(filename):
     "reads a dxf file and returns a list of shapes from its contents"
-    if dxfReader:
-        return processdxf(None,filename,getShapes=True)
+    return processdxf(None,filename,getShapes=True)
 
 
 # EXPORT ########################################################################
@@ -2317,7 +2465,7 @@ def readPreferences():
     global dxfMakeBlocks, dxfJoin, dxfRenderPolylineWidth, dxfImportTexts, dxfImportLayouts
     global dxfImportPoints, dxfImportHatches, dxfUseStandardSize, dxfGetColors, dxfUseDraftVisGroups
     global dxfFillMode, dxfBrightBackground, dxfDefaultColor, dxfUseLegacyImporter, dxfExportBlocks, dxfScaling
-    global dxfUseLegacyExporter
+    global dxfUseLegacyExporter, dxfBatchImport
     dxfCreatePart = p.GetBool("dxfCreatePart",True)
     dxfCreateDraft = p.GetBool("dxfCreateDraft",False)
     dxfCreateSketch = p.GetBool("dxfCreateSketch",False)
@@ -2325,6 +2473,7 @@ def readPreferences():
     dxfStarBlocks = p.GetBool("dxfstarblocks",False)
     dxfMakeBlocks = p.GetBool("groupLayers",False)
     dxfJoin = p.GetBool("joingeometry",False)
+    dxfBatchImport = p.GetBool("dxfBatchImport",False)
     dxfRenderPolylineWidth = p.GetBool("renderPolylineWidth",False)
     dxfImportTexts = p.GetBool("dxftext",False)
     dxfImportLayouts = p.GetBool("dxflayouts",False)
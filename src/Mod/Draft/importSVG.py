@@ -260,6 +260,29 @@ transformGeometry can be avoided."""
             pass              # non-orthogonal matrices
     return shape.transformGeometry(m)
 
+# precompiled tokenizers of lengths, path data and transform lists
+sizere = re.compile(r'([-+]?[0-9]*\.?[0-9]+([eE][-+]?[0-9]+)?)(px|pt|pc|mm|cm|in|em|ex|%)?')
+pathtokenre = re.compile(r'([mMlLhHvVaAcCqQsStTzZ])|([-+]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][-+]?[0-9]+)?)')
+numberre = re.compile(r'[-+]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][-+]?[0-9]+)?')
+transformre = re.compile(r'(matrix|translate|scale|rotate|skewX|skewY)\s*?\(([^)]*)\)')
+
+def getPathData(d):
+        """returns the commands of svg path data in one pass, as a list of (command,numbers),
+        numbers being the flat list of all coordinates and parameters given to the command"""
+        commands = []
+        numbers = None
+        for command,number in pathtokenre.findall(d):
+                if command:
+                        numbers = []
+                        commands.append((command,numbers))
+                elif numbers is not None:
+                        numbers.append(float(number))
+        return commands
+
+def getTransforms(tr):
+        "returns the transformations of a svg transform list as a list of (name,numbers)"
+        return [(name,[float(n) for n in numberre.findall(arguments)]) for name,arguments in transformre.findall(tr)]
+
 def getsize(length,mode='discard',base=1):
         """parses length values containing number and unit
         with mode 'discard': extracts a number from the given string (removes unit suffixes)
@@ -292,7 +315,7 @@ def getsize(length,mode='discard',base=1):
 
                 '%': 100 #arbitrarily chosen; has to depend on vieport size or (for filling patterns) on bounding box
                 }
-        number, exponent, unit=re.findall('([-+]?[0-9]*\.?[0-9]+([eE][-+]?[0-9]+)?)(px|pt|pc|mm|cm|in|em|ex|%)?',length)[0]
+        number, exponent, unit=sizere.findall(length)[0]
         if mode =='discard':
                 return float(number)
         elif mode == 'tuple':
@@ -330,6 +353,17 @@ def makewire(path,checkclosed=False,donttry=False):
                             sh = comp
         return sh
 
+def makepolyline(points):
+        "returns the edges of the lines through the given points, made at once, skipping null lines"
+        import Part
+        verts = points[:1]
+        for p in points[1:]:
+                if not DraftVecUtils.equals(verts[-1],p):
+                        verts.append(p)
+        if len(verts) < 2:
+                return []
+        return Part.makePolygon(verts).Edges
+
 def arccenter2end(center,rx,ry,angle1,angledelta,xrotation=0.0):
         '''calculate start and end vector and flags of an arc given in center parametrization
         see http://www.w3.org/TR/SVG/implnote.html#ArcImplementationNotes
@@ -451,7 +485,7 @@ class svgHandler(xml.sax.ContentHandler):
                 data = {}
                 for (keyword,content) in list(attrs.items()):
                         #print keyword,content
-                        if keyword != "style":
+                        if keyword != "style" and keyword != "d":
                             content = content.replace(',',' ')
                             content = content.split()
                         #print keyword,content
@@ -576,16 +610,14 @@ class svgHandler(xml.sax.ContentHandler):
                                 self.applyTrans(obj)
                                 self.format(obj)
                                 self.lastdim = obj
-                                data['d']=[]
-                        pathcommandsre=re.compile('\s*?([mMlLhHvVaAcCqQsStTzZ])\s*?([^mMlLhHvVaAcCqQsStTzZ]*)\s*?',re.DOTALL)
-                        pointsre=re.compile('([-+]?[0-9]*\.?[0-9]+([eE][-+]?[0-9]+)?)',re.DOTALL)
-                        for d,pointsstr in pathcommandsre.findall(' '.join(data['d'])):
+                                data['d']=''
+                        for d,pointlist in getPathData(data.get('d','')):
                                 relative = d.islower()
-                                pointlist = [float(number) for number,exponent in pointsre.findall(pointsstr.replace(',',' '))]
 
                                 if (d == "M" or d == "m"):
-                                        x = pointlist.pop(0)
-                                        y = pointlist.pop(0)
+                                        x = pointlist[0]
+                                        y = pointlist[1]
+                                        pointlist = pointlist[2:]
                                         if path:
                                                 #sh = Part.Wire(path)
                                                 sh = makewire(path)
@@ -607,40 +639,33 @@ class svgHandler(xml.sax.ContentHandler):
                                         firstvec = lastvec
                                         FreeCAD.Console.PrintMessage('move %s\n'%str(lastvec))
                                         lastpole = None
-                                if (d == "L" or d == "l") or \
+                                if (d in "LlHhVv") or \
                                         ((d == 'm' or d == 'M') and pointlist) :
-                                        for x,y in zip(pointlist[0::2],pointlist[1::2]):
-                                                if relative:
-                                                        currentvec = lastvec.add(Vector(x,-y,0))
-                                                else:
-                                                        currentvec = Vector(x,-y,0)
-                                                if not DraftVecUtils.equals(lastvec,currentvec):
-                                                        seg = Part.LineSegment(lastvec,currentvec).toShape()
-                                                        FreeCAD.Console.PrintMessage("line %s %s\n" %(lastvec,currentvec))
-                                                        lastvec = currentvec
-                                                        path.append(seg)
-                                                lastpole = None
-                                elif (d == "H" or d == "h"):
-                                        for x in pointlist:
-                                                if relative:
-                                                        currentvec = lastvec.add(Vector(x,0,0))
-                                                else:
-                                                        currentvec = Vector(x,lastvec.y,0)
-                                                seg = Part.LineSegment(lastvec,currentvec).toShape()
-                                                lastvec = currentvec
-                                                lastpole = None
-                                                path.append(seg)
-                                elif (d == "V" or d == "v"):
-                                        for y in pointlist:
-                                                if relative:
-                                                        currentvec = lastvec.add(Vector(0,-y,0))
-                                                else:
-                                                        currentvec = Vector(lastvec.x,-y,0)
-                                                if lastvec!=currentvec:
-                                                    seg = Part.LineSegment(lastvec,currentvec).toShape()
-                                                    lastvec = currentvec
-                                                    lastpole = None
-                                                    path.append(seg)
+                                        # all lines of the command are made at once
+                                        points = [lastvec]
+                                        x = lastvec.x
+                                        y = lastvec.y
+                                        if d in "HhVv":
+                                                for v in pointlist:
+                                                        if d == "H": x = v
+                                                        elif d == "h": x += v
+                                                        elif d == "V": y = -v
+                                                        else: y -= v
+                                                        points.append(Vector(x,y,0))
+                                        else:
+                                                for px,py in zip(pointlist[0::2],pointlist[1::2]):
+                                                        if relative:
+                                                                x += px
+                                                                y -= py
+                                                        else:
+                                                                x = px
+                                                                y = -py
+                                                        points.append(Vector(x,y,0))
+                                        edges = makepolyline(points)
+                                        if edges:
+                                                lastvec = edges[-1].Vertexes[-1].Point
+                                                path.extend(edges)
+                                        lastpole = None
                                 elif (d == "A" or d == "a"):
                                         for rx,ry,xrotation, largeflag, sweepflag,x,y in \
                                                 zip(pointlist[0::7],pointlist[1::7],pointlist[2::7],pointlist[3::7],pointlist[4::7],pointlist[5::7],pointlist[6::7]):
@@ -912,24 +937,15 @@ class svgHandler(xml.sax.ContentHandler):
                 # processing polylines and polygons
 
                 if name == "polyline" or name == "polygon":
-                        '''a simpler implementation would be sh = Part.makePolygon([Vector(svgx,-svgy,0) for svgx,svgy in zip(points[0::2],points[1::2])])
-                        but there would be more difficlult to search for duplicate points beforehand.'''
+                        '''the edges are made by one Part.makePolygon, after removing duplicate points'''
                         if not pathname: pathname = 'Polyline'
                         points=[float(d) for d in data['points']]
                         FreeCAD.Console.PrintMessage('points %s\n'%str(points))
                         lenpoints=len(points)
                         if lenpoints>=4 and lenpoints % 2 == 0:
-                                lastvec = Vector(points[0],-points[1],0)
-                                path=[]
                                 if name == 'polygon':
                                         points=points+points[:2] # emulate closepath
-                                for svgx,svgy in zip(points[2::2],points[3::2]):
-                                        currentvec = Vector(svgx,-svgy,0)
-                                        if not DraftVecUtils.equals(lastvec,currentvec):
-                                                seg = Part.LineSegment(lastvec,currentvec).toShape()
-                                                #print "polyline seg ",lastvec,currentvec
-                                                lastvec = currentvec
-                                                path.append(seg)
+                                path = makepolyline([Vector(svgx,-svgy,0) for svgx,svgy in zip(points[0::2],points[1::2])])
                                 if path:
                                         sh = Part.Wire(path)
                                         if self.fill and sh.isClosed():
@@ -1109,10 +1125,8 @@ class svgHandler(xml.sax.ContentHandler):
 
         def getMatrix(self,tr):
                 "returns a FreeCAD matrix from a svg transform attribute"
-                transformre=re.compile('(matrix|translate|scale|rotate|skewX|skewY)\s*?\((.*?)\)',re.DOTALL)
                 m = FreeCAD.Matrix()
-                for transformation, arguments in transformre.findall(tr):
-                        argsplit=[float(arg) for arg in arguments.replace(',',' ').split()]
+                for transformation, argsplit in getTransforms(tr):
                         #m.multiply(FreeCAD.Matrix (1,0,0,0,0,-1))
                         #print '%s:%s %s %d' % (transformation, arguments,argsplit,len(argsplit))
                         if transformation == 'translate':
@@ -72,7 +72,18 @@ def importFrd(
     import ObjectsFem
     if result_name_prefix is None:
         result_name_prefix = ''
-    m = read_frd_result(filename)
+    ccx_prefs = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/Fem/Ccx")
+    if ccx_prefs.GetBool("UseNumpyFrdReader", True):
+        # the numpy block reader returns the same data as read_frd_result
+        # but the result sets are decoded one by one in the loop below
+        from . import readCcxFrd
+        m = readCcxFrd.read_frd_result(
+            filename,
+            lazy_results=True,
+            use_cache=ccx_prefs.GetBool("UseFrdResultCache", False)
+        )
+    else:
+        m = read_frd_result(filename)
     result_mesh_object = None
     if len(m['Nodes']) > 0:
         if analysis:
@@ -155,6 +166,8 @@ def importFrd(
         FreeCAD.Console.PrintError(
             'Problem on frd file import. No nodes found in frd file.\n'
         )
+    if hasattr(m['Results'], 'close'):
+        m['Results'].close()
     return res_obj
 
 
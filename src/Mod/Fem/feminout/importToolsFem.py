@@ -29,6 +29,7 @@ __url__ = "http://www.freecadweb.org"
 #  \brief FreeCAD FEM import tools
 
 import FreeCAD
+import numpy as np
 
 
 def get_FemMeshObjectMeshGroups(
@@ -354,51 +355,25 @@ def fill_femresult_mechanical(
         # Should we check if the key in stress and strain dict
         # is the same as the number in NodeNumbers?
         if 'stress' in result_set:
-            stress = result_set['stress']
-            Sxx = []
-            Syy = []
-            Szz = []
-            Sxy = []
-            Sxz = []
-            Syz = []
-            # values_S .. stress_tensor .. (Sxx, Syy, Szz, Sxy, Sxz, Syz)
-            for i, values_S in enumerate(stress.values()):
-                Sxx.append(values_S[0])
-                Syy.append(values_S[1])
-                Szz.append(values_S[2])
-                Sxy.append(values_S[3])
-                Sxz.append(values_S[4])
-                Syz.append(values_S[5])
-            res_obj.NodeStressXX = Sxx
-            res_obj.NodeStressYY = Syy
-            res_obj.NodeStressZZ = Szz
-            res_obj.NodeStressXY = Sxy
-            res_obj.NodeStressXZ = Sxz
-            res_obj.NodeStressYZ = Syz
+            # stress tensor columns (Sxx, Syy, Szz, Sxy, Sxz, Syz)
+            stress = np.array(list(result_set['stress'].values()), dtype=float).reshape(-1, 6)
+            res_obj.NodeStressXX = stress[:, 0].tolist()
+            res_obj.NodeStressYY = stress[:, 1].tolist()
+            res_obj.NodeStressZZ = stress[:, 2].tolist()
+            res_obj.NodeStressXY = stress[:, 3].tolist()
+            res_obj.NodeStressXZ = stress[:, 4].tolist()
+            res_obj.NodeStressYZ = stress[:, 5].tolist()
 
         # fill res_obj.NodeStrainXX etc if they exist in result_set
         if 'strain' in result_set:
-            strain = result_set['strain']
-            Exx = []
-            Eyy = []
-            Ezz = []
-            Exy = []
-            Exz = []
-            Eyz = []
-            # values_E .. straintuple .. (Exx, Eyy, Ezz, Exy, Exz, Eyz)
-            for i, values_E in enumerate(strain.values()):
-                Exx.append(values_E[0])
-                Eyy.append(values_E[1])
-                Ezz.append(values_E[2])
-                Exy.append(values_E[3])
-                Exz.append(values_E[4])
-                Eyz.append(values_E[5])
-            res_obj.NodeStrainXX = Exx
-            res_obj.NodeStrainYY = Eyy
-            res_obj.NodeStrainZZ = Ezz
-            res_obj.NodeStrainXY = Exy
-            res_obj.NodeStrainXZ = Exz
-            res_obj.NodeStrainYZ = Eyz
+            # strain tensor columns (Exx, Eyy, Ezz, Exy, Exz, Eyz)
+            strain = np.array(list(result_set['strain'].values()), dtype=float).reshape(-1, 6)
+            res_obj.NodeStrainXX = strain[:, 0].tolist()
+            res_obj.NodeStrainYY = strain[:, 1].tolist()
+            res_obj.NodeStrainZZ = strain[:, 2].tolist()
+            res_obj.NodeStrainXY = strain[:, 3].tolist()
+            res_obj.NodeStrainXZ = strain[:, 4].tolist()
+            res_obj.NodeStrainYZ = strain[:, 5].tolist()
 
         # fill Equivalent Plastic strain if they exist
         if 'peeq' in result_set:
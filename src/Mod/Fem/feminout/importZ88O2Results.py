@@ -113,6 +113,12 @@ def import_z88_disp(
             res_obj = importToolsFem.fill_femresult_mechanical(res_obj, result_set)
             if analysis:
                 analysis_object.addObject(res_obj)
+            # complementary result object calculations
+            import femresult.resulttools as restools
+            # fill DisplacementLengths
+            res_obj = restools.add_disp_apps(res_obj)
+            # fill Stats
+            res_obj = restools.fill_femresult_stats(res_obj)
 
         if FreeCAD.GuiUp:
             if analysis:
@@ -0,0 +1,816 @@
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2019 - FreeCAD Developers                               *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+__title__ = "FreeCAD Calculix FRD bulk reader"
+__author__ = "FreeCAD Developers"
+__url__ = "http://www.freecadweb.org"
+
+## @package readCcxFrd
+#  \ingroup FEM
+#  \brief FreeCAD Calculix FRD reader based on numpy arrays
+#
+#  The frd file is memory mapped. Only the section header lines are read
+#  line by line. The node, element and result records between a header and
+#  the end of section line are parsed as one fixed width block by numpy.
+
+import mmap
+import os
+
+import numpy as np
+
+import FreeCAD
+
+
+# frd element type number: (FreeCAD mesh data key, node count, frd to FreeCAD node order)
+# node order see the notes in importCcxFrdResults.read_frd_result()
+FRD_ELEMENT_TYPES = {
+    1: ('Hexa8Elem', 8, (5, 6, 7, 4, 1, 2, 3, 0)),
+    2: ('Penta6Elem', 6, (4, 5, 3, 1, 2, 0)),
+    3: ('Tetra4Elem', 4, (1, 0, 2, 3)),
+    4: ('Hexa20Elem', 20, (
+        7, 4, 5, 6, 3, 0, 1, 2, 19, 16,
+        17, 18, 11, 8, 9, 10, 15, 12, 13, 14
+    )),
+    5: ('Penta15Elem', 15, (4, 5, 3, 1, 2, 0, 13, 14, 12, 7, 8, 6, 10, 11, 9)),
+    6: ('Tetra10Elem', 10, (1, 0, 2, 3, 4, 6, 5, 8, 7, 9)),
+    7: ('Tria3Elem', 3, (0, 1, 2)),
+    8: ('Tria6Elem', 6, (0, 1, 2, 3, 4, 5)),
+    9: ('Quad4Elem', 4, (0, 1, 2, 3)),
+    10: ('Quad8Elem', 8, (0, 1, 2, 3, 4, 5, 6, 7)),
+    11: ('Seg2Elem', 2, (0, 1)),
+    12: ('Seg3Elem', 3, (0, 1, 2)),
+}
+
+# result block name in the frd file (as it is checked in the -4 line):
+# (result set key, number of values, frd to FreeCAD value order)
+# CalculiX frd files: (Sxx, Syy, Szz, Sxy, Syz, Szx)
+# FreeCAD:            (Sxx, Syy, Szz, Sxy, Sxz, Syz)
+FRD_RESULT_FIELDS = (
+    ('DISP', 'disp', 3, (0, 1, 2)),
+    ('STRESS', 'stress', 6, (0, 1, 2, 3, 5, 4)),
+    ('TOSTRAIN', 'strain', 6, (0, 1, 2, 3, 5, 4)),
+    ('PE', 'peeq', 1, (0, )),
+    ('NDTEMP', 'temp', 1, (0, )),
+    ('MAFLOW', 'mflow', 1, (0, )),
+    ('STPRES', 'npressure', 1, (0, )),
+)
+
+
+# ********* numpy block parser *********
+def get_record_rows(
+    buf,
+    start,
+    end
+):
+    '''returns the record lines of buf[start:end] as 2D uint8 array
+
+    Line ends are not part of the returned rows. If all lines have the same
+    length (which is the case for node and result blocks) the rows are a
+    view into buf, otherwise the lines are split and padded.
+    '''
+    if end <= start:
+        return np.zeros((0, 0), dtype=np.uint8)
+    raw = np.frombuffer(buf, dtype=np.uint8, count=end - start, offset=start)
+    stride = buf.find(b'\n', start, end) - start + 1
+    if stride > 0 and (end - start + 1) % stride == 0:
+        count = (end - start + 1) // stride
+        if np.all(raw[stride - 1::stride] == 10):
+            return np.lib.stride_tricks.as_strided(
+                raw,
+                shape=(count, stride - 1),
+                strides=(stride, 1)
+            )
+    elif stride <= 0:
+        # only one line
+        return raw.reshape(1, end - start)
+    lines = np.array(bytes(buf[start:end]).split(b'\n'))
+    return lines.view(np.uint8).reshape(len(lines), lines.itemsize)
+
+
+def get_fixed_width_columns(
+    rows,
+    first,
+    width,
+    count,
+    dtype
+):
+    '''parses count fixed width fields starting at column first
+    returns an array of shape (len(rows), count)
+    '''
+    if not len(rows):
+        return np.zeros((0, count), dtype=dtype)
+    if rows.shape[1] < first + width * count:
+        # short lines, numpy string conversion ignores trailing null bytes
+        pad = np.zeros((len(rows), first + width * count - rows.shape[1]), dtype=np.uint8)
+        rows = np.hstack((rows, pad))
+    fields = np.ascontiguousarray(rows[:, first:first + width * count])
+    return fields.view('S{}'.format(width)).astype(dtype).reshape(len(rows), count)
+
+
+def is_record_row(
+    rows,
+    kind
+):
+    # kind is b'-1' or b'-2', the record type is in line[1:3]
+    return (rows[:, 1] == ord('-')) & (rows[:, 2] == ord(kind[1:2]))
+
+
+def get_record_rows_of_kind(
+    rows,
+    kind
+):
+    # node and result blocks usually do not have any other records
+    mask = is_record_row(rows, kind)
+    if np.all(mask):
+        return rows
+    return rows[mask]
+
+
+def parse_node_rows(
+    rows
+):
+    '''returns node ids and an (N, 3) array of node coordinates
+    '''
+    rows = get_record_rows_of_kind(rows, b'-1')
+    ids = get_fixed_width_columns(rows, 4, 9, 1, np.int64)[:, 0]
+    coords = get_fixed_width_columns(rows, 13, 12, 3, np.float64)
+    return ids, coords
+
+
+def parse_element_rows(
+    rows
+):
+    '''returns {frd element type: (element ids, (N, nodes) connectivity)}
+    the connectivity is already in FreeCAD node order
+    '''
+    elements = {}
+    header = np.nonzero(is_record_row(rows, b'-1'))[0]
+    if not len(header):
+        return elements
+    ids = get_fixed_width_columns(rows[header], 4, 9, 1, np.int64)[:, 0]
+    types = get_fixed_width_columns(rows[header], 14, 4, 1, np.int64)[:, 0]
+    for elem_type in np.unique(types):
+        elem_type = int(elem_type)
+        if elem_type not in FRD_ELEMENT_TYPES:
+            continue
+        node_count, node_order = FRD_ELEMENT_TYPES[elem_type][1:]
+        type_rows = header[types == elem_type]
+        # ten nodes per line, the hexa20 and penta15 go on in a second line
+        conn = get_fixed_width_columns(rows[type_rows + 1], 3, 10, min(node_count, 10), np.int64)
+        if node_count > 10:
+            conn = np.hstack((
+                conn,
+                get_fixed_width_columns(rows[type_rows + 2], 3, 10, node_count - 10, np.int64)
+            ))
+        elements[elem_type] = (ids[types == elem_type], conn[:, node_order])
+    return elements
+
+
+def parse_result_rows(
+    rows,
+    value_count,
+    value_order
+):
+    '''returns node ids and an (N, value_count) array of result values
+    the values are already in FreeCAD order
+    '''
+    rows = get_record_rows_of_kind(rows, b'-1')
+    ids = get_fixed_width_columns(rows, 4, 9, 1, np.int64)[:, 0]
+    values = get_fixed_width_columns(rows, 13, 12, value_count, np.float64)
+    return ids, values[:, value_order]
+
+
+# ********* conversion into the mesh and result dict layout of read_frd_result *********
+def make_nodes_dict(
+    ids,
+    coords
+):
+    x, y, z = coords.T.tolist()
+    return dict(zip(ids.tolist(), map(FreeCAD.Vector, x, y, z)))
+
+
+def make_elements_dict(
+    ids,
+    conn
+):
+    return dict(zip(ids.tolist(), map(tuple, conn.tolist())))
+
+
+def make_seg3_inout_dict(
+    ids,
+    conn,
+    inout_nodes
+):
+    # D network elements, the inlet and outlet node numbering
+    # see importCcxFrdResults.read_frd_result()
+    elements_seg3 = {}
+    for elem, (nd1, nd2, nd3) in zip(ids.tolist(), conn.tolist()):
+        for inout in inout_nodes:
+            if nd1 == int(inout[1]):
+                # fluid inlet node numbering
+                elements_seg3[elem] = (int(inout[2]), nd3, nd1)
+            elif nd3 == int(inout[1]):
+                # fluid outlet node numbering
+                elements_seg3[elem] = (nd1, int(inout[2]), nd3)
+    return elements_seg3
+
+
+def make_result_dict(
+    key,
+    ids,
+    values,
+    inout_nodes=None
+):
+    if key == 'disp':
+        x, y, z = values.T.tolist()
+        return dict(zip(ids.tolist(), map(FreeCAD.Vector, x, y, z)))
+    elif values.shape[1] > 1:
+        return dict(zip(ids.tolist(), map(tuple, values.tolist())))
+    values = values[:, 0]
+    if key == 'mflow':
+        values = values * 1000  # convert units to kg/s from t/s
+    if inout_nodes and key in ('mflow', 'npressure'):
+        # the inout node gets the value of the network node
+        result = {}
+        for node, value in zip(ids.tolist(), values.tolist()):
+            result[node] = value
+            for inout in inout_nodes:
+                if node == int(inout[1]):
+                    result[int(inout[2])] = value
+        return result
+    return dict(zip(ids.tolist(), values.tolist()))
+
+
+# ********* reader *********
+def read_inout_nodes(
+    frd_input
+):
+    inout_nodes = []
+    inout_nodes_file = frd_input.rsplit('.', 1)[0] + '_inout_nodes.txt'
+    if os.path.exists(inout_nodes_file):
+        FreeCAD.Console.PrintLog(
+            'Read special 1DFlow nodes data form: {}\n'.format(inout_nodes_file)
+        )
+        with open(inout_nodes_file, 'r') as f:
+            for line in f:
+                inout_nodes.append(line.split(','))
+    return inout_nodes
+
+
+def map_frd_file(
+    frd_input
+):
+    '''returns a read only memory map of the frd file
+    an empty file can not be mapped, an empty bytes object is returned
+    '''
+    with open(frd_input, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class FrdResultFile(object):
+    """random access to the mesh and the result sets of a calculix frd file
+
+    On construction one index pass over the section header lines of the
+    memory mapped frd file is made. It records the byte range of the node
+    and element blocks and of every result block by result set and field.
+    The result sets are grouped exactly like read_frd_result() does. Only the
+    blocks asked for are decoded.
+
+    frd = FrdResultFile('/tmp/FEM_ccx/FEMMeshGmsh.frd')
+    frd.result_sets[-1]['time']
+    disp = frd.get_result_field(-1, 'disp')
+    ids, values = frd.get_result_arrays(frd.find_result_set(eigenmode=3), 'stress')
+    frd.close()
+    """
+
+    def __init__(
+        self,
+        frd_input
+    ):
+        self.frd_input = frd_input
+        self.inout_nodes = read_inout_nodes(frd_input)
+        self.buf = map_frd_file(frd_input)
+        # [(node or element block, start, end)]
+        self.mesh_blocks = []
+        # [{'number': eigenmode, 'time': time, 'fields': {key: (start, end)}}]
+        self.result_sets = []
+        self._index()
+
+    def __enter__(
+        self
+    ):
+        return self
+
+    def __exit__(
+        self,
+        *args
+    ):
+        self.close()
+
+    def __len__(
+        self
+    ):
+        return len(self.result_sets)
+
+    def __getitem__(
+        self,
+        index
+    ):
+        return self.get_result_set(index)
+
+    def __iter__(
+        self
+    ):
+        # one result set after the other is decoded
+        for index in range(len(self.result_sets)):
+            yield self.get_result_set(index)
+
+    def close(
+        self
+    ):
+        if isinstance(self.buf, mmap.mmap):
+            self.buf.close()
+        self.buf = b''
+
+    def _index(
+        self
+    ):
+        # the section header lines are checked the same way as
+        # in importCcxFrdResults.read_frd_result()
+        buf = self.buf
+        mode_results = self._new_result_set()
+
+        nodes_found = False
+        elements_found = False
+        mode_time_found = False
+        field_found = None
+        field_block = (0, 0)
+        end_of_section_found = False
+        end_of_frd_data_found = False
+        node_element_section = False
+        mode_eigen_changed = False
+        mode_time_changed = False
+
+        eigenmode = 0
+        timestep = 0
+
+        size = len(buf)
+        pos = 0
+        while pos < size:
+            eol = buf.find(b'\n', pos)
+            if eol == -1:
+                eol = size
+
+            if buf[pos + 1:pos + 3] in (b'-1', b'-2'):
+                # node, element or result records, they go on until the end of section line
+                end = buf.find(b'\n -3', pos)
+                if end == -1:
+                    end = size
+                if nodes_found:
+                    self.mesh_blocks.append(('nodes', pos, end))
+                elif elements_found:
+                    self.mesh_blocks.append(('elements', pos, end))
+                elif field_found:
+                    field_block = (pos, end)
+                pos = end + 1
+                continue
+
+            line = buf[pos:eol].decode('ascii', 'replace')
+            pos = eol + 1
+
+            if line[4:6] == "2C":
+                nodes_found = True
+            if line[4:6] == "3C":
+                elements_found = True
+
+            # Check if we found new eigenmode line
+            if line[5:10] == "PMODE":
+                eigentemp = int(line[30:36])
+                if eigentemp > eigenmode:
+                    eigenmode = eigentemp
+                    mode_eigen_changed = True
+
+            # Check if we found new time step
+            if line[4:10] == "1PSTEP":
+                mode_time_found = True
+            if mode_time_found and (line[2:7] == "100CL"):
+                timetemp = float(line[13:25])
+                if timetemp > timestep:
+                    timestep = timetemp
+                    mode_time_changed = True
+
+            # Check if we found a result section
+            for frd_name, key, value_count, value_order in FRD_RESULT_FIELDS:
+                if line[5:5 + len(frd_name)] == frd_name:
+                    field_found = key
+                    field_block = (0, 0)
+
+            # Check if we found the end of a section
+            if line[1:3] == "-3":
+                end_of_section_found = True
+                if nodes_found:
+                    nodes_found = False
+                    node_element_section = True
+                if elements_found:
+                    elements_found = False
+                    node_element_section = True
+                if field_found:
+                    mode_results['fields'][field_found] = field_block
+                    field_block = (0, 0)
+                    field_found = None
+                    node_element_section = False
+
+            # Check if we found the end of frd data
+            if line[1:5] == "9999":
+                end_of_frd_data_found = True
+
+            if (mode_eigen_changed or mode_time_changed or end_of_frd_data_found) \
+                    and end_of_section_found \
+                    and not node_element_section:
+                # append mode_results to result sets and reset mode_result
+                self.result_sets.append(mode_results)
+                mode_results = self._new_result_set()
+                end_of_section_found = False
+
+            if mode_eigen_changed:
+                mode_results['number'] = eigenmode
+                mode_eigen_changed = False
+
+            if mode_time_changed:
+                mode_results['time'] = timestep
+                mode_time_found = False
+                mode_time_changed = False
+
+    def _new_result_set(
+        self
+    ):
+        # https://forum.freecadweb.org/viewtopic.php?f=18&t=32649&start=10#p274686
+        return {'number': float('NaN'), 'time': float('NaN'), 'fields': {}}
+
+    def find_result_set(
+        self,
+        eigenmode=None,
+        step_time=None
+    ):
+        """returns the index of the result set of an eigenmode or
+        of the result set with the time nearest to step_time
+        without any parameter the index of the last result set is returned
+        """
+        if not self.result_sets:
+            return None
+        if eigenmode is not None:
+            for i, result_set in enumerate(self.result_sets):
+                if result_set['number'] == eigenmode:
+                    return i
+            return None
+        if step_time is not None:
+            times = [
+                abs(result_set['time'] - step_time)
+                if result_set['time'] == result_set['time'] else float('inf')
+                for result_set in self.result_sets
+            ]
+            return times.index(min(times))
+        return len(self.result_sets) - 1
+
+    def get_mesh_arrays(
+        self
+    ):
+        """returns node ids, (N, 3) node coordinates and
+        {frd element type: (element ids, (N, nodes) connectivity)}
+        """
+        node_blocks = []
+        element_blocks = {}
+        for block, start, end in self.mesh_blocks:
+            rows = get_record_rows(self.buf, start, end)
+            if block == 'nodes':
+                node_blocks.append(parse_node_rows(rows))
+            else:
+                for elem_type, elems in parse_element_rows(rows).items():
+                    element_blocks.setdefault(elem_type, []).append(elems)
+            # the rows may be a view into the memory map
+            del rows
+        if node_blocks:
+            node_ids = np.concatenate([ids for ids, coords in node_blocks])
+            node_coords = np.concatenate([coords for ids, coords in node_blocks])
+        else:
+            node_ids = np.zeros(0, dtype=np.int64)
+            node_coords = np.zeros((0, 3))
+        elements = {}
+        for elem_type, blocks in element_blocks.items():
+            elements[elem_type] = (
+                np.concatenate([ids for ids, conn in blocks]),
+                np.concatenate([conn for ids, conn in blocks])
+            )
+        return node_ids, node_coords, elements
+
+    def get_mesh(
+        self
+    ):
+        """returns the mesh in the dict layout of read_frd_result() without Results
+        """
+        mesh_data = {}
+        for elem_key, node_count, node_order in FRD_ELEMENT_TYPES.values():
+            mesh_data[elem_key] = {}
+        node_ids, node_coords, elements = self.get_mesh_arrays()
+        mesh_data['Nodes'] = make_nodes_dict(node_ids, node_coords)
+        for elem_type, (ids, conn) in elements.items():
+            elem_key = FRD_ELEMENT_TYPES[elem_type][0]
+            if elem_key == 'Seg3Elem' and self.inout_nodes:
+                mesh_data[elem_key] = make_seg3_inout_dict(ids, conn, self.inout_nodes)
+            else:
+                mesh_data[elem_key] = make_elements_dict(ids, conn)
+        return mesh_data
+
+    def get_result_arrays(
+        self,
+        index,
+        key
+    ):
+        """returns node ids and the (N, values) array of one result field
+        the values are in FreeCAD order, but without any unit conversion
+        """
+        start, end = self.result_sets[index]['fields'][key]
+        for frd_name, field_key, value_count, value_order in FRD_RESULT_FIELDS:
+            if field_key == key:
+                break
+        rows = get_record_rows(self.buf, start, end)
+        if not len(rows):
+            return np.zeros(0, dtype=np.int64), np.zeros((0, value_count))
+        ids, values = parse_result_rows(rows, value_count, value_order)
+        del rows
+        return ids, values
+
+    def get_result_field(
+        self,
+        index,
+        key
+    ):
+        """returns one result field in the dict layout of read_frd_result()
+        """
+        ids, values = self.get_result_arrays(index, key)
+        if not len(ids):
+            return {}
+        return make_result_dict(key, ids, values, self.inout_nodes)
+
+    def get_result_set(
+        self,
+        index
+    ):
+        """returns one result set in the dict layout of read_frd_result()
+        """
+        result_set = self.result_sets[index]
+        mode_results = {}
+        mode_results['number'] = result_set['number']
+        mode_results['time'] = result_set['time']
+        for key in result_set['fields']:
+            mode_results[key] = self.get_result_field(index, key)
+        return mode_results
+
+
+# ********* binary cache of the parsed frd file *********
+# version of the cache layout, a cache of another version is not used
+FRD_CACHE_VERSION = 1
+
+
+def get_frd_cache_file(
+    frd_input
+):
+    '''the cache is saved next to the frd file, jobname.frd --> jobname_frd_cache.npz'''
+    return os.path.splitext(frd_input)[0] + '_frd_cache.npz'
+
+
+def get_frd_cache_key(
+    frd_input
+):
+    '''the cache is valid as long as path, modification time and size of the frd file match'''
+    frd_stat = os.stat(frd_input)
+    return os.path.abspath(frd_input), float(frd_stat.st_mtime), int(frd_stat.st_size)
+
+
+def write_frd_cache(
+    frd,
+    cache_file=None
+):
+    '''decodes the mesh and all result sets of a FrdResultFile
+    and saves the arrays into an uncompressed numpy .npz container
+    '''
+    if cache_file is None:
+        cache_file = get_frd_cache_file(frd.frd_input)
+    frd_path, frd_mtime, frd_size = get_frd_cache_key(frd.frd_input)
+    arrays = {
+        'version': np.array(FRD_CACHE_VERSION),
+        'frd_path': np.array(frd_path),
+        'frd_mtime': np.array(frd_mtime),
+        'frd_size': np.array(frd_size),
+        'set_numbers': np.array([r['number'] for r in frd.result_sets], dtype=np.float64),
+        'set_times': np.array([r['time'] for r in frd.result_sets], dtype=np.float64),
+    }
+    node_ids, node_coords, elements = frd.get_mesh_arrays()
+    arrays['node_ids'] = node_ids
+    arrays['node_coords'] = node_coords
+    for elem_type, (ids, conn) in elements.items():
+        arrays['elem_{}_ids'.format(elem_type)] = ids
+        arrays['elem_{}_conn'.format(elem_type)] = conn
+    for index, result_set in enumerate(frd.result_sets):
+        for key in result_set['fields']:
+            name = 'set_{}_{}'.format(index, key)
+            arrays[name + '_ids'], arrays[name + '_values'] = frd.get_result_arrays(index, key)
+    # a cache file is never left half written
+    temp_file = cache_file + '.tmp'
+    with open(temp_file, 'wb') as f:
+        np.savez(f, **arrays)
+    if os.path.exists(cache_file):
+        os.remove(cache_file)
+    os.rename(temp_file, cache_file)
+    FreeCAD.Console.PrintLog('Frd result cache written: {}\n'.format(cache_file))
+    return cache_file
+
+
+def open_frd_cache(
+    frd_input
+):
+    '''returns a FrdResultCache or None if there is no valid cache for the frd file'''
+    cache_file = get_frd_cache_file(frd_input)
+    if not os.path.isfile(cache_file) or not os.path.isfile(frd_input):
+        return None
+    try:
+        cache = FrdResultCache(frd_input, cache_file)
+    except Exception as e:
+        FreeCAD.Console.PrintLog('Frd result cache not readable: {}\n'.format(e))
+        return None
+    if not cache.is_valid():
+        cache.close()
+        return None
+    return cache
+
+
+class FrdResultCache(FrdResultFile):
+    """FrdResultFile which reads the mesh and result arrays from the
+    binary cache written by write_frd_cache() instead of the frd file
+
+    The arrays of the .npz container are read on demand,
+    thus a result set is only loaded if it is asked for.
+    """
+
+    def __init__(
+        self,
+        frd_input,
+        cache_file=None
+    ):
+        self.frd_input = frd_input
+        self.inout_nodes = read_inout_nodes(frd_input)
+        if cache_file is None:
+            cache_file = get_frd_cache_file(frd_input)
+        self.cache_file = cache_file
+        self.buf = np.load(cache_file, allow_pickle=False)
+        self.mesh_blocks = []
+        self.result_sets = []
+        for index, (number, time) in enumerate(
+            zip(self.buf['set_numbers'].tolist(), self.buf['set_times'].tolist())
+        ):
+            result_set = self._new_result_set()
+            if number == number:
+                # NaN for no eigenmode
+                result_set['number'] = int(number)
+            result_set['time'] = time
+            for frd_name, key, value_count, value_order in FRD_RESULT_FIELDS:
+                name = 'set_{}_{}'.format(index, key)
+                if name + '_ids' in self.buf.files:
+                    result_set['fields'][key] = name
+            self.result_sets.append(result_set)
+
+    def is_valid(
+        self
+    ):
+        if int(self.buf['version']) != FRD_CACHE_VERSION:
+            return False
+        frd_path, frd_mtime, frd_size = get_frd_cache_key(self.frd_input)
+        return (
+            str(self.buf['frd_path']) == frd_path
+            and float(self.buf['frd_mtime']) == frd_mtime
+            and int(self.buf['frd_size']) == frd_size
+        )
+
+    def close(
+        self
+    ):
+        if self.buf is not None:
+            self.buf.close()
+        self.buf = None
+
+    def get_mesh_arrays(
+        self
+    ):
+        elements = {}
+        for name in self.buf.files:
+            if name.startswith('elem_') and name.endswith('_ids'):
+                elem_type = int(name.split('_')[1])
+                elements[elem_type] = (
+                    self.buf[name],
+                    self.buf['elem_{}_conn'.format(elem_type)]
+                )
+        return self.buf['node_ids'], self.buf['node_coords'], elements
+
+    def get_result_arrays(
+        self,
+        index,
+        key
+    ):
+        name = self.result_sets[index]['fields'][key]
+        return self.buf[name + '_ids'], self.buf[name + '_values']
+
+
+def read_frd_result(
+    frd_input,
+    lazy_results=False,
+    use_cache=False
+):
+    '''reads a calculix frd result file
+    returns the same dict layout as importCcxFrdResults.read_frd_result()
+
+    lazy_results: the Results are the FrdResultFile itself, the result sets
+    are decoded one by one on iteration. Thus never the whole history is in
+    memory. The frd file stays mapped until Results.close() is called.
+
+    use_cache: the arrays are read from the binary cache next to the frd file,
+    if there is no valid one, the frd file is parsed and the cache is written
+    '''
+    frd = None
+    if use_cache:
+        frd = open_frd_cache(frd_input)
+        if frd is not None:
+            FreeCAD.Console.PrintMessage(
+                'Read ccx results from frd result cache: {}\n'
+                .format(frd.cache_file)
+            )
+    if frd is None:
+        FreeCAD.Console.PrintMessage(
+            'Read ccx results from frd file (numpy reader): {}\n'
+            .format(frd_input)
+        )
+        frd = FrdResultFile(frd_input)
+        if use_cache:
+            try:
+                write_frd_cache(frd)
+            except (IOError, OSError) as e:
+                FreeCAD.Console.PrintError('Frd result cache not written: {}\n'.format(e))
+    mesh_data = frd.get_mesh()
+    check_frd_result(frd, mesh_data['Nodes'])
+    if lazy_results:
+        results = frd
+    else:
+        results = list(frd)
+        frd.close()
+
+    return {
+        'Nodes': mesh_data['Nodes'],
+        'Seg2Elem': mesh_data['Seg2Elem'],
+        'Seg3Elem': mesh_data['Seg3Elem'],
+        'Tria3Elem': mesh_data['Tria3Elem'],
+        'Tria6Elem': mesh_data['Tria6Elem'],
+        'Quad4Elem': mesh_data['Quad4Elem'],
+        'Quad8Elem': mesh_data['Quad8Elem'],
+        'Tetra4Elem': mesh_data['Tetra4Elem'],
+        'Tetra10Elem': mesh_data['Tetra10Elem'],
+        'Hexa8Elem': mesh_data['Hexa8Elem'],
+        'Hexa20Elem': mesh_data['Hexa20Elem'],
+        'Penta6Elem': mesh_data['Penta6Elem'],
+        'Penta15Elem': mesh_data['Penta15Elem'],
+        'Results': results
+    }
+
+
+def check_frd_result(
+    frd,
+    nodes
+):
+    if not frd.inout_nodes:
+        if frd.result_sets:
+            fields = frd.result_sets[0]['fields']
+            if 'mflow' in fields or 'npressure' in fields:
+                FreeCAD.Console.PrintError(
+                    'We have mflow or npressure, but no inout_nodes file.\n'
+                )
+    if not nodes:
+        FreeCAD.Console.PrintError('FEM: No nodes found in Frd file.\n')
@@ -119,20 +119,282 @@ def get_femnodes_by_refshape(
             'Element name: {3}\n'
             .format(r.ShapeType, ref[0].Name, ref[0].Label, refelement)
         )
+        nodes += get_cached_ref_shape_data(
+            femmesh,
+            'Nodes',
+            ref[0],
+            refelement,
+            r,
+            get_femnodes_by_shape,
+            femmesh,
+            r
+        )
+    return nodes
+
+
+def get_femnodes_by_shape(
+    femmesh,
+    r
+):
+    if femmesh is femmesh_reference_cache.femmesh and r.ShapeType in (
+        'Vertex', 'Edge', 'Face', 'Solid'
+    ):
+        # the node grid of the writers mesh, no scan over all nodes for every reference
+        return femmesh_reference_cache.get_node_grid().get_nodes_by_shape(r)
+    if r.ShapeType == 'Vertex':
+        return femmesh.getNodesByVertex(r)
+    elif r.ShapeType == 'Edge':
+        return femmesh.getNodesByEdge(r)
+    elif r.ShapeType == 'Face':
+        return femmesh.getNodesByFace(r)
+    elif r.ShapeType == 'Solid':
+        return femmesh.getNodesBySolid(r)
+    else:
+        FreeCAD.Console.PrintMessage(
+            '  '
+            'No Vertice, Edge, Face or Solid as reference shapes!\n'
+        )
+        return []
+
+
+# ***** geometry to mesh reference cache *********************************************************
+class FemMeshReferenceCache(object):
+    '''results of geometry to mesh searches (nodes of a reference shape, node areas, ...)
+    the results are kept for (mesh content hash, reference shape element) and are only
+    valid for the femmesh which was set last, a mesh with another content clears them
+    thus unchanged constraints are not searched again if the analysis is written again
+    '''
+
+    def __init__(
+        self
+    ):
+        self.femmesh = None
+        self.femmesh_hash = None
+        self.node_grid = None
+        self.results = {}
+
+    def set_femmesh(
+        self,
+        femmesh
+    ):
+        femmesh_hash = get_femmesh_hash(femmesh)
+        if femmesh_hash != self.femmesh_hash:
+            if self.results:
+                FreeCAD.Console.PrintLog('Mesh has changed, reference cache cleared.\n')
+            self.results = {}
+            self.femmesh_hash = femmesh_hash
+        if femmesh is not self.femmesh:
+            self.node_grid = None
+        self.femmesh = femmesh
+
+    def get_node_grid(
+        self
+    ):
+        '''the FemMeshNodeGrid of the femmesh, it is made on the first node search'''
+        if self.node_grid is None:
+            self.node_grid = FemMeshNodeGrid(self.femmesh)
+        return self.node_grid
+
+    def clear(
+        self
+    ):
+        self.femmesh = None
+        self.femmesh_hash = None
+        self.node_grid = None
+        self.results = {}
+
+
+# ***** spatial index of the mesh nodes **********************************************************
+class FemMeshNodeGrid(object):
+    '''uniform grid over the node coordinates of a femmesh
+    the nodes inside a bound box are found by looking at the grid cells of the box only,
+    thus the nodes of a reference shape are searched without a scan over all mesh nodes
+
+    the node coordinates are taken from femmesh.Nodes, thus the mesh placement is applied
+    like in the FemMesh methods getNodesByVertex(), getNodesByEdge(), ...
+    ids: node ids, sorted by cell
+    coords: (N, 3) node coordinates, sorted by cell
+    cell_keys: sorted keys of the used cells, cell_starts and cell_ends index into ids
+    '''
+
+    def __init__(
+        self,
+        femmesh,
+        nodes_per_cell=8
+    ):
+        import numpy as np
+        from itertools import chain
+        nodes = femmesh.Nodes
+        ids = np.fromiter(nodes, dtype=np.int64, count=len(nodes))
+        coords = np.fromiter(
+            chain.from_iterable(nodes[n] for n in nodes),
+            dtype=np.float64,
+            count=3 * len(nodes)
+        ).reshape(-1, 3)
+        if len(ids):
+            self.min = coords.min(axis=0)
+            self.max = coords.max(axis=0)
+        else:
+            self.min = self.max = np.zeros(3)
+        extent = self.max - self.min
+        # flat meshes (shells, beams) have no extent in some directions
+        used = extent > 1e-9 * max(extent.max(), 1.0)
+        if used.any() and len(ids) > nodes_per_cell:
+            cell_count = float(len(ids)) / nodes_per_cell
+            self.cell_size = (np.prod(extent[used]) / cell_count) ** (1.0 / used.sum())
+        else:
+            self.cell_size = max(extent.max(), 1.0)
+        self.dims = (extent // self.cell_size).astype(np.int64) + 1
+        keys = self.get_cell_keys(self.get_cells(coords))
+        order = np.argsort(keys, kind='mergesort')
+        self.ids = ids[order]
+        self.coords = coords[order]
+        self.cell_keys, self.cell_starts, cell_counts = np.unique(
+            keys[order],
+            return_index=True,
+            return_counts=True
+        )
+        self.cell_ends = self.cell_starts + cell_counts
+
+    def get_cells(
+        self,
+        points
+    ):
+        import numpy as np
+        cells = np.floor((points - self.min) / self.cell_size).astype(np.int64)
+        return np.clip(cells, 0, self.dims - 1)
+
+    def get_cell_keys(
+        self,
+        cells
+    ):
+        return cells[..., 0] + self.dims[0] * (cells[..., 1] + self.dims[1] * cells[..., 2])
+
+    def get_nodes_in_box(
+        self,
+        box_min,
+        box_max
+    ):
+        '''returns the positions in ids and coords of the nodes inside the box'''
+        import numpy as np
+        box_min = np.asarray(box_min, dtype=np.float64)
+        box_max = np.asarray(box_max, dtype=np.float64)
+        if not len(self.ids) or (box_max < self.min).any() or (box_min > self.max).any():
+            return np.zeros(0, dtype=np.int64)
+        low, high = self.get_cells(np.array([box_min, box_max]))
+        if np.prod(high - low + 1) > len(self.cell_keys):
+            # the box covers most of the mesh, a scan is cheaper than the cell lookup
+            candidates = np.arange(len(self.ids))
+        else:
+            cells = np.stack(np.meshgrid(
+                *[np.arange(lo, hi + 1) for lo, hi in zip(low, high)],
+                indexing='ij'
+            ), axis=-1).reshape(-1, 3)
+            keys = self.get_cell_keys(cells)
+            pos = np.searchsorted(self.cell_keys, keys)
+            used = pos < len(self.cell_keys)
+            pos = pos[used]
+            pos = pos[self.cell_keys[pos] == keys[used]]
+            starts = self.cell_starts[pos]
+            counts = self.cell_ends[pos] - starts
+            candidates = np.repeat(starts - np.cumsum(counts) + counts, counts) \
+                + np.arange(counts.sum())
+        points = self.coords[candidates]
+        inside = ((points >= box_min) & (points <= box_max)).all(axis=1)
+        return candidates[inside]
+
+    def get_nodes_by_shape(
+        self,
+        r
+    ):
+        '''sorted node ids, the same as the FemMesh methods getNodesByVertex(),
+        getNodesByEdge(), getNodesByFace() and getNodesBySolid() return
+        '''
+        import numpy as np
+        import Part
         if r.ShapeType == 'Vertex':
-            nodes += femmesh.getNodesByVertex(r)
-        elif r.ShapeType == 'Edge':
-            nodes += femmesh.getNodesByEdge(r)
-        elif r.ShapeType == 'Face':
-            nodes += femmesh.getNodesByFace(r)
-        elif r.ShapeType == 'Solid':
-            nodes += femmesh.getNodesBySolid(r)
+            limit = r.Tolerance
+            point = np.array([r.X, r.Y, r.Z])
+            found = self.get_nodes_in_box(point - limit, point + limit)
+            distances = ((self.coords[found] - point) ** 2).sum(axis=1)
+            found = found[distances <= limit * limit]
         else:
-            FreeCAD.Console.PrintMessage(
-                '  '
-                'No Vertice, Edge, Face or Solid as reference shapes!\n'
+            # limit where the mesh node belongs to the shape
+            if r.ShapeType == 'Solid':
+                limit = r.getTolerance(1)
+            else:
+                limit = r.Tolerance
+            box = r.optimalBoundingBox(False, False)
+            box.enlarge(limit)
+            candidates = self.get_nodes_in_box(
+                (box.XMin, box.YMin, box.ZMin),
+                (box.XMax, box.YMax, box.ZMax)
             )
-    return nodes
+            found = []
+            for index, (x, y, z) in zip(candidates.tolist(), self.coords[candidates].tolist()):
+                try:
+                    distance = r.distToShape(Part.Vertex(x, y, z))[0]
+                except Part.OCCError:
+                    continue
+                if distance < limit:
+                    found.append(index)
+        return sorted(self.ids[found].tolist())
+
+
+# shared by all writers, see FemInputWriter
+femmesh_reference_cache = FemMeshReferenceCache()
+
+
+def get_femmesh_hash(
+    femmesh
+):
+    '''hash of the mesh content, node ids and coordinates and the element ids
+    the search results of reference shapes only depend on these
+    '''
+    import hashlib
+    import numpy as np
+    from itertools import chain
+    nodes = femmesh.Nodes
+    mesh_hash = hashlib.sha1()
+    mesh_hash.update(np.fromiter(nodes, dtype=np.int64, count=len(nodes)).tobytes())
+    mesh_hash.update(np.fromiter(
+        chain.from_iterable(nodes[n] for n in nodes),
+        dtype=np.float64,
+        count=3 * len(nodes)
+    ).tobytes())
+    for ele_ids in (femmesh.Edges, femmesh.Faces, femmesh.Volumes):
+        mesh_hash.update(np.array(ele_ids, dtype=np.int64).tobytes())
+        mesh_hash.update(b'|')
+    return mesh_hash.hexdigest()
+
+
+def get_cached_ref_shape_data(
+    femmesh,
+    kind,
+    ref_obj,
+    ref_element,
+    ref_shape,
+    get_data,
+    *args
+):
+    '''get_data(*args) for the reference shape element ref_obj.ref_element
+    the result is taken from the femmesh_reference_cache if femmesh is the mesh of the cache
+    the shape hashCode makes sure a recomputed reference object is searched again
+    '''
+    import copy
+    if femmesh is not femmesh_reference_cache.femmesh:
+        return get_data(*args)
+    key = (kind, ref_obj.Name, ref_element, ref_shape.hashCode())
+    results = femmesh_reference_cache.results
+    if key not in results:
+        results[key] = get_data(*args)
+    else:
+        FreeCAD.Console.PrintLog(
+            '  {} of {}.{} taken from reference cache.\n'
+            .format(kind, ref_obj.Name, ref_element)
+        )
+    # callers may change the result
+    return copy.copy(results[key])
 
 
 # ************************************************************************************************
@@ -232,6 +494,172 @@ def get_femnodes_ele_table(
     return femnodes_ele_table
 
 
+# ************************************************************************************************
+class FemElementIncidence(object):
+    '''node element incidence of a femelement_table in compressed sparse row layout
+    the arrays are ordered as the elements of the femelement_table
+    ele_ids: element ids
+    ele_lens: number of nodes per element
+    node_ids: sorted ids of all nodes used by the elements
+    node_ptr: the entries of node_ids[i] are node_ptr[i]:node_ptr[i + 1]
+    node_eles: element index of each entry
+    node_bits: position of the node in the element as a set bit, see get_femnodes_ele_table()
+    '''
+
+    def __init__(
+        self,
+        femelement_table
+    ):
+        import numpy as np
+        from itertools import chain
+        self.femelement_table = femelement_table
+        self.ele_ids = np.fromiter(femelement_table, dtype=np.int64, count=len(femelement_table))
+        self.ele_lens = np.fromiter(
+            (len(femelement_table[ele]) for ele in femelement_table),
+            dtype=np.int64,
+            count=len(femelement_table)
+        )
+        count = int(self.ele_lens.sum())
+        ele_nodes = np.fromiter(
+            chain.from_iterable(femelement_table[ele] for ele in femelement_table),
+            dtype=np.int64,
+            count=count
+        )
+        ele_starts = np.cumsum(self.ele_lens) - self.ele_lens
+        positions = np.arange(count) - np.repeat(ele_starts, self.ele_lens)
+        order = np.argsort(ele_nodes, kind='mergesort')
+        self.node_ids, node_counts = np.unique(ele_nodes, return_counts=True)
+        self.node_ptr = np.concatenate(([0], np.cumsum(node_counts)))
+        self.node_eles = np.repeat(np.arange(len(self.ele_ids)), self.ele_lens)[order]
+        self.node_bits = np.left_shift(1, positions)[order]
+
+    def is_valid(
+        self,
+        femelement_table
+    ):
+        '''the incidence is only valid for the femelement_table it was made from
+        element tables are not changed in place, a changed mesh gives a new table
+        '''
+        return (
+            femelement_table is self.femelement_table
+            and len(femelement_table) == len(self.ele_ids)
+        )
+
+    def get_node_entries(
+        self,
+        node_set
+    ):
+        '''indices into node_eles and node_bits for all nodes of node_set
+        nodes which are not used by any element are ignored
+        '''
+        import numpy as np
+        nodes = np.unique(np.fromiter(node_set, dtype=np.int64))
+        idx = np.searchsorted(self.node_ids, nodes)
+        known = idx < len(self.node_ids)
+        known[known] = self.node_ids[idx[known]] == nodes[known]
+        idx = idx[known]
+        starts = self.node_ptr[idx]
+        counts = self.node_ptr[idx + 1] - starts
+        offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        return offsets + np.arange(int(counts.sum()))
+
+    def get_bit_patterns(
+        self,
+        node_set
+    ):
+        '''vectorized get_bit_pattern_dict()
+        returns the element indices of all elements with at least one node in node_set
+        and the bit pattern of these elements
+        '''
+        import numpy as np
+        entries = self.get_node_entries(node_set)
+        ele_indices, inverse = np.unique(self.node_eles[entries], return_inverse=True)
+        patterns = np.zeros(len(ele_indices), dtype=np.int64)
+        np.bitwise_or.at(patterns, inverse, self.node_bits[entries])
+        return ele_indices, patterns
+
+    def contains_nodes(
+        self,
+        node_list
+    ):
+        '''for every node of node_list True if the node is used by any element'''
+        import numpy as np
+        return np.isin(np.fromiter(node_list, dtype=np.int64), self.node_ids)
+
+    def get_femelements_by_femnodes(
+        self,
+        node_set
+    ):
+        '''all elements which have all their nodes in node_set
+        ordered as in femelement_table
+        '''
+        ele_indices, patterns = self.get_bit_patterns(node_set)
+        full_patterns = (1 << self.ele_lens[ele_indices]) - 1
+        return self.ele_ids[ele_indices[patterns == full_patterns]].tolist()
+
+    def get_ccxelement_faces(
+        self,
+        node_set
+    ):
+        '''vectorized get_ccxelement_faces_from_binary_search()
+        [[eleID, ccx face number], ...] of all element faces with all nodes in node_set
+        '''
+        import numpy as np
+        ele_indices, patterns = self.get_bit_patterns(node_set)
+        ele_lens = self.ele_lens[ele_indices]
+        found_eles = []
+        found_faces = []
+        found_keys = []
+        for len_ele, mask_dict in get_ccxelement_face_masks().items():
+            is_type = ele_lens == len_ele
+            for key_no, key in enumerate(mask_dict):
+                hit = is_type & ((patterns & key) == key)
+                found_eles.append(ele_indices[hit])
+                found_faces.append(np.full(np.count_nonzero(hit), mask_dict[key]))
+                found_keys.append(np.full(np.count_nonzero(hit), key_no))
+        found_eles = np.concatenate(found_eles)
+        found_keys = np.concatenate(found_keys)
+        found_faces = np.concatenate(found_faces)
+        # same order as the element loop over the bit_pattern_dict
+        order = np.lexsort((found_keys, found_eles))
+        faces = [
+            [ele, face] for ele, face in zip(
+                self.ele_ids[found_eles[order]].tolist(),
+                found_faces[order].tolist()
+            )
+        ]
+        FreeCAD.Console.PrintLog('found Faces: {}\n'.format(len(faces)))
+        return faces
+
+
+_femelement_incidences = []
+
+
+def get_femelement_incidence(
+    femelement_table
+):
+    '''get the FemElementIncidence of the femelement_table
+    the incidences of the last few femelement_tables are kept and reused for every
+    search on these tables, a new table (a changed mesh) gets a new incidence
+    '''
+    for incidence in _femelement_incidences:
+        if incidence.is_valid(femelement_table):
+            return incidence
+    incidence = FemElementIncidence(femelement_table)
+    FreeCAD.Console.PrintLog(
+        'femelement incidence: {} elements, {} nodes\n'
+        .format(len(incidence.ele_ids), len(incidence.node_ids))
+    )
+    # volumes, faces and edges table of one mesh
+    _femelement_incidences.insert(0, incidence)
+    del _femelement_incidences[3:]
+    return incidence
+
+
+def clear_femelement_incidence_cache():
+    del _femelement_incidences[:]
+
+
 # ************************************************************************************************
 def get_copy_of_empty_femelement_table(
     femelement_table
@@ -278,10 +706,9 @@ def get_bit_pattern_dict(
 
 
 # ************************************************************************************************
-def get_ccxelement_faces_from_binary_search(
-    bit_pattern_dict
+def get_ccxelement_face_masks(
 ):
-    '''get the CalculiX element face numbers
+    '''{number of element nodes : {face bit pattern : CalculiX face number}}
     '''
     tet10_mask = {
         119: 1,
@@ -319,13 +746,22 @@ def get_ccxelement_faces_from_binary_search(
         25782: 3,
         22829: 4,
         12891: 5}
-    vol_dict = {
+    return {
         4: tet4_mask,
         6: pent6_mask,
         8: hex8_mask,
         10: tet10_mask,
         15: pent15_mask,
         20: hex20_mask}
+
+
+# ************************************************************************************************
+def get_ccxelement_faces_from_binary_search(
+    bit_pattern_dict
+):
+    '''get the CalculiX element face numbers
+    '''
+    vol_dict = get_ccxelement_face_masks()
     faces = []
     for ele in bit_pattern_dict:
         mask_dict = vol_dict[bit_pattern_dict[ele][0]]
@@ -383,18 +819,13 @@ def get_femelements_by_femnodes_std(
     '''for every femelement of femelement_table
     if all nodes of the femelement are in node_list,
     the femelement is added to the list which is returned
+    the search is done on the node element incidence of the femelement_table
+    thus it works for all element types
     e: elementlist
     nodes: nodelist '''
     FreeCAD.Console.PrintMessage('std search: get_femelements_by_femnodes_std\n')
-    e = []  # elementlist
-    for elementID in sorted(femelement_table):
-        nodecount = 0
-        for nodeID in femelement_table[elementID]:
-            if nodeID in node_list:
-                nodecount = nodecount + 1
-        # all nodes of the element are in the node_list!
-        if nodecount == len(femelement_table[elementID]):
-            e.append(elementID)
+    incidence = get_femelement_incidence(femelement_table)
+    e = sorted(incidence.get_femelements_by_femnodes(node_list))  # elementlist
     return e
 
 
@@ -501,6 +932,7 @@ def get_femelement_sets(
     # get remaining femelements for the fem_objects
     if has_remaining_femelements:
         remaining_femelements = []
+        referenced_femelements = set(referenced_femelements)
         for elemid in femelement_table:
             if elemid not in referenced_femelements:
                 remaining_femelements.append(elemid)
@@ -586,7 +1018,7 @@ def get_femelement_directions_theshape(femmesh, femelement_table, theshape):
     for e in theshape.Shape.Edges:
         the_edge = {}
         the_edge['direction'] = e.Vertexes[1].Point - e.Vertexes[0].Point
-        edge_femnodes = femmesh.getNodesByEdge(e)  # femnodes for the current edge
+        edge_femnodes = get_femnodes_by_shape(femmesh, e)  # femnodes for the current edge
         # femelements for this edge
         the_edge['ids'] = get_femelements_by_femnodes_std(femelement_table, edge_femnodes)
         for rot in rotations_ids:
@@ -769,7 +1201,16 @@ def get_force_obj_vertex_nodeload_table(
                 'Element name: {3}\n'
                 .format(ref_node.ShapeType, o.Name, o.Label, elem)
             )
-            node = femmesh.getNodesByVertex(ref_node)
+            node = get_cached_ref_shape_data(
+                femmesh,
+                'Nodes',
+                o,
+                elem,
+                ref_node,
+                get_femnodes_by_shape,
+                femmesh,
+                ref_node
+            )
             elem_info_string = 'node load on shape: ' + o.Name + ':' + elem
             force_obj_node_load_table.append(
                 (elem_info_string, {node[0]: node_load / node_count})
@@ -815,19 +1256,21 @@ def get_force_obj_edge_nodeload_table(
         for elem in elem_tup:
             ref_edge = o.Shape.getElement(elem)
 
-            # edge_table:
-            #     { meshedgeID : ( nodeID, ... , nodeID ) }
-            edge_table = get_ref_edgenodes_table(femmesh, femelement_table, ref_edge)
-
-            # node_length_table:
-            #     [ (nodeID, length), ... , (nodeID, length) ]
-            # some nodes will have more than one entry
-            node_length_table = get_ref_edgenodes_lengths(femnodes_mesh, edge_table)
-
             # node_sum_length_table:
             #     { nodeID : Length, ... , nodeID : Length }
             # LengthSum for each node, one entry for each node
-            node_sum_length_table = get_ref_shape_node_sum_geom_table(node_length_table)
+            node_sum_length_table = get_cached_ref_shape_data(
+                femmesh,
+                'NodeLengths',
+                o,
+                elem,
+                ref_edge,
+                get_ref_edge_node_sum_length_table,
+                femmesh,
+                femelement_table,
+                femnodes_mesh,
+                ref_edge
+            )
 
             # node_load_table:
             #     { nodeID : NodeLoad, ... , nodeID : NodeLoad }
@@ -929,6 +1372,28 @@ def get_force_obj_edge_nodeload_table(
     return force_obj_node_load_table
 
 
+# ************************************************************************************************
+def get_ref_edge_node_sum_length_table(
+    femmesh,
+    femelement_table,
+    femnodes_mesh,
+    ref_edge
+):
+    # edge_table:
+    #     { meshedgeID : ( nodeID, ... , nodeID ) }
+    edge_table = get_ref_edgenodes_table(femmesh, femelement_table, ref_edge)
+
+    # node_length_table:
+    #     [ (nodeID, length), ... , (nodeID, length) ]
+    # some nodes will have more than one entry
+    node_length_table = get_ref_edgenodes_lengths(femnodes_mesh, edge_table)
+
+    # node_sum_length_table:
+    #     { nodeID : Length, ... , nodeID : Length }
+    # LengthSum for each node, one entry for each node
+    return get_ref_shape_node_sum_geom_table(node_length_table)
+
+
 # ************************************************************************************************
 def get_ref_edgenodes_table(
     femmesh,
@@ -936,7 +1401,7 @@ def get_ref_edgenodes_table(
     refedge
 ):
     edge_table = {}  # { meshedgeID : ( nodeID, ... , nodeID ) }
-    refedge_nodes = femmesh.getNodesByEdge(refedge)
+    refedge_nodes = get_femnodes_by_shape(femmesh, refedge)
     if is_solid_femmesh(femmesh):
         refedge_fem_volumeelements = []
         # if at least two nodes of a femvolumeelement are in
@@ -1087,19 +1552,21 @@ def get_force_obj_face_nodeload_table(
         for elem in elem_tup:
             ref_face = o.Shape.getElement(elem)
 
-            # face_table:
-            #    { meshfaceID : ( nodeID, ... , nodeID ) }
-            face_table = get_ref_facenodes_table(femmesh, femelement_table, ref_face)
-
-            # node_area_table:
-            #    [ (nodeID, Area), ... , (nodeID, Area) ]
-            # some nodes will have more than one entry
-            node_area_table = get_ref_facenodes_areas(femnodes_mesh, face_table)
-
             # node_sum_area_table:
             #    { nodeID : Area, ... , nodeID : Area }
             # AreaSum for each node, one entry for each node
-            node_sum_area_table = get_ref_shape_node_sum_geom_table(node_area_table)
+            node_sum_area_table = get_cached_ref_shape_data(
+                femmesh,
+                'NodeAreas',
+                o,
+                elem,
+                ref_face,
+                get_ref_face_node_sum_area_table,
+                femmesh,
+                femelement_table,
+                femnodes_mesh,
+                ref_face
+            )
 
             # node_load_table:
             #    { nodeID : NodeLoad, ... , nodeID : NodeLoad }
@@ -1159,6 +1626,28 @@ def get_force_obj_face_nodeload_table(
     return force_obj_node_load_table
 
 
+# ************************************************************************************************
+def get_ref_face_node_sum_area_table(
+    femmesh,
+    femelement_table,
+    femnodes_mesh,
+    ref_face
+):
+    # face_table:
+    #    { meshfaceID : ( nodeID, ... , nodeID ) }
+    face_table = get_ref_facenodes_table(femmesh, femelement_table, ref_face)
+
+    # node_area_table:
+    #    [ (nodeID, Area), ... , (nodeID, Area) ]
+    # some nodes will have more than one entry
+    node_area_table = get_ref_facenodes_areas(femnodes_mesh, face_table)
+
+    # node_sum_area_table:
+    #    { nodeID : Area, ... , nodeID : Area }
+    # AreaSum for each node, one entry for each node
+    return get_ref_shape_node_sum_geom_table(node_area_table)
+
+
 # ************************************************************************************************
 def get_ref_facenodes_table(
     femmesh,
@@ -1178,7 +1667,7 @@ def get_ref_facenodes_table(
             # they are not sorted we just have the nodes.
             # We need to sort them according the
             # shell mesh notation of tria3, tria6, quad4, quad8
-            ref_face_nodes = femmesh.getNodesByFace(ref_face)
+            ref_face_nodes = get_femnodes_by_shape(femmesh, ref_face)
             # try to use getccxVolumesByFace() to get the volume ids
             # of element with elementfaces on the ref_face
             # --> should work for tetra4 and tetra10
@@ -1222,7 +1711,7 @@ def get_ref_facenodes_table(
             for mf in faces:
                 face_table[mf] = femmesh.getElementNodes(mf)
     elif is_face_femmesh(femmesh):
-        ref_face_nodes = femmesh.getNodesByFace(ref_face)
+        ref_face_nodes = get_femnodes_by_shape(femmesh, ref_face)
         ref_face_elements = get_femelements_by_femnodes_std(femelement_table, ref_face_nodes)
         for mf in ref_face_elements:
             face_table[mf] = femelement_table[mf]
@@ -1572,13 +2061,19 @@ def get_pressure_obj_faces(
         # sorted and duplicates removed
         prs_face_node_set = get_femnodes_by_femobj_with_references(femmesh, femobj)
         # FreeCAD.Console.PrintMessage('prs_face_node_set: {}\n'.format(prs_face_node_set))
-        # fill the bit_pattern_dict and search for the faces
-        bit_pattern_dict = get_bit_pattern_dict(
-            femelement_table,
-            femnodes_ele_table,
-            prs_face_node_set
-        )
-        pressure_faces = get_ccxelement_faces_from_binary_search(bit_pattern_dict)
+        if femnodes_ele_table:
+            # fill the bit_pattern_dict and search for the faces
+            bit_pattern_dict = get_bit_pattern_dict(
+                femelement_table,
+                femnodes_ele_table,
+                prs_face_node_set
+            )
+            pressure_faces = get_ccxelement_faces_from_binary_search(bit_pattern_dict)
+        else:
+            # same binary search on the cached node element incidence
+            pressure_faces = get_femelement_incidence(
+                femelement_table
+            ).get_ccxelement_faces(prs_face_node_set)
     elif is_face_femmesh(femmesh):
         pressure_faces = []
         # normally we should call get_femelements_by_references and
@@ -1873,14 +2368,13 @@ def find_element_in_shape(
 ):
     # import Part
     ele_st = anElement.ShapeType
+    if ele_st == 'Compound':
+        FreeCAD.Console.PrintError('Compound is not supported.\n')
+        return None
+    index = get_shape_element_index(aShape).find_index(anElement)
+    if index is not None:
+        return ele_st + str(index + 1)
     if ele_st == 'Solid' or ele_st == 'CompSolid':
-        for index, solid in enumerate(aShape.Solids):
-            # FreeCAD.Console.PrintMessage('{}\n'.format(is_same_geometry(solid, anElement)))
-            if is_same_geometry(solid, anElement):
-                # FreeCAD.Console.PrintMessage('{}\n'.format(index))
-                # Part.show(aShape.Solids[index])
-                ele = ele_st + str(index + 1)
-                return ele
         FreeCAD.Console.PrintError(
             'Solid ' + str(anElement) + ' not found in: ' + str(aShape) + '\n'
         )
@@ -1893,32 +2387,6 @@ def find_element_in_shape(
             FreeCAD.Console.PrintMessage(message_part + '\n')
         # Part.show(anElement)
         # Part.show(aShape)
-    elif ele_st == 'Face' or ele_st == 'Shell':
-        for index, face in enumerate(aShape.Faces):
-            # FreeCAD.Console.PrintMessage('{}\n'.format(is_same_geometry(face, anElement)))
-            if is_same_geometry(face, anElement):
-                # FreeCAD.Console.PrintMessage('{}\n'.format(index))
-                # Part.show(aShape.Faces[index])
-                ele = ele_st + str(index + 1)
-                return ele
-    elif ele_st == 'Edge' or ele_st == 'Wire':
-        for index, edge in enumerate(aShape.Edges):
-            # FreeCAD.Console.PrintMessage('{}\n'.format(is_same_geometry(edge, anElement)))
-            if is_same_geometry(edge, anElement):
-                # FreeCAD.Console.PrintMessage(index, '\n')
-                # Part.show(aShape.Edges[index])
-                ele = ele_st + str(index + 1)
-                return ele
-    elif ele_st == 'Vertex':
-        for index, vertex in enumerate(aShape.Vertexes):
-            # FreeCAD.Console.PrintMessage('{}\n'.format(is_same_geometry(vertex, anElement)))
-            if is_same_geometry(vertex, anElement):
-                # FreeCAD.Console.PrintMessage('{}\n'.format(index))
-                # Part.show(aShape.Vertexes[index])
-                ele = ele_st + str(index + 1)
-                return ele
-    elif ele_st == 'Compound':
-        FreeCAD.Console.PrintError('Compound is not supported.\n')
 
 
 # ************************************************************************************************
@@ -1928,46 +2396,158 @@ def get_vertexes_by_element(
 ):
     # we're going to extend the method find_element_in_shape and return the vertexes
     # import Part
-    ele_vertexes = []
     ele_st = anElement.ShapeType
-    if ele_st == 'Solid' or ele_st == 'CompSolid':
-        for index, solid in enumerate(aShape.Solids):
-            if is_same_geometry(solid, anElement):
-                for vele in aShape.Solids[index].Vertexes:
-                    for i, v in enumerate(aShape.Vertexes):
-                        if vele.isSame(v):  # use isSame, because orientation could be different
-                            ele_vertexes.append(i)
-                # FreeCAD.Console.PrintMessage('  ' + str(sorted(ele_vertexes)), '\n')
-                return ele_vertexes
-        FreeCAD.Console.PrintError(
-            'Error, Solid ' + str(anElement) + ' not found in: ' + str(aShape) + '\n'
-        )
-    elif ele_st == 'Face' or ele_st == 'Shell':
-        for index, face in enumerate(aShape.Faces):
-            if is_same_geometry(face, anElement):
-                for vele in aShape.Faces[index].Vertexes:
-                    for i, v in enumerate(aShape.Vertexes):
-                        if vele.isSame(v):  # use isSame, because orientation could be different
-                            ele_vertexes.append(i)
-                # FreeCAD.Console.PrintMessage('  ' + str(sorted(ele_vertexes)) + '\n')
-                return ele_vertexes
-    elif ele_st == 'Edge' or ele_st == 'Wire':
-        for index, edge in enumerate(aShape.Edges):
-            if is_same_geometry(edge, anElement):
-                for vele in aShape.Edges[index].Vertexes:
-                    for i, v in enumerate(aShape.Vertexes):
-                        if vele.isSame(v):  # use isSame, because orientation could be different
-                            ele_vertexes.append(i)
-                # FreeCAD.Console.PrintMessage('  ' + str(sorted(ele_vertexes)) + '\n')
-                return ele_vertexes
-    elif ele_st == 'Vertex':
-        for index, vertex in enumerate(aShape.Vertexes):
-            if is_same_geometry(vertex, anElement):
-                ele_vertexes.append(index)
-                # FreeCAD.Console.PrintMessage('  ' + str(sorted(ele_vertexes)) + '\n')
-                return ele_vertexes
-    elif ele_st == 'Compound':
+    if ele_st == 'Compound':
         FreeCAD.Console.PrintError('Compound is not supported.\n')
+        return None
+    shape_index = get_shape_element_index(aShape)
+    index = shape_index.find_index(anElement)
+    if index is None:
+        if ele_st == 'Solid' or ele_st == 'CompSolid':
+            FreeCAD.Console.PrintError(
+                'Error, Solid ' + str(anElement) + ' not found in: ' + str(aShape) + '\n'
+            )
+        return None
+    if ele_st == 'Vertex':
+        return [index]
+    return shape_index.get_vertex_indexes(shape_index.get_sub_shapes(ele_st)[index])
+
+
+# ************************************************************************************************
+class ShapeElementIndex(object):
+    '''index of the sub shapes (Solids, Faces, Edges, Vertexes) of a shape by geometry
+    is_same_geometry() compares the vertex count and the CenterOfMass (the point for
+    shapes with one vertex), thus the sub shapes are sorted by vertex count and the
+    x coordinate of this point. Only the sub shapes with a matching point are compared,
+    instead of all sub shapes of the shape like find_element_in_shape() did before.
+    '''
+
+    # ShapeType of the reference shape: sub shapes of the shape to search in
+    sub_shape_types = {
+        'Solid': 'Solids',
+        'CompSolid': 'Solids',
+        'Face': 'Faces',
+        'Shell': 'Faces',
+        'Edge': 'Edges',
+        'Wire': 'Edges',
+        'Vertex': 'Vertexes',
+    }
+
+    def __init__(
+        self,
+        aShape
+    ):
+        self.shape = aShape
+        self.sub_shapes = {}
+        # {'Faces': {vertex count: (sorted x coordinates, sub shape indexes)}}
+        self.geometry_keys = {}
+        self.vertex_hashes = None
+
+    def get_sub_shapes(
+        self,
+        shape_type
+    ):
+        sub_shape_type = self.sub_shape_types[shape_type]
+        if sub_shape_type not in self.sub_shapes:
+            self.sub_shapes[sub_shape_type] = getattr(self.shape, sub_shape_type)
+        return self.sub_shapes[sub_shape_type]
+
+    def get_geometry_keys(
+        self,
+        shape_type
+    ):
+        import numpy as np
+        sub_shape_type = self.sub_shape_types[shape_type]
+        if sub_shape_type not in self.geometry_keys:
+            groups = {}
+            for index, sub_shape in enumerate(self.get_sub_shapes(shape_type)):
+                key = get_geometry_key(sub_shape)
+                if key is not None:
+                    groups.setdefault(key[0], []).append((key[1], index))
+            keys = {}
+            for count, group in groups.items():
+                group.sort()
+                keys[count] = (
+                    np.array([x for x, index in group], dtype=np.float64),
+                    np.array([index for x, index in group], dtype=np.int64)
+                )
+            self.geometry_keys[sub_shape_type] = keys
+        return self.geometry_keys[sub_shape_type]
+
+    def find_index(
+        self,
+        anElement
+    ):
+        '''index of the first sub shape with the same geometry as anElement or None'''
+        import numpy as np
+        key = get_geometry_key(anElement)
+        if key is None or anElement.ShapeType not in self.sub_shape_types:
+            return None
+        keys = self.get_geometry_keys(anElement.ShapeType).get(key[0])
+        if keys is None:
+            return None
+        xs, indexes = keys
+        # Vector comparison of is_same_geometry() is not bit exact
+        margin = 1e-9 * max(1.0, abs(key[1]))
+        low = np.searchsorted(xs, key[1] - margin, side='left')
+        high = np.searchsorted(xs, key[1] + margin, side='right')
+        sub_shapes = self.get_sub_shapes(anElement.ShapeType)
+        for index in sorted(indexes[low:high].tolist()):
+            if is_same_geometry(sub_shapes[index], anElement):
+                return index
+        return None
+
+    def get_vertex_indexes(
+        self,
+        sub_shape
+    ):
+        '''indexes of the vertexes of sub_shape in shape.Vertexes'''
+        vertexes = self.get_sub_shapes('Vertex')
+        if self.vertex_hashes is None:
+            self.vertex_hashes = {}
+            for i, v in enumerate(vertexes):
+                self.vertex_hashes.setdefault(v.hashCode(), []).append(i)
+        ele_vertexes = []
+        for vele in sub_shape.Vertexes:
+            for i in self.vertex_hashes.get(vele.hashCode(), []):
+                if vele.isSame(vertexes[i]):  # use isSame, because orientation could be different
+                    ele_vertexes.append(i)
+        return ele_vertexes
+
+
+def get_geometry_key(
+    shape
+):
+    '''(vertex count, x of the point compared by is_same_geometry()) or None'''
+    vertexes = shape.Vertexes
+    if len(vertexes) == 1:
+        return (1, vertexes[0].X)
+    elif len(vertexes) > 1:
+        return (len(vertexes), shape.CenterOfMass.x)
+    return None
+
+
+_shape_element_indexes = []
+
+
+def get_shape_element_index(
+    aShape
+):
+    '''get the ShapeElementIndex of aShape
+    the indexes of the last few shapes are kept, thus all references of all
+    constraints of an analysis are searched in the index of the same shape
+    '''
+    for shape_index in _shape_element_indexes:
+        if shape_index.shape.isSame(aShape):
+            return shape_index
+    shape_index = ShapeElementIndex(aShape)
+    _shape_element_indexes.insert(0, shape_index)
+    del _shape_element_indexes[3:]
+    return shape_index
+
+
+def clear_shape_element_index_cache():
+    del _shape_element_indexes[:]
 
 
 # ************************************************************************************************
@@ -2366,49 +2946,117 @@ def compact_mesh(
     removes all gaps in node and element ids, start ids with 1
     returns a tuple (FemMesh, node_assignment_map, element_assignment_map)
     '''
-    node_map = {}  # {old_node_id: new_node_id, ...}
-    elem_map = {}  # {old_elem_id: new_elem_id, ...}
-    old_nodes = old_femmesh.Nodes
+    new_mesh, node_lookup, elem_lookup = get_compact_femmesh(old_femmesh)
+    node_map = get_compact_id_map(node_lookup)  # {old_node_id: new_node_id, ...}
+    elem_map = get_compact_id_map(elem_lookup)  # {old_elem_id: new_elem_id, ...}
+    return (new_mesh, node_map, elem_map)
+
+
+def get_compact_femmesh(
+    old_femmesh
+):
+    '''
+    removes all gaps in node and element ids, start ids with 1
+    returns a tuple (FemMesh, node_lookup, elem_lookup)
+    the lookups are numpy arrays, new_id = lookup[old_id], 0 for not used old ids
+    nodes and elements are renumbered in the order of the old mesh,
+    edges first, faces and volumes afterwards
+    '''
+    import numpy as np
+    from itertools import chain
     import Fem
     new_mesh = Fem.FemMesh()
 
-    if old_nodes:
-        for i, n in enumerate(old_nodes):
-            nid = i + 1
-            new_mesh.addNode(old_nodes[n].x, old_nodes[n].y, old_nodes[n].z, nid)
-            node_map[n] = nid
-
-    if old_femmesh.Edges:
-        for i, ed in enumerate(old_femmesh.Edges):
-            eid = i + 1
-            old_elem_nodes = old_femmesh.getElementNodes(ed)
-            new_elemnodes = []
-            for old_node_id in old_elem_nodes:
-                new_elemnodes.append(node_map[old_node_id])
-            new_mesh.addEdge(new_elemnodes, eid)
-            elem_map[ed] = eid
-
-    if old_femmesh.Faces:
-        for i, fa in enumerate(old_femmesh.Faces):
-            fid = i + 1
-            old_elem_nodes = old_femmesh.getElementNodes(fa)
-            new_elemnodes = []
-            for old_node_id in old_elem_nodes:
-                new_elemnodes.append(node_map[old_node_id])
-            new_mesh.addFace(new_elemnodes, fid)
-            elem_map[fa] = fid
-
-    if old_femmesh.Volumes:
-        for i, vo in enumerate(old_femmesh.Volumes):
-            vid = i + 1
-            old_elem_nodes = old_femmesh.getElementNodes(vo)
-            new_elemnodes = []
-            for old_node_id in old_elem_nodes:
-                new_elemnodes.append(node_map[old_node_id])
-            new_mesh.addVolume(new_elemnodes, vid)
-        elem_map[vo] = vid
-
-    # may be return another value if the mesh was compacted, just check last map entries
-    return (new_mesh, node_map, elem_map)
+    old_nodes = old_femmesh.Nodes
+    old_node_ids = np.fromiter(old_nodes, dtype=np.int64, count=len(old_nodes))
+    node_lookup = get_compact_id_lookup(old_node_ids)
+    if len(old_node_ids):
+        coords = np.fromiter(
+            chain.from_iterable(old_nodes[n] for n in old_nodes),
+            dtype=np.float64,
+            count=3 * len(old_nodes)
+        ).reshape(-1, 3).tolist()
+        add_node = new_mesh.addNode
+        for nid, (x, y, z) in enumerate(coords, 1):
+            add_node(x, y, z, nid)
+
+    old_elem_ids = []
+    get_element_nodes = old_femmesh.getElementNodes
+    for old_ids, add_element in (
+        (old_femmesh.Edges, new_mesh.addEdge),
+        (old_femmesh.Faces, new_mesh.addFace),
+        (old_femmesh.Volumes, new_mesh.addVolume),
+    ):
+        if not old_ids:
+            continue
+        first_id = len(old_elem_ids) + 1
+        old_elem_ids.extend(old_ids)
+        elem_nodes = [get_element_nodes(e) for e in old_ids]
+        new_elem_nodes = get_compact_element_nodes(elem_nodes, node_lookup)
+        for eid, new_elemnodes in enumerate(new_elem_nodes, first_id):
+            add_element(new_elemnodes, eid)
+    elem_lookup = get_compact_id_lookup(np.array(old_elem_ids, dtype=np.int64))
+
+    return (new_mesh, node_lookup, elem_lookup)
+
+
+def get_compact_id_lookup(
+    old_ids
+):
+    '''lookup array of the new ids 1 ... len(old_ids) indexed by the old ids'''
+    import numpy as np
+    old_ids = np.asarray(old_ids, dtype=np.int64)
+    lookup = np.zeros(int(old_ids.max()) + 1 if len(old_ids) else 1, dtype=np.int64)
+    lookup[old_ids] = np.arange(1, len(old_ids) + 1)
+    return lookup
+
+
+def get_compact_id_map(
+    lookup
+):
+    '''{old_id: new_id, ...} dict of a lookup array of get_compact_id_lookup()'''
+    import numpy as np
+    old_ids = np.flatnonzero(lookup)
+    return dict(zip(old_ids.tolist(), lookup[old_ids].tolist()))
+
+
+def get_compact_element_nodes(
+    elem_nodes,
+    node_lookup
+):
+    '''
+    renumbers the node tuples of the elements by one gather of the node lookup
+    returns a list of node lists
+    '''
+    import numpy as np
+    from itertools import chain
+    lens = np.fromiter(map(len, elem_nodes), dtype=np.int64, count=len(elem_nodes))
+    new_nodes = node_lookup[np.fromiter(
+        chain.from_iterable(elem_nodes),
+        dtype=np.int64,
+        count=int(lens.sum())
+    )]
+    if (lens == lens[0]).all():
+        # one element type, usually the case
+        return new_nodes.reshape(-1, int(lens[0])).tolist()
+    new_nodes = new_nodes.tolist()
+    ends = np.cumsum(lens).tolist()
+    return [new_nodes[end - n:end] for n, end in zip(lens.tolist(), ends)]
+
+
+def is_compact_femmesh(
+    femmesh
+):
+    '''
+    True if node ids and element ids already are 1 ... n in the order
+    get_compact_femmesh() would renumber them, thus compacting would not change anything
+    '''
+    import numpy as np
+    nodes = femmesh.Nodes
+    node_ids = np.fromiter(nodes, dtype=np.int64, count=len(nodes))
+    if not np.array_equal(node_ids, np.arange(1, len(node_ids) + 1)):
+        return False
+    elem_ids = np.array(femmesh.Edges + femmesh.Faces + femmesh.Volumes, dtype=np.int64)
+    return np.array_equal(elem_ids, np.arange(1, len(elem_ids) + 1))
 
 ##  @}
@@ -196,53 +196,28 @@ def fill_femresult_stats(res_obj):
     temp_min = temp_avg = temp_max = 0
     mflow_min = mflow_avg = mflow_max = npress_min = npress_avg = npress_max = 0
 
-    if res_obj.DisplacementVectors:
-        no_of_values = len(res_obj.DisplacementVectors)
-        x_max, y_max, z_max = map(max, zip(*res_obj.DisplacementVectors))
-        x_min, y_min, z_min = map(min, zip(*res_obj.DisplacementVectors))
-        sum_list = map(sum, zip(*res_obj.DisplacementVectors))
-        x_avg, y_avg, z_avg = [i / no_of_values for i in sum_list]
-        a_min = min(res_obj.DisplacementLengths)
-        a_avg = sum(res_obj.DisplacementLengths) / no_of_values
-        a_max = max(res_obj.DisplacementLengths)
-    if res_obj.StressValues:
-        s_min = min(res_obj.StressValues)
-        s_avg = sum(res_obj.StressValues) / no_of_values
-        s_max = max(res_obj.StressValues)
-    if res_obj.PrincipalMax:
-        p1_min = min(res_obj.PrincipalMax)
-        p1_avg = sum(res_obj.PrincipalMax) / no_of_values
-        p1_max = max(res_obj.PrincipalMax)
-    if res_obj.PrincipalMed:
-        p2_min = min(res_obj.PrincipalMed)
-        p2_avg = sum(res_obj.PrincipalMed) / no_of_values
-        p2_max = max(res_obj.PrincipalMed)
-    if res_obj.PrincipalMin:
-        p3_min = min(res_obj.PrincipalMin)
-        p3_avg = sum(res_obj.PrincipalMin) / no_of_values
-        p3_max = max(res_obj.PrincipalMin)
-    if res_obj.MaxShear:
-        ms_min = min(res_obj.MaxShear)
-        ms_avg = sum(res_obj.MaxShear) / no_of_values
-        ms_max = max(res_obj.MaxShear)
-    if res_obj.Peeq:
-        peeq_min = min(res_obj.Peeq)
-        peeq_avg = sum(res_obj.Peeq) / no_of_values
-        peeq_max = max(res_obj.Peeq)
-    if res_obj.Temperature:
-        temp_min = min(res_obj.Temperature)
-        temp_avg = sum(res_obj.Temperature) / no_of_values
-        temp_max = max(res_obj.Temperature)
-    if res_obj.MassFlowRate:
+    # every property is read only once, the getter returns a new list on every access
+    disp = res_obj.DisplacementVectors
+    if disp:
+        no_of_values = len(disp)
+        disp = np.array(disp, dtype=float).reshape(-1, 3)
+        x_min, y_min, z_min = disp.min(axis=0).tolist()
+        x_max, y_max, z_max = disp.max(axis=0).tolist()
+        x_avg, y_avg, z_avg = (disp.sum(axis=0) / no_of_values).tolist()
+        a_min, a_avg, a_max = get_min_avg_max(res_obj.DisplacementLengths, no_of_values)
+    s_min, s_avg, s_max = get_min_avg_max(res_obj.StressValues, no_of_values)
+    p1_min, p1_avg, p1_max = get_min_avg_max(res_obj.PrincipalMax, no_of_values)
+    p2_min, p2_avg, p2_max = get_min_avg_max(res_obj.PrincipalMed, no_of_values)
+    p3_min, p3_avg, p3_max = get_min_avg_max(res_obj.PrincipalMin, no_of_values)
+    ms_min, ms_avg, ms_max = get_min_avg_max(res_obj.MaxShear, no_of_values)
+    peeq_min, peeq_avg, peeq_max = get_min_avg_max(res_obj.Peeq, no_of_values)
+    temp_min, temp_avg, temp_max = get_min_avg_max(res_obj.Temperature, no_of_values)
+    mflow = res_obj.MassFlowRate
+    if mflow:
         # DisplacementVectors is empty, no_of_values needs to be set
-        no_of_values = len(res_obj.MassFlowRate)
-        mflow_min = min(res_obj.MassFlowRate)
-        mflow_avg = sum(res_obj.MassFlowRate) / no_of_values
-        mflow_max = max(res_obj.MassFlowRate)
-    if res_obj.NetworkPressure:
-        npress_min = min(res_obj.NetworkPressure)
-        npress_avg = sum(res_obj.NetworkPressure) / no_of_values
-        npress_max = max(res_obj.NetworkPressure)
+        no_of_values = len(mflow)
+        mflow_min, mflow_avg, mflow_max = get_min_avg_max(mflow, no_of_values)
+    npress_min, npress_avg, npress_max = get_min_avg_max(res_obj.NetworkPressure, no_of_values)
 
     res_obj.Stats = [x_min, x_avg, x_max,
                      y_min, y_avg, y_max,
@@ -287,52 +262,46 @@ def fill_femresult_stats(res_obj):
     return res_obj
 
 
+def get_min_avg_max(values, no_of_values):
+    # the average is taken over no_of_values, see fill_femresult_stats
+    if not values:
+        return 0, 0, 0
+    values = np.asarray(values, dtype=float)
+    return float(values.min()), float(values.sum() / no_of_values), float(values.max())
+
+
 def add_disp_apps(res_obj):
     res_obj.DisplacementLengths = calculate_disp_abs(res_obj.DisplacementVectors)
     FreeCAD.Console.PrintMessage('Added DisplacementLengths.\n')
     return res_obj
 
 
+def get_stress_array(res_obj):
+    # (N, 6) array, columns (Sxx, Syy, Szz, Sxy, Sxz, Syz)
+    return np.column_stack((
+        np.asarray(res_obj.NodeStressXX, dtype=float),
+        np.asarray(res_obj.NodeStressYY, dtype=float),
+        np.asarray(res_obj.NodeStressZZ, dtype=float),
+        np.asarray(res_obj.NodeStressXY, dtype=float),
+        np.asarray(res_obj.NodeStressXZ, dtype=float),
+        np.asarray(res_obj.NodeStressYZ, dtype=float)
+    ))
+
+
 def add_von_mises(res_obj):
-    mstress = []
-    iterator = zip(
-        res_obj.NodeStressXX,
-        res_obj.NodeStressYY,
-        res_obj.NodeStressZZ,
-        res_obj.NodeStressXY,
-        res_obj.NodeStressXZ,
-        res_obj.NodeStressYZ
-    )
-    for Sxx, Syy, Szz, Sxy, Sxz, Syz in iterator:
-        mstress.append(calculate_von_mises((Sxx, Syy, Szz, Sxy, Sxz, Syz)))
-    res_obj.StressValues = mstress
+    stress = get_stress_array(res_obj)
+    res_obj.StressValues = calculate_von_mises_array(stress).tolist()
     FreeCAD.Console.PrintMessage('Added StressValues (von Mises).\n')
     return res_obj
 
 
 def add_principal_stress(res_obj):
-    prinstress1 = []
-    prinstress2 = []
-    prinstress3 = []
-    shearstress = []
-    iterator = zip(
-        res_obj.NodeStressXX,
-        res_obj.NodeStressYY,
-        res_obj.NodeStressZZ,
-        res_obj.NodeStressXY,
-        res_obj.NodeStressXZ,
-        res_obj.NodeStressYZ
-    )
-    for Sxx, Syy, Szz, Sxy, Sxz, Syz in iterator:
-        prin1, prin2, prin3, shear = calculate_principal_stress((Sxx, Syy, Szz, Sxy, Sxz, Syz))
-        prinstress1.append(prin1)
-        prinstress2.append(prin2)
-        prinstress3.append(prin3)
-        shearstress.append(shear)
-    res_obj.PrincipalMax = prinstress1
-    res_obj.PrincipalMed = prinstress2
-    res_obj.PrincipalMin = prinstress3
-    res_obj.MaxShear = shearstress
+    stress = get_stress_array(res_obj)
+    prinstress = calculate_principal_stress_array(stress)
+    res_obj.PrincipalMax = prinstress[:, 0].tolist()
+    res_obj.PrincipalMed = prinstress[:, 1].tolist()
+    res_obj.PrincipalMin = prinstress[:, 2].tolist()
+    res_obj.MaxShear = prinstress[:, 3].tolist()
     FreeCAD.Console.PrintMessage('Added principal stress and max shear values.\n')
     return res_obj
 
@@ -342,65 +311,85 @@ def compact_result(res_obj):
     compacts result.Mesh and appropriate result.NodeNumbers
     '''
     # as workaround for https://www.freecadweb.org/tracker/view.php?id=2873
+    from femmesh import meshtools
+
+    # nothing to do, if there are no gaps in the ids
+    if meshtools.is_compact_femmesh(res_obj.Mesh.FemMesh):
+        return res_obj
 
     # get compact mesh data
-    from femmesh.meshtools import compact_mesh as cm
-    compact_femmesh_data = cm(res_obj.Mesh.FemMesh)
-    compact_femmesh = compact_femmesh_data[0]
-    node_map = compact_femmesh_data[1]
+    compact_femmesh, node_lookup, elem_lookup = meshtools.get_compact_femmesh(
+        res_obj.Mesh.FemMesh
+    )
     # FreeCAD result obj does not support elem results ATM
-    # elem_map = compact_femmesh_data[2]
 
     # set result mesh
     res_obj.Mesh.FemMesh = compact_femmesh
 
-    # set result node numbers
-    new_node_numbers = []
-    for old_node_id in res_obj.NodeNumbers:
-        new_node_numbers.append(node_map[old_node_id])
-    res_obj.NodeNumbers = new_node_numbers
+    # set result node numbers, one gather of the node lookup
+    res_obj.NodeNumbers = node_lookup[np.array(res_obj.NodeNumbers, dtype=np.int64)].tolist()
 
     return res_obj
 
 
 def calculate_von_mises(stress_tensor):
+    # stress_tensor ... (Sxx, Syy, Szz, Sxy, Sxz, Syz)
+    return calculate_von_mises_array(np.array([stress_tensor], dtype=float))[0]
+
+
+def calculate_von_mises_array(stress):
     # Von mises stress: http://en.wikipedia.org/wiki/Von_Mises_yield_criterion
     # simplification: https://forum.freecadweb.org/viewtopic.php?f=18&t=33974&p=296542#p296542
-    # stress_tensor ... (Sxx, Syy, Szz, Sxy, Sxz, Syz)
-    normal = stress_tensor[:3]
-    shear = stress_tensor[3:]
-    pressure = np.average(normal)
-    return np.sqrt(1.5 * np.linalg.norm(normal - pressure)**2 + 3.0 * np.linalg.norm(shear)**2)
+    # stress ... (N, 6) array, columns (Sxx, Syy, Szz, Sxy, Sxz, Syz)
+    stress = np.asarray(stress, dtype=float).reshape(-1, 6)
+    normal = stress[:, :3]
+    shear = stress[:, 3:]
+    pressure = np.average(normal, axis=1)
+    return np.sqrt(
+        1.5 * np.linalg.norm(normal - pressure[:, np.newaxis], axis=1)**2
+        + 3.0 * np.linalg.norm(shear, axis=1)**2
+    )
 
 
 def calculate_principal_stress(stress_tensor):
-    s11 = stress_tensor[0]  # Sxx
-    s22 = stress_tensor[1]  # Syy
-    s33 = stress_tensor[2]  # Szz
-    s12 = stress_tensor[3]  # Sxy
-    s31 = stress_tensor[4]  # Sxz
-    s23 = stress_tensor[5]  # Syz
-    sigma = np.array([
-        [s11, s12, s31],
-        [s12, s22, s23],
-        [s31, s23, s33]
-    ])  # https://forum.freecadweb.org/viewtopic.php?f=18&t=24637&start=10#p240408
-
-    try:  # it will fail if NaN is inside the array, which can happen on Calculix frd result files
-        # compute principal stresses
-        eigvals = list(np.linalg.eigvalsh(sigma))
-        eigvals.sort()
-        eigvals.reverse()
-        maxshear = (eigvals[0] - eigvals[2]) / 2.0
-        return (eigvals[0], eigvals[1], eigvals[2], maxshear)
-    except:
-        return (float('NaN'), float('NaN'), float('NaN'), float('NaN'))
-    # TODO might be possible without a try except for NaN
+    # stress_tensor ... (Sxx, Syy, Szz, Sxy, Sxz, Syz)
+    return tuple(calculate_principal_stress_array(np.array([stress_tensor], dtype=float))[0])
+
+
+def calculate_principal_stress_array(stress):
+    # stress ... (N, 6) array, columns (Sxx, Syy, Szz, Sxy, Sxz, Syz)
+    # returns (N, 4) array, columns (PrincipalMax, PrincipalMed, PrincipalMin, MaxShear)
+    stress = np.asarray(stress, dtype=float).reshape(-1, 6)
+    sigma = np.empty((len(stress), 3, 3))
+    # https://forum.freecadweb.org/viewtopic.php?f=18&t=24637&start=10#p240408
+    sigma[:, 0, 0] = stress[:, 0]  # Sxx
+    sigma[:, 1, 1] = stress[:, 1]  # Syy
+    sigma[:, 2, 2] = stress[:, 2]  # Szz
+    sigma[:, 0, 1] = sigma[:, 1, 0] = stress[:, 3]  # Sxy
+    sigma[:, 0, 2] = sigma[:, 2, 0] = stress[:, 4]  # Sxz
+    sigma[:, 1, 2] = sigma[:, 2, 1] = stress[:, 5]  # Syz
+
+    # NaN can be inside on Calculix frd result files, eigvalsh would fail on these nodes
     # https://forum.freecadweb.org/viewtopic.php?f=22&t=33911&start=10#p284229
+    prinstress = np.full((len(stress), 4), float('NaN'))
+    valid = np.all(np.isfinite(stress), axis=1)
+    if np.any(valid):
+        # eigenvalues in ascending order
+        eigvals = np.linalg.eigvalsh(sigma[valid])
+        prinstress[valid, 0] = eigvals[:, 2]
+        prinstress[valid, 1] = eigvals[:, 1]
+        prinstress[valid, 2] = eigvals[:, 0]
+        prinstress[valid, 3] = (eigvals[:, 2] - eigvals[:, 0]) / 2.0
+    return prinstress
 
 
 def calculate_disp_abs(displacements):
     # see https://forum.freecadweb.org/viewtopic.php?f=18&t=33106&start=100#p296657
-    return [np.linalg.norm(nd) for nd in displacements]
+    return calculate_disp_abs_array(np.array(displacements, dtype=float)).tolist()
+
+
+def calculate_disp_abs_array(displacements):
+    # displacements ... (N, 3) array
+    return np.linalg.norm(np.asarray(displacements, dtype=float).reshape(-1, 3), axis=1)
 
 ##  @}
@@ -129,14 +129,16 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
         self.femmesh.writeABAQUS(self.file_name, 1, False)
 
         # reopen file with "append" and add the analysis definition
-        inpfile = codecs.open(self.file_name, 'a', encoding="utf-8")
+        inpfile = codecs.open(
+            self.file_name, 'a', encoding="utf-8", buffering=write_buffer_size
+        )
         inpfile.write('\n\n')
 
         # Check to see if fluid sections are in analysis and use D network element type
         if self.fluidsection_objects:
             inpfile.close()
             meshtools.write_D_network_element_to_inputfile(self.file_name)
-            inpfile = open(self.file_name, 'a')
+            inpfile = open(self.file_name, 'a', write_buffer_size)
         # node and element sets
         self.write_element_sets_material_and_femelement_type(inpfile)
         if self.fixed_objects:
@@ -166,7 +168,7 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
                     self.file_name,
                     self.fluid_inout_nodes_file
                 )
-                inpfile = open(self.file_name, 'a')
+                inpfile = open(self.file_name, 'a', write_buffer_size)
 
         # constraints independent from steps
         if self.planerotation_objects:
@@ -225,7 +227,7 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
         # that the .writeABAQUS also writes in inputfile
         inpfileMain = open(self.file_name, 'w')
         inpfileMain.close()
-        inpfileMain = open(self.file_name, 'a')
+        inpfileMain = open(self.file_name, 'a', write_buffer_size)
         inpfileMain.write('\n\n')
 
         # write nodes and elements
@@ -248,19 +250,19 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
 
         # create separate inputfiles for each node set or constraint
         if self.fixed_objects or self.displacement_objects or self.planerotation_objects:
-            inpfileNodes = open(name + "_Node_sets.inp", 'w')
+            inpfileNodes = open(name + "_Node_sets.inp", 'w', write_buffer_size)
         if self.analysis_type == "thermomech" and self.temperature_objects:
-            inpfileNodeTemp = open(name + "_Node_Temp.inp", 'w')
+            inpfileNodeTemp = open(name + "_Node_Temp.inp", 'w', write_buffer_size)
         if self.force_objects:
-            inpfileForce = open(name + "_Node_Force.inp", 'w')
+            inpfileForce = open(name + "_Node_Force.inp", 'w', write_buffer_size)
         if self.pressure_objects:
-            inpfilePressure = open(name + "_Pressure.inp", 'w')
+            inpfilePressure = open(name + "_Pressure.inp", 'w', write_buffer_size)
         if self.analysis_type == "thermomech" and self.heatflux_objects:
-            inpfileHeatflux = open(name + "_Node_Heatlfux.inp", 'w')
+            inpfileHeatflux = open(name + "_Node_Heatlfux.inp", 'w', write_buffer_size)
         if self.contact_objects:
-            inpfileContact = open(name + "_Surface_Contact.inp", 'w')
+            inpfileContact = open(name + "_Surface_Contact.inp", 'w', write_buffer_size)
         if self.transform_objects:
-            inpfileTransform = open(name + "_Node_Transform.inp", 'w')
+            inpfileTransform = open(name + "_Node_Transform.inp", 'w', write_buffer_size)
 
         # node and element sets
         self.write_element_sets_material_and_femelement_type(inpfileMain)
@@ -493,8 +495,7 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
             if isinstance(ccx_elset['ccx_elset'], six.string_types):
                 f.write(ccx_elset['ccx_elset'] + '\n')
             else:
-                for elid in ccx_elset['ccx_elset']:
-                    f.write(str(elid) + ',\n')
+                write_id_lines(f, ccx_elset['ccx_elset'])
 
     def write_node_sets_constraints_fixed(self, f):
         # get nodes
@@ -511,16 +512,13 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
                     and (len(self.shellthickness_objects) > 0 or len(self.beamsection_objects) > 0):
                 if len(femobj['NodesSolid']) > 0:
                     f.write('*NSET,NSET=' + fix_obj.Name + 'Solid\n')
-                    for n in femobj['NodesSolid']:
-                        f.write(str(n) + ',\n')
+                    write_id_lines(f, femobj['NodesSolid'])
                 if len(femobj['NodesFaceEdge']) > 0:
                     f.write('*NSET,NSET=' + fix_obj.Name + 'FaceEdge\n')
-                    for n in femobj['NodesFaceEdge']:
-                        f.write(str(n) + ',\n')
+                    write_id_lines(f, femobj['NodesFaceEdge'])
             else:
                 f.write('*NSET,NSET=' + fix_obj.Name + '\n')
-                for n in femobj['Nodes']:
-                    f.write(str(n) + ',\n')
+                write_id_lines(f, femobj['Nodes'])
 
     def write_node_sets_constraints_displacement(self, f):
         # get nodes
@@ -534,8 +532,7 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
             disp_obj = femobj['Object']
             f.write('** ' + disp_obj.Label + '\n')
             f.write('*NSET,NSET=' + disp_obj.Name + '\n')
-            for n in femobj['Nodes']:
-                f.write(str(n) + ',\n')
+            write_id_lines(f, femobj['Nodes'])
 
     def write_node_sets_constraints_planerotation(self, f):
         # get nodes
@@ -581,8 +578,7 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
                 if cnt == 0:
                     MPC = node_planerotation[i]
                     MPC_nodes.append(MPC)
-            for i in range(len(MPC_nodes)):
-                f.write(str(MPC_nodes[i]) + ',\n')
+            write_id_lines(f, MPC_nodes)
 
     def write_surfaces_contraints_contact(self, f):
         # get surface nodes and write them to file
@@ -625,8 +621,7 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
                 f.write('*NSET,NSET=Rect' + trans_obj.Name + '\n')
             elif trans_obj.TransformType == "Cylindrical":
                 f.write('*NSET,NSET=Cylin' + trans_obj.Name + '\n')
-            for n in femobj['Nodes']:
-                f.write(str(n) + ',\n')
+            write_id_lines(f, femobj['Nodes'])
 
     def write_node_sets_constraints_temperature(self, f):
         # get nodes
@@ -640,8 +635,7 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
             temp_obj = femobj['Object']
             f.write('** ' + temp_obj.Label + '\n')
             f.write('*NSET,NSET=' + temp_obj.Name + '\n')
-            for n in femobj['Nodes']:
-                f.write(str(n) + ',\n')
+            write_id_lines(f, femobj['Nodes'])
 
     def write_materials(self, f):
         f.write('\n***********************************************************\n')
@@ -1100,17 +1094,21 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
             direction_vec = femobj['Object'].DirectionVector
             for ref_shape in femobj['NodeLoadTable']:
                 f.write('** ' + ref_shape[0] + '\n')
-                for n in sorted(ref_shape[1]):
-                    node_load = ref_shape[1][n]
-                    if (direction_vec.x != 0.0):
-                        v1 = "{:.13E}".format(direction_vec.x * node_load)
-                        f.write(str(n) + ',1,' + v1 + '\n')
-                    if (direction_vec.y != 0.0):
-                        v2 = "{:.13E}".format(direction_vec.y * node_load)
-                        f.write(str(n) + ',2,' + v2 + '\n')
-                    if (direction_vec.z != 0.0):
-                        v3 = "{:.13E}".format(direction_vec.z * node_load)
-                        f.write(str(n) + ',3,' + v3 + '\n')
+                nodes = sorted(ref_shape[1])
+                node_loads = [ref_shape[1][n] for n in nodes]
+                # one line per node and direction component which is not 0.0
+                line_format = ''
+                columns = []
+                for dof, direction in enumerate(
+                    (direction_vec.x, direction_vec.y, direction_vec.z),
+                    1
+                ):
+                    if direction != 0.0:
+                        columns.append(nodes)
+                        columns.append([direction * node_load for node_load in node_loads])
+                        line_format += '%d,{},%.13E\n'.format(dof)
+                if line_format:
+                    write_lines(f, line_format, *columns)
                 f.write('\n')
             f.write('\n')
 
@@ -1127,19 +1125,22 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
             f.write('** ' + prs_obj.Label + '\n')
             rev = -1 if prs_obj.Reversed else 1
             f.write('*DLOAD\n')
+            # load string for each face number
+            # solid mesh face: fno > 0
+            face_loads = dict(
+                (fno, "P{},{}".format(fno, rev * prs_obj.Pressure)) for fno in range(1, 7)
+            )
+            # on shell mesh face: fno == 0
+            # normal of element face == face normal
+            face_loads[0] = "P,{}".format(rev * prs_obj.Pressure)
+            # on shell mesh face: fno == -1
+            # normal of element face opposite direction face normal
+            face_loads[-1] = "P,{}".format(-1 * rev * prs_obj.Pressure)
             for ref_shape in femobj['PressureFaces']:
                 f.write('** ' + ref_shape[0] + '\n')
-                for face, fno in ref_shape[1]:
-                    if fno > 0:  # solid mesh face
-                        f.write("{},P{},{}\n".format(face, fno, rev * prs_obj.Pressure))
-                    # on shell mesh face: fno == 0
-                    # normal of element face == face normal
-                    elif fno == 0:
-                        f.write("{},P,{}\n".format(face, rev * prs_obj.Pressure))
-                    # on shell mesh face: fno == -1
-                    # normal of element face opposite direction face normal
-                    elif fno == -1:
-                        f.write("{},P,{}\n".format(face, -1 * rev * prs_obj.Pressure))
+                faces = [face for face, fno in ref_shape[1] if fno in face_loads]
+                loads = [face_loads[fno] for face, fno in ref_shape[1] if fno in face_loads]
+                write_lines(f, "%d,%s\n", faces, loads)
 
     def write_constraints_temperature(self, f):
         f.write('\n***********************************************************\n')
@@ -1652,6 +1653,55 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
 
 
 # Helpers
+# ************************************************************************************************
+# helper for writing large blocks of node sets, element sets and loads
+# one f.write() per line is slow for large meshes, the lines are formatted
+# for a chunk of lines at once and written as one string into a large file buffer
+write_buffer_size = 1048576
+write_chunk_size = 262144
+
+
+def get_id_lines(ids):
+    '''the text lines "id,\n" of all ids, vectorized by numpy
+    the digits of all ids are put right aligned into a byte matrix
+    and the matrix is joined without the leading pad bytes
+    '''
+    import numpy as np
+    ids = np.fromiter(ids, dtype=np.int64)
+    if len(ids) == 0:
+        return ''
+    if ids.min() < 0:
+        return ''.join(map('%d,\n'.__mod__, ids.tolist()))
+    powers = 10 ** np.arange(1, 19, dtype=np.int64)
+    ndigits = np.searchsorted(powers, ids, side='right') + 1
+    width = int(ndigits.max())
+    lines = np.empty((len(ids), width + 2), dtype=np.uint8)
+    rest = ids.copy()
+    for col in range(width - 1, -1, -1):
+        lines[:, col] = rest % 10 + ord('0')
+        rest //= 10
+    lines[:, width] = ord(',')
+    lines[:, width + 1] = ord('\n')
+    used = np.arange(width + 2) >= (width - ndigits)[:, None]
+    return lines[used].tobytes().decode('ascii')
+
+
+def write_id_lines(f, ids):
+    '''writes "id,\n" for every id of ids (node set or element set)'''
+    ids = list(ids)
+    for start in range(0, len(ids), write_chunk_size):
+        f.write(get_id_lines(ids[start:start + write_chunk_size]))
+
+
+def write_lines(f, line_format, *columns):
+    '''writes line_format % (col_1[i], col_2[i], ...) for every line i
+    the columns are lists of equal length
+    '''
+    for start in range(0, len(columns[0]), write_chunk_size):
+        end = start + write_chunk_size
+        f.write(''.join(map(line_format.__mod__, zip(*[col[start:end] for col in columns]))))
+
+
 # ccx elset names:
 # M .. Material
 # B .. Beam
@@ -106,6 +106,8 @@ class FemInputWriter():
             elif hasattr(self.mesh_object, "Part"):
                 self.theshape = self.mesh_object.Part
             self.femmesh = self.mesh_object.FemMesh
+            # searches of unchanged references are reused from the last writer run
+            meshtools.femmesh_reference_cache.set_femmesh(self.femmesh)
         else:
             FreeCAD.Console.PrintError(
                 'No finite elemente mesh object was given to the writer class. '
@@ -144,18 +146,18 @@ class FemInputWriter():
                 self.femelement_volumes_table = meshtools.get_femelement_volumes_table(
                     self.femmesh
                 )
+            volumes_incidence = meshtools.get_femelement_incidence(
+                self.femelement_volumes_table
+            )
             for femobj in self.fixed_objects:
                 # femobj --> dict, FreeCAD document object is femobj['Object']
                 nds_solid = []
                 nds_faceedge = []
-                for n in femobj['Nodes']:
-                    solid_node = False
-                    for ve in self.femelement_volumes_table:
-                        if n in self.femelement_volumes_table[ve]:
-                            solid_node = True
-                            nds_solid.append(n)
-                            break
-                    if not solid_node:
+                is_solid_node = volumes_incidence.contains_nodes(femobj['Nodes'])
+                for n, solid_node in zip(femobj['Nodes'], is_solid_node):
+                    if solid_node:
+                        nds_solid.append(n)
+                    else:
                         nds_faceedge.append(n)
                 femobj['NodesSolid'] = set(nds_solid)
                 femobj['NodesFaceEdge'] = set(nds_faceedge)
@@ -304,15 +306,10 @@ class FemInputWriter():
             # print(femobj['PressureFaces'])
         '''
 
-        if not self.femnodes_mesh:
-            self.femnodes_mesh = self.femmesh.Nodes
         if not self.femelement_table:
             self.femelement_table = meshtools.get_femelement_table(self.femmesh)
-        if not self.femnodes_ele_table:
-            self.femnodes_ele_table = meshtools.get_femnodes_ele_table(
-                self.femnodes_mesh,
-                self.femelement_table
-            )
+        # an empty femnodes_ele_table makes meshtools use the cached
+        # node element incidence of the femelement_table
 
         for femobj in self.pressure_objects:
             # femobj --> dict, FreeCAD document object is femobj['Object']
@@ -404,15 +401,8 @@ class FemInputWriter():
             if all_found is False:
                 if not self.femelement_table:
                     self.femelement_table = meshtools.get_femelement_table(self.femmesh)
-                # we're going to use the binary search for get_femelements_by_femnodes()
-                # thus we need the parameter values self.femnodes_ele_table
-                if not self.femnodes_mesh:
-                    self.femnodes_mesh = self.femmesh.Nodes
-                if not self.femnodes_ele_table:
-                    self.femnodes_ele_table = meshtools.get_femnodes_ele_table(
-                        self.femnodes_mesh,
-                        self.femelement_table
-                    )
+                # without femnodes_ele_table the std search is used, it searches
+                # on the cached node element incidence of the femelement_table
                 control = meshtools.get_femelement_sets(
                     self.femmesh,
                     self.femelement_table,
@@ -0,0 +1,150 @@
+# ***************************************************************************
+# *   Copyright (c) 2019 - FreeCAD Developers                               *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful,            *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with FreeCAD; if not, write to the Free Software        *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************/
+
+__title__ = "Benchmark of the CalculiX input file writer blocks"
+__author__ = "FreeCAD Developers"
+__url__ = "http://www.freecadweb.org"
+
+## \addtogroup FEM
+#  @{
+
+'''
+Benchmark of writing the bulk blocks (element set, node set, node loads and
+pressure faces) of a CalculiX input file for a model with element_count elements.
+
+run in FreeCAD Python console or FreeCADCmd:
+
+from femtest import benchmarkccxwriter
+benchmarkccxwriter.run_benchmark()
+'''
+
+import os
+import time
+
+import FreeCAD
+from femtest import utilstest as testtools
+from femsolver.calculix import writer
+
+
+def get_blocks(
+    element_count
+):
+    # tetra10 like ratio, about 1.5 nodes per element
+    node_count = element_count * 3 // 2
+    elset = list(range(1, element_count + 1))
+    # fixed nodes and loaded nodes and faces on about 5 % of the model
+    surface_count = max(1, node_count // 20)
+    nset = list(range(1, surface_count + 1))
+    node_loads = dict((n, 1.0 / surface_count) for n in nset)
+    pressure_faces = [(e, e % 4 + 1) for e in range(1, surface_count + 1)]
+    return elset, nset, node_loads, pressure_faces
+
+
+def write_blocks_by_lines(
+    f,
+    elset,
+    nset,
+    node_loads,
+    pressure_faces
+):
+    # the writer before the bulk block helper
+    f.write('*ELSET,ELSET=Eall\n')
+    for elid in elset:
+        f.write(str(elid) + ',\n')
+    f.write('*NSET,NSET=Fixed\n')
+    for n in nset:
+        f.write(str(n) + ',\n')
+    f.write('*CLOAD\n')
+    for n in sorted(node_loads):
+        node_load = node_loads[n]
+        v1 = "{:.13E}".format(0.6 * node_load)
+        f.write(str(n) + ',1,' + v1 + '\n')
+        v3 = "{:.13E}".format(0.8 * node_load)
+        f.write(str(n) + ',3,' + v3 + '\n')
+    f.write('*DLOAD\n')
+    for face, fno in pressure_faces:
+        f.write("{},P{},{}\n".format(face, fno, 1.0))
+
+
+def write_blocks(
+    f,
+    elset,
+    nset,
+    node_loads,
+    pressure_faces
+):
+    f.write('*ELSET,ELSET=Eall\n')
+    writer.write_id_lines(f, elset)
+    f.write('*NSET,NSET=Fixed\n')
+    writer.write_id_lines(f, nset)
+    f.write('*CLOAD\n')
+    nodes = sorted(node_loads)
+    writer.write_lines(
+        f,
+        '%d,1,%.13E\n%d,3,%.13E\n',
+        nodes,
+        [0.6 * node_loads[n] for n in nodes],
+        nodes,
+        [0.8 * node_loads[n] for n in nodes]
+    )
+    f.write('*DLOAD\n')
+    face_loads = dict((fno, "P{},{}".format(fno, 1.0)) for fno in range(1, 7))
+    writer.write_lines(
+        f,
+        "%d,%s\n",
+        [face for face, fno in pressure_faces],
+        [face_loads[fno] for face, fno in pressure_faces]
+    )
+
+
+def run_benchmark(
+    element_count=1000000
+):
+    '''writes the blocks line by line and by the bulk block helper,
+    prints the write speed in MB/s and returns the file sizes and times
+    '''
+    blocks = get_blocks(element_count)
+    results = {}
+    for name, write_function, buffer_size in (
+        ('lines', write_blocks_by_lines, -1),
+        ('blocks', write_blocks, writer.write_buffer_size),
+    ):
+        file_name = os.path.join(
+            testtools.get_fem_test_tmp_dir(),
+            'benchmark_ccx_{}.inp'.format(name)
+        )
+        timestart = time.time()
+        f = open(file_name, 'w', buffer_size)
+        write_function(f, *blocks)
+        f.close()
+        write_time = time.time() - timestart
+        size = os.path.getsize(file_name)
+        results[name] = (size, write_time)
+        FreeCAD.Console.PrintMessage(
+            'Writing {} elements by {}: {:.1f} MB in {:.2f} seconds, {:.1f} MB/s\n'
+            .format(element_count, name, size / 1e6, write_time, size / 1e6 / write_time)
+        )
+        os.remove(file_name)
+    return results
+
+##  @}
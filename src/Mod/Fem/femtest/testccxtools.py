@@ -1221,6 +1221,78 @@ class TestCcxTools(unittest.TestCase):
 
         fcc_print('--------------- End of FEM tests FLow 1D thermomech analysis ---------------')
 
+    # ********************************************************************************************
+    def test_6_batch_static_analysis(
+        self
+    ):
+        fcc_print('--------------- Start of FEM ccx batch tests ---------------')
+        from femtools import ccxbatch
+        doc = FreeCAD.open(join(self.test_file_dir, 'cube_static.FCStd'))
+        analysis = doc.Analysis
+        force = doc.FemConstraintForce.Force
+        cases = [
+            {'Name': 'force_{}'.format(i), 'Overrides': {'FemConstraintForce.Force': 100.0 * i}}
+            for i in range(1, 4)
+        ]
+        batch_dir = testtools.get_unit_test_tmp_dir(
+            self.temp_dir,
+            'FEM_ccx_batch'
+        )
+        batch = ccxbatch.FemToolsCcxBatch(
+            cases,
+            analysis,
+            working_dir=batch_dir,
+            max_processes=2,
+            test_mode=True
+        )
+        batch.env['CCX_STUB_RESULTS'] = join(self.test_file_dir, 'cube_static')
+        progress = []
+        batch.progress_callback = lambda case, done, count: progress.append(
+            (case['Name'], case['State'])
+        )
+        batch.run()
+
+        self.assertEqual(
+            [case['State'] for case in cases],
+            ['finished'] * 3,
+            "ccx batch cases did not finish:\n{}".format(batch.print_report())
+        )
+        self.assertEqual(
+            doc.FemConstraintForce.Force,
+            force,
+            "ccx batch did not restore the overridden force."
+        )
+        for i, case in enumerate(cases, 1):
+            inp_file = case['FemTools'].inp_file_name
+            self.assertTrue(
+                '*CLOAD' in open(inp_file).read(),
+                "ccx batch input file {} has no node loads.".format(inp_file)
+            )
+            self.assertEqual(
+                len(case['Results']),
+                1,
+                "ccx batch case {} has no result object.".format(case['Name'])
+            )
+            self.assertTrue(
+                case['Results'][0].Label.startswith(case['Name']),
+                "ccx batch result label {} is unexpected.".format(case['Results'][0].Label)
+            )
+        self.assertTrue(
+            ('force_3', 'finished') in progress,
+            "ccx batch progress callback was not called."
+        )
+
+        # cancel after the first written case
+        batch.progress_callback = lambda case, done, count: batch.cancel()
+        batch.run()
+        self.assertEqual(
+            [case['State'] for case in cases],
+            ['cancelled'] * 3,
+            "ccx batch cases were not cancelled."
+        )
+        FreeCAD.closeDocument(doc.Name)
+        fcc_print('--------------- End of FEM ccx batch tests ---------------')
+
     # ********************************************************************************************
     def tearDown(
         self
@@ -0,0 +1,54 @@
+# ***************************************************************************
+# *   Copyright (c) 2019 - FreeCAD Developers                               *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful,            *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with FreeCAD; if not, write to the Free Software        *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************/
+
+# stub of the CalculiX binary ccx for the unit tests, no FreeCAD modules are used
+# ccx_stub.py -i jobname
+# copies CCX_STUB_RESULTS.frd and CCX_STUB_RESULTS.dat to jobname.frd and jobname.dat
+# CCX_STUB_SLEEP seconds to wait, CCX_STUB_RETURNCODE exit code
+
+import os
+import sys
+import time
+import shutil
+
+
+def main(args):
+    if '-i' not in args or args.index('-i') + 1 >= len(args):
+        print('Usage: ccx_stub.py -i jobname')
+        return 1
+    jobname = args[args.index('-i') + 1].strip()
+    print('CalculiX stub, job {}'.format(jobname))
+    if not os.path.isfile(jobname + '.inp'):
+        print('*ERROR: input file {}.inp does not exist'.format(jobname))
+        return 201
+    time.sleep(float(os.environ.get('CCX_STUB_SLEEP', '0')))
+    results = os.environ.get('CCX_STUB_RESULTS')
+    if results:
+        shutil.copyfile(results + '.frd', jobname + '.frd')
+        shutil.copyfile(results + '.dat', jobname + '.dat')
+    print('Job finished')
+    return int(os.environ.get('CCX_STUB_RETURNCODE', '0'))
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
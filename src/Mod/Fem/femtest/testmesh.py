@@ -202,6 +202,206 @@ class TestMeshCommon(unittest.TestCase):
             )
         )
 
+    # ********************************************************************************************
+    def test_femelement_incidence(
+        self
+    ):
+        from femmesh import meshtools
+        # two hexa8 elements sharing the face 5, 6, 7, 8 and one tetra4 on top
+        femelement_table = {
+            1: [1, 2, 3, 4, 5, 6, 7, 8],
+            2: [5, 6, 7, 8, 9, 10, 11, 12],
+            3: [9, 10, 11, 13],
+        }
+        femnodes_mesh = dict((n, None) for n in range(1, 14))
+        femnodes_ele_table = meshtools.get_femnodes_ele_table(femnodes_mesh, femelement_table)
+        incidence = meshtools.get_femelement_incidence(femelement_table)
+        self.assertTrue(
+            incidence is meshtools.get_femelement_incidence(femelement_table),
+            "Incidence of the same femelement_table was not reused."
+        )
+        for node_set in (
+            [5, 6, 7, 8],
+            [9, 10, 11, 13, 5, 6, 7, 8],
+            range(1, 14),
+        ):
+            bit_pattern_dict = meshtools.get_bit_pattern_dict(
+                femelement_table,
+                femnodes_ele_table,
+                node_set
+            )
+            self.assertEqual(
+                incidence.get_ccxelement_faces(node_set),
+                meshtools.get_ccxelement_faces_from_binary_search(bit_pattern_dict),
+                "Faces of the incidence differ for node set {}.".format(list(node_set))
+            )
+        self.assertEqual(
+            incidence.get_ccxelement_faces([1, 2, 99]),
+            [],
+            "Nodes which are not in the mesh should not give faces."
+        )
+        self.assertEqual(
+            meshtools.get_femelements_by_femnodes_std(femelement_table, [9, 10, 11, 13, 1]),
+            [3],
+            "Elements by femnodes of the incidence are unexpected."
+        )
+        self.assertEqual(
+            incidence.contains_nodes([1, 13, 14]).tolist(),
+            [True, True, False],
+            "Nodes contained in the incidence are unexpected."
+        )
+        femelement_table = dict(femelement_table)
+        del femelement_table[3]
+        self.assertFalse(
+            incidence is meshtools.get_femelement_incidence(femelement_table),
+            "Incidence of a changed femelement_table was reused."
+        )
+
+    # ********************************************************************************************
+    def test_femmesh_reference_cache(
+        self
+    ):
+        from femmesh import meshtools
+        box = self.active_doc.addObject("Part::Box", "Box")
+        box.Length = 12
+        box.Width = 12
+        box.Height = 18
+        self.active_doc.recompute()
+        femmesh = Fem.FemMesh()
+        for i, pt in enumerate(((6, 12, 18), (0, 0, 18), (12, 0, 18), (6, 6, 0))):
+            femmesh.addNode(pt[0], pt[1], pt[2], i + 1)
+        femmesh.addVolume([1, 2, 3, 4])
+        ref = (box, ('Face6',))  # top face z = 18
+        expected_nodes = sorted(meshtools.get_femnodes_by_refshape(femmesh, ref))
+
+        cache = meshtools.femmesh_reference_cache
+        cache.set_femmesh(femmesh)
+        self.assertEqual(
+            sorted(meshtools.get_femnodes_by_refshape(femmesh, ref)),
+            expected_nodes,
+            "Nodes of the reference cache differ from the searched nodes."
+        )
+        self.assertEqual(
+            len(cache.results),
+            1,
+            "Reference nodes were not added to the reference cache."
+        )
+        meshtools.get_femnodes_by_refshape(femmesh, ref)
+        self.assertEqual(
+            len(cache.results),
+            1,
+            "Reference nodes were searched again."
+        )
+        # same content, another mesh
+        cache.set_femmesh(Fem.FemMesh(femmesh))
+        self.assertEqual(
+            len(cache.results),
+            1,
+            "Reference cache was cleared for a mesh with the same content."
+        )
+        femmesh.addNode(6, 0, 18, 5)
+        cache.set_femmesh(femmesh)
+        self.assertEqual(
+            len(cache.results),
+            0,
+            "Reference cache was not cleared for a changed mesh."
+        )
+        cache.clear()
+
+    # ********************************************************************************************
+    def test_femmesh_node_grid(
+        self
+    ):
+        from femmesh import meshtools
+        box = self.active_doc.addObject("Part::Box", "Box")
+        box.Length = 12
+        box.Width = 12
+        box.Height = 18
+        self.active_doc.recompute()
+        femmesh = Fem.FemMesh()
+        nid = 1
+        for x in range(0, 13, 3):
+            for y in range(0, 13, 3):
+                for z in range(0, 19, 3):
+                    femmesh.addNode(x, y, z, nid)
+                    nid += 1
+        grid = meshtools.FemMeshNodeGrid(femmesh)
+        shape = box.Shape
+        for vertex in shape.Vertexes:
+            self.assertEqual(
+                grid.get_nodes_by_shape(vertex),
+                sorted(femmesh.getNodesByVertex(vertex)),
+                "Node grid vertex nodes differ from the mesh vertex nodes."
+            )
+        for edge in shape.Edges:
+            self.assertEqual(
+                grid.get_nodes_by_shape(edge),
+                sorted(femmesh.getNodesByEdge(edge)),
+                "Node grid edge nodes differ from the mesh edge nodes."
+            )
+        for face in shape.Faces:
+            self.assertEqual(
+                grid.get_nodes_by_shape(face),
+                sorted(femmesh.getNodesByFace(face)),
+                "Node grid face nodes differ from the mesh face nodes."
+            )
+        self.assertEqual(
+            grid.get_nodes_by_shape(shape.Solids[0]),
+            sorted(femmesh.getNodesBySolid(shape.Solids[0])),
+            "Node grid solid nodes differ from the mesh solid nodes."
+        )
+        for i, face in enumerate(shape.Faces):
+            self.assertEqual(
+                meshtools.find_element_in_shape(shape, face),
+                'Face' + str(i + 1),
+                "Face was not found in the shape element index."
+            )
+        self.assertEqual(
+            meshtools.get_vertexes_by_element(shape, shape.Edges[0]),
+            [0, 1],
+            "Vertexes of the first edge are unexpected."
+        )
+
+    # ********************************************************************************************
+    def test_compact_mesh(
+        self
+    ):
+        from femmesh import meshtools
+        femmesh = Fem.FemMesh()
+        for nid, pt in ((3, (0, 0, 0)), (7, (1, 0, 0)), (8, (0, 1, 0)), (20, (0, 0, 1))):
+            femmesh.addNode(pt[0], pt[1], pt[2], nid)
+        femmesh.addFace([3, 7, 8], 5)
+        femmesh.addVolume([3, 7, 8, 20], 11)
+        self.assertFalse(
+            meshtools.is_compact_femmesh(femmesh),
+            "Mesh with gaps in the ids is reported as compact."
+        )
+        new_mesh, node_map, elem_map = meshtools.compact_mesh(femmesh)
+        self.assertEqual(
+            node_map,
+            {3: 1, 7: 2, 8: 3, 20: 4},
+            "Node map of the compacted mesh is unexpected."
+        )
+        self.assertEqual(
+            elem_map,
+            {5: 1, 11: 2},
+            "Element map of the compacted mesh is unexpected."
+        )
+        self.assertEqual(
+            new_mesh.getElementNodes(2),
+            (1, 2, 3, 4),
+            "Volume nodes of the compacted mesh are unexpected."
+        )
+        self.assertEqual(
+            new_mesh.getNodeById(4),
+            FreeCAD.Vector(0, 0, 1),
+            "Node of the compacted mesh is unexpected."
+        )
+        self.assertTrue(
+            meshtools.is_compact_femmesh(new_mesh),
+            "Compacted mesh is not reported as compact."
+        )
+
     # ********************************************************************************************
     def tearDown(
         self
@@ -269,6 +269,154 @@ class TestResult(unittest.TestCase):
             "Values of read npressure result data are unexpected"
         )
 
+    # ********************************************************************************************
+    def test_read_frd_numpy_reader(
+        self
+    ):
+        # the numpy block reader has to return exactly the data of the line by line reader
+        from feminout.importCcxFrdResults import read_frd_result as read_frd
+        from feminout.readCcxFrd import read_frd_result as read_frd_numpy
+        for frd_name in (
+            'cube_frequency.frd',
+            'cube_static.frd',
+            'Flow1D_thermomech.frd',
+            'spine_thermomech.frd'
+        ):
+            frd_file = join(testtools.get_fem_test_home_dir(), 'ccx', frd_name)
+            frd_content = read_frd(frd_file)
+            frd_content_numpy = read_frd_numpy(frd_file)
+            self.assertEqual(
+                sorted(frd_content_numpy.keys()),
+                sorted(frd_content.keys()),
+                "Keys of numpy read frd data are unexpected: {}".format(frd_name)
+            )
+            for key in frd_content:
+                if key == 'Results':
+                    continue
+                self.assertEqual(
+                    frd_content_numpy[key],
+                    frd_content[key],
+                    "Values of numpy read {} data are unexpected: {}".format(key, frd_name)
+                )
+            self.assertEqual(
+                len(frd_content_numpy['Results']),
+                len(frd_content['Results']),
+                "Number of numpy read result sets is unexpected: {}".format(frd_name)
+            )
+            for result_numpy, result in zip(frd_content_numpy['Results'], frd_content['Results']):
+                # number and time might be NaN, which is never equal
+                self.assertEqual(
+                    sorted(result_numpy.keys()),
+                    sorted(result.keys()),
+                    "Keys of numpy read result set are unexpected: {}".format(frd_name)
+                )
+                for key in result:
+                    if key in ('number', 'time'):
+                        self.assertEqual(
+                            str(result_numpy[key]),
+                            str(result[key]),
+                            "Numpy read {} is unexpected: {}".format(key, frd_name)
+                        )
+                    else:
+                        self.assertEqual(
+                            result_numpy[key],
+                            result[key],
+                            "Values of numpy read {} results are unexpected: {}"
+                            .format(key, frd_name)
+                        )
+
+    # ********************************************************************************************
+    def test_read_frd_result_sets(
+        self
+    ):
+        # random access to single result sets of the frd file
+        frd_file = join(testtools.get_fem_test_home_dir(), 'ccx', 'Flow1D_thermomech.frd')
+        from feminout.importCcxFrdResults import read_frd_result as read_frd
+        from feminout.readCcxFrd import FrdResultFile
+        frd_content = read_frd(frd_file)
+        frd = FrdResultFile(frd_file)
+        self.assertEqual(
+            len(frd),
+            len(frd_content['Results']),
+            "Number of indexed result sets is unexpected"
+        )
+        self.assertEqual(
+            frd.find_result_set(),
+            12,
+            "Index of the last result set is unexpected"
+        )
+        self.assertEqual(
+            frd.find_result_set(step_time=0.0136),
+            2,
+            "Index of the result set nearest to the time is unexpected"
+        )
+        self.assertEqual(
+            sorted(frd.result_sets[12]['fields'].keys()),
+            ['mflow', 'npressure'],
+            "Indexed result fields are unexpected"
+        )
+        self.assertEqual(
+            frd.get_result_field(12, 'mflow'),
+            frd_content['Results'][12]['mflow'],
+            "Values of the random access mflow result are unexpected"
+        )
+        self.assertEqual(
+            frd[5]['npressure'],
+            frd_content['Results'][5]['npressure'],
+            "Values of the random access npressure result are unexpected"
+        )
+        frd.close()
+
+    # ********************************************************************************************
+    def test_read_frd_result_cache(
+        self
+    ):
+        # the binary cache has to return exactly the data of the frd file
+        import os
+        import shutil
+        from feminout import readCcxFrd
+        cache_dir = testtools.get_unit_test_tmp_dir(
+            testtools.get_fem_test_tmp_dir(),
+            'FEM_frd_cache'
+        )
+        for frd_name in ('Flow1D_thermomech', 'cube_frequency'):
+            for suffix in ('.frd', '_inout_nodes.txt'):
+                source_file = join(testtools.get_fem_test_home_dir(), 'ccx', frd_name + suffix)
+                if os.path.exists(source_file):
+                    shutil.copy(source_file, cache_dir)
+            frd_file = join(cache_dir, frd_name + '.frd')
+            frd_content = readCcxFrd.read_frd_result(frd_file)
+            frd_content_cached = readCcxFrd.read_frd_result(frd_file, use_cache=True)
+            cache = readCcxFrd.open_frd_cache(frd_file)
+            self.assertTrue(
+                cache is not None,
+                "Frd result cache was not written: {}".format(frd_name)
+            )
+            cache.close()
+            frd_content_from_cache = readCcxFrd.read_frd_result(frd_file, use_cache=True)
+            for content in (frd_content_cached, frd_content_from_cache):
+                for key in frd_content:
+                    if key == 'Results':
+                        continue
+                    self.assertEqual(
+                        content[key],
+                        frd_content[key],
+                        "Values of cached {} data are unexpected: {}".format(key, frd_name)
+                    )
+                for result_cached, result in zip(content['Results'], frd_content['Results']):
+                    self.assertEqual(
+                        str(result_cached),
+                        str(result),
+                        "Cached result set is unexpected: {}".format(frd_name)
+                    )
+            # a changed frd file invalidates the cache
+            with open(frd_file, 'a') as f:
+                f.write('\n')
+            self.assertTrue(
+                readCcxFrd.open_frd_cache(frd_file) is None,
+                "Frd result cache of a changed frd file was used: {}".format(frd_name)
+            )
+
     # ********************************************************************************************
     def get_stress_values(
         self
@@ -332,6 +480,42 @@ class TestResult(unittest.TestCase):
             "Calculated principal stresses are not the expected values."
         )
 
+    # ********************************************************************************************
+    def test_stress_arrays(
+        self
+    ):
+        # the batched versions give the same values as the single node versions
+        # a node with NaN values gets NaN principal stresses
+        import numpy as np
+        from femresult.resulttools import calculate_von_mises_array as vm
+        from femresult.resulttools import calculate_principal_stress_array as pr
+        stress = np.array([
+            self.get_stress_values(),
+            (1.0, 2.0, 3.0, 0.0, 0.0, 0.0),
+            (float('NaN'), 1.0, 1.0, 1.0, 1.0, 1.0)
+        ])
+        mises = vm(stress)
+        prin = pr(stress)
+        self.assertEqual(
+            (round(mises[0], 4), round(mises[1], 4)),
+            (283.2082, 1.7321),
+            "Calculated von Mises stress array is not the expected values."
+        )
+        self.assertEqual(
+            tuple(np.round(prin[0], 4)),
+            (-178.0076, -194.0749, -468.9075, 145.4499),
+            "Calculated principal stress array is not the expected values."
+        )
+        self.assertEqual(
+            tuple(np.round(prin[1], 4)),
+            (3.0, 2.0, 1.0, 1.0),
+            "Calculated principal stress array is not the expected values."
+        )
+        self.assertTrue(
+            np.all(np.isnan(prin[2])),
+            "Principal stresses of NaN stress values are not NaN."
+        )
+
     # ********************************************************************************************
     def test_disp_abs(
         self
@@ -0,0 +1,349 @@
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2019 - FreeCAD Developers                               *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+__title__ = "FemToolsCcxBatch"
+__author__ = "FreeCAD Developers"
+__url__ = "http://www.freecadweb.org"
+
+## \addtogroup FEM
+#  @{
+
+'''
+Run many CalculiX cases (load cases, parameter studies) of one or more analyses.
+The input files are written one after the other, because the writer works on the
+document. The ccx processes run in parallel on a bounded pool. The results are
+loaded into the analyses after all processes have finished.
+
+cases = [
+    {'Name': 'force_500', 'Overrides': {'FemConstraintForce.Force': 500.0}},
+    {'Name': 'force_900', 'Overrides': {'FemConstraintForce.Force': 900.0}},
+]
+from femtools import ccxbatch
+batch = ccxbatch.FemToolsCcxBatch(cases, analysis=App.ActiveDocument.Analysis)
+batch.run()
+'''
+
+import os
+import sys
+import time
+import subprocess
+
+import FreeCAD
+from femtools import ccxtools
+
+
+class FemToolsCcxBatch(object):
+
+    ## The constructor
+    #  @param cases list of case dicts, keys: 'Name' and optional 'Analysis', 'Solver',
+    #  'Overrides' ({'ObjectName.PropertyName': value, ...}) set only for writing the case
+    #  @param analysis, solver used for the cases without 'Analysis' and 'Solver'
+    #  @param working_dir every case is written into its own sub directory 'Name'
+    #  @param max_processes number of parallel ccx processes, default is
+    #  the number of cpu's divided by the OpenMP threads of one ccx process
+    #  @param test_mode use the ccx stub of the unit tests instead of ccx
+    def __init__(
+        self,
+        cases,
+        analysis=None,
+        solver=None,
+        working_dir=None,
+        max_processes=None,
+        test_mode=False
+    ):
+        self.cases = cases
+        self.analysis = analysis
+        self.solver = solver
+        self.working_dir = working_dir
+        self.test_mode = test_mode
+        self.ccx_prefs = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/Fem/Ccx")
+        self.omp_num_threads = get_omp_num_threads(self.ccx_prefs)
+        if max_processes:
+            self.max_processes = max_processes
+        else:
+            import multiprocessing
+            self.max_processes = max(1, multiprocessing.cpu_count() // self.omp_num_threads)
+        ## @var env
+        #  additional environment of the ccx processes
+        self.env = {}
+        ## @var progress_callback
+        #  called with (case, count of finished cases, count of cases) on every state change
+        self.progress_callback = None
+        self.cancelled = False
+        self.ccx_command = []
+
+    ## Stops the run, running ccx processes are terminated, no new ones are started.
+    # Could be called from a progress_callback or from another thread.
+    #  @param self The python object self
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        self.cancelled = False
+        for case in self.cases:
+            case['State'] = 'waiting'
+            case['ReturnCode'] = None
+            case['WriteTime'] = 0.0
+            case['RunTime'] = 0.0
+            case['LoadTime'] = 0.0
+            case['Results'] = []
+        self.setup_ccx_command()
+        self.write_inp_files()
+        self.run_ccx_processes()
+        self.load_results()
+        self.print_report()
+        return self.cases
+
+    def set_state(self, case, state):
+        case['State'] = state
+        if self.progress_callback:
+            finished = [c for c in self.cases if c['State'] in ('finished', 'failed', 'cancelled')]
+            self.progress_callback(case, len(finished), len(self.cases))
+
+    def setup_ccx_command(self):
+        if self.test_mode:
+            from femtest import utilstest
+            self.ccx_command = [
+                get_python_executable(),
+                os.path.join(utilstest.get_fem_test_home_dir(), 'ccx', 'ccx_stub.py')
+            ]
+        else:
+            fea = ccxtools.FemToolsCcx(
+                self.cases[0].get('Analysis', self.analysis),
+                self.cases[0].get('Solver', self.solver)
+            )
+            fea.setup_ccx()
+            self.ccx_command = [fea.ccx_binary]
+
+    def write_inp_files(self):
+        for case in self.cases:
+            if self.cancelled:
+                self.set_state(case, 'cancelled')
+                continue
+            timestart = time.time()
+            fea = ccxtools.FemToolsCcx(
+                case.get('Analysis', self.analysis),
+                case.get('Solver', self.solver),
+                test_mode=True
+            )
+            case['FemTools'] = fea
+            if self.working_dir:
+                case_dir = os.path.join(self.working_dir, case['Name'])
+            else:
+                from femtools import femutils
+                case_dir = os.path.join(femutils.get_pref_working_dir(fea.solver), case['Name'])
+            if not os.path.isdir(case_dir):
+                os.makedirs(case_dir)
+            old_values = {}
+            try:
+                set_overrides(fea.analysis.Document, case.get('Overrides', {}), old_values)
+                fea.update_objects()
+                fea.setup_working_dir(case_dir)
+                message = fea.check_prerequisites()
+                if not message:
+                    fea.write_inp_file()
+            except Exception as e:
+                message = str(e)
+            finally:
+                set_overrides(fea.analysis.Document, old_values)
+            if message:
+                FreeCAD.Console.PrintError(
+                    "Case {} was not written:\n{}\n".format(case['Name'], message)
+                )
+            case['WriteTime'] = time.time() - timestart
+            if message or not getattr(fea, 'inp_file_name', ''):
+                self.set_state(case, 'failed')
+            else:
+                self.set_state(case, 'written')
+
+    def run_ccx_processes(self):
+        env = dict(os.environ)
+        env.update(self.env)
+        env['OMP_NUM_THREADS'] = str(self.omp_num_threads)
+        waiting = [case for case in self.cases if case['State'] == 'written']
+        running = []
+        try:
+            while waiting or running:
+                if self.cancelled:
+                    for case, process, timestart in running:
+                        stop_process(process)
+                        case['RunTime'] = time.time() - timestart
+                        self.set_state(case, 'cancelled')
+                    for case in waiting:
+                        self.set_state(case, 'cancelled')
+                    break
+                while waiting and len(running) < self.max_processes:
+                    case = waiting.pop(0)
+                    running.append((case, self.start_ccx(case, env), time.time()))
+                    self.set_state(case, 'running')
+                still_running = []
+                for case, process, timestart in running:
+                    ret_code = process.poll()
+                    if ret_code is None:
+                        still_running.append((case, process, timestart))
+                        continue
+                    case['RunTime'] = time.time() - timestart
+                    case['ReturnCode'] = ret_code
+                    for out_file in case['OutFiles']:
+                        out_file.close()
+                    if ret_code == 201 and case['FemTools'].solver.AnalysisType == 'check':
+                        # see FemToolsCcx.ccx_run, wrong exit code for *NOANALYSIS
+                        case['ReturnCode'] = 0
+                    self.set_state(case, 'finished' if case['ReturnCode'] == 0 else 'failed')
+                running = still_running
+                if running:
+                    time.sleep(0.05)
+        finally:
+            # on cancel or on an exception (KeyboardInterrupt too) no ccx is left running
+            for case, process, timestart in running:
+                stop_process(process)
+                for out_file in case['OutFiles']:
+                    out_file.close()
+
+    def start_ccx(self, case, env):
+        # ccx output goes into files, pipes could block while other processes are polled
+        inp_file_name = case['FemTools'].inp_file_name
+        case_dir, inp_name = os.path.split(inp_file_name)
+        base_name = os.path.splitext(inp_name)[0]
+        case['OutFiles'] = (
+            open(os.path.join(case_dir, base_name + '_ccx_stdout.txt'), 'w'),
+            open(os.path.join(case_dir, base_name + '_ccx_stderr.txt'), 'w'),
+        )
+        startup_info = None
+        if sys.platform == 'win32':
+            # Windows workaround to avoid blinking terminal window
+            startup_info = subprocess.STARTUPINFO()
+            startup_info.dwFlags = subprocess.STARTF_USESHOWWINDOW
+        try:
+            return subprocess.Popen(
+                self.ccx_command + ['-i', base_name],
+                cwd=case_dir,
+                stdout=case['OutFiles'][0],
+                stderr=case['OutFiles'][1],
+                env=env,
+                shell=False,
+                startupinfo=startup_info
+            )
+        except Exception:
+            for out_file in case['OutFiles']:
+                out_file.close()
+            raise
+
+    def load_results(self):
+        for case in self.cases:
+            if case['State'] != 'finished':
+                continue
+            timestart = time.time()
+            fea = case['FemTools']
+            old_members = set(m.Name for m in fea.analysis.Group)
+            try:
+                fea.load_results()
+            except Exception as e:
+                FreeCAD.Console.PrintError(
+                    'Loading results of case {} failed: {}\n'.format(case['Name'], e)
+                )
+                self.set_state(case, 'failed')
+                continue
+            for m in fea.analysis.Group:
+                if m.Name not in old_members:
+                    m.Label = case['Name'] + '_' + m.Label
+                    case['Results'].append(m)
+            case['LoadTime'] = time.time() - timestart
+
+    ## Prints the per case wall time report and returns it as string.
+    #  @param self The python object self
+    def print_report(self):
+        report = (
+            'CalculiX batch, {} cases, {} parallel processes, {} OpenMP threads each\n'
+            '{:<24}{:>10}{:>10}{:>10}{:>10}  {}\n'
+            .format(
+                len(self.cases), self.max_processes, self.omp_num_threads,
+                'case', 'write [s]', 'ccx [s]', 'load [s]', 'return', 'state'
+            )
+        )
+        for case in self.cases:
+            report += '{:<24}{:>10.2f}{:>10.2f}{:>10.2f}{:>10}  {}\n'.format(
+                case['Name'],
+                case['WriteTime'],
+                case['RunTime'],
+                case['LoadTime'],
+                '' if case['ReturnCode'] is None else case['ReturnCode'],
+                case['State']
+            )
+        FreeCAD.Console.PrintMessage(report)
+        return report
+
+
+# ************************************************************************************************
+def set_overrides(
+    doc,
+    overrides,
+    old_values=None
+):
+    '''sets {'ObjectName.PropertyName': value} and returns the old values,
+    the old value of every override is put into old_values as soon as it is set,
+    thus after an exception old_values holds just the overrides to restore'''
+    if old_values is None:
+        old_values = {}
+    for key in overrides:
+        obj_name, prop = key.split('.', 1)
+        obj = doc.getObject(obj_name)
+        if obj is None:
+            raise Exception('FEM: Object {} of override {} not found.'.format(obj_name, key))
+        old_value = getattr(obj, prop)
+        setattr(obj, prop, overrides[key])
+        old_values[key] = old_value
+    if overrides:
+        doc.recompute()
+    return old_values
+
+
+def stop_process(
+    process
+):
+    if process.poll() is None:
+        process.terminate()
+        process.wait()
+
+
+def get_omp_num_threads(
+    ccx_prefs
+):
+    # OMP_NUM_THREADS of the environment wins over the FEM preferences
+    try:
+        return max(1, int(os.environ.get('OMP_NUM_THREADS', '')))
+    except ValueError:
+        return max(1, ccx_prefs.GetInt("AnalysisNumCPUs", 1))
+
+
+def get_python_executable():
+    # inside FreeCAD sys.executable might be the FreeCAD binary
+    if 'python' in os.path.basename(sys.executable).lower():
+        return sys.executable
+    from distutils.spawn import find_executable
+    for name in ('python3', 'python'):
+        python_exe = find_executable(name)
+        if python_exe:
+            return python_exe
+    return sys.executable
+
+##  @}
@@ -26,6 +26,8 @@
 
 
 import PathScripts.PathOp as PathOp
+import PathScripts.PathPreferences as PathPreferences
+import PathScripts.PathResultCache as PathResultCache
 import PathScripts.PathUtils as PathUtils
 import Path
 import FreeCAD
@@ -39,6 +41,9 @@ from pivy import coin
 
 __doc__ = "Class and implementation of the Adaptive path operation."
 
+# increment if the results of area.Adaptive2d for the same input change
+CacheVersion = 1
+
 def convertTo2d(pathArray):
     output = []
     for path in pathArray:
@@ -306,6 +311,13 @@ def GenerateGCode(op,obj,adaptiveResults, helixDiameter):
 
     lz = z
 
+def resultCache():
+    '''resultCache() ... the cache of adaptive results of all documents, None if it's disabled.'''
+    size = PathPreferences.adaptiveCacheSize()
+    if size <= 0:
+        return None
+    return PathResultCache.ResultCache(PathPreferences.adaptiveCacheDirectory(), size * 1024 * 1024)
+
 def Execute(op,obj):
     global sceneGraph
     global topZ
@@ -406,6 +418,15 @@ def Execute(op,obj):
              inputStateChanged = True
              adaptiveResults = None
 
+        # the same input might have been calculated before, in any document
+        cache = resultCache()
+        cacheKey = {"version": CacheVersion, "input": inputStateObject}
+        if cache is not None and (inputStateChanged or adaptiveResults == None):
+            adaptiveResults = cache.get(cacheKey)
+            if adaptiveResults is not None:
+                Console.PrintMessage("*** Using cached adaptive result\n")
+                inputStateChanged = False
+
         # progress callback fn, if return true it will stop processing
         def progressFn(tpaths):
             for path in tpaths: #path[0] contains the MotionType, #path[1] contains list of points
@@ -444,6 +465,11 @@ def Execute(op,obj):
                     "AdaptivePaths": result.AdaptivePaths,
                     "ReturnMotionType": result.ReturnMotionType })
 
+            if cache is not None and not obj.StopProcessing:
+                try:
+                    cache.put(cacheKey, adaptiveResults)
+                except (IOError, OSError) as e:
+                    Console.PrintWarning("*** Adaptive result not cached: %s\n" % e)
 
         # GENERATE
         GenerateGCode(op,obj,adaptiveResults,helixDiameter)
@@ -69,8 +69,17 @@ class ObjectOp(PathOp.ObjectOp):
         '''initOperation(obj) ... adds Disabled properties and calls initCircularHoleOperation(obj).
         Do not overwrite, implement initCircularHoleOperation(obj) instead.'''
         obj.addProperty("App::PropertyStringList", "Disabled", "Base", QtCore.QT_TRANSLATE_NOOP("Path", "List of disabled features"))
+        self.addOrderOptimizationTime(obj)
         self.initCircularHoleOperation(obj)
 
+    def addOrderOptimizationTime(self, obj):
+        obj.addProperty("App::PropertyFloat", "OrderOptimizationTime", "Base", QtCore.QT_TRANSLATE_NOOP("Path", "Seconds spent shortening the rapid moves between the holes, 0 only sorts them by nearest neighbour"))
+
+    def opOnDocumentRestored(self, obj):
+        '''opOnDocumentRestored(obj) ... adds the OrderOptimizationTime property to operations created without it.'''
+        if not hasattr(obj, 'OrderOptimizationTime'):
+            self.addOrderOptimizationTime(obj)
+
     def initCircularHoleOperation(self, obj):
         '''initCircularHoleOperation(obj) ... overwrite if the subclass needs initialisation.
         Can safely be overwritten by subclasses.'''
@@ -174,8 +183,14 @@ class ObjectOp(PathOp.ObjectOp):
                 holes.append({'x': location.x, 'y': location.y, 'r': 0})
 
         if len(holes) > 0:
+            holes = self.sortHoles(obj, holes)
             self.circularHoleExecute(obj, holes)
 
+    def sortHoles(self, obj, holes):
+        '''sortHoles(obj, holes) ... return the holes in the order they are processed.
+        Can safely be overwritten by subclasses.'''
+        return PathUtils.sort_jobs(holes, ['x', 'y'], timeLimit=obj.OrderOptimizationTime)
+
     def circularHoleExecute(self, obj, holes):
         '''circularHoleExecute(obj, holes) ... implement processing of holes.
         holes is a list of dictionaries with 'x', 'y' and 'r' specified for each hole.
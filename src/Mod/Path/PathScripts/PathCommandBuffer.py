@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2019 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import Path
+import PathScripts.PathStatistics as PathStatistics
+import numpy
+import re
+
+__title__ = "PathCommandBuffer - path commands as arrays"
+__author__ = "FreeCAD Developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "The commands of a path as NumPy arrays, for scripts and dressups processing all commands at once."
+
+# A buffer is created from the G-code of a path, which Path.Path generates and
+# parses without creating a Python object per command:
+#   buf = CommandBuffer.fromPath(obj.Path)
+#   rapid = buf.isCommand('G0', 'G00')
+#   z = buf.column('Z')
+#   buf.values[:, buf.index('Z')] = numpy.where(rapid, ..., ...)
+#   obj.Path = buf.toPath()
+#
+# Parameter values have the precision of the G-code, 6 decimals. Command names
+# are normalized, a G00 becomes a G0. Comments are kept, commands which are
+# neither a letter followed by a number nor a comment are dropped. Every letter
+# can be a parameter but G, M, N and O, a line with one of them after its command
+# raises a ValueError, it can't be represented without losing the word.
+
+Columns = PathStatistics.Columns + 'ABCSTHDLEUVW'
+Unsupported = 'GMNO'  # letters which can't be parameters
+Modal = 'XYZABCF'   # parameters keeping their value until they're set again
+
+
+class CommandBuffer(object):
+    '''CommandBuffer(letters, numbers, values, comments=None) ... commands as arrays, one row per command.
+    letters and numbers are the commands, e.g. ord('G') and 1.0 for a G1, 0 and NaN for a comment.
+    values are the parameters in Columns, NaN where a parameter isn't set, comments the texts of the comments by row.'''
+
+    def __init__(self, letters, numbers, values, comments=None):
+        self.letters = letters
+        self.numbers = numbers
+        self.values = values
+        self.comments = comments if comments is not None else {}
+
+    @classmethod
+    def fromGCode(cls, gcode):
+        '''fromGCode(gcode) ... return the buffer of the G-code text with one command per line.'''
+        letters, numbers, values = PathStatistics.gcodeArrays(gcode, Columns + Unsupported)
+        rows, cols = numpy.nonzero(~numpy.isnan(values[:, len(Columns):]))
+        if len(rows):
+            raise ValueError("line {}: the {} word after the command isn't supported".format(rows[0] + 1, Unsupported[cols[0]]))
+        values = values[:, :len(Columns)].copy()
+        comments = {}
+        starts = [m.start() for m in re.finditer(r'^\(.*$', gcode, re.M)]
+        if starts:
+            lineEnds = numpy.nonzero(numpy.frombuffer(gcode.encode('ascii', 'replace'), dtype=numpy.uint8) == 10)[0]
+            for row, start in zip(numpy.searchsorted(lineEnds, starts).tolist(), starts):
+                end = gcode.find('\n', start)
+                comments[row] = gcode[start:end if end >= 0 else len(gcode)]
+        return cls(letters, numbers, values, comments)
+
+    @classmethod
+    def fromPath(cls, path):
+        '''fromPath(path) ... return the buffer of path, a Path.Path or a list of commands.'''
+        if hasattr(path, 'toGCode'):
+            return cls.fromGCode(path.toGCode())
+        return cls.fromGCode(''.join(c.toGCode() + '\n' for c in path))
+
+    @classmethod
+    def fromArrays(cls, names, **columns):
+        '''fromArrays(names, **columns) ... return the buffer of the commands names, a list of names or a single
+        name for all rows, with the parameters given as arrays by column name, NaN where a parameter isn't set.'''
+        rows = None
+        for values in columns.values():
+            rows = len(values)
+        if isinstance(names, str):
+            if rows is None:
+                raise ValueError("a single command name needs parameters")
+            names = [names]
+            inverse = numpy.zeros(rows, dtype=int)
+        else:
+            names, inverse = numpy.unique(numpy.asarray(names, dtype=str), return_inverse=True)
+            names = names.tolist()
+            inverse = inverse.reshape(-1)
+            rows = len(inverse)
+        codes = []
+        comments = {}
+        for k, name in enumerate(names):
+            if name.startswith('('):
+                codes.append((0, numpy.nan))
+                for row in numpy.nonzero(inverse == k)[0].tolist():
+                    comments[row] = name
+            else:
+                codes.append((ord(name[0].upper()), float(name[1:])))
+        letters = numpy.array([c[0] for c in codes], dtype=numpy.uint8)[inverse]
+        numbers = numpy.array([c[1] for c in codes], dtype=float)[inverse]
+        values = numpy.full((rows, len(Columns)), numpy.nan)
+        for name, column in columns.items():
+            values[:, Columns.index(name)] = column
+        return cls(letters, numbers, values, comments)
+
+    def __len__(self):
+        return len(self.letters)
+
+    def index(self, name):
+        '''index(name) ... return the column of parameter name in values.'''
+        return Columns.index(name)
+
+    def names(self):
+        '''names() ... return the list of the command names.'''
+        key = self.letters.astype(float) * 1e6 + numpy.where(numpy.isnan(self.numbers), -1, self.numbers)
+        codes, inverse = numpy.unique(key, return_inverse=True)
+        first = numpy.zeros(len(codes), dtype=int)
+        first[inverse[::-1]] = numpy.arange(len(inverse))[::-1]
+        names = numpy.array(['' if self.letters[i] == 0 else chr(self.letters[i]) + ('%g' % self.numbers[i]) for i in first.tolist()], dtype=object)[inverse]
+        for row, text in self.comments.items():
+            names[row] = text
+        return names.tolist()
+
+    def isCommand(self, *names):
+        '''isCommand(*names) ... return the mask of the rows with one of the commands names, e.g. isCommand('G0', 'G00').'''
+        mask = numpy.zeros(len(self), dtype=bool)
+        for name in names:
+            mask |= (self.letters == ord(name[0].upper())) & (self.numbers == float(name[1:]))
+        return mask
+
+    def parameter(self, name):
+        '''parameter(name) ... return the values of parameter name as set by the commands, NaN where it isn't set.'''
+        return self.values[:, Columns.index(name)]
+
+    def column(self, name, initial=numpy.nan):
+        '''column(name, initial=numpy.nan) ... return the values of parameter name in effect for every command,
+        the modal parameters, e.g. X, Y, Z and F, carry their last value starting with initial, the others are 0 where not set.'''
+        values = self.parameter(name)
+        if name in Modal:
+            return PathStatistics._carryForward(values[:, None], [initial])[1:, 0]
+        return numpy.nan_to_num(values)
+
+    def positions(self, start=(numpy.nan, numpy.nan, numpy.nan)):
+        '''positions(start=(nan, nan, nan)) ... return the (n, 3) array of the X, Y and Z in effect for every command.'''
+        return PathStatistics._carryForward(self.values[:, :3], start)[1:]
+
+    def select(self, rows):
+        '''select(rows) ... return the buffer of the commands at rows, a mask or an array of indexes.'''
+        rows = numpy.arange(len(self))[rows]
+        comments = {}
+        if self.comments:
+            for k, row in enumerate(rows.tolist()):
+                if row in self.comments:
+                    comments[k] = self.comments[row]
+        return CommandBuffer(self.letters[rows], self.numbers[rows], self.values[rows], comments)
+
+    @classmethod
+    def concatenate(cls, buffers):
+        '''concatenate(buffers) ... return the buffer of the commands of all buffers.'''
+        comments = {}
+        offset = 0
+        for b in buffers:
+            for row, text in b.comments.items():
+                comments[row + offset] = text
+            offset += len(b)
+        return cls(numpy.concatenate([b.letters for b in buffers]), numpy.concatenate([b.numbers for b in buffers]), numpy.vstack([b.values for b in buffers]), comments)
+
+    def toGCode(self, precision=6):
+        '''toGCode(precision=6) ... return the G-code text of the commands, one per line.'''
+        if not len(self):
+            return ''
+        lines = numpy.array(self.names(), dtype=object)
+        for j, name in enumerate(Columns):
+            rows = numpy.nonzero(~numpy.isnan(self.values[:, j]))[0]
+            if len(rows):
+                form = ' ' + name + '%.' + str(precision) + 'f'
+                col = numpy.full(len(self), '', dtype=object)
+                col[rows] = [form % v for v in self.values[rows, j].tolist()]
+                lines = lines + col
+        return '\n'.join(lines.tolist()) + '\n'
+
+    def toPath(self):
+        '''toPath() ... return a Path.Path of the commands.'''
+        return Path.Path(self.toGCode())
@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2019 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+
+import PathScripts.PathDropCutter as PathDropCutter
+import PathScripts.PathLog as PathLog
+import PathScripts.PathUtil as PathUtil
+import math
+import numpy
+
+__title__ = "PathDexelSim - height field stock simulation"
+__author__ = "FreeCAD Developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Simulation of the material removal of paths on a height field of the stock, without GUI."
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+
+# The stock is a grid of columns (dexels) from its bottom up to the height of its
+# top surface. A move lowers the columns within reach of the cutter to the lowest
+# height of the bottom of the cutter swept along the move, computed for all the
+# columns around the move at once:
+#  - a horizontal move cuts at its height plus the profile of the cutter at the
+#    distance of the column from the move,
+#  - on an inclined move the lowest point is the highest contact of the cutter
+#    upside down with the move as an edge, PathDropCutter.edgeDrop has a closed
+#    form for ball and flat cutters and a golden section search for the others.
+# Arcs are split into chords deviating less than a quarter of a column, canned
+# drill cycles into their moves.
+#
+# The columns are compared with a height field of the model, a column cut below
+# the model is a gouge. Material removed by a rapid move is a collision. Both are
+# reported with the command which caused them.
+#
+#   sim = Simulation(DexelStock.fromBoundBox(job.Stock.Shape.BoundBox, 0.1), modelHeights)
+#   sim.setTool(tc.Tool); sim.applyPath(op.Path, op.Label)
+#   sim.gouges, sim.collisions, sim.stock.mesh()
+
+Tolerance = 0.001
+
+
+def cutterForTool(tool):
+    '''cutterForTool(tool) ... return the PathDropCutter cutter with the profile of tool, like the 3D Surface op.'''
+    diameter = float(tool.Diameter)
+    length = float(tool.CuttingEdgeHeight) + float(tool.LengthOffset)
+    flatRadius = float(tool.FlatRadius)
+    if tool.ToolType == 'BallEndMill' and flatRadius == 0.0:
+        return PathDropCutter.BallCutter(diameter, diameter / 2 + float(tool.LengthOffset))
+    if tool.ToolType == 'BallEndMill':
+        return PathDropCutter.BullCutter(diameter, flatRadius, length)
+    if tool.ToolType in ['Engraver', 'ChamferMill'] and float(tool.CuttingEdgeAngle) > 0:
+        return PathDropCutter.ConeCutter(diameter, math.radians(float(tool.CuttingEdgeAngle) / 2), length)
+    return PathDropCutter.CylCutter(diameter, length)
+
+
+class DexelStock(object):
+    '''DexelStock(xmin, ymin, xmax, ymax, zmin, zmax, resolution) ... height field of the top of a box shaped stock,
+    one column per resolution squared.'''
+
+    def __init__(self, xmin, ymin, xmax, ymax, zmin, zmax, resolution):
+        self.resolution = float(resolution)
+        self.nx = max(int(math.ceil((xmax - xmin) / self.resolution)), 1)
+        self.ny = max(int(math.ceil((ymax - ymin) / self.resolution)), 1)
+        self.xs = xmin + (numpy.arange(self.nx) + 0.5) * (xmax - xmin) / self.nx
+        self.ys = ymin + (numpy.arange(self.ny) + 0.5) * (ymax - ymin) / self.ny
+        self.box = (xmin, ymin, xmax, ymax)
+        self.zmin = float(zmin)
+        self.zmax = float(zmax)
+        self.heights = numpy.full((self.ny, self.nx), self.zmax)
+        self.top = self.zmax
+
+    @classmethod
+    def fromBoundBox(cls, bb, resolution):
+        return cls(bb.XMin, bb.YMin, bb.XMax, bb.YMax, bb.ZMin, bb.ZMax, resolution)
+
+    def window(self, xmin, ymin, xmax, ymax):
+        '''window(xmin, ymin, xmax, ymax) ... return the slices of the columns within the rectangle.'''
+        i0 = numpy.searchsorted(self.xs, xmin, side='left')
+        i1 = numpy.searchsorted(self.xs, xmax, side='right')
+        j0 = numpy.searchsorted(self.ys, ymin, side='left')
+        j1 = numpy.searchsorted(self.ys, ymax, side='right')
+        return (slice(j0, j1), slice(i0, i1))
+
+    def iterations(self, radius):
+        '''iterations(radius) ... return the golden section steps shrinking the diameter below a tenth of a column.'''
+        return max(int(math.ceil(math.log(self.resolution / (20 * radius)) / math.log((math.sqrt(5.0) - 1.0) / 2.0))), 1) if radius > 0 else 1
+
+    def sweep(self, cutter, p0, p1, skip=False):
+        '''sweep(cutter, p0, p1, skip=False) ... return (window, heights) of the bottom of cutter moving with its tip
+        from p0 to p1, infinite where it doesn't reach, or with skip where the stock is already below the move.'''
+        radius = cutter.getRadius()
+        window = self.window(min(p0[0], p1[0]) - radius, min(p0[1], p1[1]) - radius, max(p0[0], p1[0]) + radius, max(p0[1], p1[1]) + radius)
+        X = self.xs[window[1]][None, :]
+        Y = self.ys[window[0]][:, None]
+        if X.size == 0 or Y.size == 0:
+            return (window, None)
+        dx = p1[0] - p0[0]
+        dy = p1[1] - p0[1]
+        length = math.hypot(dx, dy)
+        env = numpy.full((Y.shape[0], X.shape[1]), numpy.inf)
+
+        if length < Tolerance:
+            # plunge, the lowest point counts
+            d = numpy.hypot(X - p1[0], Y - p1[1])
+            reach = d <= radius
+            env[reach] = min(p0[2], p1[2]) + cutter.height(d[reach])
+            return (window, env)
+
+        ux = dx / length
+        uy = dy / length
+        a = (X - p0[0]) * ux + (Y - p0[1]) * uy
+        b = numpy.abs((Y - p0[1]) * ux - (X - p0[0]) * uy)
+        a, b = numpy.broadcast_arrays(a, b)
+        reach = (b <= radius) & (a >= -radius) & (a <= length + radius)
+        if skip:
+            reach &= self.heights[window] > min(p0[2], p1[2])
+        a = a[reach]
+        b = b[reach]
+        slope = (p1[2] - p0[2]) / length
+        if abs(slope) < Tolerance * Tolerance:
+            # horizontal, the nearest point of the move counts
+            d = numpy.hypot(a - numpy.clip(a, 0, length), b)
+            inside = d <= radius
+            z = numpy.full(a.shape, numpy.inf)
+            z[inside] = p0[2] + cutter.height(d[inside])
+        else:
+            rho = numpy.sqrt(numpy.maximum(radius * radius - b * b, 0))
+            lo = numpy.maximum(a - rho, 0)
+            hi = numpy.minimum(a + rho, length)
+            inside = lo <= hi
+            # the lowest bottom of the cutter is the highest tip touching the move upside down
+            z = -cutter.edgeDrop(numpy.full(a.shape, -p0[2]), -slope, a, b, lo, numpy.maximum(hi, lo), self.iterations(radius))
+            z = numpy.where(inside, z, numpy.inf)
+        env[reach] = z
+        return (window, env)
+
+    def cut(self, cutter, p0, p1):
+        '''cut(cutter, p0, p1) ... remove the material swept by cutter from p0 to p1, return (window, removed) with
+        the depth of the material removed from each column of the window, None if nothing was removed.'''
+        if min(p0[2], p1[2]) >= self.top:
+            return (None, None)
+        window, env = self.sweep(cutter, p0, p1, True)
+        if env is None:
+            return (None, None)
+        heights = self.heights[window]
+        lower = numpy.maximum(numpy.minimum(heights, env), self.zmin)
+        removed = heights - lower
+        if not (removed > Tolerance).any():
+            return (None, None)
+        self.heights[window] = lower
+        return (window, removed)
+
+    def triangles(self):
+        '''triangles() ... return the (n, 3, 3) array of the triangles of the closed surface of the stock, the top
+        through the centers of the columns.'''
+        X, Y = numpy.meshgrid(self.xs, self.ys)
+        top = numpy.stack((X, Y, self.heights), axis=2)
+        bottom = numpy.stack((X, Y, numpy.full(X.shape, self.zmin)), axis=2)
+        tris = []
+        if self.nx > 1 and self.ny > 1:
+            p00 = top[:-1, :-1].reshape(-1, 3)
+            p10 = top[:-1, 1:].reshape(-1, 3)
+            p11 = top[1:, 1:].reshape(-1, 3)
+            p01 = top[1:, :-1].reshape(-1, 3)
+            tris.append(numpy.stack((p00, p10, p11), axis=1))
+            tris.append(numpy.stack((p00, p11, p01), axis=1))
+            # the border counter clockwise, the walls facing out
+            ring = [(0, i) for i in range(self.nx)] + [(j, self.nx - 1) for j in range(1, self.ny)]
+            ring += [(self.ny - 1, i) for i in range(self.nx - 2, -1, -1)] + [(j, 0) for j in range(self.ny - 2, -1, -1)]
+            rj, ri = numpy.array(ring).T
+            t = top[rj, ri]
+            b = bottom[rj, ri]
+            tris.append(numpy.stack((b[:-1], b[1:], t[1:]), axis=1))
+            tris.append(numpy.stack((b[:-1], t[1:], t[:-1]), axis=1))
+            c = bottom[[0, 0, -1, -1], [0, -1, -1, 0]]
+            tris.append(numpy.array([[c[0], c[3], c[2]], [c[0], c[2], c[1]]]))
+        return numpy.concatenate(tris) if tris else numpy.zeros((0, 3, 3))
+
+    def mesh(self):
+        '''mesh() ... return the Mesh of the stock.'''
+        import Mesh
+        return Mesh.Mesh(self.triangles().reshape(-1, 3).tolist())
+
+
+def modelHeights(stock, triangles):
+    '''modelHeights(stock, triangles) ... return the height of the model, given as (n, 3, 3) array of triangles,
+    at the columns of stock, -inf where there is no model.'''
+    probe = PathDropCutter.CylCutter(stock.resolution * 0.001, 1.0)
+    grid = PathDropCutter.TriangleGrid(numpy.asarray(triangles, dtype=float).reshape(-1, 3, 3), probe.getRadius())
+    X, Y = numpy.meshgrid(stock.xs, stock.ys)
+    bottom = stock.zmin - 1.0
+    z = grid.drop(probe, X.ravel(), Y.ravel(), bottom).reshape(X.shape)
+    return numpy.where(z > bottom, z, -numpy.inf)
+
+
+def modelTriangles(job, deflection=None):
+    '''modelTriangles(job, deflection=None) ... return the (n, 3, 3) array of the triangles of the models of job.'''
+    import MeshPart
+    tris = []
+    for model in job.Model.Group:
+        shape = model.Shape
+        mesh = MeshPart.meshFromShape(Shape=shape, LinearDeflection=deflection or job.GeometryTolerance.Value, AngularDeflection=0.5)
+        tris.extend([[tuple(p) for p in f.Points] for f in mesh.Facets])
+    return numpy.array(tris, dtype=float).reshape(-1, 3, 3)
+
+
+class Simulation(object):
+    '''Simulation(stock, model=None, tolerance=0.01) ... removal of the material of stock, a DexelStock, by paths.
+    model is the height field of the model at the columns of stock, columns cut deeper than tolerance into it
+    are reported in gouges, material removed by rapid moves in collisions, as (label, command index, depth, x, y).'''
+
+    def __init__(self, stock, model=None, tolerance=0.01):
+        self.stock = stock
+        self.model = model
+        self.tolerance = tolerance
+        self.cutter = None
+        self.position = (None, None, None)
+        self.retract = 98
+        self.gouges = []
+        self.collisions = []
+        self.moves = 0
+
+    def setTool(self, tool):
+        self.setCutter(cutterForTool(tool))
+
+    def setCutter(self, cutter):
+        self.cutter = cutter
+
+    def _record(self, records, label, index, window, depth):
+        j, i = numpy.unravel_index(numpy.argmax(depth), depth.shape)
+        if records and records[-1][:2] == (label, index):
+            # one record per command, the deepest
+            if records[-1][2] >= depth[j, i]:
+                return
+            records.pop()
+        records.append((label, index, float(depth[j, i]), float(self.stock.xs[window[1]][i]), float(self.stock.ys[window[0]][j])))
+
+    def move(self, p1, rapid=False, label=None, index=None):
+        '''move(p1, rapid=False, label=None, index=None) ... move the cutter from the current position to p1.'''
+        p0 = self.position
+        p1 = tuple(p0[k] if p1[k] is None else p1[k] for k in range(3))
+        self.position = p1
+        if None in p0 or None in p1 or self.cutter is None:
+            return
+        self.moves += 1
+        window, removed = self.stock.cut(self.cutter, p0, p1)
+        if window is None:
+            return
+        if rapid:
+            self._record(self.collisions, label, index, window, removed)
+        if self.model is not None:
+            # only the columns lowered by this move, the earlier gouges are reported already
+            depth = numpy.where(removed > Tolerance, self.model[window] - self.stock.heights[window], 0.0)
+            if (depth > self.tolerance).any():
+                self._record(self.gouges, label, index, window, depth)
+
+    def arc(self, p1, center, cw, label=None, index=None):
+        '''arc(p1, center, cw, label=None, index=None) ... move the cutter on an arc around center in the XY plane.'''
+        p0 = self.position
+        p1 = tuple(p0[k] if p1[k] is None else p1[k] for k in range(3))
+        if None in p0:
+            self.position = p1
+            return
+        r = math.hypot(p0[0] - center[0], p0[1] - center[1])
+        a0 = math.atan2(p0[1] - center[1], p0[0] - center[0])
+        a1 = math.atan2(p1[1] - center[1], p1[0] - center[0])
+        sweep = ((a0 - a1) if cw else (a1 - a0)) % (2 * math.pi)
+        if sweep < 1e-9:
+            sweep = 2 * math.pi
+        # chords deviating less than a quarter of a column
+        deviation = min(self.stock.resolution / 4, r)
+        step = 2 * math.acos(1 - deviation / r) if r > 0 else sweep
+        n = max(int(math.ceil(sweep / step)), 1)
+        angles = a0 + (-1 if cw else 1) * sweep * numpy.arange(1, n + 1) / n
+        zs = p0[2] + (p1[2] - p0[2]) * numpy.arange(1, n + 1) / n
+        for k in range(n - 1):
+            self.move((center[0] + r * math.cos(angles[k]), center[1] + r * math.sin(angles[k]), zs[k]), False, label, index)
+        self.move(p1, False, label, index)
+
+    def applyCommand(self, cmd, label=None, index=None):
+        '''applyCommand(cmd, label=None, index=None) ... simulate cmd, return the position after it.'''
+        name = cmd.Name
+        params = cmd.Parameters
+        target = (params.get('X'), params.get('Y'), params.get('Z'))
+        if name in ['G0', 'G00', 'G1', 'G01']:
+            self.move(target, name in ['G0', 'G00'], label, index)
+        elif name in ['G2', 'G02', 'G3', 'G03']:
+            p0 = self.position
+            if None in p0:
+                self.move(target, False, label, index)
+            else:
+                center = (p0[0] + params.get('I', 0), p0[1] + params.get('J', 0))
+                self.arc(target, center, name in ['G2', 'G02'], label, index)
+        elif name in ['G98', 'G99']:
+            self.retract = int(name[1:])
+        elif name in ['G73', 'G81', 'G82', 'G83', 'G85']:
+            initial = self.position[2]
+            r = params.get('R', initial)
+            self.move((target[0], target[1], None), True, label, index)
+            self.move((None, None, r), True, label, index)
+            self.move((None, None, target[2]), False, label, index)
+            retract = r if self.retract == 99 or initial is None else max(r, initial)
+            self.move((None, None, retract), True, label, index)
+        return self.position
+
+    def applyPath(self, path, label=None):
+        '''applyPath(path, label=None) ... simulate all commands of path.'''
+        for index, cmd in enumerate(path.Commands):
+            self.applyCommand(cmd, label, index)
+        self.stock.top = float(self.stock.heights.max())
+        return self.position
+
+    def report(self):
+        '''report() ... return the lines describing the gouges and collisions.'''
+        lines = []
+        for title, records in [('gouge', self.gouges), ('rapid collision', self.collisions)]:
+            for label, index, depth, x, y in records:
+                lines.append("{} {:.3f} mm at ({:.2f}, {:.2f}) by command {} of {}".format(title, depth, x, y, index, label))
+        return lines
+
+
+def simulateJob(job, resolution=None, ops=None, tolerance=0.01):
+    '''simulateJob(job, resolution=None, ops=None, tolerance=0.01) ... return the Simulation of the operations of job,
+    or ops, on its stock with the gouges into its models. The default resolution is a 500th of the stock.'''
+    bb = job.Stock.Shape.BoundBox
+    if resolution is None:
+        resolution = max(bb.XLength, bb.YLength) / 500
+    stock = DexelStock.fromBoundBox(bb, resolution)
+    sim = Simulation(stock, modelHeights(stock, modelTriangles(job)), tolerance)
+    for op in (job.Operations.Group if ops is None else ops):
+        if not getattr(op, 'Active', True):
+            continue
+        tc = PathUtil.toolControllerForOp(op)
+        if tc is None:
+            continue
+        sim.setTool(tc.Tool)
+        sim.applyPath(op.Path, op.Label)
+    for line in sim.report():
+        PathLog.warning(line)
+    return sim
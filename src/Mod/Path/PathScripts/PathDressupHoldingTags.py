@@ -29,6 +29,7 @@ import PathScripts.PathGeom as PathGeom
 import PathScripts.PathLog as PathLog
 import PathScripts.PathUtil as PathUtil
 import PathScripts.PathUtils as PathUtils
+import bisect
 import copy
 import math
 import sys
@@ -125,9 +126,18 @@ class Tag:
     def top(self):
         return self.z + self.actualHeight
 
-    def createSolidsAt(self, z, R):
+    def solidKey(self, z, R):
+        return (self.x, self.y, self.width, self.height, self.angle, self.radius.Value, z, R)
+
+    def createSolidsAt(self, z, R, cache=None):
+        '''createSolidsAt(z, R, cache=None) ... create the solid of the tag at z for a tool of radius R,
+        if cache is a dict the solid is looked up in it and stored there.'''
         self.z = z
         self.toolRadius = R
+        key = self.solidKey(z, R)
+        if cache is not None and key in cache:
+            (self.solid, self.actualHeight, self.r1, self.r2, self.isSquare, self.realRadius) = cache[key]
+            return
         r1 = self.fullWidth() / 2
         self.r1 = r1
         self.r2 = r1
@@ -173,6 +183,8 @@ class Tag:
         if not PathGeom.isRoughly(0, radius.Value):
             PathLog.debug("makeFillet(%.4f)" % radius)
             self.solid = self.solid.makeFillet(radius, [self.solid.Edges[0]])
+        if cache is not None:
+            cache[key] = (self.solid, self.actualHeight, self.r1, self.r2, self.isSquare, self.realRadius)
 
     def filterIntersections(self, pts, face):
         if type(face.Surface) == Part.Cone or type(face.Surface) == Part.Cylinder or type(face.Surface) == Part.Toroid:
@@ -460,6 +472,7 @@ class MapWireToTag:
             try:
                 shape = self.shell().common(self.tag.solid)
                 commands = []
+                feeds = []
                 rapid = None
                 for e, flip in self.orderAndFlipEdges(self.cleanupEdges(shape.Edges)):
                     debugEdge(e, '++++++++ %s' % ('<' if flip else '>'), False)
@@ -469,9 +482,12 @@ class MapWireToTag:
                         rapid = p1 if flip else p2
                     else:
                         if rapid:
+                            commands.extend(PathGeom.cmdsForEdges(feeds, False, False, self.segm, hSpeed = self.hSpeed, vSpeed = self.vSpeed))
+                            feeds = []
                             commands.append(Path.Command('G0', {'X': rapid.x, 'Y': rapid.y, 'Z': rapid.z}))
                             rapid = None
-                        commands.extend(PathGeom.cmdsForEdge(e, False, False, self.segm, hSpeed = self.hSpeed, vSpeed = self.vSpeed))
+                        feeds.append(e)
+                commands.extend(PathGeom.cmdsForEdges(feeds, False, False, self.segm, hSpeed = self.hSpeed, vSpeed = self.vSpeed))
                 if rapid:
                     commands.append(Path.Command('G0', {'X': rapid.x, 'Y': rapid.y, 'Z': rapid.z}))
                     rapid = None
@@ -483,9 +499,7 @@ class MapWireToTag:
                 #else:
                 #    traceback.print_exc()
                 self.tag.enabled = False
-                commands = []
-                for e in self.edges:
-                    commands.extend(PathGeom.cmdsForEdge(e, hSpeed = self.hSpeed, vSpeed = self.vSpeed))
+                commands = PathGeom.cmdsForEdges(self.edges, hSpeed = self.hSpeed, vSpeed = self.vSpeed)
                 failures.append(self)
                 return commands
         return []
@@ -533,6 +547,29 @@ class _RapidEdges:
         return False
 
 
+class _TagIndex:
+    '''_TagIndex(tags) ... the XY bounding boxes of the solids of the enabled tags sorted by XMin,
+    an edge can only intersect the tags whose box its box overlaps.'''
+    def __init__(self, tags):
+        boxes = []
+        for i, tag in enumerate(tags):
+            if tag.enabled:
+                bb = tag.solid.BoundBox
+                boxes.append((bb.XMin - PathGeom.Tolerance, bb.XMax + PathGeom.Tolerance, bb.YMin - PathGeom.Tolerance, bb.YMax + PathGeom.Tolerance, i))
+        boxes.sort()
+        self.boxes = boxes
+        self.xmin = [b[0] for b in boxes]
+
+    def candidates(self, edge):
+        '''candidates(edge) ... return the set of indexes of the tags which might intersect edge.'''
+        bb = edge.BoundBox
+        result = set()
+        for xmin, xmax, ymin, ymax, i in self.boxes[:bisect.bisect_right(self.xmin, bb.XMax)]:
+            if xmax >= bb.XMin and ymin <= bb.YMax and ymax >= bb.YMin:
+                result.add(i)
+        return result
+
+
 class PathData:
     def __init__(self, obj):
         PathLog.track(obj.Base.Name)
@@ -784,6 +821,8 @@ class ObjectTagDressup:
 
         self.mappers = []
         mapper = None
+        index = _TagIndex(tags)
+        candidateEdge = None
 
         tc = PathDressup.toolController(obj.Base)
         horizFeed = tc.HorizFeed.Value
@@ -809,6 +848,13 @@ class ObjectTagDressup:
                     edge = None
 
             if edge:
+                # skip the tags the edge can't reach
+                if edge is not candidateEdge:
+                    candidateEdge = edge
+                    candidates = index.candidates(edge)
+                while t < len(tags) and (t + lastTag) % len(tags) not in candidates:
+                    t += 1
+            if edge and t < len(tags):
                 tIndex = (t + lastTag) % len(tags)
                 t += 1
                 i = tags[tIndex].intersects(edge, edge.FirstParameter)
@@ -840,9 +886,14 @@ class ObjectTagDressup:
 
     def createTagsPositionDisabled(self, obj, positionsIn, disabledIn):
         rawTags = []
+        # the solids of tags which didn't change are reused, only the current ones are kept
+        cache = getattr(self, 'tagSolids', {})
+        self.tagSolids = {}
         for i, pos in enumerate(positionsIn):
             tag = Tag(i, pos.x, pos.y, obj.Width.Value, obj.Height.Value, obj.Angle, obj.Radius, not i in disabledIn)
-            tag.createSolidsAt(self.pathData.minZ, self.toolRadius)
+            tag.createSolidsAt(self.pathData.minZ, self.toolRadius, cache)
+            key = tag.solidKey(self.pathData.minZ, self.toolRadius)
+            self.tagSolids[key] = cache[key]
             rawTags.append(tag)
         # disable all tags that intersect with their previous tag
         prev = None
@@ -553,16 +553,20 @@ class ObjectDressup:
 
     def createCommands(self, obj, edges):
         commands = []
+        feeds = []
         for edge in edges:
             israpid = False
             for redge in self.rapids:
                 if PathGeom.edgesMatch(edge, redge):
                     israpid = True
             if israpid:
+                commands.extend(PathGeom.cmdsForEdges(feeds))
+                feeds = []
                 v = edge.valueAt(edge.LastParameter)
                 commands.append(Path.Command('G0', {'X': v.x, 'Y': v.y, 'Z': v.z}))
             else:
-                commands.extend(PathGeom.cmdsForEdge(edge))
+                feeds.append(edge)
+        commands.extend(PathGeom.cmdsForEdges(feeds))
 
         lastCmd = Path.Command('G0', {'X': 0.0, 'Y': 0.0, 'Z': 0.0})
 
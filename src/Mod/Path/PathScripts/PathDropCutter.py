@@ -0,0 +1,537 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2019 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import math
+import numpy
+
+__title__ = "PathDropCutter - NumPy drop cutter"
+__author__ = "FreeCAD Developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Drop cutter on a triangulated surface, used by the 3D Surface operation if OpenCamLib is not installed."
+
+# The classes mirror the subset of the OpenCamLib (ocl) API used by PathSurface, so
+# the module can be imported in place of ocl:
+#   stl = STLSurf(); stl.addTriangle(Triangle(Point(..), Point(..), Point(..)))
+#   pdc = PathDropCutter(); pdc.setSTL(stl); pdc.setCutter(BallCutter(d, l))
+#   pdc.setZ(minZ); pdc.setSampling(s); pdc.setPath(path); pdc.run()
+#   pdc.getCLPoints() -> list of Point, cutter tip positions in path order
+#
+# The triangles are binned into a uniform xy bucket grid. The cutter location points
+# of all lines are processed in chunks. The highest vertexes in the cell of a point
+# give a lower bound of its height, only the triangles within reach reaching above
+# it are candidates. Every (point, candidate triangle) pair is tested against the
+# vertexes, the facet and the edges of the triangle with array operations and the
+# highest contact is kept.
+
+Tolerance = 1e-9
+PointChunkSize = 200     # cutter location points tested at once
+GoldenIterations = 40
+
+
+class Point(object):
+    '''Point(x, y, z) ... mutable point, used for vertexes and cutter locations.'''
+    __slots__ = ('x', 'y', 'z')
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def __repr__(self):
+        return "Point({}, {}, {})".format(self.x, self.y, self.z)
+
+
+class Triangle(object):
+    '''Triangle(p1, p2, p3) ... triangle of three Points.'''
+
+    def __init__(self, p1, p2, p3):
+        self.p = [p1, p2, p3]
+
+    def getPoints(self):
+        return self.p
+
+
+class STLSurf(object):
+    '''STLSurf() ... triangulated surface to drop the cutter on.'''
+
+    def __init__(self):
+        self.triangles = numpy.zeros((0, 3, 3))
+        self.pending = []
+        self.version = 0
+
+    def addTriangle(self, t):
+        self.pending.append([[p.x, p.y, p.z] for p in t.p])
+        self.version += 1
+
+    def addTriangles(self, points):
+        '''addTriangles(points) ... add all triangles of a (n, 3, 3) array like.'''
+        self.triangles = numpy.concatenate((self.getTriangles(), numpy.asarray(points, dtype=float).reshape(-1, 3, 3)))
+        self.version += 1
+
+    def getTriangles(self):
+        '''getTriangles() ... return the triangles as (n, 3, 3) array.'''
+        if self.pending:
+            self.triangles = numpy.concatenate((self.triangles, numpy.array(self.pending, dtype=float)))
+            self.pending = []
+        return self.triangles
+
+    def size(self):
+        return len(self.getTriangles())
+
+    def rotate(self, xr, yr, zr):
+        '''rotate(xr, yr, zr) ... rotate all triangles around the X, then the Y and then the Z axis, angles in radians.'''
+        cx, sx = math.cos(xr), math.sin(xr)
+        cy, sy = math.cos(yr), math.sin(yr)
+        cz, sz = math.cos(zr), math.sin(zr)
+        rx = numpy.array([[1.0, 0.0, 0.0], [0.0, cx, -sx], [0.0, sx, cx]])
+        ry = numpy.array([[cy, 0.0, sy], [0.0, 1.0, 0.0], [-sy, 0.0, cy]])
+        rz = numpy.array([[cz, -sz, 0.0], [sz, cz, 0.0], [0.0, 0.0, 1.0]])
+        rot = rz.dot(ry).dot(rx)
+        self.triangles = self.getTriangles().dot(rot.T)
+        self.version += 1
+
+
+class Line(object):
+    '''Line(p1, p2) ... straight span of a Path.'''
+
+    def __init__(self, p1, p2):
+        self.p1 = p1
+        self.p2 = p2
+
+
+class Path(object):
+    '''Path() ... sequence of Lines the cutter is dropped along.'''
+
+    def __init__(self):
+        self.spans = []
+
+    def append(self, span):
+        self.spans.append(span)
+
+
+class MillingCutter(object):
+    '''Rotational symmetric cutter, described by the height of its profile
+    above the tip at the distance d from the axis.'''
+
+    def __init__(self, diameter, length):
+        self.diameter = float(diameter)
+        self.length = float(length)
+
+    def getDiameter(self):
+        return self.diameter
+
+    def getRadius(self):
+        return self.diameter / 2.0
+
+    def getLength(self):
+        return self.length
+
+    def height(self, d):
+        '''height(d) ... profile height above the tip for the distances d <= radius.'''
+        raise NotImplementedError()
+
+    def facetDrop(self, px, py, nx, ny, nz, planeZ):
+        '''facetDrop(px, py, nx, ny, nz, planeZ) ... return the tip heights and the xy contact points
+        of the cutter touching the planes with the upward unit normals n, planeZ(x, y) is the height of the planes.'''
+        raise NotImplementedError()
+
+    def edgeDrop(self, az, m, s0, d0, lo, hi, iterations=GoldenIterations):
+        '''edgeDrop(az, m, s0, d0, lo, hi, iterations=GoldenIterations) ... return the tip heights of the cutter touching the edges.
+        Edge points are az + m * s along the edge, the axis is at s0 along and d0 across the edge,
+        the edge is within the cutter radius in [lo, hi]. The search shrinks [lo, hi] iterations times.'''
+        # the tip height az + m * s - height(dist) is concave in s, golden section search
+        radius = self.getRadius()
+
+        def tip(s):
+            return az + m * s - self.height(numpy.minimum(numpy.sqrt(d0 * d0 + (s - s0) ** 2), radius))
+
+        gr = (math.sqrt(5.0) - 1.0) / 2.0
+        a = lo.copy()
+        b = hi.copy()
+        c = b - gr * (b - a)
+        d = a + gr * (b - a)
+        fc = tip(c)
+        fd = tip(d)
+        for i in range(iterations):
+            # the maximum is in [a, d] if left else in [c, b], one new evaluation per step
+            left = fc > fd
+            a = numpy.where(left, a, c)
+            b = numpy.where(left, d, b)
+            c, d = numpy.where(left, b - gr * (b - a), d), numpy.where(left, c, a + gr * (b - a))
+            fnew = tip(numpy.where(left, c, d))
+            fc, fd = numpy.where(left, fnew, fd), numpy.where(left, fc, fnew)
+        return numpy.maximum(numpy.maximum(tip(lo), tip(hi)), tip((a + b) / 2.0))
+
+
+class BullCutter(MillingCutter):
+    '''BullCutter(diameter, radius, length) ... flat bottom with a torus corner of radius.'''
+
+    def __init__(self, diameter, radius, length):
+        super(BullCutter, self).__init__(diameter, length)
+        self.radius = min(max(float(radius), 0.0), self.getRadius())
+
+    def height(self, d):
+        flat = self.getRadius() - self.radius
+        dr = numpy.maximum(d - flat, 0.0)
+        return self.radius - numpy.sqrt(numpy.maximum(self.radius * self.radius - dr * dr, 0.0))
+
+    def facetDrop(self, px, py, nx, ny, nz, planeZ):
+        # the torus tube center ring touches the plane on its uphill side
+        flat = self.getRadius() - self.radius
+        slope = numpy.sqrt(nx * nx + ny * ny)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            ux = numpy.where(slope > Tolerance, -nx / slope, 0.0)
+            uy = numpy.where(slope > Tolerance, -ny / slope, 0.0)
+        qx = px + flat * ux
+        qy = py + flat * uy
+        z = planeZ(qx, qy) + self.radius / nz - self.radius
+        return z, qx - self.radius * nx, qy - self.radius * ny
+
+    def edgeDrop(self, az, m, s0, d0, lo, hi, iterations=GoldenIterations):
+        r = self.radius
+        radius = self.getRadius()
+        if r <= Tolerance:
+            # flat bottom, the highest edge point within the cutter
+            return az + m * numpy.where(m > 0.0, hi, lo)
+        if r >= radius - Tolerance:
+            # ball, the slice of the sphere through the edge is a circle of radius w
+            w = numpy.sqrt(numpy.maximum(radius * radius - d0 * d0, 0.0))
+            s = numpy.clip(s0 + w * m / numpy.sqrt(1.0 + m * m), lo, hi)
+            return az + m * s + numpy.sqrt(numpy.maximum(w * w - (s - s0) ** 2, 0.0)) - radius
+        return super(BullCutter, self).edgeDrop(az, m, s0, d0, lo, hi, iterations)
+
+
+class CylCutter(BullCutter):
+    '''CylCutter(diameter, length) ... flat end mill.'''
+
+    def __init__(self, diameter, length):
+        super(CylCutter, self).__init__(diameter, 0.0, length)
+
+
+class BallCutter(BullCutter):
+    '''BallCutter(diameter, length) ... ball end mill.'''
+
+    def __init__(self, diameter, length):
+        super(BallCutter, self).__init__(diameter, diameter / 2.0, length)
+
+
+class ConeCutter(MillingCutter):
+    '''ConeCutter(diameter, angle, length) ... cone with the half angle in radians.'''
+
+    def __init__(self, diameter, angle, length):
+        super(ConeCutter, self).__init__(diameter, length)
+        self.angle = float(angle)
+
+    def height(self, d):
+        return d / math.tan(self.angle)
+
+    def facetDrop(self, px, py, nx, ny, nz, planeZ):
+        # the tip height is linear along the steepest ascent, contact at the tip or at the rim
+        radius = self.getRadius()
+        slope = numpy.sqrt(nx * nx + ny * ny)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            ascent = numpy.where(slope > Tolerance, slope / nz, 0.0)
+            ux = numpy.where(slope > Tolerance, -nx / slope, 0.0)
+            uy = numpy.where(slope > Tolerance, -ny / slope, 0.0)
+        rim = ascent > 1.0 / math.tan(self.angle)
+        qx = numpy.where(rim, px + radius * ux, px)
+        qy = numpy.where(rim, py + radius * uy, py)
+        z = planeZ(qx, qy) - numpy.where(rim, self.height(radius), 0.0)
+        return z, qx, qy
+
+
+class TriangleGrid(object):
+    '''TriangleGrid(triangles, reach) ... bucket grid of the triangles, every cell lists the
+    triangles with an xy bound box within reach of the cell, highest triangles first.'''
+
+    def __init__(self, triangles, reach):
+        self.reach = reach
+        self.tris = triangles
+        lo = triangles.min(axis=1)
+        hi = triangles.max(axis=1)
+        self.xmin = lo[:, 0] - reach
+        self.ymin = lo[:, 1] - reach
+        self.xmax = hi[:, 0] + reach
+        self.ymax = hi[:, 1] + reach
+        self.zmax = hi[:, 2]
+        if len(triangles):
+            self.origin = (self.xmin.min(), self.ymin.min())
+            width = self.xmax.max() - self.origin[0]
+            depth = self.ymax.max() - self.origin[1]
+            # not more cells than a few per triangle
+            extent = (hi - lo)[:, :2].mean()
+            self.cellSize = max(reach / 2.0, extent, math.sqrt(width * depth / (4.0 * len(triangles))), Tolerance)
+            self.nx = int(width / self.cellSize) + 1
+            self.ny = int(depth / self.cellSize) + 1
+        else:
+            self.origin = (0.0, 0.0)
+            self.cellSize = 1.0
+            self.nx = self.ny = 1
+        self._bin()
+        self._setup()
+
+    def _cell(self, x, y):
+        ix = numpy.floor((x - self.origin[0]) / self.cellSize).astype(int)
+        iy = numpy.floor((y - self.origin[1]) / self.cellSize).astype(int)
+        return ix, iy
+
+    def _keys(self, x, y):
+        '''_keys(x, y) ... return the cell keys of the points, -1 outside of the grid.'''
+        ix, iy = self._cell(x, y)
+        inside = (ix >= 0) & (ix < self.nx) & (iy >= 0) & (iy < self.ny)
+        return numpy.where(inside, iy * self.nx + ix, -1)
+
+    def _bin(self):
+        ix0, iy0 = self._cell(self.xmin, self.ymin)
+        ix1, iy1 = self._cell(self.xmax, self.ymax)
+        ix1 = numpy.minimum(ix1, self.nx - 1)
+        iy1 = numpy.minimum(iy1, self.ny - 1)
+        wx = ix1 - ix0 + 1
+        counts = wx * (iy1 - iy0 + 1)
+        tri = numpy.repeat(numpy.arange(len(counts)), counts)
+        local = numpy.arange(counts.sum()) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+        keys = (iy0[tri] + local // wx[tri]) * self.nx + ix0[tri] + local % wx[tri]
+        # sorted by cell and descending zmax, the key + fraction of the height range below
+        # the top is searchable for all triangles of a cell reaching above a height
+        self.ztop = self.zmax.max() if len(self.zmax) else 0.0
+        self.zscale = 1.0 / ((self.ztop - self.zmax.min()) * 1.000001 + Tolerance) if len(self.zmax) else 1.0
+        order = numpy.lexsort((-self.zmax[tri], keys))
+        self.cellTris = tri[order]
+        self.cellKeys = keys[order] + (self.ztop - self.zmax[self.cellTris]) * self.zscale
+        self.cellCount = numpy.bincount(keys, minlength=self.nx * self.ny)
+        self.cellStart = numpy.cumsum(self.cellCount) - self.cellCount
+        # the highest vertex of every triangle, binned into its own cell
+        top = self.tris[numpy.arange(len(self.tris)), self.tris[:, :, 2].argmax(axis=1)] if len(self.tris) else numpy.zeros((0, 3))
+        keys = self._keys(top[:, 0], top[:, 1])
+        order = numpy.argsort(keys, kind='mergesort')
+        self.tops = top[order]
+        self.topCount = numpy.bincount(keys, minlength=self.nx * self.ny)
+        self.topStart = numpy.cumsum(self.topCount) - self.topCount
+
+    def _setup(self):
+        t = self.tris
+        n = numpy.cross(t[:, 1] - t[:, 0], t[:, 2] - t[:, 0])
+        length = numpy.sqrt((n * n).sum(axis=1))
+        length[length < Tolerance] = 1.0
+        n = n / length[:, None]
+        n[n[:, 2] < 0.0] *= -1.0
+        self.normal = n
+        # xy edge functions for the inside test, zero for triangles vertical in xy
+        area = ((t[:, 1, 0] - t[:, 0, 0]) * (t[:, 2, 1] - t[:, 0, 1])
+                - (t[:, 1, 1] - t[:, 0, 1]) * (t[:, 2, 0] - t[:, 0, 0]))
+        self.area = area
+        self.facet = (n[:, 2] > Tolerance) & (numpy.abs(area) > Tolerance)
+        # xy unit direction, xy length and slope of the edges p[i] -> p[i + 1]
+        e = numpy.roll(t, -1, axis=1) - t
+        self.edgeLength = numpy.sqrt(e[:, :, 0] ** 2 + e[:, :, 1] ** 2)
+        length = numpy.where(self.edgeLength > Tolerance, self.edgeLength, 1.0)
+        self.edgeX = e[:, :, 0] / length
+        self.edgeY = e[:, :, 1] / length
+        self.edgeSlope = e[:, :, 2] / length
+
+    def lowerBound(self, cutter, px, py, z):
+        '''lowerBound(cutter, px, py, z) ... raise z to the contacts with the top vertexes in the cell of the points.'''
+        keys = self._keys(px, py)
+        counts = numpy.where(keys >= 0, self.topCount[keys], 0)
+        pnt = numpy.repeat(numpy.arange(len(px)), counts)
+        if not len(pnt):
+            return z
+        local = numpy.arange(len(pnt)) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+        top = self.tops[self.topStart[keys][pnt] + local]
+        radius = cutter.getRadius()
+        dx = top[:, 0] - px[pnt]
+        dy = top[:, 1] - py[pnt]
+        d = numpy.sqrt(dx * dx + dy * dy)
+        vz = numpy.where(d <= radius, top[:, 2] - cutter.height(numpy.minimum(d, radius)), -numpy.inf)
+        return _maxByPoint(z, pnt, vz)
+
+    def candidates(self, px, py, z):
+        '''candidates(px, py, z) ... return the point and triangle indexes of all pairs within reach
+        of triangles higher than z, sorted by point.'''
+        keys = self._keys(px, py)
+        inside = keys >= 0
+        keys = numpy.where(inside, keys, 0)
+        start = self.cellStart[keys]
+        frac = numpy.clip((self.ztop - z) * self.zscale, 0.0, 1.0)
+        end = numpy.searchsorted(self.cellKeys, keys + frac, 'left')
+        counts = numpy.where(inside, numpy.clip(end - start, 0, self.cellCount[keys]), 0)
+        pnt = numpy.repeat(numpy.arange(len(px)), counts)
+        local = numpy.arange(len(pnt)) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+        tri = self.cellTris[start[pnt] + local]
+        x = px[pnt]
+        y = py[pnt]
+        near = (x >= self.xmin[tri]) & (x <= self.xmax[tri]) & (y >= self.ymin[tri]) & (y <= self.ymax[tri])
+        return pnt[near], tri[near]
+
+    def drop(self, cutter, px, py, minZ):
+        '''drop(cutter, px, py, minZ) ... return the tip heights of the cutter dropped at px, py.'''
+        z = numpy.full(len(px), float(minZ))
+        if not len(self.tris):
+            return z
+        for i in range(0, len(px), PointChunkSize):
+            z[i:i + PointChunkSize] = self._drop(cutter, px[i:i + PointChunkSize], py[i:i + PointChunkSize], z[i:i + PointChunkSize])
+        return z
+
+    def _drop(self, cutter, px, py, z):
+        # the cutter can't touch a triangle below the vertex lower bound
+        z = self.lowerBound(cutter, px, py, z)
+        pnt, tri = self.candidates(px, py, z - Tolerance)
+        if not len(pnt):
+            return z
+        x = px[pnt]
+        y = py[pnt]
+        radius = cutter.getRadius()
+        t = self.tris[tri]
+        best = numpy.full(len(pnt), -numpy.inf)
+
+        # vertexes
+        for i in range(3):
+            dx = t[:, i, 0] - x
+            dy = t[:, i, 1] - y
+            d = numpy.sqrt(dx * dx + dy * dy)
+            vz = t[:, i, 2] - cutter.height(numpy.minimum(d, radius))
+            best = numpy.where((d <= radius) & (vz > best), vz, best)
+        z = _maxByPoint(z, pnt, best)
+        keep = self.zmax[tri] > z[pnt]
+        if not keep.any():
+            return z
+        pnt = pnt[keep]
+        tri = tri[keep]
+        x = x[keep]
+        y = y[keep]
+        t = t[keep]
+        best = numpy.full(len(pnt), -numpy.inf)
+
+        # facets
+        n = self.normal[tri]
+        v0 = t[:, 0]
+        facet = self.facet[tri]
+        nz = numpy.where(facet, n[:, 2], 1.0)
+
+        def planeZ(qx, qy):
+            return v0[:, 2] - (n[:, 0] * (qx - v0[:, 0]) + n[:, 1] * (qy - v0[:, 1])) / nz
+
+        fz, cx, cy = cutter.facetDrop(x, y, n[:, 0], n[:, 1], nz, planeZ)
+        area = self.area[tri]
+        inside = facet
+        for i in range(3):
+            a = t[:, i]
+            b = t[:, (i + 1) % 3]
+            side = (b[:, 0] - a[:, 0]) * (cy - a[:, 1]) - (b[:, 1] - a[:, 1]) * (cx - a[:, 0])
+            inside = inside & (side * area >= -Tolerance * numpy.abs(area))
+        best = numpy.where(inside & (fz > best), fz, best)
+
+        # edges
+        for i in range(3):
+            a = t[:, i]
+            ex = self.edgeX[tri, i]
+            ey = self.edgeY[tri, i]
+            length = self.edgeLength[tri, i]
+            ax = x - a[:, 0]
+            ay = y - a[:, 1]
+            s0 = ax * ex + ay * ey
+            d0 = numpy.abs(ay * ex - ax * ey)
+            w = numpy.sqrt(numpy.maximum(radius * radius - d0 * d0, 0.0))
+            lo = numpy.maximum(s0 - w, 0.0)
+            hi = numpy.minimum(s0 + w, length)
+            valid = (length > Tolerance) & (d0 <= radius) & (lo <= hi)
+            if not valid.any():
+                continue
+            m = self.edgeSlope[tri[valid], i]
+            ez = cutter.edgeDrop(a[valid, 2], m, s0[valid], d0[valid], lo[valid], hi[valid])
+            best[valid] = numpy.maximum(best[valid], ez)
+
+        return _maxByPoint(z, pnt, best)
+
+
+def _maxByPoint(z, pnt, values):
+    '''_maxByPoint(z, pnt, values) ... raise z to the maximum of the values of every point, pnt is sorted.'''
+    starts = numpy.flatnonzero(numpy.r_[True, pnt[1:] != pnt[:-1]])
+    idx = pnt[starts]
+    z[idx] = numpy.maximum(z[idx], numpy.maximum.reduceat(values, starts))
+    return z
+
+
+class PathDropCutter(object):
+    '''PathDropCutter() ... drop the cutter along the lines of a Path, sampled at the sampling distance.'''
+
+    def __init__(self):
+        self.stl = None
+        self.cutter = None
+        self.path = None
+        self.minimumZ = 0.0
+        self.sampling = 0.1
+        self.grid = None
+        self.gridKey = None
+        self.clpoints = numpy.zeros((0, 3))
+
+    def setSTL(self, stl):
+        self.stl = stl
+
+    def setCutter(self, cutter):
+        self.cutter = cutter
+
+    def setZ(self, z):
+        self.minimumZ = z
+
+    def setSampling(self, sampling):
+        self.sampling = sampling
+
+    def setPath(self, path):
+        self.path = path
+
+    def samplePoints(self):
+        '''samplePoints() ... return the x and y arrays of the sampled path, same sampling as ocl.'''
+        xs = []
+        ys = []
+        for span in self.path.spans:
+            x1, y1 = span.p1.x, span.p1.y
+            x2, y2 = span.p2.x, span.p2.y
+            steps = int(math.hypot(x2 - x1, y2 - y1) / self.sampling + 1)
+            f = numpy.arange(steps + 1) / float(steps)
+            xs.append(x1 + f * (x2 - x1))
+            ys.append(y1 + f * (y2 - y1))
+        if not xs:
+            return numpy.zeros(0), numpy.zeros(0)
+        return numpy.concatenate(xs), numpy.concatenate(ys)
+
+    def getGrid(self):
+        key = (id(self.stl), self.stl.version, self.cutter.getRadius())
+        if self.gridKey != key:
+            self.grid = TriangleGrid(self.stl.getTriangles(), self.cutter.getRadius())
+            self.gridKey = key
+        return self.grid
+
+    def run(self):
+        px, py = self.samplePoints()
+        grid = self.getGrid()
+        z = grid.drop(self.cutter, px, py, self.minimumZ)
+        self.clpoints = numpy.column_stack((px, py, z))
+
+    def getCLArray(self):
+        '''getCLArray() ... return the cutter locations as (n, 3) array.'''
+        return self.clpoints
+
+    def getCLPoints(self):
+        return [Point(x, y, z) for x, y, z in self.clpoints.tolist()]
@@ -74,6 +74,8 @@ class ObjectOp(PathOp.ObjectOp):
 
             edges = copy.copy(offset.Edges)
             last = None
+            # the commands only differ in their depth as long as the edges are traversed in the same direction
+            cmdFlips = None
 
             for z in zValues:
                 if last:
@@ -82,6 +84,7 @@ class ObjectOp(PathOp.ObjectOp):
                     else:
                         self.commandlist.append(Path.Command('G1', {'X': last.x, 'Y': last.y, 'Z': z, 'F': self.vertFeed}))
 
+                flips = []
                 for edge in edges:
                     if not last:
                         # we set the first move to our first point
@@ -105,13 +108,16 @@ class ObjectOp(PathOp.ObjectOp):
                             self.commandlist.append(Path.Command('G1', {'X': last.x, 'Y': last.y, 'Z': z, 'F': self.vertFeed}))
 
                     if PathGeom.pointsCoincide(last, edge.Vertexes[0].Point):
-                        for cmd in PathGeom.cmdsForEdge(edge):
-                            self.appendCommand(cmd, z, rel)
+                        flips.append(False)
                         last = edge.Vertexes[-1].Point
                     else:
-                        for cmd in PathGeom.cmdsForEdge(edge, True):
-                            self.appendCommand(cmd, z, rel)
+                        flips.append(True)
                         last = edge.Vertexes[0].Point
+                if flips != cmdFlips:
+                    cmdFlips = flips
+                    cmds = PathGeom.cmdsForEdges(edges, flips)
+                for cmd in cmds:
+                    self.appendCommand(cmd, z, rel)
             self.commandlist.append(Path.Command('G0', {'Z': obj.ClearanceHeight.Value, 'F': self.vertRapid}))
 
     def appendCommand(self, cmd, z, rel):
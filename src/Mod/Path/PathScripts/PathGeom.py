@@ -231,6 +231,18 @@ def speedBetweenPoints(p0, p1, hSpeed, vSpeed):
         return min(hSpeed, vSpeed)
     return speed
 
+def _arcOffset(p1, p2, p3):
+    """(p1, p2, p3) -> Vector
+    Returns the offset from p1 to the center of the circle through the projections of the points onto the XY-plane."""
+    bx = p2.x - p1.x
+    by = p2.y - p1.y
+    cx = p3.x - p1.x
+    cy = p3.y - p1.y
+    d = 2 * (bx * cy - by * cx)
+    b2 = bx * bx + by * by
+    c2 = cx * cx + cy * cy
+    return Vector((cy * b2 - by * c2) / d, (bx * c2 - cx * b2) / d, 0)
+
 def cmdsForEdge(edge, flip = False, useHelixForBSpline = True, segm = 50, hSpeed = 0, vSpeed = 0):
     """(edge, flip=False, useHelixForBSpline=True, segm=50) -> List(Path.Command)
     Returns a list of Path.Command representing the given edge.
@@ -240,75 +252,72 @@ def cmdsForEdge(edge, flip = False, useHelixForBSpline = True, segm = 50, hSpeed
     no direct Path.Command mapping and will be approximated by straight segments.
     segm is a factor for the segmentation of arbitrary curves not mapped to G1/2/3
     commands. The higher the value the more segments will be used."""
-    pt = edge.valueAt(edge.LastParameter) if not flip else edge.valueAt(edge.FirstParameter)
-    params = {'X': pt.x, 'Y': pt.y, 'Z': pt.z}
-    if type(edge.Curve) == Part.Line or type(edge.Curve) == Part.LineSegment:
-        if hSpeed > 0 and vSpeed > 0:
-            pt2 = edge.valueAt(edge.FirstParameter) if not flip else edge.valueAt(edge.LastParameter)
-            params.update({'F': speedBetweenPoints(pt, pt2, hSpeed, vSpeed)})
-        commands =  [Path.Command('G1', params)]
-    else:
-        p1 = edge.valueAt(edge.FirstParameter) if not flip else edge.valueAt(edge.LastParameter)
-        p2 = edge.valueAt((edge.FirstParameter + edge.LastParameter)/2)
+    return cmdsForEdges([edge], flip, useHelixForBSpline, segm, hSpeed, vSpeed)
+
+def cmdsForEdges(edges, flip = False, useHelixForBSpline = True, segm = 50, hSpeed = 0, vSpeed = 0, deflection = None):
+    """(edges, flip=False, useHelixForBSpline=True, segm=50, hSpeed=0, vSpeed=0, deflection=None) -> List(Path.Command)
+    Returns the list of Path.Command representing all given edges, see cmdsForEdge.
+    flip is either a single value for all edges or a list with one value per edge.
+    Curves which have to be approximated by straight segments are discretized in one go,
+    if deflection is given no segment deviates more than deflection from the curve,
+    otherwise segm determines the number of segments."""
+    commands = []
+    flips = flip if isinstance(flip, (list, tuple)) else [flip] * len(edges)
+    for edge, flip in zip(edges, flips):
+        curve = edge.Curve
+        kind = type(curve)
+        first = edge.FirstParameter
+        last = edge.LastParameter
+        p1 = edge.valueAt(last if flip else first)
+        pt = edge.valueAt(first if flip else last)
+        params = {'X': pt.x, 'Y': pt.y, 'Z': pt.z}
+        if kind == Part.Line or kind == Part.LineSegment:
+            if hSpeed > 0 and vSpeed > 0:
+                params.update({'F': speedBetweenPoints(pt, p1, hSpeed, vSpeed)})
+            commands.append(Path.Command('G1', params))
+            continue
+
+        p2 = edge.valueAt((first + last)/2)
         p3 = pt
-
-        if (type(edge.Curve) == Part.Circle and isRoughly(edge.Curve.Axis.x, 0) and isRoughly(edge.Curve.Axis.y, 0)) or (useHelixForBSpline and type(edge.Curve) == Part.BSplineCurve):
+        if (kind == Part.Circle and isRoughly(curve.Axis.x, 0) and isRoughly(curve.Axis.y, 0)) or (useHelixForBSpline and kind == Part.BSplineCurve):
             # This is an arc or a helix and it should be represented by a simple G2/G3 command
-            if edge.Curve.Axis.z < 0:
+            if curve.Axis.z < 0:
                 cmd = 'G2' if not flip else 'G3'
             else:
                 cmd = 'G3' if not flip else 'G2'
 
             if pointsCoincide(p1, p3):
                 # A full circle
-                offset = edge.Curve.Center - pt
+                offset = curve.Center - pt
             else:
-                pd = Part.Circle(xy(p1), xy(p2), xy(p3)).Center
-                PathLog.debug("**** %s.%d: (%.2f, %.2f, %.2f) - (%.2f, %.2f, %.2f) - (%.2f, %.2f, %.2f) -> center=(%.2f, %.2f)" % (cmd, flip, p1.x, p1.y, p1.z, p2.x, p2.y, p2.z, p3.x, p3.y, p3.z, pd.x, pd.y))
-
-                # Have to calculate the center in the XY plane, using pd leads to an error if this is a helix
-                pa = xy(p1)
-                pb = xy(p2)
-                pc = xy(p3)
-                offset = Part.Circle(pa, pb, pc).Center - pa
-
-                PathLog.debug("**** (%.2f, %.2f, %.2f) - (%.2f, %.2f, %.2f)" % (pa.x, pa.y, pa.z, pc.x, pc.y, pc.z))
-                PathLog.debug("**** (%.2f, %.2f, %.2f) - (%.2f, %.2f, %.2f)" % (pb.x, pb.y, pb.z, pd.x, pd.y, pd.z))
-            PathLog.debug("**** (%.2f, %.2f, %.2f)" % (offset.x, offset.y, offset.z))
+                # Have to calculate the center in the XY plane, the center of the points leads to an error if this is a helix
+                offset = _arcOffset(p1, p2, p3)
+            PathLog.debug("**** %s.%d: (%.2f, %.2f, %.2f) - (%.2f, %.2f, %.2f) -> offset=(%.2f, %.2f, %.2f)" % (cmd, flip, p1.x, p1.y, p1.z, p3.x, p3.y, p3.z, offset.x, offset.y, offset.z))
 
             params.update({'I': offset.x, 'J': offset.y, 'K': (p3.z - p1.z)/2})
             # G2/G3 commands are always performed at hSpeed
             if hSpeed > 0:
                 params.update({'F': hSpeed})
-            commands = [ Path.Command(cmd, params) ]
-
+            commands.append(Path.Command(cmd, params))
+            continue
+
+        # We're dealing with a helix or a more complex shape and it has to get approximated
+        # by a number of straight segments
+        chord = (p3 - p1).Length
+        deviation = (p2 - (p1 + p3) * 0.5).Length
+        if isRoughly(deviation, 0):
+            commands.append(Path.Command('G1', {'X': p3.x, 'Y': p3.y, 'Z': p3.z}))
+            continue
+        # at this point pixellation is all we can do
+        if deflection:
+            points = edge.discretize(Deflection=deflection)
         else:
-            # We're dealing with a helix or a more complex shape and it has to get approximated
-            # by a number of straight segments
-            eStraight = Part.Edge(Part.LineSegment(p1, p3))
-            esP2 = eStraight.valueAt((eStraight.FirstParameter + eStraight.LastParameter)/2)
-            deviation = (p2 - esP2).Length
-            if isRoughly(deviation, 0):
-                return [ Path.Command('G1', {'X': p3.x, 'Y': p3.y, 'Z': p3.z}) ]
-            # at this point pixellation is all we can do
-            commands = []
-            segments = int(math.ceil((deviation / eStraight.Length) * segm))
-            #print("**** pixellation with %d segments" % segments)
-            dParameter = (edge.LastParameter - edge.FirstParameter) / segments
-            # starting point
-            p0 = edge.valueAt(edge.LastParameter) if flip else edge.valueAt(edge.FirstParameter)
-            for i in range(0, segments):
-                if flip:
-                    p = edge.valueAt(edge.LastParameter - (i + 1) * dParameter)
-                else:
-                    p = edge.valueAt(edge.FirstParameter + (i + 1) * dParameter)
-                if hSpeed > 0 and vSpeed > 0:
-                    params.update({'F': speedBetweenPoints(p0, p, hSpeed, vSpeed)})
-                cmd = Path.Command('G1', {'X': p.x, 'Y': p.y, 'Z': p.z})
-                #print("***** %s" % cmd)
-                commands.append(cmd)
-                p0 = p
-    #print commands
+            segments = int(math.ceil((deviation / chord) * segm)) if not isRoughly(chord, 0) else segm
+            points = edge.discretize(Number=segments + 1)
+        if flip:
+            points.reverse()
+        for p in points[1:]:
+            commands.append(Path.Command('G1', {'X': p.x, 'Y': p.y, 'Z': p.z}))
     return commands
 
 def edgeForCmd(cmd, startPoint):
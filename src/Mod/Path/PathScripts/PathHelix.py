@@ -197,6 +197,7 @@ def SetupProperties():
     setup.append("Direction")
     setup.append("StartSide")
     setup.append("StepOver")
+    setup.append("OrderOptimizationTime")
     return setup
 
 def Create(name, obj = None):
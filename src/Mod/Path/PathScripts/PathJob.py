@@ -108,6 +108,7 @@ class ObjectJob:
         obj.addProperty("App::PropertyStringList", "Fixtures", "WCS", QtCore.QT_TRANSLATE_NOOP("PathJob", "The Work Coordinate Systems for the Job"))
         obj.OrderOutputBy = ['Fixture', 'Tool', 'Operation']
         obj.Fixtures = ['G54']
+        self.setupOptimizeRapids(obj)
 
         obj.PostProcessorOutputFile = PathPreferences.defaultOutputFile()
         #obj.setEditorMode("PostProcessorOutputFile", 0)  # set to default mode
@@ -153,6 +154,11 @@ class ObjectJob:
                 PathIconViewProvider.Attach(obj.SetupSheet.ViewObject, 'SetupSheet')
         self.setupSheet = obj.SetupSheet.Proxy
 
+    def setupOptimizeRapids(self, obj):
+        if not hasattr(obj, 'OptimizeRapids'):
+            obj.addProperty('App::PropertyBool', 'OptimizeRapids', 'Output', QtCore.QT_TRANSLATE_NOOP('PathJob', 'Reorder the cutting segments of the operations and lower the rapid moves between them when posting'))
+            obj.OptimizeRapids = False
+
     def setupBaseModel(self, obj, models=None):
         PathLog.track(obj.Label, models)
         if not hasattr(obj, 'Model'):
@@ -243,6 +249,7 @@ class ObjectJob:
         self.setupBaseModel(obj)
         self.fixupOperations(obj)
         self.setupSetupSheet(obj)
+        self.setupOptimizeRapids(obj)
         obj.setEditorMode('Operations', 2) # hide
         obj.setEditorMode('Placement', 2)
 
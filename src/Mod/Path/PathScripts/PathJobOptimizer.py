@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2019 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+
+import Path
+import PathScripts.PathLog as PathLog
+import PathScripts.PathStatistics as PathStatistics
+import PathScripts.PathUtil as PathUtil
+import math
+import numpy
+
+__title__ = "PathJobOptimizer - rapid move optimization of a job"
+__author__ = "FreeCAD Developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Reordering of the cutting segments of the operations of a job and lowering of the rapid moves between them."
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+
+# The path of an operation is split into segments at the moves which retract the
+# tool to ClearanceHeight. The rapid moves between the segments are dropped, the
+# segments reordered by a nearest neighbour search and linked again by rapid moves.
+#
+# A segment has to stay after all earlier segments whose area, grown by the tool
+# radius, overlaps its own area - which keeps the step downs of a region in order.
+# The segments are never reversed and the operations keep their order, the end of
+# an operation is the start of the search of the next one until the tool changes.
+# Every operation still moves to its first segment, the post processor may output
+# it on its own, for each fixture or after another one.
+#
+# A link between two segments is lowered to SafeHeight if it is clear of the stock,
+# that is SafeHeight isn't below the top of the stock and the link stays within its
+# bounding box, so no fixture can be in its way.
+
+Tolerance = 0.0001
+
+RapidCommands = ['G0', 'G00']
+FeedCommands = ['G1', 'G01', 'G2', 'G02', 'G3', 'G03']
+ArcCommands = ['G2', 'G02', 'G3', 'G03']
+
+
+class Segment(object):
+    '''Segment(start) ... commands cutting from leaving ClearanceHeight at start until retracting to it again.'''
+
+    def __init__(self, start):
+        self.start = start
+        self.end = start
+        self.commands = []
+        self.box = [start[0], start[1], start[0], start[1]]
+
+    def add(self, cmd, end):
+        self.commands.append(cmd)
+        points = [end]
+        if cmd.Name in ArcCommands:
+            # the bounding box of the full circle
+            cx = self.end[0] + cmd.Parameters.get('I', 0)
+            cy = self.end[1] + cmd.Parameters.get('J', 0)
+            r = math.hypot(self.end[0] - cx, self.end[1] - cy)
+            points.extend([(cx - r, cy - r), (cx + r, cy + r)])
+        for x, y in ((p[0], p[1]) for p in points):
+            self.box = [min(self.box[0], x), min(self.box[1], y), max(self.box[2], x), max(self.box[3], y)]
+        self.end = end
+
+    def canLowerExit(self):
+        '''canLowerExit() ... return True if the segment ends with a vertical rapid retract.'''
+        last = self.commands[-1]
+        return last.Name in RapidCommands and list(last.Parameters.keys()) == ['Z']
+
+    def canLowerEntry(self):
+        '''canLowerEntry() ... return True if the segment starts with a straight move to an absolute height.'''
+        first = self.commands[0]
+        return first.Name in RapidCommands + ['G1', 'G01'] and 'Z' in first.Parameters
+
+
+def moveEnd(cmd, position):
+    '''moveEnd(cmd, position) ... return the position (x, y, z) after cmd, unknown coordinates are None.'''
+    return tuple(cmd.Parameters.get(axis, position[i]) for i, axis in enumerate('XYZ'))
+
+
+def coincide(p0, p1):
+    '''coincide(p0, p1) ... return True if the positions p0 and p1 are known and have the same X and Y.'''
+    if None in p0[:2] or None in p1[:2]:
+        return False
+    return abs(p0[0] - p1[0]) < Tolerance and abs(p0[1] - p1[1]) < Tolerance
+
+
+def splitPath(commands, clearance, start=(None, None, None)):
+    '''splitPath(commands, clearance, start=(None, None, None)) ... return (prefix, segments, suffix, end) of the commands,
+    or None if they can't be reordered. The prefix keeps its moves but their X and Y, suffix is kept as is.'''
+    prefix = []
+    segments = []
+    pending = []
+    segment = None
+    position = tuple(start)
+    for cmd in commands:
+        if cmd.Name.startswith('('):
+            (segment.commands if segment else pending).append(cmd)
+            continue
+        if cmd.Name not in RapidCommands + FeedCommands:
+            return None
+        end = moveEnd(cmd, position)
+        if segment:
+            segment.add(cmd, end)
+            if end[2] >= clearance - Tolerance:
+                segments.append(segment)
+                segment = None
+        elif position[2] is None:
+            # the height is unknown, this can't be a link
+            if segments:
+                return None
+            prefix.extend(pending)
+            prefix.append(cmd)
+            pending = []
+        elif cmd.Name in RapidCommands and end[2] >= clearance - Tolerance:
+            # rapid move above ClearanceHeight
+            if segments:
+                pending.append(cmd)
+            else:
+                prefix.extend(pending)
+                pending = []
+                if 'Z' in cmd.Parameters:
+                    prefix.append(Path.Command(cmd.Name, {'Z': end[2]}))
+        else:
+            if position[0] is None or position[1] is None:
+                return None
+            segment = Segment(position)
+            segment.commands.extend(c for c in pending if c.Name.startswith('('))
+            pending = []
+            segment.add(cmd, end)
+        position = end
+    if segment:
+        return None
+    if not segments:
+        return None
+    # the moves after the last segment stay
+    return (prefix, segments, pending, position)
+
+
+def precedence(segments, radius):
+    '''precedence(segments, radius) ... return the list of the indexes of the later segments each segment has to precede,
+    the segments whose bounding boxes grown by radius overlap.'''
+    boxes = numpy.array([s.box for s in segments], dtype=float).reshape(-1, 4)
+    boxes[:, :2] -= radius
+    boxes[:, 2:] += radius
+    successors = []
+    for i in range(len(segments)):
+        later = boxes[i + 1:]
+        overlap = (later[:, 0] <= boxes[i, 2]) & (later[:, 2] >= boxes[i, 0]) & (later[:, 1] <= boxes[i, 3]) & (later[:, 3] >= boxes[i, 1])
+        successors.append((numpy.nonzero(overlap)[0] + i + 1).tolist())
+    return successors
+
+
+def orderSegments(segments, origin, radius):
+    '''orderSegments(segments, origin, radius) ... return the order of the segments, starting at origin the next one is
+    the nearest segment all of whose predecessors are done.'''
+    successors = precedence(segments, radius)
+    count = numpy.zeros(len(segments), dtype=int)
+    for later in successors:
+        count[later] += 1
+    starts = numpy.array([s.start[:2] for s in segments], dtype=float).reshape(-1, 2)
+    done = numpy.zeros(len(segments), dtype=bool)
+    order = []
+    x, y = origin
+    while len(order) < len(segments):
+        distance = (starts[:, 0] - x) ** 2 + (starts[:, 1] - y) ** 2
+        distance[done | (count > 0)] = numpy.inf
+        i = int(numpy.argmin(distance))
+        done[i] = True
+        order.append(i)
+        count[successors[i]] -= 1
+        x, y = segments[i].end[:2]
+    return order
+
+
+def linkDistance(segments, order, origin):
+    '''linkDistance(segments, order, origin) ... return the length of the moves from origin through the segments in order.'''
+    length = 0.0
+    x, y = origin
+    for i in order:
+        length += math.hypot(segments[i].start[0] - x, segments[i].start[1] - y)
+        x, y = segments[i].end[:2]
+    return length
+
+
+def isClear(p0, p1, height, stock):
+    '''isClear(p0, p1, height, stock) ... return True if the rapid move from p0 to p1 at height can't hit the stock
+    nor a fixture, stock being the bounding box (xmin, ymin, zmin, xmax, ymax, zmax) of the stock.'''
+    if stock is None or height < stock[5]:
+        return False
+    return all(stock[0] <= p[0] <= stock[3] and stock[1] <= p[1] <= stock[4] for p in (p0, p1))
+
+
+def optimizeCommands(commands, clearance, safe, radius, start=(None, None, None), stock=None):
+    '''optimizeCommands(commands, clearance, safe, radius, start=(None, None, None), stock=None) ... return the commands
+    with their segments reordered and linked, and the position at their end. The commands are returned unchanged if
+    they can't be reordered.'''
+    split = splitPath(commands, clearance, start)
+    if split is None:
+        return (list(commands), pathEnd(commands, start))
+    prefix, segments, suffix, end = split
+
+    origin = start[:2] if start[0] is not None and start[1] is not None else segments[0].start[:2]
+    order = orderSegments(segments, origin, radius)
+    if linkDistance(segments, order, origin) >= linkDistance(segments, range(len(segments)), origin) - Tolerance:
+        order = list(range(len(segments)))
+
+    result = list(prefix)
+    position = pathEnd(prefix, start)
+    previous = None
+    for i in order:
+        segment = segments[i]
+        entry = segment.start
+        height = position[2]
+        lowered = previous is not None and previous.canLowerExit() and segment.canLowerEntry()
+        lowered = lowered and safe < height - Tolerance and isClear(position, entry, safe, stock)
+        if lowered:
+            # retract the previous segment to SafeHeight only
+            result[-1] = Path.Command(result[-1].Name, {'Z': safe})
+        elif entry[2] > height + Tolerance:
+            result.append(Path.Command('G0', {'Z': entry[2]}))
+        if previous is None or not coincide(position, entry):
+            # the first segment is always positioned, the post processor might start the op anywhere
+            result.append(Path.Command('G0', {'X': entry[0], 'Y': entry[1]}))
+        if not lowered and entry[2] < height - Tolerance:
+            result.append(Path.Command('G0', {'Z': entry[2]}))
+        result.extend(segment.commands)
+        position = segment.end
+        previous = segment
+    result.extend(suffix)
+    return (result, pathEnd(result, start))
+
+
+def pathEnd(commands, start=(None, None, None)):
+    '''pathEnd(commands, start=(None, None, None)) ... return the position after the commands.'''
+    position = tuple(start)
+    for cmd in commands:
+        if cmd.Name in RapidCommands + FeedCommands:
+            position = moveEnd(cmd, position)
+    return position
+
+
+def rapidTime(commands, start, hRapid, vRapid):
+    '''rapidTime(commands, start, hRapid, vRapid) ... return (distance, seconds) of the rapid moves of the commands,
+    moves from an unknown position and axes without rate aren't accounted for.'''
+    stats = PathStatistics.pathStatistics(commands, start, hRapid, vRapid)[0]
+    return (stats.rapidDistance, stats.rapidTime)
+
+
+class OptimizedOperation(object):
+    '''OptimizedOperation(op, path) ... stand-in of op with the optimized path, for the post processor.'''
+
+    def __init__(self, op, path):
+        self.Operation = op
+        self.Path = path
+
+    def __getattr__(self, name):
+        return getattr(self.Operation, name)
+
+
+def heightsOfOp(op):
+    '''heightsOfOp(op) ... return (ClearanceHeight, SafeHeight) of op or its base op, None if it has none.'''
+    while op is not None and not (hasattr(op, 'ClearanceHeight') and hasattr(op, 'SafeHeight')):
+        op = getattr(op, 'Base', None)
+    if op is None:
+        return None
+    return (op.ClearanceHeight.Value, op.SafeHeight.Value)
+
+
+def ratesOfToolController(tc):
+    '''ratesOfToolController(tc) ... return the horizontal and vertical rapid rate of tc in mm/s, its feed rate if it
+    has no rapid rate set.'''
+    hRapid = tc.HorizRapid.Value if tc.HorizRapid.Value > 0 else tc.HorizFeed.Value
+    vRapid = tc.VertRapid.Value if tc.VertRapid.Value > 0 else tc.VertFeed.Value
+    return (hRapid, vRapid)
+
+
+def optimizeJob(job, ops=None):
+    '''optimizeJob(job, ops=None) ... return the operations of job, or ops, with the ones whose rapid moves could be
+    shortened replaced by an OptimizedOperation, and the estimated seconds saved.'''
+    if ops is None:
+        ops = job.Operations.Group
+    bb = job.Stock.Shape.BoundBox
+    stock = (bb.XMin, bb.YMin, bb.ZMin, bb.XMax, bb.YMax, bb.ZMax)
+
+    result = []
+    saved = 0.0
+    position = (None, None, None)
+    tool = None
+    for op in ops:
+        tc = PathUtil.toolControllerForOp(op)
+        if tc is None or tc.ToolNumber != tool:
+            # the tool change moves the tool to an unknown position
+            position = (None, None, None)
+            tool = tc.ToolNumber if tc is not None else None
+        heights = heightsOfOp(op)
+        commands = op.Path.Commands
+        if tc is None or heights is None:
+            result.append(op)
+            position = pathEnd(commands, position)
+            continue
+
+        radius = float(tc.Tool.Diameter) / 2
+        optimized, end = optimizeCommands(commands, heights[0], heights[1], radius, position, stock)
+        rates = ratesOfToolController(tc)
+        before = rapidTime(commands, position, *rates)
+        after = rapidTime(optimized, position, *rates)
+        if after[0] < before[0] - Tolerance:
+            PathLog.info("{}: rapid moves {:.1f} mm -> {:.1f} mm, {:.1f} s saved".format(op.Label, before[0], after[0], before[1] - after[1]))
+            saved += before[1] - after[1]
+            result.append(OptimizedOperation(op, Path.Path(optimized)))
+            position = end
+        else:
+            result.append(op)
+            position = pathEnd(commands, position)
+    PathLog.info("{}: estimated cycle time saved by the rapid move optimization {:.1f} s".format(job.Label, saved))
+    return (result, saved)
@@ -29,6 +29,7 @@ import FreeCAD
 import FreeCADGui
 import Path
 import PathScripts.PathJob as PathJob
+import PathScripts.PathJobOptimizer as PathJobOptimizer
 import PathScripts.PathLog as PathLog
 import PathScripts.PathPreferences as PathPreferences
 import PathScripts.PathUtil as PathUtil
@@ -276,6 +277,11 @@ class CommandPathPost:
         else:
             split = False
 
+        operations = job.Operations.Group
+        if getattr(job, "OptimizeRapids", False):
+            # optimizeJob logs the time saved
+            operations = PathJobOptimizer.optimizeJob(job)[0]
+
         postlist = []
 
         if orderby == 'Fixture':
@@ -294,7 +300,7 @@ class CommandPathPost:
                 sublist = [fobj]
 
                 # Now generate the gcode
-                for obj in job.Operations.Group:
+                for obj in operations:
                     tc = PathUtil.toolControllerForOp(obj)
                     if tc is not None:
                         if tc.ToolNumber != currTool:
@@ -325,7 +331,7 @@ class CommandPathPost:
             curlist = []  # list of ops for tool, will repeat for each fixture
             sublist = []  # list of ops for output splitting
 
-            for idx, obj in enumerate(job.Operations.Group):
+            for idx, obj in enumerate(operations):
                 tc = PathUtil.toolControllerForOp(obj)
                 if tc is None or tc.ToolNumber == currTool:
                     curlist.append(obj)
@@ -342,7 +348,7 @@ class CommandPathPost:
                     curlist = [obj]
                     currTool = tc.ToolNumber
 
-                if idx == len(job.Operations.Group) - 1:  # Last operation.
+                if idx == len(operations) - 1:  # Last operation.
                     for fixture in fixturelist:
                         sublist.append(fixture)
                         sublist.extend(curlist)
@@ -364,7 +370,7 @@ class CommandPathPost:
                 fixturelist.append(fobj)
 
             # Now generate the gcode
-            for obj in job.Operations.Group:
+            for obj in operations:
                 sublist = []
                 PathLog.debug("obj: {}".format(obj.Name))
                 for fixture in fixturelist:
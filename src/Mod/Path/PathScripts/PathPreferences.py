@@ -47,6 +47,10 @@ LibAreaCurveAccuracy    = "LibAreaCurveAccuarcy"
 
 EnableExperimentalFeatures = "EnableExperimentalFeatures"
 
+# Results of adaptive clearing stored on disk, shared by all documents
+AdaptiveCacheDirectory  = "AdaptiveCacheDirectory"
+AdaptiveCacheSize       = "AdaptiveCacheSize"
+
 
 def preferences():
     return FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/Path")
@@ -170,3 +174,13 @@ def experimentalFeaturesEnabled():
     except:
         FreeCAD.Console.PrintError("OpenCamLib is not working!\n")
         return False
+
+def adaptiveCacheDirectory():
+    path = preferences().GetString(AdaptiveCacheDirectory, "")
+    if not path:
+        path = os.path.join(FreeCAD.getUserAppDataDir(), "Path", "AdaptiveCache")
+    return path
+
+def adaptiveCacheSize():
+    '''adaptiveCacheSize() ... maximum size of the adaptive cache in MB, 0 disables it.'''
+    return preferences().GetInt(AdaptiveCacheSize, 200)
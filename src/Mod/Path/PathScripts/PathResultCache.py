@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2019 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import PathScripts.PathLog as PathLog
+import gzip
+import hashlib
+import json
+import os
+import sys
+
+__title__ = "PathResultCache - persistent cache of computed results"
+__author__ = "FreeCAD Developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Results of expensive computations stored on disk by the hash of their inputs, shared by all documents."
+
+# Every result is a gzipped JSON file in the cache directory, named by the
+# SHA-256 of the JSON of its key, which has to contain all inputs of the
+# computation. Reading a result touches its file, if the files take more
+# space than allowed the least recently used ones are removed.
+#
+# The files are written to a temporary name first and atomically replace the
+# result, so a cache directory can be shared by several processes or synced
+# between machines.
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+
+Suffix = '.json.gz'
+
+
+def replaceFile(src, dst):
+    '''replaceFile(src, dst) ... rename src to dst, replacing dst if it exists.'''
+    if hasattr(os, 'replace'):
+        os.replace(src, dst)
+        return
+    # Python 2 renames atomically over an existing file, but not on Windows
+    if sys.platform == 'win32' and os.path.exists(dst):
+        os.remove(dst)
+    os.rename(src, dst)
+
+
+class ResultCache(object):
+    '''ResultCache(directory, maxSize) ... cache of JSON serializable results in directory,
+    keeping the most recently used ones up to maxSize bytes.'''
+
+    def __init__(self, directory, maxSize):
+        self.directory = directory
+        self.maxSize = maxSize
+
+    def digest(self, key):
+        '''digest(key) ... return the hash of key, a JSON serializable object.'''
+        text = json.dumps(key, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def fileName(self, digest):
+        return os.path.join(self.directory, digest + Suffix)
+
+    def get(self, key):
+        '''get(key) ... return the result stored for key, None if there is none.'''
+        name = self.fileName(self.digest(key))
+        if not os.path.isfile(name):
+            return None
+        try:
+            with gzip.open(name, 'rb') as fp:
+                result = json.loads(fp.read().decode('utf-8'))
+            os.utime(name, None)
+            return result
+        except (IOError, OSError, ValueError) as e:
+            PathLog.warning("ignoring broken cache file %s: %s" % (name, e))
+            return None
+
+    def put(self, key, result):
+        '''put(key, result) ... store result for key and remove the least recently used results if the cache is too big.'''
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        name = self.fileName(self.digest(key))
+        temp = "%s.%d.tmp" % (name, os.getpid())
+        try:
+            with gzip.open(temp, 'wb') as fp:
+                fp.write(json.dumps(result, separators=(',', ':')).encode('utf-8'))
+            replaceFile(temp, name)
+        finally:
+            if os.path.exists(temp):
+                os.remove(temp)
+        self.evict()
+
+    def entries(self):
+        '''entries() ... return the list of (access time, size, file name) of the cached results.'''
+        entries = []
+        if os.path.isdir(self.directory):
+            for f in os.listdir(self.directory):
+                if f.endswith(Suffix):
+                    name = os.path.join(self.directory, f)
+                    try:
+                        st = os.stat(name)
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, name))
+        return entries
+
+    def evict(self):
+        '''evict() ... remove the least recently used results until the cache is no bigger than maxSize.'''
+        entries = sorted(self.entries())
+        size = sum(e[1] for e in entries)
+        for mtime, length, name in entries:
+            if size <= self.maxSize:
+                break
+            try:
+                os.remove(name)
+            except OSError:
+                pass
+            size -= length
+
+    def clear(self):
+        '''clear() ... remove all cached results.'''
+        for mtime, length, name in self.entries():
+            os.remove(name)
@@ -31,6 +31,7 @@ import FreeCAD
 import FreeCADGui
 import PathScripts
 import PathScripts.PathLog as PathLog
+import PathScripts.PathStatistics as PathStatistics
 # import PathScripts.PathCollision as PC
 # Qt translation handling
 def translate(context, text, disambig=None):
@@ -140,9 +141,32 @@ class CommandPathSanity:
             FreeCAD.Console.PrintWarning(translate("Path_Sanity", "A Tool Controller was not found. Default values are used which is dangerous. Please add a Tool Controller.")+"\n")
             clean = False
 
+        self.__reportStatistics(obj)
+
         if clean:
             FreeCAD.Console.PrintMessage(translate("Path_Sanity", "No issues detected, {} has passed basic sanity check.").format(obj.Label))
 
+    def __reportStatistics(self, obj):
+        "prints the estimated cycle time and distances of the job, its operations and tools"
+        ops = [op for op in obj.Operations.Group if getattr(op, 'Active', True)]
+        total, operations, tools = PathStatistics.jobStatistics(obj, ops=ops)
+
+        def line(label, stats):
+            zRange = '-'
+            if stats.zMin is not None:
+                zRange = "{:.2f} .. {:.2f}".format(stats.zMin, stats.zMax)
+            return "  {}: {}, rapid {:.1f} mm, feed {:.1f} mm, Z {}\n".format(label, PathStatistics.formatTime(stats.time), stats.rapidDistance, stats.feedDistance, zRange)
+
+        FreeCAD.Console.PrintMessage(translate("Path_Sanity", "Estimated cycle time of {}: {}").format(obj.Label, PathStatistics.formatTime(total.time))+"\n")
+        FreeCAD.Console.PrintMessage(translate("Path_Sanity", "Operations:")+"\n")
+        for op, stats in operations:
+            FreeCAD.Console.PrintMessage(line(op.Label, stats))
+        FreeCAD.Console.PrintMessage(translate("Path_Sanity", "Tools:")+"\n")
+        for tc, stats in tools:
+            FreeCAD.Console.PrintMessage(line("T{} {}".format(tc.ToolNumber, tc.Label), stats))
+        if total.feedDistance > 0 and any(tc.HorizRapid == 0 for tc, stats in tools):
+            FreeCAD.Console.PrintWarning(translate("Path_Sanity", "Rapid moves of Tool Controllers without rapid rates aren't included in the cycle time.")+"\n")
+
     def __checkTC(self, tc):
         clean = True
         if tc.ToolNumber == 0:
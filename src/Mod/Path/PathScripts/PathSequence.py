@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2019 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import math
+import numpy
+import time
+
+__title__ = "PathSequence - ordering of locations"
+__author__ = "FreeCAD Developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Nearest neighbour ordering of locations and 2-opt shortening of the rapid moves between them."
+
+# The locations are binned into a uniform grid of a few locations per cell.
+# A nearest neighbour search walks the rings of cells around the current location
+# until no location in the next ring can be closer than the best one found.
+#
+# The 2-opt pass reverses a section of the order if that shortens the path, only
+# the moves connecting a location with one of its nearest neighbours are tried.
+# The origin the path starts from stays first, the end of the path is open.
+
+Neighbours = 8      # neighbours of each location tried by the 2-opt pass
+
+
+class LocationGrid(object):
+    '''LocationGrid(points, density=2.0) ... bucket grid of the (x, y) points with about density points per cell,
+    the points can be removed.'''
+
+    def __init__(self, points, density=2.0):
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        self.x0 = min(xs)
+        self.y0 = min(ys)
+        width = max(xs) - self.x0
+        height = max(ys) - self.y0
+        self.size = max(math.sqrt(density * width * height / len(points)), density * max(width, height) / len(points), 1e-9)
+        self.cols = int(width / self.size) + 1
+        self.rows = int(height / self.size) + 1
+        self.points = points
+        self.cells = {}
+        for i, (x, y) in enumerate(points):
+            self.cells.setdefault(self.cell(x, y), []).append(i)
+        self.count = len(points)
+
+    def cell(self, x, y):
+        return (int(math.floor((x - self.x0) / self.size)), int(math.floor((y - self.y0) / self.size)))
+
+    def center(self, i, j):
+        return (self.x0 + (i + 0.5) * self.size, self.y0 + (j + 0.5) * self.size)
+
+    def remove(self, i):
+        key = self.cell(*self.points[i])
+        cell = self.cells[key]
+        cell.remove(i)
+        if not cell:
+            del self.cells[key]
+        self.count -= 1
+
+    def rings(self, x, y):
+        '''rings(x, y) ... generator of (distance, indexes), the points of the rings of cells around (x, y),
+        the points of the ring and all later rings are at least distance away from (x, y).'''
+        ci, cj = self.cell(x, y)
+        first = max(0, -ci, ci - self.cols + 1, -cj, cj - self.rows + 1)
+        last = max(ci, self.cols - 1 - ci, cj, self.rows - 1 - cj)
+        for r in range(first, last + 1):
+            ring = []
+            for i in range(max(ci - r, 0), min(ci + r, self.cols - 1) + 1):
+                if abs(i - ci) == r:
+                    js = range(max(cj - r, 0), min(cj + r, self.rows - 1) + 1)
+                else:
+                    js = [j for j in (cj - r, cj + r) if 0 <= j < self.rows]
+                for j in js:
+                    cell = self.cells.get((i, j))
+                    if cell:
+                        ring.extend(cell)
+            yield max(r - 1, 0) * self.size, ring
+
+    def nearest(self, x, y, weights=None, weight=0.0, slope=0.0):
+        '''nearest(x, y, weights=None, weight=0.0, slope=0.0) ... return the index of the point with the least
+        squared distance from (x, y) plus its weight, the lowest index of equal ones.
+        The weights must not be negative nor less than weight - slope * distance from (x, y).'''
+        best = None
+        for distance, ring in self.rings(x, y):
+            if best is not None:
+                # least cost of the points at distance or further away
+                bound = distance * distance
+                if weights is not None and slope > 0.0:
+                    d = max(distance, slope / 2.0)
+                    bound = max(bound, d * d - slope * d + weight)
+                if bound > best[0]:
+                    break
+            for i in ring:
+                px, py = self.points[i]
+                cost = 0
+                cost += (px - x) ** 2
+                cost += (py - y) ** 2
+                if weights is not None:
+                    cost += weights[i]
+                if best is None or (cost, i) < best:
+                    best = (cost, i)
+        return None if best is None else best[1]
+
+
+def nearestNeighbourOrder(points, origin=(0.0, 0.0), weights=None, slope=0.0):
+    '''nearestNeighbourOrder(points, origin=(0.0, 0.0), weights=None, slope=0.0) ... return the order of the points,
+    starting at origin the next point is the one with the least squared distance plus weight.
+    With a slope the weight of a point is at least the weight of the previous point minus slope times their distance.'''
+    if not points:
+        return []
+    grid = LocationGrid(points)
+    order = []
+    x, y = origin
+    weight = 0.0
+    while grid.count:
+        i = grid.nearest(x, y, weights, weight, slope if order else 0.0)
+        grid.remove(i)
+        order.append(i)
+        x, y = points[i]
+        if weights is not None:
+            weight = weights[i]
+    return order
+
+
+def rapidDistance(points, order, origin=(0.0, 0.0)):
+    '''rapidDistance(points, order, origin=(0.0, 0.0)) ... return the length of the path from origin through the points in order.'''
+    length = 0.0
+    x, y = origin
+    for i in order:
+        px, py = points[i]
+        length += math.hypot(px - x, py - y)
+        x, y = px, py
+    return length
+
+
+def neighbours(points, count):
+    '''neighbours(points, count) ... return the indexes of the count nearest points of every point, searched
+    in the cells around the cell of the point holding more than count points and one more ring of cells.'''
+    grid = LocationGrid(points, 2.0 * count)
+    xy = numpy.array(points, dtype=float).reshape(-1, 2)
+    result = [[]] * len(points)
+    for (ci, cj), cell in grid.cells.items():
+        candidates = []
+        for distance, ring in grid.rings(*grid.center(ci, cj)):
+            enough = len(candidates) > count
+            candidates.extend(ring)
+            if enough:
+                break
+        if len(candidates) < 2:
+            continue
+        candidates = numpy.array(candidates)
+        d = ((xy[cell][:, None, :] - xy[candidates][None, :, :]) ** 2).sum(axis=2)
+        d[candidates[None, :] == numpy.array(cell)[:, None]] = numpy.inf
+        k = min(count, len(candidates) - 1)
+        nearest = candidates[numpy.argsort(d, axis=1)[:, :k]]
+        for i, row in zip(cell, nearest.tolist()):
+            result[i] = row
+    return result
+
+
+def twoOpt(points, order, origin=(0.0, 0.0), timeLimit=1.0):
+    '''twoOpt(points, order, origin=(0.0, 0.0), timeLimit=1.0) ... return the order shortened by reversing sections
+    of it, until no reversal connecting a point with one of its nearest neighbours helps or timeLimit seconds passed.'''
+    if len(order) < 3:
+        return list(order)
+    end = time.time() + timeLimit
+    # the origin is node n, always first
+    n = len(points)
+    nodes = list(points) + [origin]
+    tour = [n] + list(order)
+    last = len(tour) - 1
+    pos = [0] * (n + 1)
+    for k, node in enumerate(tour):
+        pos[node] = k
+    near = neighbours(points, Neighbours)
+
+    def dist(a, b):
+        return math.hypot(nodes[a][0] - nodes[b][0], nodes[a][1] - nodes[b][1])
+
+    def edge(k):
+        # length of the move from position k to the next one
+        return dist(tour[k], tour[k + 1]) if k < last else 0.0
+
+    queue = list(order)
+    queued = [True] * n
+    while queue and time.time() < end:
+        a = queue.pop()
+        queued[a] = False
+        for c in near[a]:
+            pa = pos[a]
+            pc = pos[c]
+            # connect a and c, either replacing the moves leaving them or the moves arriving at them
+            moves = [(min(pa, pc), max(pa, pc))]
+            if min(pa, pc) > 1:
+                moves.append((min(pa, pc) - 1, max(pa, pc) - 1))
+            improved = False
+            for i, j in moves:
+                if j - i < 2:
+                    continue
+                gain = edge(i) + edge(j) - dist(tour[i], tour[j]) - (dist(tour[i + 1], tour[j + 1]) if j < last else 0.0)
+                if gain > 1e-9:
+                    tour[i + 1:j + 1] = tour[j:i:-1]
+                    for k in range(i + 1, j + 1):
+                        pos[tour[k]] = k
+                    for node in (tour[i], tour[i + 1], tour[j], tour[j + 1] if j < last else n):
+                        if node != n and not queued[node]:
+                            queued[node] = True
+                            queue.append(node)
+                    improved = True
+                    break
+            if improved:
+                break
+    return tour[1:]
@@ -2,6 +2,7 @@ import FreeCAD
 import Mesh
 import Part
 import Path
+import PathScripts.PathDexelSim as PathDexelSim
 import PathScripts.PathDressup as PathDressup
 import PathScripts.PathGeom as PathGeom
 import PathScripts.PathLog as PathLog
@@ -19,6 +20,11 @@ if FreeCAD.GuiUp:
 
 # compiled with pyrcc4 -py3 Resources\CAM_Sim.qrc -o CAM_Sim_rc.py
 
+# index of the Dexel entry of comboMode
+DexelMode = 1
+# commands simulated by Dexel between two meshes of the stock while playing
+DexelMeshSteps = 25
+
 
 class CAMSimTaskUi:
     def __init__(self, parent):
@@ -72,6 +78,7 @@ class PathSimulation:
         form.sliderAccuracy.valueChanged.connect(self.onAccuracyBarChange)
         self.onAccuracyBarChange()
         form.comboJobs.currentIndexChanged.connect(self.onJobChange)
+        form.comboMode.currentIndexChanged.connect(self.onModeChange)
         jobList = FreeCAD.ActiveDocument.findObjects("Path::FeaturePython", "Job.*")
         form.comboJobs.clear()
         self.jobs = []
@@ -81,8 +88,11 @@ class PathSimulation:
         FreeCADGui.Control.showDialog(self.taskForm)
         self.disableAnim = False
         self.isVoxel = True
+        self.isDexel = form.comboMode.currentIndex() == DexelMode
         self.firstDrill = True
         self.voxSim = PathSimulator.PathSim()
+        self.dexelSim = None
+        self.dexelModel = None
         self.SimulateMill()
         self.initdone = True
 
@@ -98,7 +108,19 @@ class PathSimulation:
                 self.numCommands += len(self.operations[i].Path.Commands)
 
         self.stock = self.job.Stock.Shape
-        if (self.isVoxel):
+        if self.isDexel:
+            maxlen = max(self.stock.BoundBox.XLength, self.stock.BoundBox.YLength)
+            stock = PathDexelSim.DexelStock.fromBoundBox(self.stock.BoundBox, 0.01 * self.accuracy * maxlen)
+            # the height field of the models only changes with the job and the resolution
+            key = (self.job.Name, stock.resolution)
+            if self.dexelModel is None or self.dexelModel[0] != key:
+                self.dexelModel = (key, PathDexelSim.modelHeights(stock, PathDexelSim.modelTriangles(self.job)))
+            self.dexelSim = PathDexelSim.Simulation(stock, self.dexelModel[1])
+            self.dexelSim.position = (self.initialPos.x, self.initialPos.y, self.initialPos.z)
+            self.dexelSteps = 0
+            self.cutMaterial.Mesh = stock.mesh()
+            self.cutMaterialIn.Mesh = Mesh.Mesh()
+        elif (self.isVoxel):
             maxlen = self.stock.BoundBox.XLength
             if (maxlen < self.stock.BoundBox.YLength):
                 maxlen = self.stock.BoundBox.YLength
@@ -129,6 +151,8 @@ class PathSimulation:
             self.cutTool.Shape = Part.makeSolid(toolProf.revolve(Vector(0, 0, 0), Vector(0, 0, 1)))
             self.cutTool.ViewObject.show()
             self.voxSim.SetCurrentTool(self.tool)
+            if self.isDexel:
+                self.dexelSim.setTool(self.tool)
         self.icmd = 0
         self.curpos = FreeCAD.Placement(self.initialPos, self.stdrot)
         # self.cutTool.Placement = FreeCAD.Placement(self.curpos, self.stdrot)
@@ -276,8 +300,41 @@ class PathSimulation:
                 self.SetupOperation(self.ioperation)
         self.busy = False
 
+    def PerformCutDexel(self):
+        if self.resetSimulation:
+            self.resetSimulation = False
+            self.SetupSimulation()
+
+        if self.busy:
+            return
+        self.busy = True
+
+        cmd = self.opCommands[self.icmd]
+        pos = self.dexelSim.applyCommand(cmd, self.operation.Label, self.icmd)
+        if not self.disableAnim and None not in pos:
+            self.cutTool.Placement = FreeCAD.Placement(Vector(pos[0], pos[1], pos[2]), self.stdrot)
+            # meshing the whole stock costs more than simulating a command, while playing
+            # it is only redone every DexelMeshSteps commands, when pausing and at the end
+            self.dexelSteps += 1
+            if self.dexelSteps >= DexelMeshSteps or not self.timer.isActive():
+                self.dexelSteps = 0
+                self.cutMaterial.Mesh = self.dexelSim.stock.mesh()
+        self.icmd += 1
+        self.iprogress += 1
+        self.UpdateProgress()
+        if self.icmd >= len(self.opCommands):
+            self.ioperation += 1
+            if self.ioperation >= len(self.activeOps):
+                self.EndSimulation()
+                return
+            else:
+                self.SetupOperation(self.ioperation)
+        self.busy = False
+
     def PerformCut(self):
-        if (self.isVoxel):
+        if self.isDexel:
+            self.PerformCutDexel()
+        elif (self.isVoxel):
             self.PerformCutVoxel()
         else:
             self.PerformCutBoolean()
@@ -451,6 +508,11 @@ class PathSimulation:
         if  self.initdone:
           self.SetupSimulation()
 
+    def onModeChange(self):
+        self.isDexel = self.taskForm.form.comboMode.currentIndex() == DexelMode
+        if self.initdone:
+            self.SetupSimulation()
+
     def onSpeedBarChange(self):
         form = self.taskForm.form
         self.simperiod = 1000 / form.sliderSpeed.value()
@@ -476,6 +538,9 @@ class PathSimulation:
         self.timer.stop()
         self.GuiBusy(False)
         self.ViewShape()
+        if self.isDexel and self.dexelSim is not None and self.iprogress >= self.numCommands:
+            for line in self.dexelSim.report():
+                FreeCAD.Console.PrintWarning(line + "\n")
         self.resetSimulation = True
 
     def SimStop(self):
@@ -512,13 +577,16 @@ class PathSimulation:
         self.timer.start(self.simperiod)
 
     def ViewShape(self):
-        if self.isVoxel:
+        if self.isDexel:
+            if self.dexelSim is not None:
+                self.cutMaterial.Mesh = self.dexelSim.stock.mesh()
+        elif self.isVoxel:
             (self.cutMaterial.Mesh, self.cutMaterialIn.Mesh) = self.voxSim.GetResultMesh()
         else:
             self.cutMaterial.Shape = self.stock
 
     def SimPause(self):
-        if self.disableAnim:
+        if self.disableAnim or self.isDexel:
             self.ViewShape()
         self.GuiBusy(False)
         self.timer.stop()
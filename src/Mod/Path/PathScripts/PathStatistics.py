@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2019 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+
+import PathScripts.PathUtil as PathUtil
+import math
+import numpy
+import re
+
+__title__ = "PathStatistics - cycle time and distances of paths"
+__author__ = "FreeCAD Developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Estimation of the machining time, the rapid and feed distances and the height range of paths, operations and jobs."
+
+# A path is converted into its G-code and the text into arrays at once: the
+# command and the parameters of every line, NaN where a parameter isn't set.
+# The position before and after every command are the parameters carried
+# forward, from which the lengths and the times of all moves follow.
+#
+# Arcs are in the XY plane, their center is relative to their start point like
+# in PathGeom.edgeForCmd, a G2/G3 ending at its start point is a full circle.
+# Canned drill cycles account for the move to the hole, the feed to the bottom
+# and the retract to R (G99) or the initial height (G98), G83 adds its pecks.
+#
+# Without acceleration every move runs at its feed rate, or the rapid rates of
+# the tool controller. With acceleration a move starts and ends at the speed of
+# its junctions, which is reduced by the angle between the moves and the length
+# of the moves next to it, the moves too short to reach their feed rate are
+# counted as feed limited.
+
+Columns = 'XYZIJKFRQP'
+Tolerance = 0.000001
+
+_column = numpy.full(256, -1, dtype=int)
+for _j, _c in enumerate(Columns):
+    _column[ord(_c)] = _j
+_numeric = numpy.zeros(256, dtype=bool)
+for _c in '0123456789.-+':
+    _numeric[ord(_c)] = True
+
+
+class Statistics(object):
+    '''Statistics() ... accumulated times in seconds, distances in mm and the height range of moves.'''
+
+    def __init__(self):
+        self.commands = 0
+        self.moves = 0
+        self.feedLimited = 0
+        self.rapidDistance = 0.0
+        self.feedDistance = 0.0
+        self.rapidTime = 0.0
+        self.feedTime = 0.0
+        self.dwellTime = 0.0
+        self.zMin = None
+        self.zMax = None
+
+    @property
+    def time(self):
+        return self.rapidTime + self.feedTime + self.dwellTime
+
+    @property
+    def distance(self):
+        return self.rapidDistance + self.feedDistance
+
+    def add(self, other):
+        '''add(other) ... accumulate the statistics of other.'''
+        for name in ['commands', 'moves', 'feedLimited', 'rapidDistance', 'feedDistance', 'rapidTime', 'feedTime', 'dwellTime']:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        if other.zMin is not None:
+            self.zMin = other.zMin if self.zMin is None else min(self.zMin, other.zMin)
+            self.zMax = other.zMax if self.zMax is None else max(self.zMax, other.zMax)
+        return self
+
+
+def formatTime(seconds):
+    '''formatTime(seconds) ... return seconds as h:mm:ss.'''
+    seconds = int(round(seconds))
+    return "{}:{:02d}:{:02d}".format(seconds // 3600, seconds // 60 % 60, seconds % 60)
+
+
+def gcodeArrays(gcode, columns=Columns):
+    '''gcodeArrays(gcode, columns=Columns) ... return (letters, numbers, values) of the G-code text with one command per line.
+    letters and numbers are the commands, e.g. ord('G') and 1.0 for a G1, 0 and NaN for lines without a command.
+    values are the parameters of the lines in columns, NaN where a parameter isn't set.'''
+    lookup = _column
+    if columns != Columns:
+        lookup = numpy.full(256, -1, dtype=int)
+        for j, c in enumerate(columns):
+            lookup[ord(c)] = j
+    gcode = re.sub(r'\([^\n]*', '', gcode)
+    if not gcode.endswith('\n'):
+        gcode += '\n'
+    buf = numpy.frombuffer(gcode.encode('ascii', 'replace') if not isinstance(gcode, bytes) else gcode, dtype=numpy.uint8)
+    lineEnds = numpy.nonzero(buf == 10)[0]
+    rows = len(lineEnds)
+
+    # a word is an upper case letter at the start of a line or after a blank, followed by a number
+    numeric = _numeric[buf]
+    word = (buf >= 65) & (buf <= 90)
+    word[-1] = False
+    word[:-1] &= numeric[1:]
+    word[1:] &= (buf[:-1] == 10) | (buf[:-1] == 32) | (buf[:-1] == 9)
+    words = numpy.nonzero(word)[0]
+    row = numpy.searchsorted(lineEnds, words)
+
+    # the numbers of the words are the runs of numeric characters right after their letters
+    numbers = _numbers(numpy.where(numeric, buf, 32))
+    if numbers.size != words.size:
+        # there are numbers outside of words
+        start = numeric.copy()
+        start[1:] &= ~numeric[:-1]
+        run = numpy.cumsum(start)
+        keep = numpy.zeros(run[-1] + 1, dtype=bool)
+        keep[run[words + 1]] = True
+        numbers = _numbers(numpy.where(numeric & keep[run], buf, 32))
+    if numbers.size != words.size:
+        raise ValueError("malformed G-code")
+    first = (words == 0) | (buf[numpy.maximum(words - 1, 0)] == 10)
+
+    letters = numpy.zeros(rows, dtype=numpy.uint8)
+    commands = numpy.full(rows, numpy.nan)
+    values = numpy.full((rows, len(columns)), numpy.nan)
+    letters[row[first]] = buf[words[first]]
+    commands[row[first]] = numbers[first]
+    column = lookup[buf[words]]
+    param = ~first & (column >= 0)
+    values[row[param], column[param]] = numbers[param]
+    return (letters, commands, values)
+
+
+def _numbers(buf):
+    '''the numbers separated by blanks in buf'''
+    if not buf.size:
+        return numpy.zeros(0)
+    return numpy.fromstring(buf.astype(numpy.uint8).tobytes().decode('ascii'), sep=' ')
+
+
+def _carryForward(values, initial):
+    '''the last value that isn't NaN in each column, starting with initial'''
+    known = numpy.vstack((numpy.asarray(initial, dtype=float).reshape(1, -1), values))
+    rows = numpy.where(numpy.isnan(known), 0, numpy.arange(len(known))[:, None])
+    return known[numpy.maximum.accumulate(rows, axis=0), numpy.arange(known.shape[1])]
+
+
+def _moveTimes(length, speed, v0, v1, acceleration):
+    '''times of moves accelerating from v0 to speed and decelerating to v1, and which of them don't reach speed'''
+    d0 = (speed * speed - v0 * v0) / (2 * acceleration)
+    d1 = (speed * speed - v1 * v1) / (2 * acceleration)
+    limited = d0 + d1 > length
+    peak = numpy.where(limited, numpy.sqrt(numpy.maximum((2 * acceleration * length + v0 * v0 + v1 * v1) / 2, 0)), speed)
+    cruise = numpy.where(limited, 0.0, length - d0 - d1)
+    times = (2 * peak - v0 - v1) / acceleration + cruise / numpy.where(speed > 0, speed, 1)
+    return (times, limited)
+
+
+def pathStatistics(path, start=(None, None, None), hRapid=0.0, vRapid=0.0, hFeed=0.0, vFeed=0.0, acceleration=0.0):
+    '''pathStatistics(path, start=(None, None, None), hRapid=0.0, vRapid=0.0, hFeed=0.0, vFeed=0.0, acceleration=0.0)
+    ... return (statistics, end) of path, a Path.Path or a list of commands, starting at start.
+    The rates are in mm/s, the feed rates are used for feed moves without F, acceleration in mm/s^2.
+    Moves from an unknown position and axes without rate take no time.'''
+    if hasattr(path, 'toGCode'):
+        gcode = path.toGCode()
+    else:
+        gcode = ''.join(c.toGCode() + '\n' for c in path)
+    letters, commands, values = gcodeArrays(gcode)
+    stats = Statistics()
+    stats.commands = len(letters)
+    start = [numpy.nan if v is None else v for v in start]
+    if not len(letters):
+        return (stats, tuple(None if numpy.isnan(v) else v for v in start))
+
+    g = numpy.where(letters == ord('G'), commands, numpy.nan)
+    rapid = g == 0
+    line = g == 1
+    cw = g == 2
+    arc = cw | (g == 3)
+    dwell = g == 4
+    cycle = (g == 73) | (g == 81) | (g == 82) | (g == 83) | (g == 85)
+    motion = rapid | line | arc
+    stop = dwell | cycle | (letters == ord('M'))
+
+    # G98 returns to the height before the cycle, G99 to R
+    mode = _carryForward(numpy.where(g == 99, 99.0, numpy.where(g == 98, 98.0, numpy.nan))[:, None], [98.0])[1:, 0]
+    target = numpy.where((motion | cycle)[:, None], values[:, :3], numpy.nan)
+    depth = target[:, 2].copy()
+    target[cycle, 2] = numpy.nan
+    before = _carryForward(target[:, 2:3], [start[2]])[:-1, 0]
+    r = numpy.where(numpy.isnan(values[:, 7]), before, values[:, 7])
+    target[cycle, 2] = numpy.where(mode == 99, r, numpy.fmax(r, before))[cycle]
+    position = _carryForward(target, start)
+    p0 = position[:-1]
+    p1 = position[1:]
+
+    delta = numpy.nan_to_num(p1 - p0)
+    h = numpy.hypot(delta[:, 0], delta[:, 1])
+    v = numpy.abs(delta[:, 2])
+
+    # arcs
+    center = p0[:, :2] + numpy.nan_to_num(values[:, 3:5])
+    radial0 = p0[:, :2] - center
+    radial1 = p1[:, :2] - center
+    radius = numpy.nan_to_num(numpy.hypot(radial0[:, 0], radial0[:, 1]))
+    a0 = numpy.arctan2(radial0[:, 1], radial0[:, 0])
+    a1 = numpy.arctan2(radial1[:, 1], radial1[:, 0])
+    sweep = numpy.mod(numpy.where(cw, a0 - a1, a1 - a0), 2 * math.pi)
+    sweep = numpy.nan_to_num(numpy.where(sweep < Tolerance, 2 * math.pi, sweep))
+    h = numpy.where(arc, radius * sweep, h)
+    length = numpy.hypot(h, v)
+
+    # drill cycles
+    z0 = numpy.nan_to_num(p0[:, 2])
+    bottom = numpy.nan_to_num(depth)
+    rc = numpy.nan_to_num(r)
+    plunge = numpy.where(cycle, numpy.maximum(rc - bottom, 0), 0.0)
+    q = numpy.nan_to_num(values[:, 8])
+    pecks = numpy.where(cycle & (g == 83) & (q > 0), numpy.ceil(plunge / numpy.where(q > 0, q, 1)), 1)
+    cycleVertical = numpy.abs(z0 - rc) + numpy.abs(numpy.nan_to_num(p1[:, 2]) - bottom) + q * pecks * (pecks - 1)
+    cycleVertical = numpy.where(cycle, cycleVertical, 0.0)
+
+    def rate(horizontal, vertical):
+        return numpy.maximum(numpy.where(horizontal > 0, horizontal / hRapid if hRapid > 0 else 0, 0),
+                             numpy.where(vertical > 0, vertical / vRapid if vRapid > 0 else 0, 0))
+
+    rapidTimes = numpy.where(rapid, rate(h, v), 0.0) + numpy.where(cycle, rate(h, 0 * h) + rate(0 * h, cycleVertical), 0.0)
+    feed = _carryForward(values[:, 6:7], [numpy.nan])[1:, 0]
+    defaultFeed = numpy.where(h > Tolerance, hFeed, vFeed)
+    defaultFeed = numpy.where(cycle, vFeed, defaultFeed)
+    feed = numpy.where(numpy.isnan(feed) | (feed <= 0), defaultFeed, feed)
+    feedLength = numpy.where(line | arc, length, 0.0) + plunge
+    feedTimes = numpy.where(feedLength > 0, feedLength / numpy.where(feed > 0, feed, numpy.inf), 0.0)
+
+    if acceleration > 0:
+        moves = numpy.nonzero(motion & (length > Tolerance))[0]
+        speed = numpy.where(rapid, length / numpy.where(rapidTimes > 0, rapidTimes, numpy.inf), feed)[moves]
+        ml = length[moves]
+        # directions at the start and the end of the moves
+        dz = delta[moves, 2] / ml
+        tangent = numpy.stack((delta[moves, 0] / ml, delta[moves, 1] / ml, dz), axis=1)
+        t0 = tangent.copy()
+        t1 = tangent
+        isArc = arc[moves]
+        side = numpy.where(cw[moves], -1.0, 1.0) * h[moves] / ml / numpy.where(radius[moves] > 0, radius[moves], 1)
+        for t, radial in ((t0, radial0[moves]), (t1, radial1[moves])):
+            t[isArc, 0] = (-radial[:, 1] * side)[isArc]
+            t[isArc, 1] = (radial[:, 0] * side)[isArc]
+        cos = numpy.clip((t1[:-1] * t0[1:]).sum(axis=1), 0, 1)
+        junction = numpy.minimum(speed[:-1], speed[1:]) * cos
+        junction = numpy.minimum(junction, numpy.sqrt(acceleration * numpy.minimum(ml[:-1], ml[1:])))
+        stops = numpy.cumsum(stop)
+        junction[stops[moves[1:]] != stops[moves[:-1]]] = 0.0
+        v0 = numpy.concatenate(([0.0], junction))
+        v1 = numpy.concatenate((junction, [0.0]))
+        times, limited = _moveTimes(ml, speed, v0, v1, acceleration)
+        times = numpy.where(speed > 0, times, 0.0)
+        isRapid = rapid[moves]
+        rapidTimes[moves[isRapid]] = times[isRapid]
+        feedTimes[moves[~isRapid]] = times[~isRapid]
+        stats.feedLimited = int((limited & ~isRapid & (speed > 0)).sum())
+
+        # the pieces of the drill cycles start and stop
+        holes = numpy.nonzero(cycle)[0]
+        if holes.size:
+            ft, limited = _moveTimes(plunge[holes], feed[holes], 0.0, 0.0, acceleration)
+            feedTimes[holes] = numpy.where(feed[holes] > 0, ft, 0.0)
+            stats.feedLimited += int((limited & (feed[holes] > 0)).sum())
+
+    stats.moves = int((motion | cycle).sum())
+    stats.rapidDistance = float(numpy.where(rapid, length, 0.0).sum() + numpy.where(cycle, h + cycleVertical, 0.0).sum())
+    stats.feedDistance = float(feedLength.sum())
+    stats.rapidTime = float(rapidTimes.sum())
+    stats.feedTime = float(feedTimes.sum())
+    stats.dwellTime = float(numpy.nan_to_num(values[dwell | (cycle & (g == 82)), 9]).sum())
+    heights = numpy.concatenate((p1[motion | cycle, 2], depth[cycle]))
+    heights = heights[~numpy.isnan(heights)]
+    if heights.size:
+        stats.zMin = float(heights.min())
+        stats.zMax = float(heights.max())
+    end = tuple(None if numpy.isnan(v) else float(v) for v in position[-1])
+    return (stats, end)
+
+
+def toolControllerRates(tc):
+    '''toolControllerRates(tc) ... return (hRapid, vRapid, hFeed, vFeed) of tc in mm/s.'''
+    return (tc.HorizRapid.Value, tc.VertRapid.Value, tc.HorizFeed.Value, tc.VertFeed.Value)
+
+
+def jobStatistics(job, acceleration=0.0, ops=None):
+    '''jobStatistics(job, acceleration=0.0, ops=None) ... return (total, operations, tools) of the operations of job,
+    or ops, with operations and tools lists of (op, statistics) and (tool controller, statistics) in order of use.'''
+    if ops is None:
+        ops = job.Operations.Group
+    total = Statistics()
+    operations = []
+    tools = []
+    position = (None, None, None)
+    for op in ops:
+        tc = PathUtil.toolControllerForOp(op)
+        rates = toolControllerRates(tc) if tc is not None else (0.0, 0.0, 0.0, 0.0)
+        stats, position = pathStatistics(op.Path, position, *rates, acceleration=acceleration)
+        operations.append((op, stats))
+        total.add(stats)
+        if tc is not None:
+            for t, s in tools:
+                if t == tc:
+                    s.add(stats)
+                    break
+            else:
+                tools.append((tc, Statistics().add(stats)))
+    return (total, operations, tools)
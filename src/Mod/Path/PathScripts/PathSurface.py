@@ -59,13 +59,17 @@ from __future__ import print_function
 import FreeCAD
 import MeshPart
 import Path
+import PathScripts.PathDropCutter as PathDropCutter
 import PathScripts.PathLog as PathLog
 import PathScripts.PathUtils as PathUtils
 import PathScripts.PathOp as PathOp
+import PathScripts.PathSurfaceSupport as PathSurfaceSupport
 
 from PySide import QtCore
 import time
 import math
+import multiprocessing
+import numpy
 
 
 __title__ = "Path Surface Operation"
@@ -89,14 +93,12 @@ def translate(context, text, disambig=None):
     return QtCore.QCoreApplication.translate(context, text, disambig)
 
 
-# OCL must be installed
+# OCL is used if installed, otherwise the built-in drop cutter with the same interface
 try:
     import ocl
 except ImportError:
-    FreeCAD.Console.PrintError(
-        translate("Path_Surface", "This operation requires OpenCamLib to be installed.") + "\n")
-    import sys
-    sys.exit(translate("Path_Surface", "This operation requires OpenCamLib to be installed."))
+    ocl = PathDropCutter
+    PathLog.info(translate("Path_Surface", "OpenCamLib is not installed, using the built-in drop cutter."))
 
 
 class ObjectSurface(PathOp.ObjectOp):
@@ -136,6 +138,7 @@ class ObjectSurface(PathOp.ObjectOp):
         # obj.addProperty("App::PropertyFloatConstraint", "SampleInterval", "Surface", QtCore.QT_TRANSLATE_NOOP("App::Property", "The Sample Interval. Small values cause long wait times"))
         obj.addProperty("App::PropertyFloat", "SampleInterval", "Surface", QtCore.QT_TRANSLATE_NOOP("App::Property", "The Sample Interval. Small values cause long wait times"))
         obj.addProperty("App::PropertyBool", "Optimize", "Surface", QtCore.QT_TRANSLATE_NOOP("App::Property", "Enable optimization which removes unnecessary points from G-Code output"))
+        obj.addProperty("App::PropertyInteger", "WorkerProcesses", "Surface", QtCore.QT_TRANSLATE_NOOP("App::Property", "Number of processes computing waterline layers and rotational index angles in parallel, 0 uses all CPUs, 1 computes them in FreeCAD"))
         obj.addProperty("App::PropertyBool", "IgnoreWaste", "Waste", QtCore.QT_TRANSLATE_NOOP("App::Property", "Ignore areas that proceed below specified depth."))
         obj.addProperty("App::PropertyFloat", "IgnoreWasteDepth", "Waste", QtCore.QT_TRANSLATE_NOOP("App::Property", "Depth used to identify waste areas to ignore."))
         obj.addProperty("App::PropertyBool", "ReleaseFromWaste", "Waste", QtCore.QT_TRANSLATE_NOOP("App::Property", "Cut through waste to depth at model edge, releasing the model."))
@@ -168,6 +171,9 @@ class ObjectSurface(PathOp.ObjectOp):
             self.setEditorProperties(obj)
 
     def opOnDocumentRestored(self, obj):
+        if not hasattr(obj, 'WorkerProcesses'):
+            obj.addProperty("App::PropertyInteger", "WorkerProcesses", "Surface", QtCore.QT_TRANSLATE_NOOP("App::Property", "Number of processes computing waterline layers and rotational index angles in parallel, 0 uses all CPUs, 1 computes them in FreeCAD"))
+            obj.WorkerProcesses = 1
         self.setEditorProperties(obj)
         # Import FinalDepth from existing operation for use in recompute() operations
         self.initFinalDepth = obj.FinalDepth.Value
@@ -385,41 +391,6 @@ class ObjectSurface(PathOp.ObjectOp):
         ignoreWasteFlag = obj.IgnoreWaste
         ignoreMap = [1]
 
-        def createTopoMap(scanCLP, ignoreDepth):
-            topoMap = []
-            for pt in scanCLP:
-                if pt.z < ignoreDepth:
-                    topoMap.append(0)
-                else:
-                    topoMap.append(2)
-            return topoMap
-
-        # Convert linear list of points to multi-dimensional list
-        def listToMultiDimensional(points, nL, pPL):
-            multiDim = []
-            for L in range(0, nL):
-                multiDim.append([])
-                for P in range(0, pPL):
-                    pi = L * pPL + P
-                    multiDim[L].append(points[pi])
-            return multiDim
-
-        # De-buffer multi dimensional list
-        def debufferMultiDimenList(multi):
-            multi.pop(0)
-            multi.pop()
-            for i in range(0, len(multi)):
-                multi[i].pop(0)
-                multi[i].pop()
-            return multi
-
-        # Convert multi-dimensional list to linear list of points
-        def multiDimensionalToList(multi):
-            points = []
-            for L in multi:
-                points.extend(L)
-            return points
-
         # Prepare global holdpoint container
         if self.holdPoint is None:
             self.holdPoint = ocl.Point(float("inf"), float("inf"), float("inf"))
@@ -473,14 +444,9 @@ class ObjectSurface(PathOp.ObjectOp):
         if math.ceil(pntsPerLine) != math.floor(pntsPerLine):
             pntsPerLine = None
 
-        # Create topo map for ignoring waste material
+        # Create topo map for ignoring waste material, with the ring of waste around the model cut by ReleaseFromWaste
         if ignoreWasteFlag is True:
-            topoMap = createTopoMap(scanCLP, obj.IgnoreWasteDepth)
-            self.topoMap = listToMultiDimensional(topoMap, numLines, pntsPerLine)
-            self._bufferTopoMap(numLines, pntsPerLine)
-            self._highlightWaterline(4, 1)
-            self.topoMap = debufferMultiDimenList(self.topoMap)
-            ignoreMap = multiDimensionalToList(self.topoMap)
+            ignoreMap = PathSurfaceSupport.wasteMap([pt.z for pt in scanCLP], obj.IgnoreWasteDepth, pntsPerLine, obj.CutPattern == 'ZigZag')
 
         # Extract layers per depthparams
         for lyr in range(0, lenDP):
@@ -959,6 +925,15 @@ class ObjectSurface(PathOp.ObjectOp):
         # Begin gcode operation with raising cutter to safe height
         commands.append(Path.Command('G0', {'Z': self.safeHeight, 'F': self.vertRapid}))
 
+        # The workers scan the index angles of each layer on the triangles and cutter shared once,
+        # ocl scans are computed in FreeCAD, the workers only have the built-in drop cutter
+        pool = None
+        workers = self._workerCount(obj)
+        if workers > 1 and ocl is not PathDropCutter:
+            self.reportThis("--OCL cutter, index angles scanned in FreeCAD")
+        elif workers > 1:
+            pool = self._workerPool(workers, {'triangles': self._stlTriangles(stl), 'cutter': self._builtinCutter()})
+
         # Complete rotational scans at layer and translate into gcode
         for layDep in depthparams:
             t_before = time.time()
@@ -989,7 +964,7 @@ class ObjectSurface(PathOp.ObjectOp):
                 sample = obj.SampleInterval
             else:
                 sample = self.cutOut
-            scanLines = self._indexedDropCutScan(obj, stl, advances, xmin, ymin, xmax, ymax, layDep, sample)
+            scanLines = self._indexedDropCutScan(obj, stl, advances, xmin, ymin, xmax, ymax, layDep, sample, pool)
 
             # Complete rotation if necessary
             if arc == 360.0:
@@ -1054,9 +1029,12 @@ class ObjectSurface(PathOp.ObjectOp):
             self.reportThis("--Layer " + str(lCnt) + ": " + str(len(advances)) + " OCL scans and gcode in " + str(time.time() - t_before) + " s")
             time.sleep(0.2)
         # Eol
+        if pool:
+            pool.close()
+            self._reportWorkers(pool, "index angles")
         return commands
 
-    def _indexedDropCutScan(self, obj, stl, advances, xmin, ymin, xmax, ymax, layDep, sample):
+    def _indexedDropCutScan(self, obj, stl, advances, xmin, ymin, xmax, ymax, layDep, sample, pool=None):
         cutterOfst = 0.0
         # radsRot = 0.0
         # reset = 0.0
@@ -1064,16 +1042,31 @@ class ObjectSurface(PathOp.ObjectOp):
         Lines = []
         result = None
 
-        pdc = ocl.PathDropCutter()   # create a pdc
-        pdc.setCutter(self.cutter)
-        pdc.setZ(layDep)  # set minimumZ (final / ta9rget depth value)
-        pdc.setSampling(sample)
-
         # if self.useTiltCutter == True:
         if obj.CutterTilt != 0.0:
             cutterOfst = layDep * math.sin(obj.CutterTilt * math.pi / 180.0)
             self.reportThis("CutterTilt: cutterOfst is " + str(cutterOfst))
 
+        if pool:
+            # each index angle is scanned by a worker on the model rotated by the sum of the advances,
+            # starting from the rotation the serial scans leave the model in after resetTolerance
+            tasks = []
+            sumAdv = self.stlRotation
+            for iCnt in range(0, len(advances)):
+                sumAdv += advances[iCnt]
+                p1, p2 = self._indexedScanLine(obj, iCnt, xmin, ymin, xmax, ymax, cutterOfst)
+                tasks.append((math.radians(sumAdv), obj.RotationAxis, p1, p2, layDep, sample))
+            for result in pool.map(PathSurfaceSupport.indexedScan, tasks, self._reportWorkerProgress):
+                Lines.append([ocl.Point(x, y, z) for x, y, z in result.tolist()])
+            self.stlRotation += self.resetTolerance
+            self.resetTolerance = 0.0
+            return Lines
+
+        pdc = ocl.PathDropCutter()   # create a pdc
+        pdc.setCutter(self.cutter)
+        pdc.setZ(layDep)  # set minimumZ (final / ta9rget depth value)
+        pdc.setSampling(sample)
+
         sumAdv = 0.0
         for adv in advances:
             sumAdv += adv
@@ -1088,28 +1081,9 @@ class ObjectSurface(PathOp.ObjectOp):
             # Set STL after rotation is made
             pdc.setSTL(stl)
 
-            # add Line objects to the path in this loop
-            if obj.RotationAxis == 'X':
-                p1 = ocl.Point(xmin, cutterOfst, 0.0)   # start-point of line
-                p2 = ocl.Point(xmax, cutterOfst, 0.0)   # end-point of line
-            else:
-                p1 = ocl.Point(cutterOfst, ymin, 0.0)   # start-point of line
-                p2 = ocl.Point(cutterOfst, ymax, 0.0)   # end-point of line
-
             # Create line object
-            if obj.RotationAxis == obj.DropCutterDir:  # parallel cut
-                if obj.CutPattern == 'ZigZag':
-                    if (iCnt % 2 == 0.0):  # even
-                        lo = ocl.Line(p1, p2)
-                    else:  # odd
-                        lo = ocl.Line(p2, p1)
-                elif obj.CutPattern == 'Line':
-                    if obj.CutMode == 'Conventional':
-                        lo = ocl.Line(p1, p2)
-                    else:
-                        lo = ocl.Line(p2, p1)
-            else:
-                lo = ocl.Line(p1, p2)   # line-object
+            p1, p2 = self._indexedScanLine(obj, iCnt, xmin, ymin, xmax, ymax, cutterOfst)
+            lo = ocl.Line(ocl.Point(*p1), ocl.Point(*p2))   # line-object
 
             path = ocl.Path()                   # create an empty path object
             path.append(lo)         # add the line to the path
@@ -1130,6 +1104,26 @@ class ObjectSurface(PathOp.ObjectOp):
 
         return Lines
 
+    def _indexedScanLine(self, obj, iCnt, xmin, ymin, xmax, ymax, cutterOfst):
+        # start and end point of the scan line of index iCnt, in cut direction
+        if obj.RotationAxis == 'X':
+            p1 = (xmin, cutterOfst, 0.0)   # start-point of line
+            p2 = (xmax, cutterOfst, 0.0)   # end-point of line
+        else:
+            p1 = (cutterOfst, ymin, 0.0)   # start-point of line
+            p2 = (cutterOfst, ymax, 0.0)   # end-point of line
+
+        if obj.RotationAxis == obj.DropCutterDir:  # parallel cut
+            if obj.CutPattern == 'ZigZag':
+                if (iCnt % 2 == 0.0):  # even
+                    return (p1, p2)
+                return (p2, p1)  # odd
+            elif obj.CutPattern == 'Line':
+                if obj.CutMode == 'Conventional':
+                    return (p1, p2)
+                return (p2, p1)
+        return (p1, p2)
+
     def _indexedScanToGcode(self, obj, li, CLP, idxAng, prvDep, layerDepth, numDeps):
         # generate the path commands
         output = []
@@ -1349,15 +1343,10 @@ class ObjectSurface(PathOp.ObjectOp):
         lenOS = len(oclScan)
         ptPrLn = int(lenOS / numScanLines)
 
-        # Convert oclScan list of points to multi-dimensional list
-        scanLines = []
-        for L in range(0, numScanLines):
-            scanLines.append([])
-            for P in range(0, ptPrLn):
-                pi = L * ptPrLn + P
-                scanLines[L].append(oclScan[pi])
-        lenSL = len(scanLines)
-        pntsPerLine = len(scanLines[0])
+        # Convert oclScan list of points to (lines, points, xyz) array
+        scanLines = numpy.array([(p.x, p.y, p.z) for p in oclScan[:numScanLines * ptPrLn]]).reshape(numScanLines, ptPrLn, 3)
+        lenSL = numScanLines
+        pntsPerLine = ptPrLn
         self.reportThis("--OCL scan: " + str(lenSL * pntsPerLine) + " points, with " + str(numScanLines) + " lines and " + str(pntsPerLine) + " pts/line")
         self.reportThis("--Setup, OCL scan, and scan conversion to multi-dimen. list took " + str(time.time() - t_begin) + " s")
 
@@ -1365,11 +1354,23 @@ class ObjectSurface(PathOp.ObjectOp):
         lyr = 0
         cmds = []
         layTime = time.time()
-        self.topoMap = []
-        for layDep in depthparams:
-            cmds = self._getWaterline(obj, scanLines, layDep, lyr, lenSL, pntsPerLine)
-            commands.extend(cmds)
-            lyr += 1
+        workers = self._workerCount(obj, lenDP)
+        if workers > 1:
+            pool = self._workerPool(workers, {'scanLines': scanLines})
+            # the workers extract the loops of the layers, gcode is created in layer order
+            try:
+                loopLists = pool.map(PathSurfaceSupport.waterlineLayer, [(layDep, obj.CutMode == 'Climb') for layDep in depthparams], self._reportWorkerProgress)
+            finally:
+                pool.close()
+            self._reportWorkers(pool, "layers")
+            for layDep, loopList in zip(depthparams, loopLists):
+                for loop in loopList:
+                    commands.extend(self._loopToGcode(obj, layDep, loop))
+        else:
+            for layDep in depthparams:
+                cmds = self._getWaterline(obj, scanLines, layDep, lyr, lenSL, pntsPerLine)
+                commands.extend(cmds)
+                lyr += 1
         self.reportThis("--All layer scans combined took " + str(time.time() - layTime) + " s")
         return commands
 
@@ -1396,266 +1397,49 @@ class ObjectSurface(PathOp.ObjectOp):
 
     def _getWaterline(self, obj, scanLines, layDep, lyr, lenSL, pntsPerLine):
         commands = []
-        cmds = []
-        loopList = []
-        self.topoMap = []
-        # Create topo map from scanLines (highs and lows)
-        self.topoMap = self._createTopoMap(scanLines, layDep, lenSL, pntsPerLine)
-        # Add buffer lines and columns to topo map
-        self._bufferTopoMap(lenSL, pntsPerLine)
-        # Identify layer waterline from OCL scan
-        self._highlightWaterline(4, 9)
-        # Extract waterline and convert to gcode
+        # Create topo map from scanLines (highs and lows), buffered by a border of lows
+        self.topoMap = self._createTopoMap(scanLines, layDep)
+        # Extract waterline loops and convert to gcode
         loopList = self._extractWaterlines(obj, scanLines, lyr, layDep)
-        time.sleep(0.1)
-        # save commands
         for loop in loopList:
-            cmds = self._loopToGcode(obj, layDep, loop)
-            commands.extend(cmds)
+            commands.extend(self._loopToGcode(obj, layDep, loop))
         return commands
 
-    def _createTopoMap(self, scanLines, layDep, lenSL, pntsPerLine):
-        topoMap = []
-        for L in range(0, lenSL):
-            topoMap.append([])
-            for P in range(0, pntsPerLine):
-                if scanLines[L][P].z > layDep:
-                    topoMap[L].append(2)
-                else:
-                    topoMap[L].append(0)
-        return topoMap
-
-    def _bufferTopoMap(self, lenSL, pntsPerLine):
-        # add buffer boarder of zeros to all sides to topoMap data
-        pre = [0, 0]
-        post = [0, 0]
-        for p in range(0, pntsPerLine):
-            pre.append(0)
-            post.append(0)
-        for l in range(0, lenSL):
-            self.topoMap[l].insert(0, 0)
-            self.topoMap[l].append(0)
-        self.topoMap.insert(0, pre)
-        self.topoMap.append(post)
-        return True
+    def _createTopoMap(self, scanLines, layDep):
+        # True where the cutter can not reach layDep, with a border of False
+        return PathSurfaceSupport.topoMap(scanLines, layDep)
 
-    def _highlightWaterline(self, extraMaterial, insCorn):
-        TM = self.topoMap
-        lastPnt = len(TM[1]) - 1
-        lastLn = len(TM) - 1
-        highFlag = 0
-
-        # self.reportThis("--Convert parallel data to ridges")
-        for lin in range(1, lastLn):
-            for pt in range(1, lastPnt):  # Ignore first and last points
-                if TM[lin][pt] == 0:
-                    if TM[lin][pt + 1] == 2:  # step up
-                        TM[lin][pt] = 1
-                    if TM[lin][pt - 1] == 2:  # step down
-                        TM[lin][pt] = 1
-
-        # self.reportThis("--Convert perpendicular data to ridges and highlight ridges")
-        for pt in range(1, lastPnt):  # Ignore first and last points
-            for lin in range(1, lastLn):
-                if TM[lin][pt] == 0:
-                    highFlag = 0
-                    if TM[lin + 1][pt] == 2:  # step up
-                        TM[lin][pt] = 1
-                    if TM[lin - 1][pt] == 2:  # step down
-                        TM[lin][pt] = 1
-                elif TM[lin][pt] == 2:
-                    highFlag += 1
-                    if highFlag == 3:
-                        if TM[lin - 1][pt - 1] < 2 or TM[lin - 1][pt + 1] < 2:
-                            highFlag = 2
-                        else:
-                            TM[lin - 1][pt] = extraMaterial
-                            highFlag = 2
-
-        # Square corners
-        # self.reportThis("--Square corners")
-        for pt in range(1, lastPnt):
-            for lin in range(1, lastLn):
-                if TM[lin][pt] == 1:                    # point == 1
-                    cont = True
-                    if TM[lin + 1][pt] == 0:            # forward == 0
-                        if TM[lin + 1][pt - 1] == 1:    # forward left == 1
-                            if TM[lin][pt - 1] == 2:    # left == 2
-                                TM[lin + 1][pt] = 1     # square the corner
-                                cont = False
-
-                        if cont is True and TM[lin + 1][pt + 1] == 1:  # forward right == 1
-                            if TM[lin][pt + 1] == 2:    # right == 2
-                                TM[lin + 1][pt] = 1     # square the corner
-                        cont = True
-
-                    if TM[lin - 1][pt] == 0:          # back == 0
-                        if TM[lin - 1][pt - 1] == 1:    # back left == 1
-                            if TM[lin][pt - 1] == 2:    # left == 2
-                                TM[lin - 1][pt] = 1     # square the corner
-                                cont = False
-
-                        if cont is True and TM[lin - 1][pt + 1] == 1:  # back right == 1
-                            if TM[lin][pt + 1] == 2:    # right == 2
-                                TM[lin - 1][pt] = 1     # square the corner
-
-        # remove inside corners
-        # self.reportThis("--Remove inside corners")
-        for pt in range(1, lastPnt):
-            for lin in range(1, lastLn):
-                if TM[lin][pt] == 1:                    # point == 1
-                    if TM[lin][pt + 1] == 1:
-                        if TM[lin - 1][pt + 1] == 1 or TM[lin + 1][pt + 1] == 1:
-                            TM[lin][pt + 1] = insCorn
-                    elif TM[lin][pt - 1] == 1:
-                        if TM[lin - 1][pt - 1] == 1 or TM[lin + 1][pt - 1] == 1:
-                            TM[lin][pt - 1] = insCorn
-
-        # PathLog.debug("\n-------------")
-        # for li in TM:
-        #    PathLog.debug("Line: " + str(li))
-        return True
-
-    def _extractWaterlines(self, obj, oclScan, lyr, layDep):
-        srch = True
-        lastPnt = len(self.topoMap[0]) - 1
-        lastLn = len(self.topoMap) - 1
-        maxSrchs = 5
-        srchCnt = 1
-        loopList = []
-        loop = []
-        loopNum = 0
-
-        if obj.CutMode == 'Conventional':
-            lC = [1, 1, 1, 0, -1, -1, -1, 0, 1, 1, 1, 0, -1, -1, -1, 0, 1, 1, 1, 0, -1, -1, -1, 0]
-            pC = [-1, 0, 1, 1, 1, 0, -1, -1, -1, 0, 1, 1, 1, 0, -1, -1, -1, 0, 1, 1, 1, 0, -1, -1]
-        else:
-            lC = [-1, -1, -1, 0, 1, 1, 1, 0, -1, -1, -1, 0, 1, 1, 1, 0, -1, -1, -1, 0, 1, 1, 1, 0]
-            pC = [-1, 0, 1, 1, 1, 0, -1, -1, -1, 0, 1, 1, 1, 0, -1, -1, -1, 0, 1, 1, 1, 0, -1, -1]
-
-        while srch is True:
-            srch = False
-            if srchCnt > maxSrchs:
-                self.reportThis("Max search scans, " + str(maxSrchs) + " reached\nPossible incomplete waterline result!")
-                break
-            for L in range(1, lastLn):
-                for P in range(1, lastPnt):
-                    if self.topoMap[L][P] == 1:
-                        # start loop follow
-                        srch = True
-                        loopNum += 1
-                        loop = self._trackLoop(oclScan, lC, pC, L, P, loopNum)
-                        self.topoMap[L][P] = 0  # Mute the starting point
-                        loopList.append(loop)
-            srchCnt += 1
-        # self.reportThis("Search count for layer " + str(lyr) + " is " + str(srchCnt) + ", with " + str(loopNum) + " loops.")
+    def _extractWaterlines(self, obj, scanLines, lyr, layDep):
+        loopList = PathSurfaceSupport.waterlineLoops(self.topoMap, scanLines, obj.CutMode == 'Climb')
+        # self.reportThis("Layer " + str(lyr) + " has " + str(len(loopList)) + " loops.")
         return loopList
 
-    def _trackLoop(self, oclScan, lC, pC, L, P, loopNum):
-        loop = [oclScan[L - 1][P - 1]]  # Start loop point list
-        cur = [L, P, 1]
-        prv = [L, P - 1, 1]
-        nxt = [L, P + 1, 1]
-        follow = True
-        ptc = 0
-        ptLmt = 200000
-        while follow is True:
-            ptc += 1
-            if ptc > ptLmt:
-                self.reportThis("Loop number " + str(loopNum) + " at [" + str(nxt[0]) + ", " + str(nxt[1]) + "] pnt count exceeds, " + str(ptLmt) + ".  Stopped following loop.")
-                break
-            nxt = self._findNextWlPoint(lC, pC, cur[0], cur[1], prv[0], prv[1])  # get next point
-            loop.append(oclScan[nxt[0] - 1][nxt[1] - 1])  # add it to loop point list
-            self.topoMap[nxt[0]][nxt[1]] = nxt[2]  # Mute the point, if not Y stem
-            if nxt[0] == L and nxt[1] == P:  # check if loop complete
-                follow = False
-            elif nxt[0] == cur[0] and nxt[1] == cur[1]:  # check if line cannot be detected
-                follow = False
-            prv = cur
-            cur = nxt
-        return loop
-
-    def _findNextWlPoint(self, lC, pC, cl, cp, pl, pp):
-        dl = cl - pl
-        dp = cp - pp
-        num = 0
-        i = 3
-        s = 0
-        mtch = 0
-        found = False
-        while mtch < 8:  # check all 8 points around current point
-            if lC[i] == dl:
-                if pC[i] == dp:
-                    s = i - 3
-                    found = True
-                    # Check for y branch where current point is connection between branches
-                    for y in range(1, mtch):
-                        if lC[i + y] == dl:
-                            if pC[i + y] == dp:
-                                num = 1
-                                break
-                    break
-            i += 1
-            mtch += 1
-        if found is False:
-            # self.reportThis("_findNext: No start point found.")
-            return [cl, cp, num]
-
-        for r in range(0, 8):
-            l = cl + lC[s + r]
-            p = cp + pC[s + r]
-            if self.topoMap[l][p] == 1:
-                return [l, p, num]
-
-        # self.reportThis("_findNext: No next pnt found")
-        return [cl, cp, num]
-
     def _loopToGcode(self, obj, layDep, loop):
         # generate the path commands
         output = []
-        optimize = obj.Optimize
-
-        prev = ocl.Point(float("inf"), float("inf"), float("inf"))
-        nxt = ocl.Point(float("inf"), float("inf"), float("inf"))
-        pnt = ocl.Point(float("inf"), float("inf"), float("inf"))
-
-        # Create first point
-        pnt.x = loop[0].x
-        pnt.y = loop[0].y
-        pnt.z = layDep
 
         # Position cutter to begin loop
         output.append(Path.Command('G0', {'Z': obj.ClearanceHeight.Value, 'F': self.vertRapid}))
-        output.append(Path.Command('G0', {'X': pnt.x, 'Y': pnt.y, 'F': self.horizRapid}))
-        output.append(Path.Command('G1', {'Z': pnt.z, 'F': self.vertFeed}))
-
-        lenCLP = len(loop)
-        lastIdx = lenCLP - 1
-        # Cycle through each point on loop
-        for i in range(0, lenCLP):
-            if i < lastIdx:
-                nxt.x = loop[i + 1].x
-                nxt.y = loop[i + 1].y
-                nxt.z = layDep
-            else:
-                optimize = False
-
-            if not optimize or not self.isPointOnLine(FreeCAD.Vector(prev.x, prev.y, prev.z), FreeCAD.Vector(nxt.x, nxt.y, nxt.z), FreeCAD.Vector(pnt.x, pnt.y, pnt.z)):
-                output.append(Path.Command('G1', {'X': pnt.x, 'Y': pnt.y, 'F': self.horizFeed}))
-
-            # Rotate point data
-            prev.x = pnt.x
-            prev.y = pnt.y
-            prev.z = pnt.z
-            pnt.x = nxt.x
-            pnt.y = nxt.y
-            pnt.z = nxt.z
-        # self.reportThis("points after optimization: " + str(len(output)))
+        first = loop[0].tolist()
+        output.append(Path.Command('G0', {'X': first[0], 'Y': first[1], 'F': self.horizRapid}))
+        output.append(Path.Command('G1', {'Z': layDep, 'F': self.vertFeed}))
+
+        # skip the points on the line from their previous to their next point, not the last one
+        keep = numpy.ones(len(loop), dtype=bool)
+        if obj.Optimize and len(loop) > 2:
+            ab = loop[2:] - loop[:-2]
+            ac = loop[1:-1] - loop[:-2]
+            cross = ab[:, 0] * ac[:, 1] - ab[:, 1] * ac[:, 0]
+            dot = (ab * ac).sum(axis=1)
+            keep[1:-1] = (numpy.abs(cross) > 1e-6) | (dot < 0) | (dot > (ab * ab).sum(axis=1))
+            # the cutter is already at the first point
+            keep[0] = False
+        for x, y in loop[keep].tolist():
+            output.append(Path.Command('G1', {'X': x, 'Y': y, 'F': self.horizFeed}))
 
         # Save layer end point for use in transitioning to next layer
-        self.layerEndPnt.x = pnt.x
-        self.layerEndPnt.y = pnt.y
-        self.layerEndPnt.z = pnt.z
+        self.layerEndPnt.x, self.layerEndPnt.y = loop[-1].tolist()
+        self.layerEndPnt.z = layDep
 
         return output
 
@@ -1746,10 +1530,46 @@ class ObjectSurface(PathOp.ObjectOp):
     def reportThis(self, txt):
         self.opReport += "\n" + txt
 
+    def _workerCount(self, obj, numTasks=None):
+        # number of worker processes, 1 to compute in FreeCAD
+        processes = obj.WorkerProcesses
+        if not hasattr(multiprocessing, 'get_context'):
+            # the workers are spawned, Python 2 can only fork FreeCAD
+            return 1
+        if processes <= 0:
+            processes = multiprocessing.cpu_count()
+        if numTasks is not None:
+            processes = min(processes, numTasks)
+        return max(processes, 1)
+
+    def _workerPool(self, processes, shared):
+        self.reportThis("--Starting " + str(processes) + " worker processes")
+        return PathSurfaceSupport.WorkerPool(processes, shared)
+
+    def _reportWorkerProgress(self, worker, workerDone, done, total):
+        PathLog.debug("worker {}: {} done, {} of {} complete".format(worker, workerDone, done, total))
+
+    def _reportWorkers(self, pool, txt):
+        for worker, done in enumerate(pool.tasksPerWorker()):
+            self.reportThis("--Worker " + str(worker) + ": " + str(done) + " " + txt)
+
+    def _stlTriangles(self, stl):
+        # (n, 3, 3) array of the triangles of an ocl or built-in STLSurf
+        triangles = stl.getTriangles()
+        if isinstance(triangles, numpy.ndarray):
+            return triangles
+        return numpy.array([[(p.x, p.y, p.z) for p in t.getPoints()] for t in triangles], dtype=float).reshape(-1, 3, 3)
+
+    def _builtinCutter(self):
+        # the workers use the built-in drop cutter, ocl objects can not be sent to other processes
+        name, args = self.cutterSpec
+        return getattr(PathDropCutter, name)(*args)
+
     def resetOpVariables(self):
         # reset operation variables
         self.opReport = ""
         self.cutter = None
+        self.cutterSpec = None
         self.holdPoint = None
         self.stl = None
         self.layerEndPnt = None
@@ -1767,6 +1587,7 @@ class ObjectSurface(PathOp.ObjectOp):
         self.layerEndIdx = 0.0
         self.layerEndzMax = 0.0
         self.resetTolerance = 0.0
+        self.stlRotation = 0.0
         self.holdPntCnt = 0
         self.startTime = 0.0
         self.endTime = 0.0
@@ -1795,35 +1616,36 @@ class ObjectSurface(PathOp.ObjectOp):
 
         if obj.ToolController.Tool.ToolType == 'EndMill':
             # Standard End Mill
-            self.cutter = ocl.CylCutter(diam_1, (CEH + lenOfst))
+            self.cutterSpec = ('CylCutter', (diam_1, (CEH + lenOfst)))
 
         elif obj.ToolController.Tool.ToolType == 'BallEndMill' and FR == 0.0:
             # Standard Ball End Mill
             # OCL -> BallCutter::BallCutter(diameter, length)
-            self.cutter = ocl.BallCutter(diam_1, (diam_1 / 2 + lenOfst))
+            self.cutterSpec = ('BallCutter', (diam_1, (diam_1 / 2 + lenOfst)))
             self.useTiltCutter = True
 
         elif obj.ToolController.Tool.ToolType == 'BallEndMill' and FR > 0.0:
             # Bull Nose or Corner Radius cutter
             # Reference: https://www.fine-tools.com/halbstabfraeser.html
             # OCL -> BallCutter::BallCutter(diameter, length)
-            self.cutter = ocl.BullCutter(diam_1, FR, (CEH + lenOfst))
+            self.cutterSpec = ('BullCutter', (diam_1, FR, (CEH + lenOfst)))
 
         elif obj.ToolController.Tool.ToolType == 'Engraver' and FR > 0.0:
             # Bull Nose or Corner Radius cutter
             # Reference: https://www.fine-tools.com/halbstabfraeser.html
             # OCL -> ConeCutter::ConeCutter(diameter, angle, lengthOffset)
-            self.cutter = ocl.ConeCutter(diam_1, (obj.ToolController.Tool.CuttingEdgeAngle / 2), lenOfst)
+            self.cutterSpec = ('ConeCutter', (diam_1, (obj.ToolController.Tool.CuttingEdgeAngle / 2), lenOfst))
 
         elif obj.ToolController.Tool.ToolType == 'ChamferMill':
             # Bull Nose or Corner Radius cutter
             # Reference: https://www.fine-tools.com/halbstabfraeser.html
             # OCL -> ConeCutter::ConeCutter(diameter, angle, lengthOffset)
-            self.cutter = ocl.ConeCutter(diam_1, (obj.ToolController.Tool.CuttingEdgeAngle / 2), lenOfst)
+            self.cutterSpec = ('ConeCutter', (diam_1, (obj.ToolController.Tool.CuttingEdgeAngle / 2), lenOfst))
         else:
             # Default to standard end mill
-            self.cutter = ocl.CylCutter(diam_1, (CEH + lenOfst))
+            self.cutterSpec = ('CylCutter', (diam_1, (CEH + lenOfst)))
             PathLog.info("Defaulting cutter to standard end mill.")
+        self.cutter = getattr(ocl, self.cutterSpec[0])(*self.cutterSpec[1])
 
         # http://www.carbidecutter.net/products/carbide-burr-cone-shape-sm.html
         '''
@@ -1863,6 +1685,7 @@ class ObjectSurface(PathOp.ObjectOp):
         obj.StartIndex = 0.0
         obj.StopIndex = 360.0
         obj.SampleInterval = 1.0
+        obj.WorkerProcesses = 1
 
         # need to overwrite the default depth calculations for facing
         job = PathUtils.findParentJob(obj)
@@ -1910,6 +1733,7 @@ def SetupProperties():
     setup.append("IgnoreWasteDepth")
     setup.append("IgnoreWaste")
     setup.append("ReleaseFromWaste")
+    setup.append("WorkerProcesses")
     return setup
 
 
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2019 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import PathScripts.PathDropCutter as PathDropCutter
+import multiprocessing
+import numpy
+import os
+import sys
+
+__title__ = "PathSurfaceSupport - 3D Surface layer and index angle workers"
+__author__ = "FreeCAD Developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Waterline extraction and drop cutter scans of the 3D Surface operation, and the process pool running them in parallel."
+
+# The module only depends on NumPy and the built-in drop cutter, so it can be imported by
+# worker processes started without FreeCAD. The mesh, the cutter and the scan are handed
+# to every worker once when the pool starts, a task only carries its layer or angle.
+
+
+def _waterlineSegments():
+    # Marching squares segments of the 16 cases of a topo map cell, [in edge, out edge, low corner of the in edge,
+    # corner to square an outside corner]. The corners 0 to 3 and the edges k from corner k to k + 1 go around
+    # the cell. The highs are on the left of the segments, diagonal highs are connected.
+    table = numpy.full((16, 2, 4), -1, dtype=int)
+    for case in range(16):
+        high = [(case >> k) & 1 for k in range(4)]
+        s = 0
+        for k in range(4):
+            if high[k] and not high[(k + 1) % 4]:
+                e = [e for e in ((k + i) % 4 for i in range(1, 4)) if not high[e] and high[(e + 1) % 4]][0]
+                table[case, s] = [k, e, (k + 1) % 4, (k + 2) % 4 if sum(high) == 1 else -1]
+                s += 1
+    return table
+
+
+WaterlineSegments = _waterlineSegments()
+
+
+def waterlineLoops(topoMap, scanLines, climb):
+    '''waterlineLoops(topoMap, scanLines, climb) ... return the loops around the highs of the buffered topo map
+    as (n, 2) arrays of scan point xy, traced with marching squares in a single pass.
+    The loops follow the low scan points next to the highs, the outside corners are squared.'''
+    rows, cols = topoMap.shape
+    # xy of the buffered grid, the border one sample interval outside of the scan
+    gx = numpy.pad(scanLines[:, :, 0], 1, 'reflect', reflect_type='odd')
+    gy = numpy.pad(scanLines[:, :, 1], 1, 'reflect', reflect_type='odd')
+
+    # case of every cell, corners (i, j), (i, j + 1), (i + 1, j + 1), (i + 1, j)
+    t = topoMap.astype(numpy.int8)
+    case = t[:-1, :-1] + 2 * t[:-1, 1:] + 4 * t[1:, 1:] + 8 * t[1:, :-1]
+    ci, cj = numpy.nonzero((case > 0) & (case < 15))
+    case = case[ci, cj]
+
+    # ids of the edges, horizontal edges first, and of the nodes at the cell corners
+    nHor = rows * (cols - 1)
+    edgeBase = numpy.array([[0, 0, 0], [nHor, 0, 1], [0, 1, 0], [nHor, 0, 0]])
+    edgeStride = numpy.array([cols - 1, cols, cols - 1, cols])
+    cornerOfs = numpy.array([[0, 0], [0, 1], [1, 1], [1, 0]])
+
+    def edgeId(e):
+        return edgeBase[e, 0] + (ci + edgeBase[e, 1]) * edgeStride[e] + cj + edgeBase[e, 2]
+
+    def nodeId(c):
+        return (ci + cornerOfs[c, 0]) * cols + cj + cornerOfs[c, 1]
+
+    segIn = []
+    segOut = []
+    segNode = []
+    segMid = []
+    for s in range(2):
+        sel = WaterlineSegments[case, s, 0] >= 0
+        seg = WaterlineSegments[case, s]
+        segIn.append(numpy.where(sel, edgeId(seg[:, 0]), -1))
+        segOut.append(numpy.where(sel, edgeId(seg[:, 1]), -1))
+        segNode.append(nodeId(seg[:, 2]))
+        segMid.append(numpy.where(seg[:, 3] >= 0, nodeId(seg[:, 3]), -1))
+    # segments in cell order
+    segIn = numpy.column_stack(segIn).ravel()
+    used = segIn >= 0
+    segIn = segIn[used]
+    segOut = numpy.column_stack(segOut).ravel()[used]
+    segNode = numpy.column_stack(segNode).ravel()[used]
+    segMid = numpy.column_stack(segMid).ravel()[used]
+
+    # the segment leaving a cell through an edge enters the neighbour cell through it
+    segByIn = numpy.full(nHor + (rows - 1) * cols, -1)
+    segByIn[segIn] = numpy.arange(len(segIn))
+    nxtSeg = segByIn[segOut].tolist()
+    segNode = segNode.tolist()
+    segMid = segMid.tolist()
+
+    loopList = []
+    visited = [False] * len(nxtSeg)
+    for start in range(len(nxtSeg)):
+        if visited[start]:
+            continue
+        nodes = []
+        s = start
+        while not visited[s]:
+            visited[s] = True
+            nodes.append(segNode[s])
+            if segMid[s] >= 0:
+                nodes.append(segMid[s])
+            s = nxtSeg[s]
+        nodes = numpy.array(nodes)
+        nodes = nodes[nodes != numpy.roll(nodes, 1)]
+        if len(nodes) == 0:
+            continue
+        # the highs are on the left, conventional milling
+        if climb:
+            nodes = nodes[::-1]
+        nodes = numpy.append(nodes, nodes[0])
+        loopList.append(numpy.column_stack((gx.ravel()[nodes], gy.ravel()[nodes])))
+    return loopList
+
+
+def topoMap(scanLines, layDep):
+    '''topoMap(scanLines, layDep) ... True where the cutter can not reach layDep, with a border of False.'''
+    return numpy.pad(scanLines[:, :, 2] > layDep, 1, 'constant', constant_values=False)
+
+
+def wasteMap(z, ignoreDepth, pntsPerLine, zigzag):
+    '''wasteMap(z, ignoreDepth, pntsPerLine, zigzag) ... the ignore waste map of the planar scan point heights z,
+    2 for the highs at or above ignoreDepth, 1 for the ring of waste around them, cut at ignoreDepth to release
+    the model, and 0 for the waste to ignore. Odd lines of a zigzag scan run backwards.'''
+    highs = numpy.asarray(z) >= ignoreDepth
+    if not pntsPerLine:
+        return numpy.where(highs, 2, 0).tolist()
+    highs = highs.reshape(-1, int(pntsPerLine))
+    if zigzag:
+        highs = highs.copy()
+        highs[1::2] = highs[1::2, ::-1]
+    # the waste next to a high, diagonals included, so the ring is closed around outside corners
+    rows, cols = highs.shape
+    grid = numpy.pad(highs, 1, 'constant', constant_values=False)
+    ring = numpy.zeros_like(highs)
+    for i in range(3):
+        for j in range(3):
+            ring |= grid[i:i + rows, j:j + cols]
+    wmap = numpy.where(highs, 2, numpy.where(ring, 1, 0))
+    if zigzag:
+        wmap[1::2] = wmap[1::2, ::-1]
+    return wmap.ravel().tolist()
+
+
+def waterlineLayer(shared, layDep, climb):
+    '''waterlineLayer(shared, layDep, climb) ... worker task, the waterline loops of the shared scanLines at layDep.'''
+    scanLines = shared['scanLines']
+    return waterlineLoops(topoMap(scanLines, layDep), scanLines, climb)
+
+
+def indexedScan(shared, angle, axis, start, end, minZ, sampling):
+    '''indexedScan(shared, angle, axis, start, end, minZ, sampling) ... worker task, drop the shared cutter
+    along the line from start to end on the shared triangles rotated by angle (radians) around the X or Y axis.
+    Returns the cutter locations as (n, 3) array.'''
+    stl = PathDropCutter.STLSurf()
+    stl.addTriangles(shared['triangles'])
+    if axis == 'X':
+        stl.rotate(angle, 0.0, 0.0)
+    else:
+        stl.rotate(0.0, angle, 0.0)
+    path = PathDropCutter.Path()
+    path.append(PathDropCutter.Line(PathDropCutter.Point(*start), PathDropCutter.Point(*end)))
+    pdc = PathDropCutter.PathDropCutter()
+    pdc.setSTL(stl)
+    pdc.setCutter(shared['cutter'])
+    pdc.setZ(minZ)
+    pdc.setSampling(sampling)
+    pdc.setPath(path)
+    pdc.run()
+    return pdc.getCLArray()
+
+
+def pythonExecutable():
+    '''pythonExecutable() ... return the python interpreter to spawn workers with,
+    sys.executable is FreeCAD itself if python is embedded.'''
+    exe = sys.executable
+    if 'python' in os.path.basename(exe).lower():
+        return exe
+    for name in ['python.exe', 'python3', 'python']:
+        candidate = os.path.join(os.path.dirname(exe), name)
+        if os.path.isfile(candidate):
+            return candidate
+    return exe
+
+
+_Shared = {}
+
+
+def _initWorker(shared):
+    _Shared.clear()
+    _Shared.update(shared)
+
+
+def _runTask(args):
+    func, index, task = args
+    return index, os.getpid(), func(_Shared, *task)
+
+
+class WorkerPool(object):
+    '''WorkerPool(processes, shared) ... process pool handing the shared dict to every worker once.'''
+
+    def __init__(self, processes, shared):
+        # the workers are spawned, forking FreeCAD with its GUI is not safe. The interpreter is only set
+        # while they start, so the multiprocessing setup of FreeCAD and of other modules stays untouched.
+        from multiprocessing import spawn
+        context = multiprocessing.get_context('spawn')
+        executable = spawn.get_executable()
+        spawn.set_executable(pythonExecutable())
+        try:
+            self.pool = context.Pool(processes, _initWorker, (shared,))
+        finally:
+            spawn.set_executable(executable)
+        self.processes = processes
+        self.workers = {}
+
+    def tasksPerWorker(self):
+        '''tasksPerWorker() ... return the number of tasks completed by each worker, in order of their first result.'''
+        return [done for pid, (wid, done) in sorted(self.workers.items(), key=lambda item: item[1][0])]
+
+    def map(self, func, tasks, progress=None):
+        '''map(func, tasks, progress=None) ... return [func(shared, *task) for task in tasks], computed by the workers.
+        progress(worker, workerDone, done, total) is called as the results come in.'''
+        results = [None] * len(tasks)
+        try:
+            for done, (index, pid, result) in enumerate(self.pool.imap_unordered(_runTask, [(func, i, t) for i, t in enumerate(tasks)]), 1):
+                results[index] = result
+                wid, workerDone = self.workers.get(pid, (len(self.workers), 0))
+                self.workers[pid] = (wid, workerDone + 1)
+                if progress:
+                    progress(wid, workerDone + 1, done, len(tasks))
+        except Exception:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+            raise
+        return results
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
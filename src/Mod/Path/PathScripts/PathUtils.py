@@ -35,6 +35,7 @@ from DraftGeomUtils import geomType
 from FreeCAD import Vector
 from PathScripts import PathJob
 from PathScripts import PathLog
+from PathScripts import PathSequence
 from PySide import QtCore
 from PySide import QtGui
 
@@ -665,58 +666,31 @@ def rampPlunge(edge, rampangle, destZ, startZ):
     return rampCmds
 
 
-def sort_jobs(locations, keys, attractors=[]):
+def sort_jobs(locations, keys, attractors=[], timeLimit=0.0):
     """ sort holes by the nearest neighbor method
         keys: two-element list of keys for X and Y coordinates. for example ['x','y']
+        attractors: keys of the coordinates whose absolute values are added to the square distance, default keys[0]
+        timeLimit: seconds spent shortening the rapid moves with 2-opt after sorting, 0 to skip it
         originally written by m0n5t3r for PathHelix
     """
-    try:
-        from queue import PriorityQueue
-    except ImportError:
-        from Queue import PriorityQueue
-    from collections import defaultdict
+    if not locations:
+        return []
 
     attractors = attractors or [keys[0]]
 
-    def sqdist(a, b):
-        """ square Euclidean distance """
-        d = 0
-        for k in keys:
-            d += (a[k] - b[k]) ** 2
-
-        return d
-
-    def weight(location):
-        w = 0
-
-        for k in attractors:
-            w += abs(location[k])
-
-        return w
-
-    def find_closest(location_list, location, dist):
-        q = PriorityQueue()
-
-        for i, j in enumerate(location_list):
-            # prevent dictionary comparison by inserting the index
-            q.put((dist(j, location) + weight(j), i, j))
-
-        prio, i, result = q.get()
-
-        return result
-
-    out = []
-    zero = defaultdict(lambda: 0)
-
-    out.append(find_closest(locations, zero, sqdist))
-    locations.remove(out[-1])
+    points = [(location[keys[0]], location[keys[1]]) for location in locations]
+    weights = [sum(abs(location[k]) for k in attractors) for location in locations]
+    # the weights change no more than the distance times this slope between two locations
+    slope = math.sqrt(len(attractors)) if all(k in keys for k in attractors) else 0.0
+    order = PathSequence.nearestNeighbourOrder(points, (0.0, 0.0), weights, slope)
 
-    while locations:
-        closest = find_closest(locations, out[-1], sqdist)
-        out.append(closest)
-        locations.remove(closest)
+    if timeLimit > 0.0:
+        before = PathSequence.rapidDistance(points, order)
+        order = PathSequence.twoOpt(points, order, (0.0, 0.0), timeLimit)
+        after = PathSequence.rapidDistance(points, order)
+        PathLog.info(translate("PathUtils", "Rapid distance of {} locations: {:.2f} before and {:.2f} after optimization").format(len(points), before, after))
 
-    return out
+    return [locations[i] for i in order]
 
 
 def guessDepths(objshape, subs=None):
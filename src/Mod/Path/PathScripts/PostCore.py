@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2019 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import FreeCAD
+import itertools
+import numpy
+
+__title__ = "PostCore - streaming post processor"
+__author__ = "FreeCAD Developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Translation of path commands into G-code lines, configured by a dialect description."
+
+# A post processor describes its G-code with a Dialect and lets a PostProcessor
+# translate the commands:
+#   processor = PostProcessor(Dialect(precision=2, lengthScale=unitScale(FreeCAD.Units.Length, 'in')))
+#   for line in processor.parse(obj): ...
+#   processor.write(obj, fp)
+#
+# The commands are processed in chunks. The parameter values of a chunk are
+# collected in one array, scaled to the output units and compared with the
+# previous values of each parameter column at once, only the formatting of
+# the remaining words and the assembly of the lines is done per value.
+
+ChunkSize = 4096    # commands formatted at once
+
+
+def unitScale(quantity, unit):
+    '''unitScale(quantity, unit) ... return the factor converting the internal unit of quantity, e.g. FreeCAD.Units.Length, into unit.'''
+    return float(FreeCAD.Units.Quantity(1.0, quantity).getValueAs(unit))
+
+
+class Dialect(object):
+    '''Dialect(**kwargs) ... description of the G-code a post processor emits, every attribute can be set by a keyword argument.'''
+
+    def __init__(self, **kwargs):
+        # parameters in output order, others are dropped
+        self.parameters = ['X', 'Y', 'Z', 'A', 'B', 'C', 'I', 'J', 'F', 'S', 'T', 'Q', 'R', 'L', 'H', 'D', 'P']
+        self.integerParameters = ['S', 'T', 'H', 'D']
+        self.speedParameters = ['F']
+        self.precision = 3
+        self.lengthScale = 1.0          # from mm into the output unit
+        self.speedScale = 60.0          # from mm/s into the output unit
+        self.modal = False              # suppress a command if it is the same as the previous one
+        self.outputDoubles = True       # output parameter values which didn't change
+        self.outputComments = True
+        self.lineNumbers = False
+        self.lineNumberStart = 100
+        self.lineNumberIncrement = 10
+        self.commandSpace = ' '
+        self.rapidCommands = ['G0', 'G00']  # commands without feed rate
+        self.toolChange = ''            # lines inserted before a M6
+        self.initialLocation = {'X': -1, 'Y': -1, 'Z': -1, 'F': 0.0}
+
+        for name, value in kwargs.items():
+            if not hasattr(self, name):
+                raise TypeError("Dialect has no attribute '{}'".format(name))
+            setattr(self, name, value)
+
+
+class PostProcessor(object):
+    '''PostProcessor(dialect) ... translate path commands into G-code lines of the dialect.
+    The modal state carries over between the calls of lines(), parse() starts every path with a reset.'''
+
+    def __init__(self, dialect):
+        self.dialect = dialect
+        self.lineNr = dialect.lineNumberStart
+        self.column = dict((p, j) for j, p in enumerate(dialect.parameters))
+        self.integer = numpy.array([p in dialect.integerParameters for p in dialect.parameters])
+        self.speed = numpy.array([p in dialect.speedParameters for p in dialect.parameters])
+        self.scale = numpy.where(self.speed, dialect.speedScale, dialect.lengthScale)
+        self.scale[self.integer] = 1.0
+        floatFormat = '%.' + str(int(dialect.precision)) + 'f'
+        self.formats = [p + ('%d' if i else floatFormat) for p, i in zip(dialect.parameters, self.integer)]
+        self.reset()
+
+    def reset(self):
+        '''reset() ... forget the previous command and the location.'''
+        self.lastCommand = None
+        self.location = numpy.full(len(self.dialect.parameters), numpy.nan)
+        for p, v in self.dialect.initialLocation.items():
+            if p in self.column:
+                self.location[self.column[p]] = v
+
+    def lineNumber(self):
+        '''lineNumber() ... return the prefix of the next line, empty without line numbers.'''
+        if not self.dialect.lineNumbers:
+            return ''
+        self.lineNr += self.dialect.lineNumberIncrement
+        return 'N' + str(self.lineNr) + ' '
+
+    def lines(self, commands):
+        '''lines(commands) ... generator of the G-code lines, without line ends, of the commands.'''
+        commands = iter(commands)
+        while True:
+            chunk = list(itertools.islice(commands, ChunkSize))
+            if not chunk:
+                return
+            for line in self._chunkLines(chunk):
+                yield line
+
+    def parse(self, pathobj):
+        '''parse(pathobj) ... generator of the G-code lines of pathobj, or of all paths in its Group.'''
+        if hasattr(pathobj, 'Group'):
+            for p in pathobj.Group:
+                for line in self.parse(p):
+                    yield line
+        elif hasattr(pathobj, 'Path'):
+            self.reset()
+            for line in self.lines(pathobj.Path.Commands):
+                yield line
+
+    def write(self, pathobj, stream):
+        '''write(pathobj, stream) ... write the G-code of pathobj to the file like stream as it is generated.'''
+        lines = self.parse(pathobj)
+        while True:
+            chunk = list(itertools.islice(lines, ChunkSize))
+            if not chunk:
+                return
+            stream.write('\n'.join(chunk) + '\n')
+
+    def _chunkLines(self, chunk):
+        d = self.dialect
+        names = []
+        params = []
+        for c in chunk:
+            name = c.Name
+            if name[0] == '(' and not d.outputComments:
+                continue
+            names.append(name)
+            params.append(c.Parameters)
+        if not names:
+            return
+
+        # parameter values, nan where not set
+        values = numpy.full((len(names), len(d.parameters)), numpy.nan)
+        column = self.column
+        for i, p in enumerate(params):
+            for k, v in p.items():
+                j = column.get(k)
+                if j is not None:
+                    values[i, j] = v
+
+        # the value of each parameter before each command
+        known = numpy.vstack((self.location, values))
+        rows = numpy.where(numpy.isnan(known), 0, numpy.arange(len(known))[:, None])
+        known = known[numpy.maximum.accumulate(rows, axis=0), numpy.arange(len(d.parameters))]
+        previous = known[:-1]
+        self.location = known[-1]
+
+        show = ~numpy.isnan(values)
+        if not d.outputDoubles:
+            show &= self.integer | (values != previous)
+        scaled = values * self.scale
+        if self.speed.any():
+            # no feed rate for rapid moves, nor if it isn't positive
+            rapid = numpy.array([n in d.rapidCommands for n in names])
+            show[:, self.speed] &= ~rapid[:, None] & (scaled[:, self.speed] > 0.0)
+
+        words = []
+        for j in range(len(d.parameters)):
+            rows = numpy.nonzero(show[:, j])[0]
+            if len(rows):
+                fmt = self.formats[j]
+                col = numpy.full(len(names), '', dtype=object)
+                col[rows] = [fmt % v for v in scaled[rows, j].tolist()]
+                words.append(col.tolist())
+
+        commands = list(names)
+        if d.modal:
+            for i, name in enumerate(names):
+                if name == self.lastCommand:
+                    commands[i] = ''
+                self.lastCommand = name
+        else:
+            self.lastCommand = names[-1]
+
+        toolChange = d.toolChange.splitlines()
+        space = d.commandSpace
+        for name, row in zip(names, zip(commands, *words)):
+            if name == 'M6':
+                for line in toolChange:
+                    yield self.lineNumber() + line
+            if name == 'message':
+                row = row[1:]
+            line = [w for w in row if w]
+            if line:
+                if d.lineNumbers:
+                    line.insert(0, self.lineNumber())
+                yield space.join(line).strip()
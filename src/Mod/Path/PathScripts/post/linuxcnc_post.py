@@ -22,11 +22,10 @@
 # ***************************************************************************/
 from __future__ import print_function
 import FreeCAD
-from FreeCAD import Units
-import Path
 import argparse
 import datetime
 import shlex
+from PathScripts import PostCore
 from PathScripts import PostUtils
 from PathScripts import PathUtils
 
@@ -161,20 +160,20 @@ def export(objectslist, filename, argstring):
             return None
 
     print("postprocessing...")
-    gcode = ""
+    gcode = []
 
     # write header
     if OUTPUT_HEADER:
-        gcode += linenumber() + "(Exported by FreeCAD)\n"
-        gcode += linenumber() + "(Post Processor: " + __name__ + ")\n"
-        gcode += linenumber() + "(Output Time:" + str(now) + ")\n"
+        gcode.append(linenumber() + "(Exported by FreeCAD)\n")
+        gcode.append(linenumber() + "(Post Processor: " + __name__ + ")\n")
+        gcode.append(linenumber() + "(Output Time:" + str(now) + ")\n")
 
     # Write the preamble
     if OUTPUT_COMMENTS:
-        gcode += linenumber() + "(begin preamble)\n"
+        gcode.append(linenumber() + "(begin preamble)\n")
     for line in PREAMBLE.splitlines(False):
-        gcode += linenumber() + line + "\n"
-    gcode += linenumber() + UNITS + "\n"
+        gcode.append(linenumber() + line + "\n")
+    gcode.append(linenumber() + UNITS + "\n")
 
     for obj in objectslist:
 
@@ -198,24 +197,25 @@ def export(objectslist, filename, argstring):
 
         # do the pre_op
         if OUTPUT_COMMENTS:
-            gcode += linenumber() + "(begin operation: %s)\n" % obj.Label
-            gcode += linenumber() + "(machine: %s, %s)\n" % (myMachine, UNIT_SPEED_FORMAT)
+            gcode.append(linenumber() + "(begin operation: %s)\n" % obj.Label)
+            gcode.append(linenumber() + "(machine: %s, %s)\n" % (myMachine, UNIT_SPEED_FORMAT))
         for line in PRE_OPERATION.splitlines(True):
-            gcode += linenumber() + line
+            gcode.append(linenumber() + line)
 
-        gcode += parse(obj)
+        gcode.append(parse(obj))
 
         # do the post_op
         if OUTPUT_COMMENTS:
-            gcode += linenumber() + "(finish operation: %s)\n" % obj.Label
+            gcode.append(linenumber() + "(finish operation: %s)\n" % obj.Label)
         for line in POST_OPERATION.splitlines(True):
-            gcode += linenumber() + line
+            gcode.append(linenumber() + line)
 
     # do the post_amble
     if OUTPUT_COMMENTS:
-        gcode += "(begin postamble)\n"
+        gcode.append("(begin postamble)\n")
     for line in POSTAMBLE.splitlines(True):
-        gcode += linenumber() + line
+        gcode.append(linenumber() + line)
+    gcode = ''.join(gcode)
 
     if FreeCAD.GuiUp and SHOW_EDITOR:
         dia = PostUtils.GCodeEditorDialog()
@@ -246,106 +246,30 @@ def linenumber():
     return ""
 
 
-def parse(pathobj):
-    global PRECISION
-    global MODAL
-    global OUTPUT_DOUBLES
-    global UNIT_FORMAT
-    global UNIT_SPEED_FORMAT
+def dialect():
+    # the G-code of the current settings
+    # linuxcnc doesn't want K properties on XY plane  Arcs need work.
+    return PostCore.Dialect(
+        parameters=['X', 'Y', 'Z', 'A', 'B', 'C', 'I', 'J', 'F', 'S', 'T', 'Q', 'R', 'L', 'H', 'D', 'P'],
+        precision=int(PRECISION),
+        lengthScale=PostCore.unitScale(FreeCAD.Units.Length, UNIT_FORMAT),
+        speedScale=PostCore.unitScale(FreeCAD.Units.Velocity, UNIT_SPEED_FORMAT),
+        modal=MODAL,
+        outputDoubles=OUTPUT_DOUBLES,
+        outputComments=OUTPUT_COMMENTS,
+        lineNumbers=OUTPUT_LINE_NUMBERS,
+        lineNumberStart=LINENR,
+        commandSpace=COMMAND_SPACE,
+        rapidCommands=['G0', 'G00'],  # linuxcnc doesn't use rapid speeds
+        toolChange=TOOL_CHANGE)
 
-    out = ""
-    lastcommand = None
-    precision_string = '.' + str(PRECISION) + 'f'
-    currLocation = {}  # keep track for no doubles
 
-    # the order of parameters
-    # linuxcnc doesn't want K properties on XY plane  Arcs need work.
-    params = ['X', 'Y', 'Z', 'A', 'B', 'C', 'I', 'J', 'F', 'S', 'T', 'Q', 'R', 'L', 'H', 'D', 'P']
-    firstmove = Path.Command("G0", {"X": -1, "Y": -1, "Z": -1, "F": 0.0})
-    currLocation.update(firstmove.Parameters)  # set First location Parameters
-
-    if hasattr(pathobj, "Group"):  # We have a compound or project.
-        # if OUTPUT_COMMENTS:
-        #     out += linenumber() + "(compound: " + pathobj.Label + ")\n"
-        for p in pathobj.Group:
-            out += parse(p)
-        return out
-    else:  # parsing simple path
-
-        # groups might contain non-path things like stock.
-        if not hasattr(pathobj, "Path"):
-            return out
-
-        # if OUTPUT_COMMENTS:
-        #     out += linenumber() + "(" + pathobj.Label + ")\n"
-
-        for c in pathobj.Path.Commands:
-
-            outstring = []
-            command = c.Name
-            outstring.append(command)
-
-            # if modal: suppress the command if it is the same as the last one
-            if MODAL is True:
-                if command == lastcommand:
-                    outstring.pop(0)
-
-            if c.Name[0] == '(' and not OUTPUT_COMMENTS: # command is a comment
-                continue
-
-            # Now add the remaining parameters in order
-            for param in params:
-                if param in c.Parameters:
-                    if param == 'F' and (currLocation[param] != c.Parameters[param] or OUTPUT_DOUBLES):
-                        if c.Name not in ["G0", "G00"]:  # linuxcnc doesn't use rapid speeds
-                            speed = Units.Quantity(c.Parameters['F'], FreeCAD.Units.Velocity)
-                            if speed.getValueAs(UNIT_SPEED_FORMAT) > 0.0:
-                                outstring.append(param + format(float(speed.getValueAs(UNIT_SPEED_FORMAT)), precision_string))
-                        else:
-                            continue
-                    elif param == 'T':
-                        outstring.append(param + str(int(c.Parameters['T'])))
-                    elif param == 'H':
-                        outstring.append(param + str(int(c.Parameters['H'])))
-                    elif param == 'D':
-                        outstring.append(param + str(int(c.Parameters['D'])))
-                    elif param == 'S':
-                        outstring.append(param + str(int(c.Parameters['S'])))
-                    else:
-                        if (not OUTPUT_DOUBLES) and (param in currLocation) and (currLocation[param] == c.Parameters[param]):
-                            continue
-                        else:
-                            pos = Units.Quantity(c.Parameters[param], FreeCAD.Units.Length)
-                            outstring.append(
-                                param + format(float(pos.getValueAs(UNIT_FORMAT)), precision_string))
-
-            # store the latest command
-            lastcommand = command
-            currLocation.update(c.Parameters)
-
-            # Check for Tool Change:
-            if command == 'M6':
-                # if OUTPUT_COMMENTS:
-                #     out += linenumber() + "(begin toolchange)\n"
-                for line in TOOL_CHANGE.splitlines(True):
-                    out += linenumber() + line
-
-            if command == "message":
-                if OUTPUT_COMMENTS is False:
-                    out = []
-                else:
-                    outstring.pop(0)  # remove the command
-
-            # prepend a line number and append a newline
-            if len(outstring) >= 1:
-                if OUTPUT_LINE_NUMBERS:
-                    outstring.insert(0, (linenumber()))
-
-                # append the line to the final output
-                for w in outstring:
-                    out += w + COMMAND_SPACE
-                out = out.strip() + "\n"
-
-        return out
+def parse(pathobj):
+    global LINENR
+
+    processor = PostCore.PostProcessor(dialect())
+    out = ''.join(line + "\n" for line in processor.parse(pathobj))
+    LINENR = processor.lineNr
+    return out
 
 print(__name__ + " gcode postprocessor loaded.")
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2019 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import Path
+import PathScripts.PathCommandBuffer as PathCommandBuffer
+import PathTests.PathTestUtils as PathTestUtils
+import math
+import numpy
+
+CommandBuffer = PathCommandBuffer.CommandBuffer
+
+
+def commands(*moves):
+    return [Path.Command(name, params) for name, params in moves]
+
+
+class TestPathCommandBuffer(PathTestUtils.PathTestBase):
+
+    def setUp(self):
+        self.path = Path.Path(commands(
+            ('(start)', {}),
+            ('G0', {'Z': 10}),
+            ('G0', {'X': 5, 'Y': 2}),
+            ('G1', {'Z': -1, 'F': 3}),
+            ('G2', {'X': 7, 'Y': 4, 'I': 2, 'J': 0}),
+            ('M6', {'T': 2}),
+            ('G1', {'X': 1})))
+
+    def test00(self):
+        '''Verify the arrays of the commands of a path.'''
+        buf = CommandBuffer.fromPath(self.path)
+        self.assertEqual(7, len(buf))
+        self.assertEqual(['(start)', 'G0', 'G0', 'G1', 'G2', 'M6', 'G1'], buf.names())
+        self.assertEqual([False, True, True, False, False, False, False], buf.isCommand('G0', 'G00').tolist())
+        self.assertEqual(2, buf.parameter('T')[5])
+        self.assertTrue(math.isnan(buf.parameter('X')[1]))
+
+        # modal parameters carry their value, the others are 0 where not set
+        self.assertEqual([0, 0, 5, 5, 7, 7, 1], buf.column('X', 0).tolist())
+        self.assertEqual([3, 3, 3], buf.column('F')[3:6].tolist())
+        self.assertTrue(math.isnan(buf.column('F')[2]))
+        self.assertEqual([0, 0, 0, 0, 2, 0, 0], buf.column('I').tolist())
+        self.assertEqual([5, 2, -1], buf.positions()[3].tolist())
+
+    def test01(self):
+        '''Verify a path from modified arrays.'''
+        buf = CommandBuffer.fromPath(self.path)
+        z = buf.parameter('Z')
+        z[~numpy.isnan(z)] += 1
+        path = buf.toPath()
+        self.assertEqual(7, len(path.Commands))
+        self.assertEqual('(start)', path.Commands[0].Name)
+        self.assertEqual({'Z': 11}, path.Commands[1].Parameters)
+        self.assertEqual({'Z': 0, 'F': 3}, path.Commands[3].Parameters)
+        self.assertEqual({'X': 7, 'Y': 4, 'I': 2, 'J': 0}, path.Commands[4].Parameters)
+        self.assertEqual({'T': 2}, path.Commands[5].Parameters)
+
+    def test02(self):
+        '''Verify building, selecting and concatenating commands in bulk.'''
+        x = numpy.arange(5, dtype=float)
+        buf = CommandBuffer.fromArrays('G1', X=x, Y=x * 2)
+        self.assertEqual(['G1'] * 5, buf.names())
+        self.assertEqual([3, 6], [buf.column('X')[3], buf.column('Y')[3]])
+
+        buf = CommandBuffer.fromArrays(['G0', '(move)', 'G1'], Z=[5, numpy.nan, 1])
+        self.assertEqual(['G0', '(move)', 'G1'], buf.names())
+        self.assertEqual([5, 5, 1], buf.column('Z').tolist())
+
+        both = CommandBuffer.concatenate([buf, buf.select(numpy.array([True, True, False]))])
+        self.assertEqual(['G0', '(move)', 'G1', 'G0', '(move)'], both.names())
+        self.assertEqual(['G0 Z5.000', '(move)', 'G1 Z1.000', 'G0 Z5.000', '(move)'], both.toGCode(3).splitlines())
+
+    def test03(self):
+        '''Verify all parameters are kept and words which can't be parameters are refused.'''
+        path = Path.Path(commands(('G1', {'X': 1, 'U': 2, 'V': 3, 'W': 4, 'E': 5})))
+        buf = CommandBuffer.fromPath(path)
+        self.assertEqual([2, 3, 4], [buf.parameter(name)[0] for name in 'UVW'])
+        self.assertEqual(path.toGCode(), buf.toPath().toGCode())
+
+        self.assertRaises(ValueError, CommandBuffer.fromGCode, 'G0 Z5\nG1 X1 M3\n')
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2019 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import Path
+import PathScripts.PathDexelSim as PathDexelSim
+import PathScripts.PathDropCutter as PathDropCutter
+import PathTests.PathTestUtils as PathTestUtils
+import numpy
+
+
+def bruteForceSweep(stock, cutter, p0, p1, samples=5001):
+    '''the lowest bottom of the cutter at many points of the move, for every column'''
+    X, Y = numpy.meshgrid(stock.xs, stock.ys)
+    env = numpy.full(X.shape, numpy.inf)
+    for t in numpy.linspace(0, 1, samples):
+        x, y, z = [p0[k] + t * (p1[k] - p0[k]) for k in range(3)]
+        d = numpy.hypot(X - x, Y - y)
+        reach = d <= cutter.getRadius()
+        env[reach] = numpy.minimum(env[reach], z + cutter.height(d[reach]))
+    return env
+
+
+class TestPathDexelSim(PathTestUtils.PathTestBase):
+
+    def setUp(self):
+        self.stock = PathDexelSim.DexelStock(0, 0, 20, 10, -5, 0, 0.5)
+
+    def test00(self):
+        '''Verify a flat cutter cutting a slot.'''
+        self.assertEqual((20, 40), self.stock.heights.shape)
+        window, removed = self.stock.cut(PathDropCutter.CylCutter(4, 10), (2, 5, -1), (18, 5, -1))
+        self.assertRoughly(1, removed.max())
+        heights = self.stock.heights
+        self.assertRoughly(-1, heights[10, 20])
+        self.assertRoughly(-1, heights[13, 20])
+        self.assertRoughly(0, heights[16, 20])
+        # above the stock nothing is cut
+        self.assertEqual((None, None), self.stock.cut(PathDropCutter.CylCutter(4, 10), (2, 5, 1), (18, 5, 1)))
+
+    def test01(self):
+        '''Verify the swept cutters on inclined moves.'''
+        for cutter in [PathDropCutter.CylCutter(4, 10), PathDropCutter.BallCutter(4, 10), PathDropCutter.BullCutter(4, 0.5, 10), PathDropCutter.ConeCutter(4, 0.7, 10)]:
+            for p0, p1 in [((2, 5, 0), (18, 5, -4)), ((18, 2, -4), (3, 8, -1)), ((10, 5, 0), (10, 5, -3))]:
+                window, env = self.stock.sweep(cutter, p0, p1)
+                expected = bruteForceSweep(self.stock, cutter, p0, p1)[window]
+                reach = numpy.isfinite(expected)
+                self.assertTrue((numpy.isfinite(env) == reach).all())
+                self.assertLess(numpy.abs(env[reach] - expected[reach]).max(), 0.002)
+
+    def test02(self):
+        '''Verify arcs, drill cycles, gouges and collisions.'''
+        model = numpy.full(self.stock.heights.shape, -numpy.inf)
+        model[:, 30:] = -2
+        sim = PathDexelSim.Simulation(self.stock, model)
+        sim.setCutter(PathDropCutter.CylCutter(1, 10))
+        commands = [
+            Path.Command('G0', {'X': 5, 'Y': 5, 'Z': 5}),
+            Path.Command('G1', {'X': 5, 'Y': 5, 'Z': -1}),
+            Path.Command('G2', {'X': 5, 'Y': 5, 'I': 3, 'J': 0}),
+            Path.Command('G0', {'Z': 5}),
+            Path.Command('G99'),
+            Path.Command('G81', {'X': 12, 'Y': 5, 'Z': -4, 'R': 1}),
+            Path.Command('G0', {'X': 17, 'Y': 5, 'Z': -0.5}),
+            Path.Command('G1', {'X': 17, 'Y': 5, 'Z': -3})]
+        sim.applyPath(Path.Path(commands), 'op')
+        heights = self.stock.heights
+        # the circle around (8, 5)
+        for x, y in [(5.25, 5.25), (10.75, 5.25), (8.25, 2.25), (8.25, 7.75)]:
+            self.assertRoughly(-1, heights[int(y / 0.5), int(x / 0.5)])
+        self.assertRoughly(0, heights[10, 16])
+        self.assertRoughly(-4, heights[10, 24])
+        self.assertEqual(4, (heights < -3.5).sum())
+        self.assertEqual(99, sim.retract)
+        self.assertEqual((17, 5, -3), sim.position)
+        self.assertEqual([('op', 6)], [r[:2] for r in sim.collisions])
+        self.assertEqual([('op', 7)], [r[:2] for r in sim.gouges])
+        self.assertRoughly(1, sim.gouges[0][2])
+        self.assertEqual(1, len(sim.report()) - 1)
+        # cutting next to the gouge above the model doesn't report it again
+        sim.applyPath(Path.Path([Path.Command('G0', {'Z': -1}), Path.Command('G1', {'X': 19, 'Y': 5, 'Z': -1})]), 'op2')
+        self.assertRoughly(-1, heights[10, 37])
+        self.assertEqual([('op', 7)], [r[:2] for r in sim.gouges])
+
+    def test03(self):
+        '''Verify the surface of the stock is closed and the model height field.'''
+        self.stock.cut(PathDropCutter.BallCutter(4, 10), (2, 5, -1), (18, 5, -1))
+        tris = self.stock.triangles()
+        # the signed volume of a closed surface
+        volume = numpy.einsum('ij,ij->i', tris[:, 0], numpy.cross(tris[:, 1], tris[:, 2])).sum() / 6
+        dx = self.stock.xs[1] - self.stock.xs[0]
+        cells = (self.stock.heights[:-1, :-1] + self.stock.heights[1:, :-1] + self.stock.heights[:-1, 1:] + self.stock.heights[1:, 1:]) / 4
+        self.assertRoughly((cells + 5).sum() * dx * dx, volume, 0.0001)
+        self.assertLess(volume, 19.5 * 9.5 * 5)
+
+        plateau = [((4, 4, -2), (14, 4, -2), (14, 6, -2)), ((4, 4, -2), (14, 6, -2), (4, 6, -2))]
+        heights = PathDexelSim.modelHeights(self.stock, plateau)
+        self.assertRoughly(-2, heights[10, 20])
+        self.assertEqual(-numpy.inf, heights[2, 20])
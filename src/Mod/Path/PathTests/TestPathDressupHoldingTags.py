@@ -74,3 +74,35 @@ class TestHoldingTags(PathTestBase):
         print(h)
         self.assertConeAt(tag.solid, Vector(0,0,-h * 0.01), 2.5, 0, h)
 
+
+    def test05(self):
+        """Verify the solids of tags are reused from the cache."""
+        cache = {}
+        tag = Tag(0, 0, 0, 5, 17, 60, 0, True)
+        tag.createSolidsAt(0, 0, cache)
+        self.assertEqual(1, len(cache))
+
+        other = Tag(1, 0, 0, 5, 17, 60, 0, True)
+        other.createSolidsAt(0, 0, cache)
+        self.assertIs(tag.solid, other.solid)
+        self.assertRoughly(tag.actualHeight, other.actualHeight)
+
+        other.createSolidsAt(1, 0, cache)
+        self.assertIsNot(tag.solid, other.solid)
+        self.assertEqual(2, len(cache))
+
+    def test06(self):
+        """Verify only tags near an edge are candidates for an intersection."""
+        tags = [Tag(i, 10 * i, 0, 4, 5, 90, 0, i != 2) for i in range(5)]
+        for tag in tags:
+            tag.createSolidsAt(0, 1)
+        index = PathScripts.PathDressupHoldingTags._TagIndex(tags)
+
+        def edge(x0, y0, x1, y1):
+            return Part.Edge(Part.LineSegment(Vector(x0, y0, 0), Vector(x1, y1, 0)))
+
+        self.assertEqual(set([0, 1]), index.candidates(edge(-5, 0, 12, 0)))
+        # disabled tags are never candidates
+        self.assertEqual(set([1, 3]), index.candidates(edge(10, 0, 30, 0)))
+        self.assertEqual(set([4]), index.candidates(edge(40, -10, 40, 10)))
+        self.assertEqual(set(), index.candidates(edge(0, 10, 40, 10)))
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2019 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import PathScripts.PathDropCutter as PathDropCutter
+import PathTests.PathTestUtils as PathTestUtils
+import math
+
+P = PathDropCutter.Point
+
+
+def createSTL(triangles):
+    stl = PathDropCutter.STLSurf()
+    for p, q, r in triangles:
+        stl.addTriangle(PathDropCutter.Triangle(P(*p), P(*q), P(*r)))
+    return stl
+
+
+def dropAlongX(stl, cutter, y, xmin, xmax, sampling, minZ=-10.0):
+    pdc = PathDropCutter.PathDropCutter()
+    pdc.setSTL(stl)
+    pdc.setCutter(cutter)
+    pdc.setZ(minZ)
+    pdc.setSampling(sampling)
+    path = PathDropCutter.Path()
+    path.append(PathDropCutter.Line(P(xmin, y, 0), P(xmax, y, 0)))
+    pdc.setPath(path)
+    pdc.run()
+    return pdc.getCLPoints()
+
+
+class TestPathDropCutter(PathTestUtils.PathTestBase):
+
+    def setUp(self):
+        # square plateau at z=5
+        self.plateau = createSTL([((0, 0, 5), (10, 0, 5), (10, 10, 5)), ((0, 0, 5), (10, 10, 5), (0, 10, 5))])
+        # 45 degree roof with the ridge along y at x=5, z=5
+        self.roof = createSTL([
+            ((0, 0, 0), (5, 0, 5), (5, 10, 5)), ((0, 0, 0), (5, 10, 5), (0, 10, 0)),
+            ((5, 0, 5), (10, 0, 0), (10, 10, 0)), ((5, 0, 5), (10, 10, 0), (5, 10, 5))])
+
+    def test00(self):
+        '''Verify sampling and cutter locations of a flat cutter on a plateau.'''
+        cl = dropAlongX(self.plateau, PathDropCutter.CylCutter(4, 10), 5, -4, 4, 1)
+        # same as ocl, int(length / sampling + 1) steps
+        self.assertEqual(10, len(cl))
+        self.assertRoughly(-4, cl[0].x)
+        self.assertRoughly(-4 + 8.0 / 9, cl[1].x)
+        self.assertRoughly(4, cl[-1].x)
+        self.assertRoughly(5, cl[-1].y)
+        # the cutter radius hangs over the edge
+        self.assertEqual([-10, -10, -10, 5, 5, 5, 5, 5, 5, 5], [round(p.z, 6) for p in cl])
+
+    def test01(self):
+        '''Verify a ball cutter on the facets and the ridge of a roof.'''
+        cutter = PathDropCutter.BallCutter(4, 10)
+        cl = dropAlongX(self.roof, cutter, 5, 1, 9, 0.5)
+        for p in cl:
+            d = abs(p.x - 5)
+            if d < 2 * math.sin(math.pi / 4):
+                # touches the ridge
+                self.assertRoughly(5 + math.sqrt(4 - d * d) - 2, p.z)
+            else:
+                # touches the facet, the center is 2 above the plane
+                self.assertRoughly(5 - d + 2 * math.sqrt(2) - 2, p.z)
+
+    def test02(self):
+        '''Verify flat, bull nose and cone cutters on the ridge of a roof.'''
+        cl = dropAlongX(self.roof, PathDropCutter.CylCutter(4, 10), 5, 2, 8, 1)
+        for p in cl:
+            self.assertRoughly(5 - max(0, abs(p.x - 5) - 2), p.z)
+
+        # the torus corner of radius 0.5 touches the ridge 0.25 outside of the flat bottom
+        cl = dropAlongX(self.roof, PathDropCutter.BullCutter(4, 0.5, 10), 5, 6.75, 6.75, 1)
+        self.assertRoughly(5 - (0.5 - math.sqrt(0.5 * 0.5 - 0.25 * 0.25)), cl[0].z)
+
+        # a 90 degree cone touches the roof with its whole flank
+        cl = dropAlongX(self.roof, PathDropCutter.ConeCutter(4, math.pi / 4, 10), 5, 3, 7, 1)
+        for p in cl:
+            self.assertRoughly(5 - abs(p.x - 5), p.z)
+
+    def test03(self):
+        '''Verify rotating the surface.'''
+        stl = createSTL([((0, 0, 5), (10, 0, 5), (10, 10, 5)), ((0, 0, 5), (10, 10, 5), (0, 10, 5))])
+        cutter = PathDropCutter.CylCutter(2, 10)
+        # upside down at z=-5 within y=-10..0
+        stl.rotate(math.pi, 0, 0)
+        self.assertRoughly(-5, dropAlongX(stl, cutter, -5, 5, 5, 1)[0].z)
+        self.assertRoughly(-10, dropAlongX(stl, cutter, 5, 5, 5, 1)[0].z)
+        stl.rotate(-math.pi, 0, 0)
+        self.assertRoughly(5, dropAlongX(stl, cutter, 5, 5, 5, 1)[0].z)
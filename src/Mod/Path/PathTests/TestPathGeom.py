@@ -317,6 +317,27 @@ class TestPathGeom(PathTestBase):
 
         self.assertCommandEqual(cmds(center, radius), cmd('G3', Vector(15, 10, 0), Vector(-5, 0, 0)))
 
+    def test42(self):
+        """Verify conversion of several edges at once."""
+        line = Part.Edge(Part.LineSegment(Vector(0, 0, 0), Vector(10, 0, 0)))
+        arc = Part.Edge(Part.Arc(Vector(10, 0, 0), Vector(15, 5, 0), Vector(10, 10, 0)))
+
+        commands = PathGeom.cmdsForEdges([line, arc, line], [False, False, True])
+        self.assertEqual(3, len(commands))
+        self.assertCommandEqual(commands[0], Path.Command('G1', {'X': 10, 'Y': 0, 'Z': 0}))
+        self.assertCommandEqual(commands[1], Path.Command('G3', {'X': 10, 'Y': 10, 'Z': 0, 'I': 0, 'J': 5, 'K': 0}))
+        self.assertCommandEqual(commands[2], Path.Command('G1', {'X': 0, 'Y': 0, 'Z': 0}))
+
+        # half an ellipse has to be approximated by segments
+        ellipse = Part.Edge(Part.Ellipse(Vector(0, 0, 0), 10, 5), 0, math.pi)
+        for flip, end in [(False, -10), (True, 10)]:
+            commands = PathGeom.cmdsForEdges([ellipse], flip, deflection=0.01)
+            self.assertTrue(len(commands) > 10)
+            for c in commands:
+                self.assertEqual('G1', c.Name)
+                self.assertRoughly(1, (c.Parameters['X'] / 10) ** 2 + (c.Parameters['Y'] / 5) ** 2)
+            self.assertCommandEqual(commands[-1], Path.Command('G1', {'X': end, 'Y': 0, 'Z': 0}))
+
     def test50(self):
         """Verify proper wire(s) aggregation from a Path."""
         commands = []
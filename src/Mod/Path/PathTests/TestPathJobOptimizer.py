@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2019 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import Path
+import PathScripts.PathJobOptimizer as PathJobOptimizer
+import PathTests.PathTestUtils as PathTestUtils
+
+Clearance = 20.0
+Safe = 5.0
+
+
+def square(x, y, z, size=10):
+    '''commands cutting a square at depth z and retracting to Clearance'''
+    return [
+        Path.Command('G0', {'X': x, 'Y': y}),
+        Path.Command('G0', {'Z': Safe}),
+        Path.Command('G1', {'Z': z}),
+        Path.Command('G1', {'X': x + size}),
+        Path.Command('G1', {'Y': y + size}),
+        Path.Command('G1', {'X': x}),
+        Path.Command('G1', {'Y': y}),
+        Path.Command('G0', {'Z': Clearance})]
+
+
+def operation(*squares):
+    commands = [Path.Command('(op)'), Path.Command('G0', {'Z': Clearance})]
+    for sq in squares:
+        commands.extend(square(*sq))
+    commands.append(Path.Command('G0', {'Z': Clearance}))
+    return commands
+
+
+class TestPathJobOptimizer(PathTestUtils.PathTestBase):
+
+    def test00(self):
+        '''Verify splitting a path into segments.'''
+        commands = operation((0, 0, -1), (100, 0, -1))
+        prefix, segments, suffix, end = PathJobOptimizer.splitPath(commands, Clearance)
+        self.assertEqual(['(op)', 'G0'], [c.Name for c in prefix])
+        self.assertEqual(2, len(segments))
+        self.assertEqual((0, 0, Clearance), segments[0].start)
+        self.assertEqual((100, 0, Clearance), segments[1].start)
+        self.assertEqual([100, 0, 110, 10], segments[1].box)
+        self.assertEqual(7, len(segments[1].commands))
+        self.assertEqual(1, len(suffix))
+        self.assertEqual((100, 0, Clearance), end)
+
+        # canned cycles aren't split
+        commands.insert(3, Path.Command('G81', {'X': 1, 'Y': 1, 'Z': -1, 'R': Safe}))
+        self.assertIsNone(PathJobOptimizer.splitPath(commands, Clearance))
+
+    def test01(self):
+        '''Verify the segments are reordered but step downs of a region stay in order.'''
+        commands = operation((0, 0, -1), (100, 0, -1), (0, 0, -2), (100, 0, -2))
+        prefix, segments, suffix, end = PathJobOptimizer.splitPath(commands, Clearance)
+        self.assertEqual([[2], [3], [], []], PathJobOptimizer.precedence(segments, 1))
+        self.assertEqual([0, 2, 1, 3], PathJobOptimizer.orderSegments(segments, (0, 0), 1))
+        # the segment of the other region is nearer but has to wait for its step down
+        self.assertEqual([1, 3, 0, 2], PathJobOptimizer.orderSegments(segments, (100, 0), 1))
+
+        optimized, end = PathJobOptimizer.optimizeCommands(commands, Clearance, Safe, 1, (0, 0, Clearance))
+        self.assertEqual((100, 0, Clearance), end)
+        before = PathJobOptimizer.rapidTime(commands, (0, 0, Clearance), 10, 5)
+        after = PathJobOptimizer.rapidTime(optimized, (0, 0, Clearance), 10, 5)
+        # the rapid moves down to SafeHeight and the retracts from the depths stay
+        vertical = 4 * (Clearance - Safe) + 2 * (Clearance + 1) + 2 * (Clearance + 2)
+        self.assertRoughly(300 + vertical, before[0])
+        self.assertRoughly(100 + vertical, after[0])
+        self.assertRoughly(30 + vertical / 5, before[1])
+        self.assertRoughly(10 + vertical / 5, after[1])
+
+    def test02(self):
+        '''Verify retracts are only lowered to SafeHeight above the stock.'''
+        commands = operation((0, 0, -1), (50, 0, -1))
+        optimized, end = PathJobOptimizer.optimizeCommands(commands, Clearance, Safe, 1, (0, 0, Clearance))
+        self.assertEqual(Clearance, optimized[9].Parameters['Z'])
+
+        stock = (-10, -10, -10, 70, 20, 0)
+        optimized, end = PathJobOptimizer.optimizeCommands(commands, Clearance, Safe, 1, (0, 0, Clearance), stock)
+        self.assertEqual({'Z': Safe}, optimized[9].Parameters)
+        self.assertEqual({'X': 50, 'Y': 0}, optimized[10].Parameters)
+        self.assertEqual({'Z': Safe}, optimized[11].Parameters)
+        self.assertEqual({'Z': Clearance}, optimized[-2].Parameters)
+        self.assertEqual((50, 0, Clearance), end)
+
+        # the link leaves the stock
+        stock = (-10, -10, -10, 40, 20, 0)
+        optimized, end = PathJobOptimizer.optimizeCommands(commands, Clearance, Safe, 1, (0, 0, Clearance), stock)
+        self.assertEqual(Clearance, optimized[9].Parameters['Z'])
+        # SafeHeight is below the top of the stock
+        stock = (-10, -10, -10, 70, 20, Safe + 1)
+        optimized, end = PathJobOptimizer.optimizeCommands(commands, Clearance, Safe, 1, (0, 0, Clearance), stock)
+        self.assertEqual(Clearance, optimized[9].Parameters['Z'])
+
+    def test03(self):
+        '''Verify the op moves to its first segment even if it starts there.'''
+        commands = operation((10, 10, -1), (50, 0, -1))
+        optimized, end = PathJobOptimizer.optimizeCommands(commands, Clearance, Safe, 1, (10, 10, Clearance))
+        self.assertEqual(['(op)', 'G0', 'G0'], [c.Name for c in optimized[:3]])
+        self.assertEqual({'Z': Clearance}, optimized[1].Parameters)
+        self.assertEqual({'X': 10, 'Y': 10}, optimized[2].Parameters)
+        self.assertEqual({'Z': Safe}, optimized[3].Parameters)
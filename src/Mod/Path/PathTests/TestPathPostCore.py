@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2019 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import Path
+import PathScripts.PostCore as PostCore
+import PathTests.PathTestUtils as PathTestUtils
+
+
+class PathObject(object):
+    def __init__(self, commands):
+        self.Path = Path.Path(commands)
+
+
+class Stream(object):
+    def __init__(self):
+        self.text = ''
+
+    def write(self, text):
+        self.text += text
+
+
+class TestPathPostCore(PathTestUtils.PathTestBase):
+
+    def setUp(self):
+        self.commands = [
+            Path.Command('(begin)'),
+            Path.Command('G0', {'Z': 5}),
+            Path.Command('G0', {'X': 1, 'Y': 2, 'F': 50}),
+            Path.Command('G1', {'X': 1, 'Y': 3, 'Z': -1.5, 'F': 10}),
+            Path.Command('G1', {'X': 2, 'Y': 3, 'Z': -1.5, 'F': 10}),
+            Path.Command('M6', {'T': 2}),
+            Path.Command('M3', {'S': 1000.7})]
+        self.chunkSize = PostCore.ChunkSize
+
+    def tearDown(self):
+        PostCore.ChunkSize = self.chunkSize
+
+    def lines(self, **kwargs):
+        return list(PostCore.PostProcessor(PostCore.Dialect(**kwargs)).lines(self.commands))
+
+    def test00(self):
+        '''Verify the default dialect.'''
+        self.assertEqual([
+            '(begin)',
+            'G0 Z5.000',
+            'G0 X1.000 Y2.000',
+            'G1 X1.000 Y3.000 Z-1.500 F600.000',
+            'G1 X2.000 Y3.000 Z-1.500 F600.000',
+            'M6 T2',
+            'M3 S1000'], self.lines())
+
+    def test01(self):
+        '''Verify modal commands, suppressed doubles and comments.'''
+        self.assertEqual([
+            'G0 Z5.00',
+            'X1.00 Y2.00',
+            'G1 Y3.00 Z-1.50 F600.00',
+            'X2.00',
+            'M6 T2',
+            'M3 S1000'], self.lines(precision=2, modal=True, outputDoubles=False, outputComments=False))
+
+    def test02(self):
+        '''Verify unit scales, line numbers and tool change lines.'''
+        self.assertEqual([
+            'N110  G0 Z0.1969',
+            'N120  G0 X0.0394 Y0.0787',
+            'N130  G1 X0.0394 Y0.1181 Z-0.0591 F23.6220',
+            'N140  G1 X0.0787 Y0.1181 Z-0.0591 F23.6220',
+            'N150 M5',
+            'N160  M6 T2',
+            'N170  M3 S1000'], self.lines(precision=4, lengthScale=1 / 25.4, speedScale=60 / 25.4, outputComments=False, lineNumbers=True, toolChange='M5\n'))
+
+    def test03(self):
+        '''Verify the modal state carries over the chunks.'''
+        PostCore.ChunkSize = 2
+        self.assertEqual([
+            'G0 Z5',
+            'X1 Y2',
+            'G1 Y3 Z-2 F600',
+            'X2',
+            'M6 T2',
+            'M3 S1000'], self.lines(precision=0, modal=True, outputDoubles=False, outputComments=False))
+
+    def test04(self):
+        '''Verify the paths of a group are streamed with a reset of the modal state.'''
+        group = PathObject([])
+        group.Group = [PathObject(self.commands[1:3]), PathObject(self.commands[1:3])]
+        processor = PostCore.PostProcessor(PostCore.Dialect(precision=1, modal=True))
+        stream = Stream()
+        processor.write(group, stream)
+        self.assertEqual('G0 Z5.0\nX1.0 Y2.0\nG0 Z5.0\nX1.0 Y2.0\n', stream.text)
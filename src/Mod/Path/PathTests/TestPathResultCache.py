@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2019 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+
+import PathScripts.PathResultCache as PathResultCache
+import PathTests.PathTestUtils as PathTestUtils
+import os
+import shutil
+import tempfile
+
+
+class TestPathResultCache(PathTestUtils.PathTestBase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test00(self):
+        '''Verify results are found by the content of their key.'''
+        cache = PathResultCache.ResultCache(os.path.join(self.directory, 'cache'), 1000000)
+        key = {'tool': 6.0, 'geometry': [[(0, 0), (10, 0), (10, 10)]], 'side': 'Inside'}
+        self.assertIsNone(cache.get(key))
+
+        cache.put(key, [{'StartPoint': (1, 2), 'ReturnMotionType': 0}])
+        # a new cache on the same directory, with the key built in a different order
+        cache = PathResultCache.ResultCache(os.path.join(self.directory, 'cache'), 1000000)
+        same = {'side': 'Inside', 'geometry': [[[0, 0], [10, 0], [10, 10]]], 'tool': 6.0}
+        self.assertEqual([{'StartPoint': [1, 2], 'ReturnMotionType': 0}], cache.get(same))
+        self.assertIsNone(cache.get(dict(same, tool=5.0)))
+
+        cache.clear()
+        self.assertIsNone(cache.get(key))
+
+    def test01(self):
+        '''Verify the least recently used results are removed.'''
+        cache = PathResultCache.ResultCache(self.directory, 1000000)
+        for i in range(3):
+            cache.put(i, list(range(100 * i, 100 * i + 100)))
+            os.utime(cache.fileName(cache.digest(i)), (1000 + i, 1000 + i))
+        # reading 0 makes 1 the least recently used
+        self.assertEqual(0, cache.get(0)[0])
+        sizes = sorted(e[1] for e in cache.entries())
+
+        cache.maxSize = sum(sizes) - 1
+        cache.evict()
+        self.assertIsNone(cache.get(1))
+        self.assertEqual(200, cache.get(2)[0])
+        self.assertEqual(0, cache.get(0)[0])
+
+        cache.maxSize = 0
+        cache.evict()
+        self.assertEqual([], cache.entries())
+
+    def test02(self):
+        '''Verify a result replaces the stored one and a failed store leaves no files behind.'''
+        cache = PathResultCache.ResultCache(self.directory, 1000000)
+        cache.put('key', [1])
+        cache.put('key', [2])
+        self.assertEqual([2], cache.get('key'))
+
+        self.assertRaises(TypeError, cache.put, 'other', [object()])
+        self.assertIsNone(cache.get('other'))
+        self.assertEqual([os.path.basename(cache.fileName(cache.digest('key')))], os.listdir(self.directory))
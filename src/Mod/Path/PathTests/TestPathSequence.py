@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2019 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import PathScripts.PathSequence as PathSequence
+import PathTests.PathTestUtils as PathTestUtils
+import math
+import random
+
+
+def bruteForceOrder(points, weights):
+    '''nearest neighbour order by searching all remaining points'''
+    order = []
+    remaining = list(range(len(points)))
+    x, y = 0.0, 0.0
+    while remaining:
+        i = min(remaining, key=lambda i: ((points[i][0] - x) ** 2 + (points[i][1] - y) ** 2 + weights[i], i))
+        remaining.remove(i)
+        order.append(i)
+        x, y = points[i]
+    return order
+
+
+class TestPathSequence(PathTestUtils.PathTestBase):
+
+    def test00(self):
+        '''Verify the nearest neighbour order of weighted locations.'''
+        rnd = random.Random(7)
+        for n in [1, 2, 10, 100]:
+            for points in [
+                    [(rnd.uniform(-50, 50), rnd.uniform(-50, 50)) for i in range(n)],
+                    [(rnd.randint(0, 4) * 5.0, rnd.randint(0, 4) * 5.0) for i in range(n)],
+                    [(rnd.uniform(10, 90), 20.0) for i in range(n)]]:
+                weights = [abs(x) for x, y in points]
+                self.assertEqual(bruteForceOrder(points, weights), PathSequence.nearestNeighbourOrder(points, (0.0, 0.0), weights, 1.0))
+                weights = [0.0] * n
+                self.assertEqual(bruteForceOrder(points, weights), PathSequence.nearestNeighbourOrder(points))
+
+    def test01(self):
+        '''Verify the rapid distance and that 2-opt untangles crossing moves.'''
+        points = [(0, 10), (10, 0), (10, 10), (0, 20)]
+        self.assertRoughly(10 + math.sqrt(200) + 10 + math.sqrt(200), PathSequence.rapidDistance(points, [0, 1, 2, 3]))
+        # along the x axis the moves 1 -> 3 and 2 -> 4 overlap
+        points = [(1, 0), (3, 0), (2, 0), (4, 0)]
+        self.assertRoughly(6, PathSequence.rapidDistance(points, [0, 1, 2, 3]))
+        order = PathSequence.twoOpt(points, [0, 1, 2, 3])
+        self.assertEqual([0, 2, 1, 3], order)
+        self.assertRoughly(4, PathSequence.rapidDistance(points, order))
+
+    def test02(self):
+        '''Verify 2-opt keeps all locations and doesn't lengthen the path.'''
+        rnd = random.Random(3)
+        points = [(rnd.uniform(0, 100), rnd.uniform(0, 100)) for i in range(300)]
+        order = PathSequence.nearestNeighbourOrder(points)
+        improved = PathSequence.twoOpt(points, order, (0.0, 0.0), 10.0)
+        self.assertEqual(list(range(300)), sorted(improved))
+        self.assertLess(PathSequence.rapidDistance(points, improved), PathSequence.rapidDistance(points, order))
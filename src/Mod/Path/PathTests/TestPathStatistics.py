@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2019 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import Path
+import PathScripts.PathStatistics as PathStatistics
+import PathTests.PathTestUtils as PathTestUtils
+import math
+
+
+def commands(*moves):
+    return [Path.Command(name, params) for name, params in moves]
+
+
+class TestPathStatistics(PathTestUtils.PathTestBase):
+
+    def test00(self):
+        '''Verify converting G-code into arrays.'''
+        letters, numbers, values = PathStatistics.gcodeArrays("G0 X1.000000 Y-2.5\n(comment X5)\nM6 T2\nG01 F10.000000 Z-1.250000\nG2 I.5 J-0.5")
+        self.assertEqual([ord('G'), 0, ord('M'), ord('G'), ord('G')], letters.tolist())
+        self.assertEqual([0, 6, 1, 2], numbers[[0, 2, 3, 4]].tolist())
+        self.assertTrue(math.isnan(numbers[1]))
+        self.assertEqual([1, -2.5], values[0, :2].tolist())
+        self.assertTrue(all(math.isnan(v) for v in values[1]))
+        self.assertTrue(all(math.isnan(v) for v in values[2]))
+        self.assertEqual([-1.25, 10], values[3, [2, 6]].tolist())
+        self.assertEqual([0.5, -0.5], values[4, 3:5].tolist())
+
+    def test01(self):
+        '''Verify distances and times of straight moves and arcs.'''
+        path = commands(
+            ('G0', {'Z': 10}),
+            ('G0', {'X': 10}),
+            ('G1', {'Z': 0, 'F': 2}),
+            ('G2', {'X': 20, 'Y': 0, 'I': 5, 'J': 0, 'F': 5}),
+            ('G3', {'X': 20, 'Y': 0, 'I': -5, 'J': 0}))
+        stats, end = PathStatistics.pathStatistics(path, (0, 0, 0), 10, 5)
+        self.assertEqual(5, stats.moves)
+        self.assertRoughly(20, stats.rapidDistance)
+        self.assertRoughly(3, stats.rapidTime)
+        self.assertRoughly(10 + 15 * math.pi, stats.feedDistance)
+        self.assertRoughly(5 + 3 * math.pi, stats.feedTime)
+        self.assertEqual((0, 10), (stats.zMin, stats.zMax))
+        self.assertEqual((20, 0, 0), end)
+
+        # feed rates of the tool controller, nothing is known before the first move
+        path = commands(('G1', {'X': 10, 'Y': 0, 'Z': 0}), ('G1', {'Z': -4}), ('G1', {'X': 20}))
+        stats, end = PathStatistics.pathStatistics(path, hFeed=5, vFeed=2)
+        self.assertRoughly(14, stats.feedDistance)
+        self.assertRoughly(4, stats.feedTime)
+
+    def test02(self):
+        '''Verify canned drill cycles.'''
+        path = commands(
+            ('G81', {'X': 10, 'Y': 0, 'Z': -5, 'R': 2, 'F': 1}),
+            ('G99', {}),
+            ('G81', {'X': 20, 'Y': 0, 'Z': -5, 'R': 2}),
+            ('G83', {'X': 30, 'Y': 0, 'Z': -5, 'R': 2, 'Q': 3}),
+            ('G82', {'X': 40, 'Y': 0, 'Z': -5, 'R': 2, 'P': 1.5}))
+        stats, end = PathStatistics.pathStatistics(path, (0, 0, 10), 10, 5)
+        self.assertEqual(4, stats.moves)
+        # G98 returns to 10, G99 to R, G83 pecks 3 times
+        self.assertRoughly(4 * 10 + (8 + 15) + (8 + 7) + (7 + 3 * 3 * 2) + 7, stats.rapidDistance)
+        self.assertRoughly(4 * 7, stats.feedDistance)
+        self.assertRoughly(28, stats.feedTime)
+        self.assertRoughly(1.5, stats.dwellTime)
+        self.assertEqual((-5, 10), (stats.zMin, stats.zMax))
+        self.assertEqual((40, 0, 2), end)
+
+    def test03(self):
+        '''Verify acceleration limits the speed at corners and of short moves.'''
+        straight = commands(('G1', {'X': 10, 'F': 10}), ('G1', {'X': 20}))
+        stats, end = PathStatistics.pathStatistics(straight, (0, 0, 0), acceleration=10)
+        self.assertRoughly(3, stats.feedTime)
+        self.assertEqual(0, stats.feedLimited)
+
+        corner = commands(('G1', {'X': 10, 'F': 10}), ('G1', {'Y': 10}))
+        stats, end = PathStatistics.pathStatistics(corner, (0, 0, 0), acceleration=10)
+        self.assertRoughly(4, stats.feedTime)
+
+        # the tangent of the arc continues the straight move
+        tangent = commands(('G1', {'X': 10, 'F': 10}), ('G3', {'X': 10, 'Y': 20, 'I': 0, 'J': 10}))
+        stats, end = PathStatistics.pathStatistics(tangent, (0, 0, 0), acceleration=10)
+        self.assertRoughly(1.5 + 10 * math.pi / 10 + 0.5, stats.feedTime)
+
+        short = commands(('G1', {'X': 1, 'F': 10}))
+        stats, end = PathStatistics.pathStatistics(short, (0, 0, 0), acceleration=10)
+        self.assertRoughly(2 * math.sqrt(10) / 10, stats.feedTime)
+        self.assertEqual(1, stats.feedLimited)
+
+    def test04(self):
+        '''Verify accumulating statistics and formatting times.'''
+        stats = PathStatistics.Statistics()
+        stats.add(PathStatistics.pathStatistics(commands(('G0', {'Z': 5})), (0, 0, 0), 0, 5)[0])
+        stats.add(PathStatistics.pathStatistics(commands(('G1', {'Z': -2, 'F': 1})), (0, 0, 5), 0, 5)[0])
+        self.assertEqual(2, stats.commands)
+        self.assertRoughly(8, stats.time)
+        self.assertRoughly(12, stats.distance)
+        self.assertEqual((-2, 5), (stats.zMin, stats.zMax))
+        self.assertEqual('0:00:08', PathStatistics.formatTime(stats.time))
+        self.assertEqual('1:01:01', PathStatistics.formatTime(3661))
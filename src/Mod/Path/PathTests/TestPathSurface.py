@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2019 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import PathScripts.PathDropCutter as PathDropCutter
+import PathScripts.PathSurface as PathSurface
+import PathScripts.PathSurfaceSupport as PathSurfaceSupport
+import PathTests.PathTestUtils as PathTestUtils
+import math
+import numpy
+
+
+def createScan(z):
+    '''scan lines along X at 1mm spacing with the heights z[line][point]'''
+    z = numpy.array(z, dtype=float)
+    x, y = numpy.meshgrid(numpy.arange(z.shape[1]), numpy.arange(z.shape[0]))
+    return numpy.dstack((x, y, z))
+
+
+def loopArea(loop):
+    return 0.5 * numpy.sum(loop[:-1, 0] * loop[1:, 1] - loop[1:, 0] * loop[:-1, 1])
+
+
+class Length(object):
+    def __init__(self, value):
+        self.Value = value
+
+
+class PlanarObj(object):
+    '''the properties of a single-pass planar 3D Surface op ignoring waste below -5'''
+    def __init__(self, release):
+        self.Optimize = False
+        self.IgnoreWaste = True
+        self.IgnoreWasteDepth = -5.0
+        self.ReleaseFromWaste = release
+        self.LayerMode = 'Single-pass'
+        self.DropCutterDir = 'X'
+        self.CutPattern = 'Line'
+        self.ClearanceHeight = Length(20)
+        self.SafeHeight = Length(10)
+        self.OpStockZMax = Length(5)
+        self.DepthOffset = Length(0)
+
+
+class RotaryObj(object):
+    '''the properties of a rotational 3D Surface op indexed around X'''
+    def __init__(self):
+        self.RotationAxis = 'X'
+        self.DropCutterDir = 'X'
+        self.CutPattern = 'Line'
+        self.CutMode = 'Conventional'
+        self.CutterTilt = 0.0
+
+
+class TestPathSurface(PathTestUtils.PathTestBase):
+
+    def test00(self):
+        '''Verify the waterline loop around a single high point.'''
+        z = numpy.zeros((5, 5))
+        z[2][2] = 5
+        scan = createScan(z)
+        topoMap = numpy.pad(scan[:, :, 2] > 1, 1, 'constant', constant_values=False)
+        loops = PathSurfaceSupport.waterlineLoops(topoMap, scan, False)
+        self.assertEqual(1, len(loops))
+        loop = loops[0]
+        # closed loop through the 8 neighbours, corners squared, the high on the left
+        self.assertEqual(9, len(loop))
+        self.assertEqual(loop[0].tolist(), loop[-1].tolist())
+        self.assertEqual(sorted(set(map(tuple, loop.tolist()))), [(x, y) for x in (1.0, 2.0, 3.0) for y in (1.0, 2.0, 3.0) if (x, y) != (2.0, 2.0)])
+        self.assertRoughly(4, loopArea(loop))
+
+        climb = PathSurfaceSupport.waterlineLoops(topoMap, scan, True)[0]
+        self.assertRoughly(-4, loopArea(climb))
+
+    def test01(self):
+        '''Verify the waterline loops of a high ring.'''
+        z = numpy.zeros((10, 12))
+        z[2:8, 3:9] = 5
+        z[4:6, 5:7] = 0
+        scan = createScan(z)
+        topoMap = numpy.pad(scan[:, :, 2] > 1, 1, 'constant', constant_values=False)
+        loops = PathSurfaceSupport.waterlineLoops(topoMap, scan, False)
+        self.assertEqual(2, len(loops))
+        outside, inside = loops
+        # all loop points are low, next to the ring
+        for loop in loops:
+            self.assertTrue(all(z[int(y)][int(x)] == 0 for x, y in loop.tolist()))
+        self.assertRoughly(7 * 7, loopArea(outside))
+        self.assertRoughly(-1, loopArea(inside))
+        # the buffer around the scan is outside of the scan area
+        z[0:10, 0:3] = 5
+        scan = createScan(z)
+        topoMap = numpy.pad(scan[:, :, 2] > 1, 1, 'constant', constant_values=False)
+        loops = PathSurfaceSupport.waterlineLoops(topoMap, scan, False)
+        self.assertEqual(-1, min(x for loop in loops for x, y in loop.tolist()))
+
+    def test02(self):
+        '''Verify the worker pool computes the layers and index angles in task order.'''
+        z = numpy.zeros((10, 12))
+        z[2:8, 3:9] = 5
+        z[4:6, 5:7] = 2
+        scan = createScan(z)
+        triangles = numpy.array([((0, 0, 5), (10, 0, 5), (10, 10, 5)), ((0, 0, 5), (10, 10, 5), (0, 10, 5))], dtype=float)
+        cutter = PathDropCutter.CylCutter(2, 10)
+        pool = PathSurfaceSupport.WorkerPool(2, {'scanLines': scan, 'triangles': triangles, 'cutter': cutter})
+        progress = []
+        try:
+            layers = pool.map(PathSurfaceSupport.waterlineLayer, [(4, False), (1, False), (4, True)], lambda *args: progress.append(args))
+            angles = [0, math.pi / 2, math.pi, 3 * math.pi / 2]
+            lines = pool.map(PathSurfaceSupport.indexedScan, [(a, 'X', (5, -5, 0), (5, 5, 0), -20, 1) for a in angles])
+        finally:
+            pool.close()
+
+        self.assertEqual([2, 1, 2], [len(loops) for loops in layers])
+        for loops, (layDep, climb) in zip(layers, [(4, False), (1, False), (4, True)]):
+            expected = PathSurfaceSupport.waterlineLoops(PathSurfaceSupport.topoMap(scan, layDep), scan, climb)
+            self.assertEqual([e.tolist() for e in expected], [loop.tolist() for loop in loops])
+        self.assertEqual([1, 2, 3], sorted(done for worker, workerDone, done, total in progress))
+        # the tasks of both maps
+        self.assertEqual(7, sum(pool.tasksPerWorker()))
+
+        # the plateau is in y 0..10 at z 5, rotated around X by the angle of each task
+        stl = PathDropCutter.STLSurf()
+        stl.addTriangles(triangles)
+        for angle, cl in zip(angles, lines):
+            self.assertEqual((12, 3), cl.shape)
+            stl.rotate(angle, 0, 0)
+            pdc = PathDropCutter.PathDropCutter()
+            pdc.setSTL(stl)
+            pdc.setCutter(cutter)
+            pdc.setZ(-20)
+            pdc.setSampling(1)
+            path = PathDropCutter.Path()
+            path.append(PathDropCutter.Line(PathDropCutter.Point(5, -5, 0), PathDropCutter.Point(5, 5, 0)))
+            pdc.setPath(path)
+            pdc.run()
+            self.assertEqual(pdc.getCLArray().tolist(), cl.tolist())
+            stl.rotate(-angle, 0, 0)
+        self.assertRoughly(5, lines[0][-1][2])
+        self.assertRoughly(-5, lines[2][0][2])
+
+    def test03(self):
+        '''Verify the ignore waste map has a closed ring of waste around the model.'''
+        z = numpy.full((5, 6), -10.0)
+        z[2][2:4] = 5
+        wmap = numpy.array(PathSurfaceSupport.wasteMap(z.ravel(), -5, 6, False)).reshape(5, 6)
+        self.assertEqual([[0, 0, 0, 0, 0, 0],
+                          [0, 1, 1, 1, 1, 0],
+                          [0, 1, 2, 2, 1, 0],
+                          [0, 1, 1, 1, 1, 0],
+                          [0, 0, 0, 0, 0, 0]], wmap.tolist())
+        # the odd lines of a zigzag scan run backwards
+        zigzag = z.copy()
+        zigzag[1::2] = zigzag[1::2, ::-1]
+        wmap[1::2] = wmap[1::2, ::-1]
+        self.assertEqual(wmap.ravel().tolist(), PathSurfaceSupport.wasteMap(zigzag.ravel(), -5, 6, True))
+        # without whole lines there is no ring
+        self.assertEqual([0, 2, 0], PathSurfaceSupport.wasteMap([-10, 5, -10], -5, None, False))
+
+    def test04(self):
+        '''Verify ReleaseFromWaste cuts the ring around the model at the ignore waste depth.'''
+        z = numpy.full((5, 6), -10.0)
+        z[2][2:4] = 5
+        scan = createScan(z).reshape(-1, 3)
+        ignoreMap = PathSurfaceSupport.wasteMap(scan[:, 2], -5, 6, False)
+
+        def cuts(release):
+            op = PathSurface.ObjectSurface.__new__(PathSurface.ObjectSurface)
+            op.resetOpVariables()
+            op.horizRapid = op.vertRapid = op.horizFeed = op.vertFeed = 0
+            clp = [PathDropCutter.Point(*p) for p in scan.tolist()]
+            op._planarScanToGcode(PlanarObj(release), 0, -10, -10, clp, 6, ignoreMap)
+            return [(c.Parameters['X'], c.Parameters['Y'], c.Parameters['Z']) for c in op.gcodeCmds if c.Name == 'G1' and 'X' in c.Parameters]
+
+        self.assertEqual([(2, 2, 5), (3, 2, 5)], sorted(set(cuts(False))))
+        ring = sorted(set(cut for cut in cuts(True) if cut[2] == -5))
+        self.assertEqual([(x, y, -5) for x in range(1, 5) for y in range(1, 4) if y != 2 or x in (1, 4)], ring)
+
+    def test05(self):
+        '''Verify the workers scan the index angles of each layer like the op does in FreeCAD.'''
+        triangles = numpy.array([((-5, -5, 5), (5, -5, 5), (5, 5, 3)), ((-5, -5, 5), (5, 5, 3), (-5, 5, 3))], dtype=float)
+        obj = RotaryObj()
+        advances = [0.0, 30.0, 60.0, 90.0]
+
+        def scans(pool):
+            op = PathSurface.ObjectSurface.__new__(PathSurface.ObjectSurface)
+            op.resetOpVariables()
+            op.cutter = PathDropCutter.CylCutter(2, 10)
+            stl = PathDropCutter.STLSurf()
+            stl.addTriangles(triangles)
+            op.resetTolerance = 0.0000001
+            layers = []
+            for layDep in (2, 1):
+                lines = op._indexedDropCutScan(obj, stl, advances, -5, 0, 5, 0, layDep, 1, pool)
+                layers.append([[(p.x, p.y, p.z) for p in line] for line in lines])
+            return layers
+
+        from multiprocessing import spawn
+        executable = spawn.get_executable()
+        pool = PathSurfaceSupport.WorkerPool(2, {'triangles': triangles, 'cutter': PathDropCutter.CylCutter(2, 10)})
+        try:
+            parallel = scans(pool)
+        finally:
+            pool.close()
+        # the interpreter of the workers is not left set for other users of multiprocessing
+        self.assertEqual(executable, spawn.get_executable())
+        serial = scans(None)
+        self.assertEqual(len(serial), len(parallel))
+        for serialLayer, parallelLayer in zip(serial, parallel):
+            self.assertEqual(len(advances), len(parallelLayer))
+            for serialLine, parallelLine in zip(serialLayer, parallelLayer):
+                self.assertEqual(len(serialLine), len(parallelLine))
+                for s, p in zip(serialLine, parallelLine):
+                    for a, b in zip(s, p):
+                        self.assertRoughly(a, b)
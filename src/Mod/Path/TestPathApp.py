@@ -39,4 +39,13 @@ from PathTests.TestPathTooltable import TestPathTooltable
 from PathTests.TestPathToolController import TestPathToolController
 from PathTests.TestPathSetupSheet import TestPathSetupSheet
 from PathTests.TestPathDeburr  import TestPathDeburr
+from PathTests.TestPathDropCutter import TestPathDropCutter
+from PathTests.TestPathSurface import TestPathSurface
+from PathTests.TestPathPostCore import TestPathPostCore
+from PathTests.TestPathSequence import TestPathSequence
 
+from PathTests.TestPathJobOptimizer import TestPathJobOptimizer
+from PathTests.TestPathStatistics import TestPathStatistics
+from PathTests.TestPathDexelSim import TestPathDexelSim
+from PathTests.TestPathCommandBuffer import TestPathCommandBuffer
+from PathTests.TestPathResultCache import TestPathResultCache